@@ -0,0 +1,86 @@
+"""
+Contention benchmark of the concurrent InMemoryDatabase mode.
+
+Every thread persists, fetches, updates and logs in its own users (so the writers spread over the lock stripes)
+and the total throughput is reported for 1 up to N threads, compared with the same work done by one thread.
+
+Note: on a CPython build with the GIL the pure python work can't run in parallel, so the scaling mostly shows
+the locking overhead staying flat, a free-threaded build is needed to see the throughput really scaling up.
+
+usage: python -m benchmark.persistence.in_memory_contention [--max-threads 8] [--operations 20000] [--stripes 64]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.types import List
+from src.domain.entity.user import DomainUser, UserRole
+
+
+def generate_users(*, thread_number: int, count: int) -> List[DomainUser]:
+    # building the users directly, validation cost isn't what we measure here
+    return [
+        DomainUser(
+            name=f"user{thread_number}x{number}",
+            age=26,
+            password="Str0ngPassword",
+            email=f"user{thread_number}x{number}@test.com",
+            role=UserRole.USER
+        )
+        for number in range(count)
+    ]
+
+
+def work(*, db: InMemoryDatabase, users: List[DomainUser]) -> int:
+    operations = 0
+    for user in users:
+        persisted_user = db.persist_user(user=user)
+        db.fetch_user_by.id(user_id=persisted_user.id)
+        db.fetch_user_by.name(user_name=user.name)
+        db.persist_access_token(username=user.name, password=user.password)
+        db.fetch_access_token(username=user.name)
+        db.update_user_by.id(user_id=persisted_user.id, updated_user=user)
+        operations += 6
+
+    return operations
+
+
+def run(*, threads: int, operations: int, stripes: int) -> float:
+    db = InMemoryDatabase(config=dict(concurrent=True, lock_stripes=stripes))
+    users_per_thread = max(1, operations // 6 // threads)
+    users = [generate_users(thread_number=number, count=users_per_thread) for number in range(threads)]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        done_operations = sum(executor.map(lambda thread_users: work(db=db, users=thread_users), users))
+        elapsed = time.perf_counter() - start
+
+    return done_operations / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="InMemoryDatabase lock striping contention benchmark")
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--operations", type=int, default=60_000)
+    parser.add_argument("--stripes", type=int, default=64)
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}, "
+          f"{args.stripes} lock stripes, {args.operations} operations per run")
+    print(f"{'threads':>8} {'ops/sec':>12} {'scaling':>8}")
+
+    baseline = None
+    for threads in range(1, args.max_threads + 1):
+        throughput = run(threads=threads, operations=args.operations, stripes=args.stripes)
+        baseline = baseline or throughput
+        print(f"{threads:>8} {throughput:>12.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
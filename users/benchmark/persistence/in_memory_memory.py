@@ -0,0 +1,73 @@
+"""
+Memory benchmark of the InMemoryDatabase storages, reports the bytes taken per user for planning the node sizes.
+
+Every (storage, users) run happens in a fresh process, the users (with tokens for a tenth of them) are persisted
+then the growth of the process' resident memory is divided by the number of users, so it counts everything
+a user costs (the records, the indexes, the strings and the allocator's overhead).
+
+usage: python -m benchmark.persistence.in_memory_memory [--users 100000 1000000 10000000] [--storages dict compact]
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+from multiprocessing import get_context
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.domain.entity.user import DomainUser, UserRole
+
+
+def resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # no procfs, the peak is the closest thing (kilobytes on linux but bytes on macOS)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def measure(storage: str, users: int) -> float:
+    gc.collect()
+    before = resident_memory()
+
+    db = InMemoryDatabase(config=dict(storage=storage))
+    for number in range(users):
+        # building the users directly, validation cost isn't what we measure here
+        user = DomainUser(
+            name=f"user{number}",
+            age=16 + number % 100,
+            password=f"Str0ngPassword{number}",
+            email=f"user{number}@test.com",
+            role=UserRole.ADMIN if number % 1000 == 0 else UserRole.USER
+        )
+        db.persist_user(user=user)
+        if number % 10 == 0:
+            db.persist_access_token(username=user.name, password=user.password)
+
+    gc.collect()
+    return (resident_memory() - before) / users
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="InMemoryDatabase memory per user benchmark")
+    parser.add_argument("--users", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--storages", nargs="+", default=["dict", "compact"], choices=["dict", "compact"])
+    args = parser.parse_args()
+
+    print(f"python {sys.version.split()[0]}, resident memory growth per user (tokens for 10% of users)")
+    print(f"{'storage':>8} {'users':>10} {'bytes/user':>11} {'total MiB':>10}")
+
+    context = get_context("spawn")
+    for users in args.users:
+        for storage in args.storages:
+            with context.Pool(processes=1) as pool:
+                bytes_per_user = pool.apply(measure, (storage, users))
+            print(f"{storage:>8} {users:>10} {bytes_per_user:>11.0f} {bytes_per_user * users / 2 ** 20:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Access tokens benchmark, issuing and verifying them with PyJWT compared with the pre-keyed HmacSigner
+(and the JwtKeyring built on it, with and without reusing the still fresh tokens of the users logging in again).
+
+usage: python -m benchmark.web.access_tokens [--operations 50000] [--users 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import jwt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.authentication.signer import HmacSigner
+from src.application.types import Any, Callable, List
+from src.domain.entity.user import UserRole
+
+
+def generate_users(*, count: int) -> List[ApplicationUser]:
+    return [
+        ApplicationUser(
+            id=str(number),
+            name=f"user{number}",
+            age=26,
+            email=f"user{number}@test.com",
+            password="Str0ngPassword",
+            role=UserRole.USER
+        )
+        for number in range(count)
+    ]
+
+
+def claims_of(*, user: ApplicationUser) -> dict:
+    now = int(time.time())
+    return dict(iss="users-service", sub=user.name, uid=user.id, email=user.email, role=user.role.name,
+                iat=now, exp=now + 3600)
+
+
+def throughput(*, operations: int, items: List[Any], call: Callable[[Any], Any]) -> float:
+    start = time.perf_counter()
+    for number in range(operations):
+        call(items[number % len(items)])
+
+    return operations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="access tokens issuing and verifying benchmark")
+    parser.add_argument("--operations", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    users = generate_users(count=args.users)
+    signer = HmacSigner()
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=3600)
+    fresh_keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=3600, max_reused=0)
+    pyjwt_tokens = [jwt.encode(claims_of(user=user), "secret", algorithm="HS256").decode("utf-8") for user in users]
+    signer_tokens = [signer.sign(claims=claims_of(user=user), key="secret", kid="first") for user in users]
+    keyring_tokens = [keyring.issue(user=user).token for user in users]
+
+    runs = [
+        ("pyjwt encode", users,
+         lambda user: jwt.encode(claims_of(user=user), "secret", algorithm="HS256", headers=dict(kid="first"))),
+        ("signer sign", users, lambda user: signer.sign(claims=claims_of(user=user), key="secret", kid="first")),
+        ("keyring issue", users, lambda user: fresh_keyring.issue(user=user)),
+        ("keyring issue (reused)", users, lambda user: keyring.issue(user=user)),
+        ("pyjwt decode", pyjwt_tokens, lambda token: jwt.decode(token, "secret", algorithms=["HS256"])),
+        ("signer verify", signer_tokens, lambda token: signer.verify(token=token, key="secret")),
+        ("keyring verify", keyring_tokens, lambda token: keyring.verify(token=token))
+    ]
+
+    print(f"python {sys.version.split()[0]}, {args.users} users, {args.operations} operations per run")
+    print(f"{'operation':>24} {'ops/sec':>12}")
+    for name, items, call in runs:
+        print(f"{name:>24} {throughput(operations=args.operations, items=items, call=call):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+JSON cost per endpoint: encoding every endpoint's typical response (and decoding its request body, if it has one)
+the former way (as_dict then starlette's stdlib json) compared with the json codecs encoding the entities directly.
+
+usage: python -m benchmark.web.json_codec [--operations 20000] [--page-size 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+
+from src.application.entity.bulk_import import BulkImportFailure, BulkImportReport
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.codec import JsonCodecInterface
+from src.application.infrastructure.web.codec.stdlib import StdlibJsonCodec
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.user_json import UserJson
+from src.application.types import Any, Callable, Dict, List, Maybe, Tuple
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+
+try:
+    from src.application.infrastructure.web.codec.orjson import OrjsonCodec
+except ImportError:
+    OrjsonCodec = None
+
+
+def generate_users(*, count: int) -> List[ApplicationUser]:
+    return [
+        ApplicationUser(
+            id=str(number),
+            name=f"user{number}",
+            age=26,
+            email=f"user{number}@test.com",
+            password="Str0ngPassword",
+            role=UserRole.USER
+        )
+        for number in range(count)
+    ]
+
+
+def as_dicts(value: Any) -> Any:
+    # the handlers' former way, every entity turned into its dict first
+    if isinstance(value, dict):
+        return {key: as_dicts(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [as_dicts(item) for item in value]
+
+    return value.as_dict() if hasattr(value, "as_dict") else value
+
+
+def starlette_json(value: Any) -> bytes:
+    return json.dumps(
+        as_dicts(value), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def endpoints(*, page_size: int) -> Dict[str, Tuple[Any, Maybe[bytes]]]:
+    # endpoint -> (its response, its request body)
+    users = generate_users(count=page_size)
+    user_jsons: List[UserJson] = [from_application_user_to_json_user(application_user=user) for user in users]
+    user_body = json.dumps(dict(name="user0", age=26, password="Str0ngPassword", email="user0@test.com")).encode()
+    return {
+        "POST /users/login": (
+            AccessToken(token="e30." * 40), json.dumps(dict(username="user0", password="Str0ngPassword")).encode()
+        ),
+        "POST /users": (user_jsons[0], user_body),
+        "GET /users": (user_jsons[0], None),
+        "PUT /users": (user_jsons[0], user_body),
+        "DELETE /users": (Success(), None),
+        "GET /users/list": (dict(users=user_jsons, next_cursor=users[-1].id), None),
+        "GET /users/suggestions": (dict(suggestions=[
+            dict(user=user_json, score=0.5) for user_json in user_jsons
+        ]), None),
+        "POST /users/lookup": (
+            user_jsons + [Failure(error="There is no user with this id")],
+            json.dumps(dict(ids=[user.id for user in users])).encode()
+        ),
+        "POST /users/bulk": (BulkImportReport(
+            imported=page_size,
+            failures=[BulkImportFailure(row=row, error="Invalid email") for row in range(10)]
+        ), None)
+    }
+
+
+def cost(*, operations: int, call: Callable[[], Any]) -> float:
+    # in microseconds a call
+    start = time.perf_counter()
+    for _ in range(operations):
+        call()
+
+    return (time.perf_counter() - start) / operations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON encoding and decoding cost per endpoint")
+    parser.add_argument("--operations", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    codecs: Dict[str, JsonCodecInterface] = dict(stdlib=StdlibJsonCodec(config=None))
+    if OrjsonCodec is not None:
+        codecs["orjson"] = OrjsonCodec(config=None)
+
+    print(f"python {sys.version.split()[0]}, {args.operations} operations per run, pages of {args.page_size} users, "
+          f"microseconds per call")
+    print(f"{'endpoint':>24} {'as_dict+json':>13} " + " ".join(f"{name:>8}" for name in codecs)
+          + f" {'json.loads':>10} " + " ".join(f"{name:>8}" for name in codecs))
+    for endpoint, (response, body) in endpoints(page_size=args.page_size).items():
+        encodings = [cost(operations=args.operations, call=lambda: starlette_json(response))] + [
+            cost(operations=args.operations, call=lambda: codec.encode(value=response)) for codec in codecs.values()
+        ]
+        decodings = [cost(operations=args.operations, call=lambda: json.loads(body))] + [
+            cost(operations=args.operations, call=lambda: codec.decode(data=body)) for codec in codecs.values()
+        ] if body is not None else []
+
+        decoding_columns = "".join(
+            f" {value:>10.2f}" if number == 0 else f" {value:>8.2f}" for number, value in enumerate(decodings)
+        )
+        print(f"{endpoint:>24} {encodings[0]:>13.2f} " + " ".join(f"{value:>8.2f}" for value in encodings[1:])
+              + decoding_columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import marshmallow_dataclass
+
+from src.application.types import (
+    dataclass,
+    FrozenSlots,
+    List,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class BulkImportFailure(FrozenSlots):
+    __slots__ = ("row", "error")
+
+    row: int  # 1 based, the header of a csv isn't counted
+    error: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            row=self.row,
+            error=self.error
+        )
+
+
+@dataclass(frozen=True)
+class BulkImportReport(FrozenSlots):
+    __slots__ = ("imported", "failures")
+
+    imported: int
+    failures: List[BulkImportFailure]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            imported=self.imported,
+            failures=[failure.as_dict() for failure in self.failures]
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(BulkImportReport)
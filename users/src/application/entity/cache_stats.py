@@ -0,0 +1,37 @@
+import marshmallow_dataclass
+
+from src.application.types import (
+    dataclass,
+    FrozenSlots,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class CacheStats(FrozenSlots):
+    __slots__ = ("hits", "misses", "evictions", "expirations", "invalidations", "size", "max_size")
+
+    hits: int
+    misses: int
+    evictions: int  # dropped for room, a high count with a low hit ratio means max_size is too small
+    expirations: int  # dropped for being older than the ttl
+    invalidations: int
+    size: int
+    max_size: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            invalidations=self.invalidations,
+            size=self.size,
+            max_size=self.max_size
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(CacheStats)
@@ -0,0 +1,33 @@
+import marshmallow_dataclass
+
+from src.application.types import (
+    dataclass,
+    FrozenSlots,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class HashingStats(FrozenSlots):
+    __slots__ = ("processes", "pending", "max_pending", "completed", "rejected")
+
+    processes: int
+    pending: int  # submitted and not done yet, near max_pending means more processes are needed
+    max_pending: int
+    completed: int
+    rejected: int  # refused for a full queue
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            processes=self.processes,
+            pending=self.pending,
+            max_pending=self.max_pending,
+            completed=self.completed,
+            rejected=self.rejected
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(HashingStats)
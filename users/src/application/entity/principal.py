@@ -0,0 +1,36 @@
+import marshmallow_dataclass
+
+from src.domain.entity.user import UserRole
+from src.application.types import (
+    Maybe,
+    dataclass,
+    FrozenSlots,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class Principal(FrozenSlots):
+    __slots__ = ("id", "name", "email", "role", "expires_at")
+
+    # the authenticated caller, as it was when its access token was issued
+    id: str
+    name: str
+    email: Maybe[str]
+    role: UserRole
+    expires_at: Maybe[int]  # epoch seconds, None for the stored tokens (not expiring on their own)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            id=self.id,
+            name=self.name,
+            email=self.email,
+            role=self.role.name,
+            expires_at=self.expires_at
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(Principal)
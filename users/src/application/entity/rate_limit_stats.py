@@ -0,0 +1,34 @@
+import marshmallow_dataclass
+
+from src.application.types import (
+    dataclass,
+    FrozenSlots,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class RateLimitStats(FrozenSlots):
+    __slots__ = ("allowed", "limited", "evictions", "buckets", "max_buckets")
+
+    # counted per bucket a call takes from, a request taking from its client's then its username's one
+    allowed: int
+    limited: int  # no token left, so answered with a 429
+    evictions: int  # idle buckets dropped for room, a high count means max_buckets is too small for the traffic
+    buckets: int
+    max_buckets: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            allowed=self.allowed,
+            limited=self.limited,
+            evictions=self.evictions,
+            buckets=self.buckets,
+            max_buckets=self.max_buckets
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(RateLimitStats)
@@ -4,13 +4,16 @@ from src.domain.entity.user import UserRole
 from src.application.types import (
     Maybe,
     dataclass,
+    FrozenSlots,
     Dict,
     Any
 )
 
 
 @dataclass(frozen=True)
-class ApplicationUser:
+class ApplicationUser(FrozenSlots):
+    __slots__ = ("id", "name", "age", "email", "password", "role")
+
     id: str
     name: str
     age: int
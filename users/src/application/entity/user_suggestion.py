@@ -0,0 +1,28 @@
+import marshmallow_dataclass
+
+from src.application.entity.user import ApplicationUser
+from src.application.types import (
+    dataclass,
+    FrozenSlots,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class UserSuggestion(FrozenSlots):
+    __slots__ = ("user", "score")
+
+    user: ApplicationUser
+    score: float  # from 0.0 to 1.0 (the same name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            user=self.user.as_dict(),
+            score=self.score
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(UserSuggestion)
@@ -0,0 +1,30 @@
+import marshmallow_dataclass
+
+from src.application.entity.user import ApplicationUser
+from src.application.types import (
+    Maybe,
+    dataclass,
+    FrozenSlots,
+    List,
+    Dict,
+    Any
+)
+
+
+@dataclass(frozen=True)
+class UsersPage(FrozenSlots):
+    __slots__ = ("users", "next_cursor")
+
+    users: List[ApplicationUser]
+    next_cursor: Maybe[str]  # None on the last page
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(
+            users=[user.as_dict() for user in self.users],
+            next_cursor=self.next_cursor
+        )
+
+
+# compatibility with marshmallow serialization
+# maybe making it better later ;)
+marshmallow_dataclass.class_schema(UsersPage)
@@ -0,0 +1,184 @@
+import asyncio
+import os
+from base64 import b64decode, b64encode
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from hashlib import pbkdf2_hmac, scrypt
+from hmac import compare_digest
+from multiprocessing import get_context
+from threading import Lock
+
+from src.application.entity.hashing_stats import HashingStats
+from src.application.types import (
+    Any,
+    Callable,
+    List,
+    Maybe,
+    Either,
+    NamedTuple,
+    SimpleConfig
+)
+from src.domain.entity.failure import Failure
+
+_default_costs = {"scrypt": 2 ** 14, "pbkdf2_sha256": 600_000}
+_scrypt_block_size = 8
+_salt_size = 16
+_key_size = 32
+
+
+class PasswordScheme(NamedTuple):
+    # how the passwords are hashed, the cost being scrypt's n (a power of 2) or pbkdf2's iterations
+    algorithm: str
+    cost: int
+
+
+def _derive(*, scheme: PasswordScheme, password: str, salt: bytes) -> bytes:
+    if scheme.algorithm == "scrypt":
+        return scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=scheme.cost,
+            r=_scrypt_block_size,
+            p=1,
+            maxmem=256 * _scrypt_block_size * scheme.cost,
+            dklen=_key_size
+        )
+
+    return pbkdf2_hmac("sha256", password.encode("utf-8"), salt, scheme.cost, dklen=_key_size)
+
+
+def _parse(*, encoded: str) -> Maybe[List[str]]:
+    # "algorithm$cost$salt$key", anything else being a password stored before hashing them
+    parts = encoded.split("$")
+    if len(parts) != 4 or parts[0] not in _default_costs or not parts[1].isdigit():
+        return None
+
+    return parts
+
+
+def hash_password(scheme: PasswordScheme, password: str) -> str:
+    # module level (and positional) to be run in the pool's processes
+    salt = os.urandom(_salt_size)
+    key = _derive(scheme=scheme, password=password, salt=salt)
+    return f"{scheme.algorithm}${scheme.cost}${b64encode(salt).decode('ascii')}${b64encode(key).decode('ascii')}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    parts = _parse(encoded=encoded)
+    if parts is None:
+        return compare_digest(password.encode("utf-8"), encoded.encode("utf-8"))
+
+    algorithm, cost, salt, key = parts
+    return compare_digest(
+        _derive(scheme=PasswordScheme(algorithm=algorithm, cost=int(cost)), password=password, salt=b64decode(salt)),
+        b64decode(key)
+    )
+
+
+class PasswordHasher:
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        """
+        config as {"algorithm": "scrypt", "cost": 16384, "processes": 8, "max_pending": 64}
+
+        The passwords are hashed and verified on a pool of `processes` processes (0 runs them in the calling thread,
+        or on the loop's default threads for the async methods), so the event loop never waits for them and
+        the logins use all the cores. At most `max_pending` of them wait for the pool, the others being refused
+        instead of queueing logins no client waits for anymore.
+
+        Changing the algorithm or the cost only applies to the new hashes, `needs_rehash` tells which ones are old
+        (or not hashed at all).
+        """
+        config = config or {}
+        algorithm = config.get("algorithm", "scrypt")
+        if algorithm not in _default_costs:
+            raise ValueError(f"algorithm should be within this list {list(_default_costs)}")
+
+        self.__scheme = PasswordScheme(algorithm=algorithm, cost=config.get("cost", _default_costs[algorithm]))
+        self.__processes: int = config.get("processes", os.cpu_count() or 1)
+        self.__max_pending: int = config.get("max_pending", 8 * max(1, self.__processes))
+        self.__pool: Maybe[ProcessPoolExecutor] = None
+        self.__lock = Lock()
+        self.__pending = 0
+        self.__completed = 0
+        self.__rejected = 0
+
+    @property
+    def scheme(self) -> PasswordScheme:
+        return self.__scheme
+
+    def needs_rehash(self, *, encoded: str) -> bool:
+        parts = _parse(encoded=encoded)
+        return parts is None or (parts[0], int(parts[1])) != tuple(self.__scheme)
+
+    def __hashing_pool(self) -> Maybe[ProcessPoolExecutor]:
+        if self.__processes <= 0:
+            return None
+
+        with self.__lock:
+            if self.__pool is None:
+                # spawned (not forked) processes, forking a process already running threads isn't safe
+                self.__pool = ProcessPoolExecutor(max_workers=self.__processes, mp_context=get_context("spawn"))
+
+            return self.__pool
+
+    def __reserve(self) -> bool:
+        with self.__lock:
+            if self.__pending >= self.__max_pending:
+                self.__rejected += 1
+                return False
+
+            self.__pending += 1
+            return True
+
+    def __release(self) -> None:
+        with self.__lock:
+            self.__pending -= 1
+            self.__completed += 1
+
+    def __run(self, call: Callable[..., Any], *args: Any) -> Either[Failure, Any]:
+        if not self.__reserve():
+            return Failure(error="Too many passwords are being checked, try again later.")
+
+        try:
+            pool = self.__hashing_pool()
+            return call(*args) if pool is None else pool.submit(call, *args).result()
+        finally:
+            self.__release()
+
+    async def __run_async(self, call: Callable[..., Any], *args: Any) -> Either[Failure, Any]:
+        if not self.__reserve():
+            return Failure(error="Too many passwords are being checked, try again later.")
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__hashing_pool(), partial(call, *args))
+        finally:
+            self.__release()
+
+    def hash(self, *, password: str) -> Either[Failure, str]:
+        return self.__run(hash_password, self.__scheme, password)
+
+    async def hash_async(self, *, password: str) -> Either[Failure, str]:
+        return await self.__run_async(hash_password, self.__scheme, password)
+
+    def verify(self, *, password: str, encoded: str) -> Either[Failure, bool]:
+        return self.__run(verify_password, password, encoded)
+
+    async def verify_async(self, *, password: str, encoded: str) -> Either[Failure, bool]:
+        return await self.__run_async(verify_password, password, encoded)
+
+    @property
+    def stats(self) -> HashingStats:
+        with self.__lock:
+            return HashingStats(
+                processes=self.__processes,
+                pending=self.__pending,
+                max_pending=self.__max_pending,
+                completed=self.__completed,
+                rejected=self.__rejected
+            )
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__pool is not None:
+                self.__pool.shutdown(wait=True)
+                self.__pool = None
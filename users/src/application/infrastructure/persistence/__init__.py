@@ -4,13 +4,14 @@ from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.entity.health_check import HealthCheckStatus
 from src.application.entity.user import ApplicationUser
 from src.application.types import (
+    List,
     Maybe,
     Either,
     SimpleConfig
 )
 from src.domain.entity.failure import Failure
 from src.domain.entity.success import Success
-from src.domain.entity.user import DomainUser as DomainUser
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
 
 
 class PersistenceInterface(metaclass=ABCMeta):
@@ -25,6 +26,16 @@ class PersistenceInterface(metaclass=ABCMeta):
         @abstractmethod
         def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]: pass
 
+        # batches, one result per requested item (in the same order) so callers resolve many users in one call
+        @abstractmethod
+        def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+        @abstractmethod
+        def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+        @abstractmethod
+        def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
     class UpdateBy:
         @abstractmethod
         def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]: pass
@@ -72,8 +83,18 @@ class PersistenceInterface(metaclass=ABCMeta):
             role=user.role
         )
 
+    @property
+    def thread_safe(self) -> bool:
+        # whether its methods may run on many threads at once, the ones that can't are only called from one at a time
+        return True
+
     @abstractmethod
-    def persist_access_token(self, *, username: str, password: str) -> Either[Failure, AccessToken]: pass
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        """
+        A new stored access token of the user, whose stored password should be `password`
+        (None when the caller verified it already, e.g. against the stored hash).
+        """
+        pass
 
     @abstractmethod
     def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]: pass
@@ -81,6 +102,65 @@ class PersistenceInterface(metaclass=ABCMeta):
     @abstractmethod
     def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]: pass
 
+    @abstractmethod
+    def persist_users(self, *,
+                      users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+    @abstractmethod
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        """
+        At most `limit` users ordered by id, starting right after `after_id` (or from the first one),
+        the cost should only depend on `limit` and not on how far `after_id` is.
+        """
+        pass
+
+    @abstractmethod
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        """
+        Like list_users but only the users matching all the given (not None) filters, both age bounds included.
+        """
+        pass
+
+    @abstractmethod
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        """
+        At most `limit` users whose key in the `prefix_indexes[selector]` index starts with `prefix` (a key already),
+        ordered by (key, id) and starting right after (`after_key`, `after_id`), costing O(log n + limit).
+        """
+        pass
+
+    @abstractmethod
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        """
+        At most `limit` candidates for a fuzzy search of `name`, the users sharing the most trigrams with it
+        (in no particular order, ranking them is up to the caller), costing about the same whatever the number of users.
+        """
+        pass
+
+    @abstractmethod
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        """
+        Whether a user has this name (or email), a missing one being no failure.
+        """
+        pass
+
+    def may_have_user(self, *, selector: str, data: str) -> bool:
+        """
+        False only when there's certainly no user with this name (or email), answered without reading the storage,
+        so True (unsure) unless a filter was put in front of it.
+        """
+        return True
+
     @abstractmethod
     def _fetch_user_by(self) -> 'PersistenceInterface.FetchBy': pass
 
@@ -92,3 +172,109 @@ class PersistenceInterface(metaclass=ABCMeta):
 
     @abstractmethod
     def health_check(self) -> HealthCheckStatus: pass
+
+
+class AsyncPersistenceInterface(metaclass=ABCMeta):
+    # same surface as PersistenceInterface, awaited so the event loop never blocks on the storage
+    class FetchBy:
+        @abstractmethod
+        async def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]: pass
+
+        @abstractmethod
+        async def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]: pass
+
+        @abstractmethod
+        async def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]: pass
+
+        @abstractmethod
+        async def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+        @abstractmethod
+        async def names(self, *,
+                        user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+        @abstractmethod
+        async def emails(self, *,
+                         user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+    class UpdateBy:
+        @abstractmethod
+        async def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]: pass
+
+        @abstractmethod
+        async def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]: pass
+
+        @abstractmethod
+        async def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]: pass
+
+    class DeleteBy:
+        @abstractmethod
+        async def id(self, *, user_id: str) -> Either[Failure, Success]: pass
+
+        @abstractmethod
+        async def name(self, *, user_name: str) -> Either[Failure, Success]: pass
+
+        @abstractmethod
+        async def email(self, *, user_email: str) -> Either[Failure, Success]: pass
+
+    @abstractmethod
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        self.fetch_user_by = self._fetch_user_by()
+        self.update_user_by = self._update_user_by()
+        self.delete_user_by = self._delete_user_by()
+
+    @abstractmethod
+    async def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]: pass
+
+    @abstractmethod
+    async def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]: pass
+
+    @abstractmethod
+    async def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]: pass
+
+    @abstractmethod
+    async def persist_users(self, *,
+                            users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]: pass
+
+    @abstractmethod
+    async def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]: pass
+
+    @abstractmethod
+    async def search_users(self, *,
+                           role: Maybe[UserRole],
+                           age_gte: Maybe[int],
+                           age_lte: Maybe[int],
+                           after_id: Maybe[str],
+                           limit: int) -> Either[Failure, List[ApplicationUser]]: pass
+
+    @abstractmethod
+    async def search_users_by_prefix(self, *,
+                                     selector: str,
+                                     prefix: str,
+                                     after_key: Maybe[str],
+                                     after_id: Maybe[str],
+                                     limit: int) -> Either[Failure, List[ApplicationUser]]: pass
+
+    @abstractmethod
+    async def search_users_by_similar_name(self, *,
+                                           name: str,
+                                           limit: int) -> Either[Failure, List[ApplicationUser]]: pass
+
+    @abstractmethod
+    async def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]: pass
+
+    # not awaited, it never reads the storage
+    @abstractmethod
+    def may_have_user(self, *, selector: str, data: str) -> bool: pass
+
+    @abstractmethod
+    def _fetch_user_by(self) -> 'AsyncPersistenceInterface.FetchBy': pass
+
+    @abstractmethod
+    def _update_user_by(self) -> 'AsyncPersistenceInterface.UpdateBy': pass
+
+    @abstractmethod
+    def _delete_user_by(self) -> 'AsyncPersistenceInterface.DeleteBy': pass
+
+    @abstractmethod
+    async def health_check(self) -> HealthCheckStatus: pass
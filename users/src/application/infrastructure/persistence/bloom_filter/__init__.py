@@ -0,0 +1,295 @@
+from src.application.entity.health_check import HealthCheckStatus
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.structures import ScalableBloomFilter
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    List,
+    Maybe,
+    Either,
+    SimpleConfig
+)
+from src.application.utilities.functions import exception_handler
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+_default_capacity = 100_000
+_default_error_rate = 0.001
+_default_page_size = 1_000
+_filtered_selectors = ("name", "email")
+
+
+def _key(*, selector: str, data: str) -> str:
+    return f"{selector}:{data}"
+
+
+class BloomFilterPersistence(PersistenceInterface):
+    """
+    A negative cache in front of any PersistenceInterface, a ScalableBloomFilter of all the names and emails
+    (rebuilt from the storage when created) answering the reads and writes of a certainly absent name or email
+    with no storage access, everything else going to the wrapped one.
+
+    The names and emails are added before being written, so the filter may only be ahead of the storage,
+    but only the writes going through this wrapper are seen: it's for a storage having no other writer.
+    """
+
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"capacity": 100000, "error_rate": 0.001, "page_size": 1000}
+
+        "capacity" is the number of keys (two per user) of the first filter, more of them only add filters,
+        "page_size" the number of users read at once while rebuilding it.
+        """
+        config = config or {}
+        self.__persistence = persistence
+        self.__filter = ScalableBloomFilter(
+            capacity=config.get("capacity", _default_capacity),
+            error_rate=config.get("error_rate", _default_error_rate)
+        )
+        self.__rebuild(page_size=config.get("page_size", _default_page_size))
+        super().__init__(config=config)
+
+    @property
+    def thread_safe(self) -> bool:
+        return self.__persistence.thread_safe
+
+    def close(self) -> None:
+        close = getattr(self.__persistence, "close", None)
+        if close is not None:
+            close()
+
+    def __rebuild(self, *, page_size: int) -> None:
+        after_id: Maybe[str] = None
+        while True:
+            list_users_status = self.__persistence.list_users(after_id=after_id, limit=page_size)
+            if isinstance(list_users_status, Failure):
+                raise RuntimeError(f"Can't rebuild the filter of the users, {list_users_status.error}")
+
+            for user in list_users_status:
+                self.__add(user=user)
+            if len(list_users_status) < page_size:
+                return
+            after_id = list_users_status[-1].id
+
+    def __add(self, *, user: Any) -> None:
+        for selector in _filtered_selectors:
+            self.__filter.add(key=_key(selector=selector, data=getattr(user, selector)))
+
+    def may_have_user(self, *, selector: str, data: str) -> bool:
+        return selector not in _filtered_selectors or self.__filter.may_contain(key=_key(selector=selector, data=data))
+
+    def __filtered(self, *,
+                   selector: str,
+                   data: str,
+                   action: str,
+                   call: Callable[[], Either[Failure, Any]]) -> Either[Failure, Any]:
+        if not self.may_have_user(selector=selector, data=data):
+            return Failure(error=f"There is no user with {selector} {data} to be {action}")
+
+        return call()
+
+    def __filtered_many(self, *,
+                        selector: str,
+                        values: List[str],
+                        fetch: Callable[[List[str]], Either[Failure, List[Either[Failure, ApplicationUser]]]]
+                        ) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        results: List[Any] = [
+            None if self.may_have_user(selector=selector, data=value)
+            else Failure(error=f"There is no user with {selector} {value} to be fetched")
+            for value in values
+        ]
+        maybes = [position for position, result in enumerate(results) if result is None]
+        if not maybes:
+            return results
+
+        fetch_users_status = fetch([values[position] for position in maybes])
+        if isinstance(fetch_users_status, Failure):
+            return fetch_users_status
+
+        for position, fetch_user_status in zip(maybes, fetch_users_status):
+            results[position] = fetch_user_status
+
+        return results
+
+    def health_check(self) -> HealthCheckStatus:
+        return self.__persistence.health_check()
+
+    @exception_handler
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        return self.__filtered(
+            selector="name",
+            data=username,
+            action="fetched",
+            call=lambda: self.__persistence.persist_access_token(username=username, password=password)
+        )
+
+    @exception_handler
+    def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
+        return self.__persistence.fetch_access_token(username=username)
+
+    @exception_handler
+    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        self.__add(user=user)
+        return self.__persistence.persist_user(user=user)
+
+    @exception_handler
+    def persist_users(self, *, users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        for user in users:
+            self.__add(user=user)
+        return self.__persistence.persist_users(users=users)
+
+    @exception_handler
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.list_users(after_id=after_id, limit=limit)
+
+    @exception_handler
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users(
+            role=role,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @exception_handler
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users_by_prefix(
+            selector=selector,
+            prefix=prefix,
+            after_key=after_key,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @exception_handler
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users_by_similar_name(name=name, limit=limit)
+
+    @exception_handler
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        if not self.may_have_user(selector=selector, data=data):
+            return False
+
+        return self.__persistence.has_user(selector=selector, data=data)
+
+    def _fetch_user_by(self) -> PersistenceInterface.FetchBy:
+        filtered = self.__filtered
+        filtered_many = self.__filtered_many
+        fetch_user_by = self.__persistence.fetch_user_by
+
+        class BloomFilterFetchBy(PersistenceInterface.FetchBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]:
+                return fetch_user_by.id(user_id=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
+                return filtered(
+                    selector="name",
+                    data=user_name,
+                    action="fetched",
+                    call=lambda: fetch_user_by.name(user_name=user_name)
+                )
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
+                return filtered(
+                    selector="email",
+                    data=user_email,
+                    action="fetched",
+                    call=lambda: fetch_user_by.email(user_email=user_email)
+                )
+
+            @exception_handler
+            def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_user_by.ids(user_ids=user_ids)
+
+            @exception_handler
+            def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return filtered_many(
+                    selector="name",
+                    values=user_names,
+                    fetch=lambda names: fetch_user_by.names(user_names=names)
+                )
+
+            @exception_handler
+            def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return filtered_many(
+                    selector="email",
+                    values=user_emails,
+                    fetch=lambda emails: fetch_user_by.emails(user_emails=emails)
+                )
+
+        return BloomFilterFetchBy()
+
+    def _update_user_by(self) -> PersistenceInterface.UpdateBy:
+        add = self.__add
+        filtered = self.__filtered
+        update_user_by = self.__persistence.update_user_by
+
+        class BloomFilterUpdateBy(PersistenceInterface.UpdateBy):
+            @exception_handler
+            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                add(user=updated_user)
+                return update_user_by.id(user_id=user_id, updated_user=updated_user)
+
+            @exception_handler
+            def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                def update() -> Either[Failure, ApplicationUser]:
+                    add(user=updated_user)
+                    return update_user_by.name(user_name=user_name, updated_user=updated_user)
+
+                return filtered(selector="name", data=user_name, action="updated", call=update)
+
+            @exception_handler
+            def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                def update() -> Either[Failure, ApplicationUser]:
+                    add(user=updated_user)
+                    return update_user_by.email(user_email=user_email, updated_user=updated_user)
+
+                return filtered(selector="email", data=user_email, action="updated", call=update)
+
+        return BloomFilterUpdateBy()
+
+    def _delete_user_by(self) -> PersistenceInterface.DeleteBy:
+        filtered = self.__filtered
+        delete_user_by = self.__persistence.delete_user_by
+
+        class BloomFilterDeleteBy(PersistenceInterface.DeleteBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, Success]:
+                return delete_user_by.id(user_id=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, Success]:
+                return filtered(
+                    selector="name",
+                    data=user_name,
+                    action="deleted",
+                    call=lambda: delete_user_by.name(user_name=user_name)
+                )
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, Success]:
+                return filtered(
+                    selector="email",
+                    data=user_email,
+                    action="deleted",
+                    call=lambda: delete_user_by.email(user_email=user_email)
+                )
+
+        return BloomFilterDeleteBy()
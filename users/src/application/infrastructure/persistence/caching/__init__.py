@@ -0,0 +1,325 @@
+from src.application.entity.cache_stats import CacheStats
+from src.application.entity.health_check import HealthCheckStatus
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Maybe,
+    Either,
+    SimpleConfig
+)
+from src.application.utilities.cache import TtlLruCache
+from src.application.utilities.functions import exception_handler
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+_default_max_users = 10_000
+_default_max_tokens = 10_000
+_default_ttl = 30.0
+
+
+class CachingPersistence(PersistenceInterface):
+    """
+    Read-through cache in front of any PersistenceInterface, the users (by id, name or email) and the access tokens
+    being served from bounded LRUs for at most `ttl` seconds, anything else going straight to the wrapped one.
+
+    A user is only kept once (by id), the names and emails only point to its id and are checked against it,
+    so a write only has to drop the user's id and token. Only the writes going through this wrapper are seen,
+    the ones of the other processes sharing the storage are only caught up with once the ttl has passed.
+    """
+
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_users": 10000, "max_tokens": 10000, "ttl": 30.0}
+
+        "ttl" (in seconds) bounds how stale a user or a token may be, None keeps them until evicted.
+        """
+        config = config or {}
+        ttl: Maybe[float] = config.get("ttl", _default_ttl)
+        max_users: int = config.get("max_users", _default_max_users)
+
+        self.__persistence = persistence
+        self.__users = TtlLruCache(max_size=max_users, ttl=ttl)
+        # two aliases (name and email) per user
+        self.__aliases = TtlLruCache(max_size=2 * max_users, ttl=ttl)
+        self.__tokens = TtlLruCache(max_size=config.get("max_tokens", _default_max_tokens), ttl=ttl)
+        super().__init__(config=config)
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        # a lookup by name or email only reaches the users once its alias is found
+        return dict(users=self.__users.stats, aliases=self.__aliases.stats, tokens=self.__tokens.stats)
+
+    def clear(self) -> None:
+        self.__users.clear()
+        self.__aliases.clear()
+        self.__tokens.clear()
+
+    @property
+    def thread_safe(self) -> bool:
+        return self.__persistence.thread_safe
+
+    def close(self) -> None:
+        self.clear()
+        close = getattr(self.__persistence, "close", None)
+        if close is not None:
+            close()
+
+    def __cached_user(self, *, selector: str, value: str) -> Maybe[ApplicationUser]:
+        user_id = value if selector == "id" else self.__aliases.get((selector, value))
+        user: Maybe[ApplicationUser] = self.__users.get(user_id) if user_id is not None else None
+        # an alias outliving a rename points to a user not having this name (or email) anymore
+        if user is None or getattr(user, selector) != value:
+            return None
+
+        return user
+
+    def __keep(self, *, user: ApplicationUser, generation: int) -> None:
+        if self.__users.put(user.id, user, generation=generation):
+            self.__aliases.put(("name", user.name), user.id)
+            self.__aliases.put(("email", user.email), user.id)
+
+    def __forget(self, *users: ApplicationUser) -> None:
+        self.__users.invalidate(*(user.id for user in users))
+        self.__tokens.invalidate(*(user.name for user in users))
+
+    def __fetch_one(self, *,
+                    selector: str,
+                    value: str,
+                    fetch: Callable[[], Either[Failure, ApplicationUser]]) -> Either[Failure, ApplicationUser]:
+        cached_user = self.__cached_user(selector=selector, value=value)
+        if cached_user is not None:
+            return cached_user
+
+        # taken before reading, so a user read right before a write isn't kept after it
+        generation = self.__users.generation()
+        fetch_user_status = fetch()
+        if isinstance(fetch_user_status, ApplicationUser):
+            self.__keep(user=fetch_user_status, generation=generation)
+
+        return fetch_user_status
+
+    def __fetch_many(self, *,
+                     selector: str,
+                     values: List[str],
+                     fetch: Callable[[List[str]], Either[Failure, List[Either[Failure, ApplicationUser]]]]
+                     ) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        results: List[Any] = [self.__cached_user(selector=selector, value=value) for value in values]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        # only the missing ones are fetched, still in one call
+        generation = self.__users.generation()
+        fetch_users_status = fetch([values[position] for position in missing])
+        if isinstance(fetch_users_status, Failure):
+            return fetch_users_status
+
+        for position, fetch_user_status in zip(missing, fetch_users_status):
+            if isinstance(fetch_user_status, ApplicationUser):
+                self.__keep(user=fetch_user_status, generation=generation)
+            results[position] = fetch_user_status
+
+        return results
+
+    def __write(self, *,
+                current_user_status: Either[Failure, ApplicationUser],
+                write: Callable[[], Either[Failure, Any]]) -> Either[Failure, Any]:
+        # the user as it was is needed too, a rename also moves the token of its former name
+        write_status = write()
+        self.__forget(*(
+            user for user in (current_user_status, write_status) if isinstance(user, ApplicationUser)
+        ))
+
+        return write_status
+
+    def health_check(self) -> HealthCheckStatus:
+        return self.__persistence.health_check()
+
+    @exception_handler
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        persist_access_token_status = self.__persistence.persist_access_token(username=username, password=password)
+        self.__tokens.invalidate(username)
+
+        return persist_access_token_status
+
+    @exception_handler
+    def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
+        cached_access_token: Maybe[AccessToken] = self.__tokens.get(username)
+        if cached_access_token is not None:
+            return cached_access_token
+
+        generation = self.__tokens.generation()
+        fetch_access_token_status = self.__persistence.fetch_access_token(username=username)
+        if isinstance(fetch_access_token_status, AccessToken):
+            self.__tokens.put(username, fetch_access_token_status, generation=generation)
+
+        return fetch_access_token_status
+
+    # new users can't be cached already, and the pages aren't cached at all
+    @exception_handler
+    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        return self.__persistence.persist_user(user=user)
+
+    @exception_handler
+    def persist_users(self, *, users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        return self.__persistence.persist_users(users=users)
+
+    @exception_handler
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.list_users(after_id=after_id, limit=limit)
+
+    @exception_handler
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users(
+            role=role,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @exception_handler
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users_by_prefix(
+            selector=selector,
+            prefix=prefix,
+            after_key=after_key,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @exception_handler
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return self.__persistence.search_users_by_similar_name(name=name, limit=limit)
+
+    @exception_handler
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        if self.__cached_user(selector=selector, value=data) is not None:
+            return True
+
+        return self.__persistence.has_user(selector=selector, data=data)
+
+    def may_have_user(self, *, selector: str, data: str) -> bool:
+        return self.__persistence.may_have_user(selector=selector, data=data)
+
+    def _fetch_user_by(self) -> PersistenceInterface.FetchBy:
+        fetch_one = self.__fetch_one
+        fetch_many = self.__fetch_many
+        fetch_user_by = self.__persistence.fetch_user_by
+
+        class CachingFetchBy(PersistenceInterface.FetchBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]:
+                return fetch_one(selector="id", value=user_id, fetch=lambda: fetch_user_by.id(user_id=user_id))
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
+                return fetch_one(
+                    selector="name",
+                    value=user_name,
+                    fetch=lambda: fetch_user_by.name(user_name=user_name)
+                )
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
+                return fetch_one(
+                    selector="email",
+                    value=user_email,
+                    fetch=lambda: fetch_user_by.email(user_email=user_email)
+                )
+
+            @exception_handler
+            def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(selector="id", values=user_ids, fetch=lambda ids: fetch_user_by.ids(user_ids=ids))
+
+            @exception_handler
+            def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(
+                    selector="name",
+                    values=user_names,
+                    fetch=lambda names: fetch_user_by.names(user_names=names)
+                )
+
+            @exception_handler
+            def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(
+                    selector="email",
+                    values=user_emails,
+                    fetch=lambda emails: fetch_user_by.emails(user_emails=emails)
+                )
+
+        return CachingFetchBy()
+
+    def _update_user_by(self) -> PersistenceInterface.UpdateBy:
+        write = self.__write
+        fetch_user_by = self.fetch_user_by
+        update_user_by = self.__persistence.update_user_by
+
+        class CachingUpdateBy(PersistenceInterface.UpdateBy):
+            @exception_handler
+            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return write(
+                    current_user_status=fetch_user_by.id(user_id=user_id),
+                    write=lambda: update_user_by.id(user_id=user_id, updated_user=updated_user)
+                )
+
+            @exception_handler
+            def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return write(
+                    current_user_status=fetch_user_by.name(user_name=user_name),
+                    write=lambda: update_user_by.name(user_name=user_name, updated_user=updated_user)
+                )
+
+            @exception_handler
+            def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return write(
+                    current_user_status=fetch_user_by.email(user_email=user_email),
+                    write=lambda: update_user_by.email(user_email=user_email, updated_user=updated_user)
+                )
+
+        return CachingUpdateBy()
+
+    def _delete_user_by(self) -> PersistenceInterface.DeleteBy:
+        write = self.__write
+        fetch_user_by = self.fetch_user_by
+        delete_user_by = self.__persistence.delete_user_by
+
+        class CachingDeleteBy(PersistenceInterface.DeleteBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, Success]:
+                return write(
+                    current_user_status=fetch_user_by.id(user_id=user_id),
+                    write=lambda: delete_user_by.id(user_id=user_id)
+                )
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, Success]:
+                return write(
+                    current_user_status=fetch_user_by.name(user_name=user_name),
+                    write=lambda: delete_user_by.name(user_name=user_name)
+                )
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, Success]:
+                return write(
+                    current_user_status=fetch_user_by.email(user_email=user_email),
+                    write=lambda: delete_user_by.email(user_email=user_email)
+                )
+
+        return CachingDeleteBy()
@@ -0,0 +1,211 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from weakref import WeakKeyDictionary, ref
+
+from src.application.entity.health_check import HealthCheckStatus
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import AsyncPersistenceInterface, PersistenceInterface
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    List,
+    Maybe,
+    Either,
+    SimpleConfig
+)
+from src.application.utilities.functions import async_exception_handler
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+_default_max_workers = 16
+
+# neither side is kept alive by this cache, the adapter lives as long as the usecases holding it
+_adapted_persistences: 'WeakKeyDictionary[PersistenceInterface, ref]' = WeakKeyDictionary()
+_adapted_persistences_lock = Lock()
+
+
+class ExecutorAsyncPersistence(AsyncPersistenceInterface):
+    """
+    Adapts any PersistenceInterface to AsyncPersistenceInterface by running its calls on a bounded pool of threads,
+    so a slow storage call only holds one of these threads and never the event loop.
+
+    A persistence that isn't thread safe (like an InMemoryDatabase without "concurrent") gets a pool of one thread,
+    its calls still leave the event loop but run one after the other.
+    """
+
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        self.__persistence = persistence
+        self.__executor = ThreadPoolExecutor(
+            max_workers=(config or {}).get("max_workers", _default_max_workers),
+            thread_name_prefix=f"{persistence.__class__.__name__}-executor"
+        )
+        super().__init__(config=config)
+
+    @classmethod
+    def of(cls, *, persistence: PersistenceInterface) -> AsyncPersistenceInterface:
+        # one adapter (and so one bounded pool) per persistence, shared by all the usecases on top of it
+        if isinstance(persistence, AsyncPersistenceInterface):
+            return persistence
+
+        with _adapted_persistences_lock:
+            adapted_persistence = _adapted_persistences.get(persistence, None)
+            async_persistence = adapted_persistence() if adapted_persistence is not None else None
+            if async_persistence is None:
+                async_persistence = cls(
+                    config=None if persistence.thread_safe else dict(max_workers=1),
+                    persistence=persistence
+                )
+                _adapted_persistences[persistence] = ref(async_persistence)
+
+            return async_persistence
+
+    async def __run(self, func: Callable[..., Any], **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, partial(func, **kwargs))
+
+    def close(self) -> None:
+        self.__executor.shutdown(wait=True)
+
+    async def health_check(self) -> HealthCheckStatus:
+        return await self.__run(self.__persistence.health_check)
+
+    @async_exception_handler
+    async def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        return await self.__run(self.__persistence.persist_access_token, username=username, password=password)
+
+    @async_exception_handler
+    async def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
+        return await self.__run(self.__persistence.fetch_access_token, username=username)
+
+    @async_exception_handler
+    async def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        return await self.__run(self.__persistence.persist_user, user=user)
+
+    @async_exception_handler
+    async def persist_users(self, *,
+                            users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        return await self.__run(self.__persistence.persist_users, users=users)
+
+    @async_exception_handler
+    async def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return await self.__run(self.__persistence.list_users, after_id=after_id, limit=limit)
+
+    @async_exception_handler
+    async def search_users(self, *,
+                           role: Maybe[UserRole],
+                           age_gte: Maybe[int],
+                           age_lte: Maybe[int],
+                           after_id: Maybe[str],
+                           limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return await self.__run(
+            self.__persistence.search_users,
+            role=role,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @async_exception_handler
+    async def search_users_by_prefix(self, *,
+                                     selector: str,
+                                     prefix: str,
+                                     after_key: Maybe[str],
+                                     after_id: Maybe[str],
+                                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return await self.__run(
+            self.__persistence.search_users_by_prefix,
+            selector=selector,
+            prefix=prefix,
+            after_key=after_key,
+            after_id=after_id,
+            limit=limit
+        )
+
+    @async_exception_handler
+    async def search_users_by_similar_name(self, *,
+                                           name: str,
+                                           limit: int) -> Either[Failure, List[ApplicationUser]]:
+        return await self.__run(self.__persistence.search_users_by_similar_name, name=name, limit=limit)
+
+    @async_exception_handler
+    async def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        return await self.__run(self.__persistence.has_user, selector=selector, data=data)
+
+    def may_have_user(self, *, selector: str, data: str) -> bool:
+        return self.__persistence.may_have_user(selector=selector, data=data)
+
+    def _fetch_user_by(self) -> 'AsyncPersistenceInterface.FetchBy':
+        run = self.__run
+        fetch_user_by = self.__persistence.fetch_user_by
+
+        class ExecutorFetchBy(AsyncPersistenceInterface.FetchBy):
+            @async_exception_handler
+            async def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]:
+                return await run(fetch_user_by.id, user_id=user_id)
+
+            @async_exception_handler
+            async def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
+                return await run(fetch_user_by.name, user_name=user_name)
+
+            @async_exception_handler
+            async def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
+                return await run(fetch_user_by.email, user_email=user_email)
+
+            # the whole batch is one trip to the pool
+            @async_exception_handler
+            async def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return await run(fetch_user_by.ids, user_ids=user_ids)
+
+            @async_exception_handler
+            async def names(self, *,
+                            user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return await run(fetch_user_by.names, user_names=user_names)
+
+            @async_exception_handler
+            async def emails(self, *,
+                             user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return await run(fetch_user_by.emails, user_emails=user_emails)
+
+        return ExecutorFetchBy()
+
+    def _update_user_by(self) -> 'AsyncPersistenceInterface.UpdateBy':
+        run = self.__run
+        update_user_by = self.__persistence.update_user_by
+
+        class ExecutorUpdateBy(AsyncPersistenceInterface.UpdateBy):
+            @async_exception_handler
+            async def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return await run(update_user_by.id, user_id=user_id, updated_user=updated_user)
+
+            @async_exception_handler
+            async def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return await run(update_user_by.name, user_name=user_name, updated_user=updated_user)
+
+            @async_exception_handler
+            async def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return await run(update_user_by.email, user_email=user_email, updated_user=updated_user)
+
+        return ExecutorUpdateBy()
+
+    def _delete_user_by(self) -> 'AsyncPersistenceInterface.DeleteBy':
+        run = self.__run
+        delete_user_by = self.__persistence.delete_user_by
+
+        class ExecutorDeleteBy(AsyncPersistenceInterface.DeleteBy):
+            @async_exception_handler
+            async def id(self, *, user_id: str) -> Either[Failure, Success]:
+                return await run(delete_user_by.id, user_id=user_id)
+
+            @async_exception_handler
+            async def name(self, *, user_name: str) -> Either[Failure, Success]:
+                return await run(delete_user_by.name, user_name=user_name)
+
+            @async_exception_handler
+            async def email(self, *, user_email: str) -> Either[Failure, Success]:
+                return await run(delete_user_by.email, user_email=user_email)
+
+        return ExecutorDeleteBy()
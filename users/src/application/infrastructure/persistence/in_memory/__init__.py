@@ -1,24 +1,136 @@
-from jwt import encode
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
+from threading import Event, Lock, Thread
+from time import monotonic
+from weakref import ref
 
 from src.application.entity.health_check import HealthCheckStatus, Status
 from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.indexes import IndexManager, prefix_indexes, name_trigrams_index
+from src.application.infrastructure.persistence.in_memory.compact import compact_tables
+from src.application.infrastructure.persistence.in_memory.durability import Durability, JournalTransaction
+from src.application.infrastructure.persistence.in_memory.expiring import ExpiringTable
+from src.application.infrastructure.persistence.in_memory.lock_striping import LockStripes, NoLockStripes
+from src.application.infrastructure.persistence.in_memory.ordered import OrderedTable
+from src.application.infrastructure.persistence.search import plan_search, predicates_of
+from src.application.infrastructure.persistence.structures import PrefixIndex, TrigramIndex
+from src.application.infrastructure.web.authentication.signer import stored_token_of
 from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.types import (
+    Dict,
+    Iterator,
+    List,
     Maybe,
     Either,
     SimpleConfig
 )
 from src.application.utilities.functions import exception_handler
+from src.application.utilities.text import trigrams_of
 from src.domain.entity.failure import Failure
 from src.domain.entity.success import Success
-from src.domain.entity.user import DomainUser as DomainUser
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+_default_lock_stripes = 64
+_default_token_ttl = 3600.0
+_default_token_tick = 1.0
+
+
+def _expire_access_tokens_forever(*, database: 'ref[InMemoryDatabase]', tick: float, stopped: Event) -> None:
+    # only a weak reference, a database nobody closed still gets collected (and this thread ends with it)
+    while not stopped.wait(tick):
+        db = database()
+        if db is None:
+            return
+        db.expire_access_tokens()
+        del db
+
+
+@contextmanager
+def _hold_user(*,
+               db: Dict[str, MutableMapping],
+               locks: LockStripes,
+               indexes: IndexManager,
+               user_id: str,
+               updated_user: Maybe[DomainUser] = None) -> Iterator[Maybe[ApplicationUser]]:
+    # the user's current name/email are only known after reading it without a lock,
+    # so retry until the user we locked is still the one stored under this id
+    while True:
+        user: Maybe[ApplicationUser] = db["ids"].get(user_id)
+        held = locks.hold(("id", user_id), *indexes.lock_keys(user, updated_user))
+        held.__enter__()
+        # (equality rather than identity, the compact storage builds a new user on every read)
+        if db["ids"].get(user_id) == user:
+            break
+        held.__exit__(None, None, None)
+
+    try:
+        yield user
+    finally:
+        held.__exit__(None, None, None)
 
 
 class InMemoryDatabase(PersistenceInterface):
     def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
-        self.__db = dict(ids={}, names={}, emails={}, tokens={})
+        compact: bool = (config or {}).get("storage", "dict") == "compact"
+        self.__db: Dict[str, MutableMapping] = compact_tables() if compact else dict(
+            ids={},
+            names={},
+            emails={},
+            tokens={}
+        )
+        # the ids are also kept sorted for listing the users page by page
+        self.__db["ids"] = OrderedTable(table=self.__db["ids"])
+        tokens_config = dict(ttl=_default_token_ttl, sliding=True, tick=_default_token_tick)
+        tokens_config.update((config or {}).get("tokens", None) or {})
+        if tokens_config["ttl"] is not None:
+            self.__db["tokens"] = ExpiringTable(
+                table=self.__db["tokens"],
+                ttl=tokens_config["ttl"],
+                tick=tokens_config["tick"],
+                clock=tokens_config.get("clock", monotonic)
+            )
+        self.__sliding_tokens: bool = tokens_config["sliding"]
+        self.__expiry_stopped = Event()
+        # every other index (the unique "names"/"emails" tables included) is kept by the index manager only
+        self.__indexes = IndexManager(tables=self.__db)
         self.__last_id = 0  # just simple increment but in real db it's more complicated xD
+        """
+        Passing config as {"concurrent": True, "lock_stripes": 64} makes it safe to share between threads,
+        writers lock only the stripes of the ids/names they touch while the readers never lock at all.
+
+        Passing config as {"durability": {"directory": "/var/lib/users"}} keeps every write in a write ahead log
+        (plus snapshots of it) inside this directory, so restarting with the same directory brings the data back.
+
+        Passing config as {"storage": "compact"} keeps the tables as columns of the users' fields with integer ids
+        instead of dicts of users, way smaller for millions of users at the cost of building the users on every read.
+
+        Passing config as {"tokens": {"ttl": 3600.0, "sliding": True, "tick": 1.0}} (the default) expires the access
+        tokens `ttl` seconds after the login (or after their last fetch when sliding), None as ttl keeps them forever.
+        A concurrent database removes them from a background thread every `tick` seconds, the other one along
+        the logins. Their deadlines aren't journaled, so the tokens recovered after a restart get a whole ttl again.
+        """
+        concurrent: bool = (config or {}).get("concurrent", False)
+        self.__concurrent = concurrent
+        self.__locks: LockStripes = (
+            LockStripes(stripes=(config or {}).get("lock_stripes", _default_lock_stripes)) if concurrent
+            else NoLockStripes()
+        )
+        self.__last_id_lock = Lock() if concurrent else nullcontext()
+        self.__durability = Durability(
+            config=(config or {}).get("durability", None),
+            db=self.__db,
+            last_id=lambda: self.__last_id
+        )
+        self.__last_id = self.__durability.recovered_last_id
+        self.__indexes.rebuild(users=self.__db["ids"].items())
+        if concurrent and isinstance(self.__db["tokens"], ExpiringTable):
+            Thread(
+                target=_expire_access_tokens_forever,
+                kwargs=dict(database=ref(self), tick=tokens_config["tick"], stopped=self.__expiry_stopped),
+                name="tokens-expiry",
+                daemon=True
+            ).start()
         super().__init__(config=config)
         """
         For example the DB will look like these references
@@ -56,50 +168,204 @@ class InMemoryDatabase(PersistenceInterface):
         except Exception as ex:
             return HealthCheckStatus(service_name=self.__class__.__name__, service_state=Status.UNHEALTHY)
 
-    # maybe later will modularize the functions in modules to be easier to maintain ;)
+    @property
+    def thread_safe(self) -> bool:
+        return self.__concurrent
 
-    @exception_handler
-    def persist_access_token(self, *, username: str, password: str) -> Either[Failure, AccessToken]:
-        fetch_user_status = self._fetch_user_by().name(user_name=username)
-        if isinstance(fetch_user_status, Failure):
-            return fetch_user_status
+    @property
+    def indexes(self) -> IndexManager:
+        return self.__indexes
 
-        if fetch_user_status.password != password:
-            return Failure(error=f"Invalid password for user {username}")
+    def snapshot(self) -> None:
+        self.__durability.snapshot()
 
-        # will make the generation better and generic later ;)
-        access_token = AccessToken(
-            token=encode({"username": username}, password, algorithm='HS256').decode("utf-8")
-        )
-        self.__db["tokens"][username] = access_token
+    def close(self) -> None:
+        self.__expiry_stopped.set()
+        self.__durability.close()
+
+    def expire_access_tokens(self) -> int:
+        """
+        Removes the access tokens whose lifetime is over (through the journal like any write) and returns their count,
+        costing the expired tokens only.
+        """
+        tokens = self.__db["tokens"]
+        if not isinstance(tokens, ExpiringTable):
+            return 0
+
+        expired = 0
+        for username in tokens.expired():
+            held = self.__locks.hold(("name", username))
+            with self.__durability.transaction() as transaction, transaction.holding(held):
+                # a login may have renewed it meanwhile
+                if username in tokens and tokens.is_expired(key=username):
+                    transaction.delete(table="tokens", key=username)
+                    transaction.log()
+                    expired += 1
+
+        return expired
+
+    # maybe later will modularize the functions in modules to be easier to maintain ;)
 
-        return access_token
+    @exception_handler
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        if not self.__concurrent:
+            # no thread sweeping them, the logins do
+            self.expire_access_tokens()
+        held = self.__locks.hold(("name", username))
+        with self.__durability.transaction() as transaction, transaction.holding(held):
+            fetch_user_status = self._fetch_user_by().name(user_name=username)
+            if isinstance(fetch_user_status, Failure):
+                return fetch_user_status
+
+            if password is not None and fetch_user_status.password != password:
+                return Failure(error=f"Invalid password for user {username}")
+
+            # will make the generation better and generic later ;)
+            access_token = AccessToken(token=stored_token_of(username=username))
+            transaction.set(table="tokens", key=username, value=access_token)
+            transaction.log()
+
+            return access_token
 
     @exception_handler
     def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
-        fetch_access_token_status = self.__db["tokens"].get(username, None)
+        tokens = self.__db["tokens"]
+        if self.__sliding_tokens and isinstance(tokens, ExpiringTable):
+            # renewing under the user's stripe, the expiry can't remove it between the two
+            with self.__locks.hold(("name", username)):
+                fetch_access_token_status = tokens.get(username, None)
+                if fetch_access_token_status is not None:
+                    tokens.touch(key=username)
+        else:
+            fetch_access_token_status = tokens.get(username, None)
         if fetch_access_token_status is not None:
             return fetch_access_token_status
 
         return Failure(error=f"There is no access token for user {username}")
 
-    @exception_handler
-    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
-        if self.__db["names"].get(user.name, None) is not None:
-            return Failure(error=f"Username {user.name} is already exist, please use a different name.")
+    def __insert_user(self, *, transaction: JournalTransaction, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        # the caller holds the locks of the user's unique keys
+        conflict = self.__indexes.conflict(user=user)
+        if conflict is not None:
+            return conflict
+        with self.__last_id_lock:
+            user_id = str(self.__last_id)
+            self.__last_id += 1
         persisted_user = PersistenceInterface.from_domain_user_to_database_user(
             user=user,
-            user_id=str(self.__last_id)
+            user_id=user_id
         )
-        self.__db['ids'][str(self.__last_id)] = persisted_user
-        self.__db['names'][user.name] = str(self.__last_id)
-        self.__db['emails'][user.email] = str(self.__last_id)
-        self.__last_id += 1
+        # the user is published by id first so lock-free readers never find a name pointing to nothing
+        transaction.set(table="ids", key=user_id, value=persisted_user)
+        self.__indexes.add(user_id=user_id, user=persisted_user, writer=transaction)
 
         return persisted_user
 
+    @exception_handler
+    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        held = self.__locks.hold(*self.__indexes.lock_keys(user))
+        with self.__durability.transaction() as transaction, transaction.holding(held):
+            persisted_user = self.__insert_user(transaction=transaction, user=user)
+            transaction.log()
+
+            return persisted_user
+
+    @exception_handler
+    def persist_users(self, *, users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        # the whole batch is one log record (one fsync) instead of one per user
+        held = self.__locks.hold(*self.__indexes.lock_keys(*users))
+        with self.__durability.transaction() as transaction, transaction.holding(held):
+            persisted_users = [self.__insert_user(transaction=transaction, user=user) for user in users]
+            transaction.log()
+
+            return persisted_users
+
+    @exception_handler
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        ids: OrderedTable = self.__db["ids"]
+        users: List[ApplicationUser] = []
+        while len(users) < limit:
+            user_ids = ids.keys_after(key=after_id, limit=limit - len(users))
+            if not user_ids:
+                break
+            # a user deleted since its id was read is just skipped
+            users.extend(user for user in map(ids.get, user_ids) if user is not None)
+            after_id = user_ids[-1]
+
+        return users
+
+    @exception_handler
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        ids: OrderedTable = self.__db["ids"]
+        predicates = predicates_of(role=role, age_gte=age_gte, age_lte=age_lte)
+        first_id = int(after_id) if after_id is not None else None
+        users: List[ApplicationUser] = []
+        for user_id in plan_search(
+                indexes=self.__indexes,
+                all_ids=ids.ids_after(user_id=first_id),
+                predicates=predicates,
+                after_id=first_id
+        ):
+            user: Maybe[ApplicationUser] = ids.get(str(user_id))
+            if user is not None and all(predicate.matches(user=user) for predicate in predicates):
+                users.append(user)
+                if len(users) >= limit:
+                    break
+
+        return users
+
+    @exception_handler
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        definition = prefix_indexes[selector]
+        prefix_index: PrefixIndex = self.__indexes.structure(field=definition.index_name)
+        ids: OrderedTable = self.__db["ids"]
+        users: List[ApplicationUser] = []
+        after_user_id = int(after_id) if after_id is not None else None
+        while len(users) < limit:
+            pairs = prefix_index.prefixed(
+                prefix=prefix,
+                after_key=after_key,
+                after_id=after_user_id,
+                limit=limit - len(users)
+            )
+            if not pairs:
+                break
+            for key, user_id in pairs:
+                user: Maybe[ApplicationUser] = ids.get(str(user_id))
+                # a user deleted (or updated away from this key) since its key was read is just skipped
+                if user is not None and definition.key_of(user=user) == key:
+                    users.append(user)
+            after_key, after_user_id = pairs[-1]
+
+        return users
+
+    @exception_handler
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        trigram_index: TrigramIndex = self.__indexes.structure(field=name_trigrams_index.index_name)
+        ids: OrderedTable = self.__db["ids"]
+        # (a user deleted since is just missing)
+        return [user for user in (
+            ids.get(str(user_id)) for user_id in trigram_index.candidates(trigrams=trigrams_of(name), limit=limit)
+        ) if user is not None]
+
+    @exception_handler
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        user_id: Maybe[str] = self.__indexes.get(field=selector, key=data)
+        return user_id is not None and user_id in self.__db["ids"]
+
     def _fetch_user_by(self) -> 'PersistenceInterface.FetchBy':
         db = self.__db
+        indexes = self.__indexes
 
         class InMemoryFetchBy(PersistenceInterface.FetchBy):
             @exception_handler
@@ -112,108 +378,159 @@ class InMemoryDatabase(PersistenceInterface):
 
             @exception_handler
             def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
-                user_id: str = db["names"].get(user_name)
+                user_id: Maybe[str] = indexes.get(field="name", key=user_name)
                 if user_id is not None:
-                    user: ApplicationUser = db["ids"][user_id]
-                    return user
+                    user: Maybe[ApplicationUser] = db["ids"].get(user_id)
+                    if user is not None:
+                        return user
 
                 return Failure(error=f"There is no user with name {user_name} to be fetched")
 
             @exception_handler
             def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
-                user_id: str = db["emails"].get(user_email)
+                user_id: Maybe[str] = indexes.get(field="email", key=user_email)
                 if user_id is not None:
-                    user: ApplicationUser = db["ids"][user_id]
-                    return user
+                    user: Maybe[ApplicationUser] = db["ids"].get(user_id)
+                    if user is not None:
+                        return user
 
                 return Failure(error=f"There is no user with email {user_email} to be fetched")
 
+            # the reads are lock-free already, a batch is just the single lookups in a row
+            @exception_handler
+            def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [self.id(user_id=user_id) for user_id in user_ids]
+
+            @exception_handler
+            def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [self.name(user_name=user_name) for user_name in user_names]
+
+            @exception_handler
+            def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [self.email(user_email=user_email) for user_email in user_emails]
+
         return InMemoryFetchBy()
 
     def _update_user_by(self) -> 'PersistenceInterface.UpdateBy':
         db = self.__db
+        locks = self.__locks
+        indexes = self.__indexes
+        durability = self.__durability
 
         class InMemoryUpdateBy(PersistenceInterface.UpdateBy):
             @exception_handler
-            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
-                fetch_status: Maybe[ApplicationUser] = db["ids"].get(user_id)
-                if isinstance(fetch_status, ApplicationUser):
-                    db["ids"][fetch_status.id] = PersistenceInterface.from_domain_user_to_database_user(
+            def __inner_update_user(self, *,
+                                    user_id: str,
+                                    updated_user: DomainUser,
+                                    not_found: Failure) -> Either[Failure, ApplicationUser]:
+                with durability.transaction() as transaction, transaction.holding(_hold_user(
+                        db=db,
+                        locks=locks,
+                        indexes=indexes,
+                        user_id=user_id,
+                        updated_user=updated_user
+                )) as user:
+                    if user is None:
+                        return not_found
+
+                    conflict = indexes.conflict(user=updated_user, user_id=user.id)
+                    if conflict is not None:
+                        return conflict
+
+                    persisted_user = PersistenceInterface.from_domain_user_to_database_user(
                         user=updated_user,
-                        user_id=fetch_status.id
+                        user_id=user.id
                     )
+                    # the new index entries go first and the stale ones last,
+                    # so lock-free readers find the user by either of its values meanwhile
+                    indexes.add(user_id=user.id, user=persisted_user, writer=transaction)
+                    transaction.set(table="ids", key=user.id, value=persisted_user)
+                    indexes.remove(user_id=user.id, user=user, kept=persisted_user, writer=transaction)
 
-                    access_token_status = db["tokens"].get(fetch_status.name, None)
-                    if access_token_status is not None:
-                        del db["tokens"][fetch_status.name]
-                        db["tokens"][updated_user.name] = access_token_status
+                    access_token_status = db["tokens"].get(user.name, None)
+                    if access_token_status is not None and user.name != updated_user.name:
+                        transaction.delete(table="tokens", key=user.name)
+                        transaction.set(table="tokens", key=updated_user.name, value=access_token_status)
+                    transaction.log()
 
-                    return db["ids"][fetch_status.id]
+                    return persisted_user
 
-                return Failure(error=f"There is no user with id {user_id} to be updated")
+            @exception_handler
+            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return self.__inner_update_user(
+                    user_id=user_id,
+                    updated_user=updated_user,
+                    not_found=Failure(error=f"There is no user with id {user_id} to be updated")
+                )
 
+            @exception_handler
             def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
-                user_id: Maybe[str] = db["names"].get(user_name)
+                not_found = Failure(error=f"There is no user with name {user_name} to be updated")
+                user_id: Maybe[str] = indexes.get(field="name", key=user_name)
                 if user_id is not None:
-                    db["ids"][user_id] = PersistenceInterface.from_domain_user_to_database_user(
-                        user=updated_user,
-                        user_id=user_id
-                    )
-
-                    return db["ids"][user_id]
+                    return self.__inner_update_user(user_id=user_id, updated_user=updated_user, not_found=not_found)
 
-                return Failure(error=f"There is no user with name {user_name} to be updated")
+                return not_found
 
+            @exception_handler
             def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
-                user_id: Maybe[str] = db["emails"].get(user_email)
+                not_found = Failure(error=f"There is no user with email {user_email} to be updated")
+                user_id: Maybe[str] = indexes.get(field="email", key=user_email)
                 if user_id is not None:
-                    db["ids"][user_id] = PersistenceInterface.from_domain_user_to_database_user(
-                        user=updated_user,
-                        user_id=user_id
-                    )
+                    return self.__inner_update_user(user_id=user_id, updated_user=updated_user, not_found=not_found)
 
-                    return db["ids"][user_id]
-
-                return Failure(error=f"There is no user with email {user_email} to be updated")
+                return not_found
 
         return InMemoryUpdateBy()
 
     def _delete_user_by(self) -> 'PersistenceInterface.DeleteBy':
         db = self.__db
+        locks = self.__locks
+        indexes = self.__indexes
+        durability = self.__durability
 
         class InMemoryDeleteBy(PersistenceInterface.DeleteBy):
             @exception_handler
-            def __inner_delete_user(self, *, user: ApplicationUser) -> Either[Failure, Success]:
-                del db["ids"][user.id]
-                del db["names"][user.name]
-                del db["emails"][user.email]
+            def __inner_delete_user(self, *, user_id: str) -> Either[Failure, Success]:
+                with durability.transaction() as transaction, transaction.holding(_hold_user(
+                        db=db,
+                        locks=locks,
+                        indexes=indexes,
+                        user_id=user_id
+                )) as user:
+                    if user is None:
+                        return Failure(error=f"There is no user with id {user_id} to be deleted")
 
-                return Success()
+                    # unlinking the indexes first so lock-free readers never follow them to a deleted user
+                    indexes.remove(user_id=user.id, user=user, writer=transaction)
+                    if db["tokens"].get(user.name, None) is not None:
+                        transaction.delete(table="tokens", key=user.name)
+                    transaction.delete(table="ids", key=user.id)
+                    transaction.log()
+
+                    return Success()
 
             @exception_handler
             def id(self, *, user_id: str) -> Either[Failure, Success]:
                 fetch_status: Maybe[ApplicationUser] = db["ids"].get(user_id)
                 if isinstance(fetch_status, ApplicationUser):
-                    self.__inner_delete_user(user=fetch_status)
-                    return Success()
+                    return self.__inner_delete_user(user_id=fetch_status.id)
 
                 return Failure(error=f"There is no user with id {user_id} to be deleted")
 
             @exception_handler
             def name(self, *, user_name: str) -> Either[Failure, Success]:
-                user_id: Maybe[str] = db["names"].get(user_name)
+                user_id: Maybe[str] = indexes.get(field="name", key=user_name)
                 if user_id is not None:
-                    self.__inner_delete_user(user=db["ids"][user_id])
-                    return Success()
+                    return self.__inner_delete_user(user_id=user_id)
 
                 return Failure(error=f"There is no user with name {user_name} to be deleted")
 
             @exception_handler
             def email(self, *, user_email: str) -> Either[Failure, Success]:
-                user_id: Maybe[str] = db["emails"].get(user_email)
+                user_id: Maybe[str] = indexes.get(field="email", key=user_email)
                 if user_id is not None:
-                    self.__inner_delete_user(user=db["ids"][user_id])
-                    return Success()
+                    return self.__inner_delete_user(user_id=user_id)
 
                 return Failure(error=f"There is no user with email {user_email} to be deleted")
 
@@ -0,0 +1,281 @@
+from array import array
+from collections.abc import MutableMapping
+from threading import Lock
+from time import sleep
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Dict,
+    Tuple,
+    Iterator,
+    Maybe
+)
+from src.domain.entity.user import UserRole
+
+# roles are kept as one byte index into this tuple, so every user shares the same few role values
+_roles: Tuple[UserRole, ...] = tuple(UserRole)
+# (by name, the members of UserRole all compare equal)
+_role_indexes: Dict[str, int] = {role.name: index for index, role in enumerate(_roles)}
+_absent = -1
+_version_mask = 0xFFFFFFFF
+
+
+def _to_row(key: Any) -> Maybe[int]:
+    # only the canonical decimal strings are ids (like the keys of the plain dicts), "01" or "-1" are not
+    if isinstance(key, str) and key.isascii() and key.isdigit() and (key == "0" or key[0] != "0"):
+        return int(key)
+
+    return None
+
+
+class CompactUsers(MutableMapping):
+    """
+    The "ids" table as struct of arrays, one column per user field and the integer id as the row of the user,
+    the string ids and ApplicationUser instances only exist while someone is reading them.
+
+    Every row has a version (seqlock), writers make it odd while changing the row's columns
+    so the lock-free readers just retry when they caught a row in the middle of a write.
+    Writers of the same row should still be serialized by the caller (like the lock stripes do).
+    """
+
+    def __init__(self) -> None:
+        self.__names: list = []
+        self.__ages = array("H")
+        self.__emails: list = []
+        self.__passwords: list = []
+        self.__roles = array("b")
+        self.__versions = array("I")
+        self.__grow_lock = Lock()
+
+    def __grow(self, *, row: int) -> None:
+        with self.__grow_lock:
+            missing_rows = row + 1 - len(self.__versions)
+            if missing_rows > 0:
+                # the versions go last, readers only look at the rows below its length
+                self.__names.extend([None] * missing_rows)
+                self.__ages.extend([0] * missing_rows)
+                self.__emails.extend([None] * missing_rows)
+                self.__passwords.extend([None] * missing_rows)
+                self.__roles.extend([_absent] * missing_rows)
+                self.__versions.extend([0] * missing_rows)
+
+    def __begin_write(self, *, row: int) -> None:
+        self.__versions[row] = (self.__versions[row] + 1) & _version_mask
+
+    def __end_write(self, *, row: int) -> None:
+        self.__versions[row] = (self.__versions[row] + 1) & _version_mask
+
+    def __read_row(self, *, row: int) -> Tuple[Maybe[str], int, Maybe[str], Maybe[str], int]:
+        while True:
+            version = self.__versions[row]
+            if version & 1:
+                sleep(0)  # a writer is in the middle of this row, letting it finish
+                continue
+            columns = (
+                self.__names[row],
+                self.__ages[row],
+                self.__emails[row],
+                self.__passwords[row],
+                self.__roles[row]
+            )
+            if self.__versions[row] == version:
+                return columns
+
+    def __setitem__(self, key: str, user: ApplicationUser) -> None:
+        row = _to_row(key)
+        if row is None:
+            raise KeyError(f"{key} is not a valid id")
+        if row >= len(self.__versions):
+            self.__grow(row=row)
+
+        role = _role_indexes[user.role.name]
+        self.__begin_write(row=row)
+        try:
+            self.__names[row] = user.name
+            self.__ages[row] = user.age
+            self.__emails[row] = user.email
+            self.__passwords[row] = user.password
+            self.__roles[row] = role
+        finally:
+            self.__end_write(row=row)
+
+    def __getitem__(self, key: str) -> ApplicationUser:
+        row = _to_row(key)
+        if row is None or row >= len(self.__versions):
+            raise KeyError(key)
+
+        name, age, email, password, role = self.__read_row(row=row)
+
+        if role == _absent:
+            raise KeyError(key)
+
+        return ApplicationUser(id=key, name=name, age=age, email=email, password=password, role=_roles[role])
+
+    def __delitem__(self, key: str) -> None:
+        row = _to_row(key)
+        if row is None or row >= len(self.__versions) or self.__roles[row] == _absent:
+            raise KeyError(key)
+
+        self.__begin_write(row=row)
+        try:
+            self.__roles[row] = _absent
+            self.__names[row] = self.__emails[row] = self.__passwords[row] = None
+        finally:
+            self.__end_write(row=row)
+
+    def __contains__(self, key: Any) -> bool:
+        row = _to_row(key)
+        return row is not None and row < len(self.__versions) and self.__roles[row] != _absent
+
+    def __iter__(self) -> Iterator[str]:
+        for row, role in enumerate(self.__roles):
+            if role != _absent:
+                yield str(row)
+
+    def __len__(self) -> int:
+        return len(self.__roles) - self.__roles.count(_absent)
+
+    def copy(self) -> 'CompactUsers':
+        # every column is copied atomically on its own, the rows written in between are read again as a whole,
+        # nobody writes the copy so all of its versions are even (a row caught mid-write would be unreadable there)
+        copied = CompactUsers()
+        versions = self.__versions[:len(self.__versions)]
+        rows = len(versions)
+        copied.__names = self.__names[:rows]
+        copied.__ages = self.__ages[:rows]
+        copied.__emails = self.__emails[:rows]
+        copied.__passwords = self.__passwords[:rows]
+        copied.__roles = self.__roles[:rows]
+        copied.__versions = array("I", [0]) * rows
+
+        for row, version in enumerate(versions):
+            if version & 1 or self.__versions[row] != version:
+                (
+                    copied.__names[row],
+                    copied.__ages[row],
+                    copied.__emails[row],
+                    copied.__passwords[row],
+                    copied.__roles[row]
+                ) = self.__read_row(row=row)
+
+        return copied
+
+
+class _SharedRows:
+    """
+    The names and the emails of a user are indexed one after the other with the same id,
+    remembering the last converted one lets both indexes point to the same int instead of two equal ones.
+    """
+
+    def __init__(self) -> None:
+        self.__last: Tuple[Maybe[str], Maybe[int]] = (None, None)
+
+    def row_of(self, *, user_id: str) -> Maybe[int]:
+        last = self.__last  # one read, other writers may replace it meanwhile
+        if last[0] is user_id:
+            return last[1]
+
+        row = _to_row(user_id)
+        self.__last = (user_id, row)
+        return row
+
+
+class CompactIndex(MutableMapping):
+    """
+    The "names"/"emails" tables, the same string ids outside but integer ids (the rows of CompactUsers) inside.
+    """
+
+    def __init__(self, *, rows: Maybe[Dict[str, int]] = None, shared_rows: Maybe[_SharedRows] = None) -> None:
+        self.__rows: Dict[str, int] = rows if rows is not None else {}
+        self.__shared_rows = shared_rows or _SharedRows()
+
+    def __read_row(self, *, row: int) -> Tuple[Maybe[str], int, Maybe[str], Maybe[str], int]:
+        while True:
+            version = self.__versions[row]
+            if version & 1:
+                sleep(0)  # a writer is in the middle of this row, letting it finish
+                continue
+            columns = (
+                self.__names[row],
+                self.__ages[row],
+                self.__emails[row],
+                self.__passwords[row],
+                self.__roles[row]
+            )
+            if self.__versions[row] == version:
+                return columns
+
+    def __setitem__(self, key: str, user_id: str) -> None:
+        row = self.__shared_rows.row_of(user_id=user_id)
+        if row is None:
+            raise KeyError(f"{user_id} is not a valid id")
+        self.__rows[key] = row
+
+    def __getitem__(self, key: str) -> str:
+        return str(self.__rows[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self.__rows.get(key, None)
+        return str(row) if row is not None else default
+
+    def __delitem__(self, key: str) -> None:
+        del self.__rows[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.__rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__rows)
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def copy(self) -> 'CompactIndex':
+        return CompactIndex(rows=self.__rows.copy(), shared_rows=self.__shared_rows)
+
+
+class CompactTokens(MutableMapping):
+    """
+    The "tokens" table keeping only the token strings, the AccessToken instances are created while reading.
+    """
+
+    def __init__(self, *, tokens: Maybe[Dict[str, str]] = None) -> None:
+        self.__tokens: Dict[str, str] = tokens if tokens is not None else {}
+
+    def __setitem__(self, key: str, access_token: AccessToken) -> None:
+        self.__tokens[key] = access_token.token
+
+    def __getitem__(self, key: str) -> AccessToken:
+        return AccessToken(token=self.__tokens[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        token = self.__tokens.get(key, None)
+        return AccessToken(token=token) if token is not None else default
+
+    def __delitem__(self, key: str) -> None:
+        del self.__tokens[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.__tokens
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__tokens)
+
+    def __len__(self) -> int:
+        return len(self.__tokens)
+
+    def copy(self) -> 'CompactTokens':
+        return CompactTokens(tokens=self.__tokens.copy())
+
+
+def compact_tables() -> Dict[str, MutableMapping]:
+    shared_rows = _SharedRows()
+
+    return dict(
+        ids=CompactUsers(),
+        names=CompactIndex(shared_rows=shared_rows),
+        emails=CompactIndex(shared_rows=shared_rows),
+        tokens=CompactTokens()
+    )
@@ -0,0 +1,388 @@
+import json
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from threading import Condition, Event, Lock, Thread
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Maybe,
+    Callable,
+    Iterator,
+    TypeVar,
+    ContextManager,
+    SimpleConfig
+)
+from src.domain.entity.user import UserRole
+
+_wal_suffix = ".wal"
+_snapshot_suffix = ".snapshot"
+_tables = ("ids", "names", "emails", "tokens")
+_missing = object()
+
+_T = TypeVar("_T")
+
+# a change is (table, key, value) to set a key or (table, key) to delete it
+Change = Tuple[Any, ...]
+
+_encoders: Dict[str, Callable[[Any], Any]] = {
+    "ids": lambda user: (user.id, user.name, user.age, user.email, user.password, user.role.name),
+    "tokens": lambda access_token: access_token.token
+}
+_decoders: Dict[str, Callable[[Any], Any]] = {
+    "ids": lambda user: ApplicationUser(
+        id=user[0],
+        name=user[1],
+        age=user[2],
+        email=user[3],
+        password=user[4],
+        role=UserRole[user[5]]
+    ),
+    "tokens": lambda token: AccessToken(token=token)
+}
+
+
+def _encode(*, table: str, value: Any) -> Any:
+    return _encoders.get(table, lambda _value: _value)(value)
+
+
+def _decode(*, table: str, value: Any) -> Any:
+    return _decoders.get(table, lambda _value: _value)(value)
+
+
+def _fsync_directory(*, directory: str) -> None:
+    directory_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+
+def _files_of(*, directory: str, suffix: str) -> List[Tuple[int, str]]:
+    # files are named by the first (or snapshot) lsn they contain, so sorting them by name is sorting by lsn
+    return sorted(
+        (int(file_name[:-len(suffix)]), os.path.join(directory, file_name))
+        for file_name in os.listdir(directory) if file_name.endswith(suffix)
+    )
+
+
+class WriteAheadLog:
+    """
+    Append only log split into segments, one json record per line.
+
+    Appending only buffers the record and hands back its lsn, a single flusher thread writes and fsyncs
+    everything buffered so far at once (group commit), so many writers waiting on `commit` share one fsync.
+    """
+
+    def __init__(self, *, directory: str, next_lsn: int, group_commit_interval: float) -> None:
+        self.__directory = directory
+        self.__group_commit_interval = group_commit_interval
+        self.__state = Condition(Lock())
+        self.__io_lock = Lock()
+        self.__pending: List[str] = []
+        self.__next_lsn = next_lsn
+        self.__durable_lsn = next_lsn - 1
+        self.__closed = False
+        self.__segment = self.__open_segment(first_lsn=next_lsn)
+        self.__flusher = Thread(target=self.__flush_forever, name="wal-flusher", daemon=True)
+        self.__flusher.start()
+
+    def __open_segment(self, *, first_lsn: int):
+        segment = open(os.path.join(self.__directory, f"{first_lsn:020d}{_wal_suffix}"), "a", encoding="utf-8")
+        _fsync_directory(directory=self.__directory)
+        return segment
+
+    @property
+    def next_lsn(self) -> int:
+        with self.__state:
+            return self.__next_lsn
+
+    def append(self, *, changes: List[Change]) -> int:
+        with self.__state:
+            if self.__closed:
+                raise RuntimeError("The write ahead log is already closed")
+            lsn = self.__next_lsn
+            self.__next_lsn += 1
+            self.__pending.append(json.dumps(dict(lsn=lsn, changes=changes), separators=(",", ":")) + "\n")
+            self.__state.notify_all()
+
+            return lsn
+
+    def commit(self, *, lsn: int) -> None:
+        with self.__state:
+            while self.__durable_lsn < lsn:
+                if self.__closed:
+                    raise RuntimeError("The write ahead log was closed before the record got durable")
+                self.__state.wait()
+
+    def __flush(self) -> None:
+        with self.__io_lock:
+            with self.__state:
+                pending, self.__pending = self.__pending, []
+                last_lsn = self.__next_lsn - 1
+            if pending:
+                self.__segment.write("".join(pending))
+                self.__segment.flush()
+                os.fsync(self.__segment.fileno())
+            with self.__state:
+                self.__durable_lsn = max(self.__durable_lsn, last_lsn)
+                self.__state.notify_all()
+
+    def __flush_forever(self) -> None:
+        while True:
+            with self.__state:
+                while not self.__pending and not self.__closed:
+                    self.__state.wait()
+                if self.__closed and not self.__pending:
+                    return
+            if self.__group_commit_interval > 0:
+                # giving the other writers a moment to join the same fsync
+                time.sleep(self.__group_commit_interval)
+            self.__flush()
+
+    def rotate(self) -> int:
+        """
+        Starts a new segment and returns its first lsn,
+        every record below it is already applied to the tables and durable in an older segment.
+        """
+        with self.__io_lock:
+            with self.__state:
+                pending, self.__pending = self.__pending, []
+                first_lsn = self.__next_lsn
+            if pending:
+                self.__segment.write("".join(pending))
+                self.__segment.flush()
+                os.fsync(self.__segment.fileno())
+            self.__segment.close()
+            self.__segment = self.__open_segment(first_lsn=first_lsn)
+            with self.__state:
+                self.__durable_lsn = max(self.__durable_lsn, first_lsn - 1)
+                self.__state.notify_all()
+
+            return first_lsn
+
+    def remove_segments_before(self, *, lsn: int) -> None:
+        segments = _files_of(directory=self.__directory, suffix=_wal_suffix)
+        for (_, segment_path), (next_first_lsn, _) in zip(segments, segments[1:]):
+            if next_first_lsn <= lsn:
+                os.remove(segment_path)
+
+    def close(self) -> None:
+        with self.__state:
+            self.__closed = True
+            self.__state.notify_all()
+        self.__flusher.join()
+        self.__flush()
+        self.__segment.close()
+
+    @staticmethod
+    def replay(*, directory: str, from_lsn: int) -> Iterator[Tuple[int, List[Change]]]:
+        for _, segment_path in _files_of(directory=directory, suffix=_wal_suffix):
+            with open(segment_path, "r+b") as segment:
+                valid_size = 0
+                for line in segment:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("Incomplete record")
+                        record = json.loads(line)
+                    except ValueError:
+                        # a torn write at the tail of the log from a crash, nothing after it was acknowledged
+                        # so it's cut off before anything gets appended after it
+                        segment.truncate(valid_size)
+                        break
+                    valid_size += len(line)
+                    if record["lsn"] >= from_lsn:
+                        yield record["lsn"], record["changes"]
+
+
+class JournalTransaction:
+    """
+    Changes of one write, applied to the tables right away and logged all together as one record.
+    Leaving `with durability.transaction() as tx` waits till that record got fsynced,
+    or undoes the changes not logged yet when an exception left it.
+    """
+
+    def __init__(self, *, wal: Maybe[WriteAheadLog], db: Dict[str, Dict[Any, Any]]) -> None:
+        self.__wal = wal
+        self.__db = db
+        self.__changes: List[Change] = []
+        # the previous value of every changed key (_missing when it had none), newest last
+        self.__undo_log: List[Tuple[str, Any, Any]] = []
+        self.__lsn: Maybe[int] = None
+
+    def __enter__(self) -> 'JournalTransaction':
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is not None:
+            self.__undo()
+        if self.__lsn is not None:
+            self.__wal.commit(lsn=self.__lsn)
+
+    @contextmanager
+    def holding(self, held: ContextManager[_T]) -> Iterator[_T]:
+        # the locks of the changed keys, an exception undoes the changes before they're released
+        # so no other writer builds on top of changes that never made it to the log
+        with held as value:
+            try:
+                yield value
+            except BaseException:
+                self.__undo()
+                raise
+
+    def __undo(self) -> None:
+        while self.__undo_log:
+            table, key, previous = self.__undo_log.pop()
+            if previous is _missing:
+                self.__db[table].pop(key, None)
+            else:
+                self.__db[table][key] = previous
+        self.__changes = []
+
+    def set(self, *, table: str, key: Any, value: Any) -> None:
+        self.__undo_log.append((table, key, self.__db[table].get(key, _missing)))
+        self.__db[table][key] = value
+        if self.__wal is not None:
+            self.__changes.append((table, key, _encode(table=table, value=value)))
+
+    def delete(self, *, table: str, key: Any) -> None:
+        self.__undo_log.append((table, key, self.__db[table][key]))
+        del self.__db[table][key]
+        if self.__wal is not None:
+            self.__changes.append((table, key))
+
+    def log(self) -> None:
+        # should be called while still holding the locks of the changed keys, so the log order matches theirs
+        if self.__changes:
+            self.__lsn = self.__wal.append(changes=self.__changes)
+        self.__changes = []
+        # logged changes are replayed on recovery, they can't be undone anymore
+        self.__undo_log = []
+
+
+class Durability:
+    """
+    Optional durability of the in memory tables as a write ahead log plus periodic snapshots.
+
+    The log records the raw key changes of every write, so replaying them on top of a snapshot that was
+    taken while writers kept going still ends up in the exact same tables (the replay is idempotent).
+    Restarting loads the newest snapshot then replays only the log written after it.
+    """
+
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig],
+                 db: Dict[str, Dict[Any, Any]],
+                 last_id: Callable[[], int]) -> None:
+        config = config or {}
+        self.__db = db
+        self.__last_id = last_id
+        self.__directory: Maybe[str] = config.get("directory", None)
+        self.__snapshot_interval: float = config.get("snapshot_interval", 60.0)
+        self.__snapshot_min_records: int = config.get("snapshot_min_records", 100_000)
+        self.__snapshot_lock = Lock()
+        self.__snapshot_lsn = 0
+        self.__stopped = Event()
+        self.recovered_last_id = 0
+        self.wal: Maybe[WriteAheadLog] = None
+
+        if self.__directory is not None:
+            os.makedirs(self.__directory, exist_ok=True)
+            next_lsn = self.__recover()
+            self.wal = WriteAheadLog(
+                directory=self.__directory,
+                next_lsn=next_lsn,
+                group_commit_interval=config.get("group_commit_interval", 0.0)
+            )
+            Thread(target=self.__snapshot_forever, name="snapshotter", daemon=True).start()
+
+    def transaction(self) -> JournalTransaction:
+        return JournalTransaction(wal=self.wal, db=self.__db)
+
+    def __apply(self, *, changes: List[Change]) -> None:
+        for change in changes:
+            table, key = change[0], change[1]
+            if len(change) == 3:
+                self.__db[table][key] = _decode(table=table, value=change[2])
+                if table == "ids":
+                    self.recovered_last_id = max(self.recovered_last_id, int(key) + 1)
+            else:
+                self.__db[table].pop(key, None)
+
+    def __recover(self) -> int:
+        snapshots = _files_of(directory=self.__directory, suffix=_snapshot_suffix)
+        from_lsn = 0
+        if snapshots:
+            from_lsn, snapshot_path = snapshots[-1]
+            with open(snapshot_path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+            for table in _tables:
+                decode = _decoders.get(table, None)
+                self.__db[table].update(
+                    snapshot["tables"][table] if decode is None
+                    else {key: decode(value) for key, value in snapshot["tables"][table].items()}
+                )
+            self.recovered_last_id = snapshot["last_id"]
+        self.__snapshot_lsn = from_lsn
+
+        next_lsn = from_lsn
+        for lsn, changes in WriteAheadLog.replay(directory=self.__directory, from_lsn=from_lsn):
+            self.__apply(changes=changes)
+            next_lsn = lsn + 1
+
+        return next_lsn
+
+    def snapshot(self) -> None:
+        with self.__snapshot_lock:
+            snapshot_lsn = self.wal.rotate()
+            # copying a dict is atomic, every change below snapshot_lsn is in these copies already
+            # and any newer one that made it in too just gets replayed over itself on recovery
+            tables = {table: self.__db[table].copy() for table in _tables}
+            snapshot = dict(
+                lsn=snapshot_lsn,
+                last_id=self.__last_id(),
+                tables={
+                    table: {key: _encode(table=table, value=value) for key, value in tables[table].items()}
+                    for table in _tables
+                }
+            )
+            snapshot_path = os.path.join(self.__directory, f"{snapshot_lsn:020d}{_snapshot_suffix}")
+            try:
+                with open(f"{snapshot_path}.tmp", "wb") as snapshot_file:
+                    pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+                    snapshot_file.flush()
+                    os.fsync(snapshot_file.fileno())
+                os.replace(f"{snapshot_path}.tmp", snapshot_path)
+            except BaseException:
+                # (a full disk for example) the log isn't trimmed, so nothing is lost but the half written file
+                if os.path.exists(f"{snapshot_path}.tmp"):
+                    os.remove(f"{snapshot_path}.tmp")
+                raise
+            _fsync_directory(directory=self.__directory)
+
+            for older_snapshot_lsn, older_snapshot_path in _files_of(directory=self.__directory,
+                                                                     suffix=_snapshot_suffix):
+                if older_snapshot_lsn < snapshot_lsn:
+                    os.remove(older_snapshot_path)
+            self.wal.remove_segments_before(lsn=snapshot_lsn)
+            self.__snapshot_lsn = snapshot_lsn
+
+    def __snapshot_forever(self) -> None:
+        while not self.__stopped.wait(self.__snapshot_interval):
+            if self.wal.next_lsn - self.__snapshot_lsn >= self.__snapshot_min_records:
+                try:
+                    self.snapshot()
+                except Exception as error:
+                    # the thread keeps going, the next interval tries again
+                    print(f"Snapshot of {self.__directory} failed, retrying in {self.__snapshot_interval}s: {error!r}")
+
+    def close(self) -> None:
+        self.__stopped.set()
+        if self.wal is not None:
+            with self.__snapshot_lock:
+                self.wal.close()
@@ -0,0 +1,84 @@
+from collections.abc import MutableMapping
+from time import monotonic
+
+from src.application.infrastructure.persistence.structures import TimerWheel
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Iterator
+)
+
+
+class ExpiringTable(MutableMapping):
+    """
+    The "tokens" table with a lifetime for every entry, `ttl` seconds after it was set (or touched, for a sliding one),
+    the deadlines kept in a TimerWheel so the expired entries are found without scanning the live ones.
+
+    Every write (including the log replay and snapshot loading of the recovery) goes through here,
+    an expired entry is hidden from `get` right away but only removed by the owner of the table
+    (through its journal) when `expired` returns it, so the memory follows the live entries only.
+    """
+
+    def __init__(self, *,
+                 table: MutableMapping,
+                 ttl: float,
+                 tick: float,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.__table = table
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__deadlines: Dict[Any, float] = {}
+        self.__wheel = TimerWheel(tick=tick, now=clock())
+        for key in table:
+            self.__schedule(key=key)
+
+    def __schedule(self, *, key: Any) -> None:
+        deadline = self.__clock() + self.__ttl
+        self.__deadlines[key] = deadline
+        self.__wheel.schedule(key=key, deadline=deadline)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.__table[key] = value
+        self.__schedule(key=key)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__table[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self.__table.get(key, None)
+        if value is None or self.is_expired(key=key):
+            return default
+
+        return value
+
+    def __delitem__(self, key: Any) -> None:
+        del self.__table[key]
+        self.__deadlines.pop(key, None)
+        self.__wheel.cancel(key=key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.__table
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__table)
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    def copy(self) -> MutableMapping:
+        return self.__table.copy()
+
+    def is_expired(self, *, key: Any) -> bool:
+        deadline = self.__deadlines.get(key, None)
+        return deadline is not None and deadline <= self.__clock()
+
+    def touch(self, *, key: Any) -> None:
+        # sliding expiry, a live entry gets a whole ttl again
+        if key in self.__table and not self.is_expired(key=key):
+            self.__schedule(key=key)
+
+    def expired(self) -> List[Any]:
+        # the entries touched again since they were put in their bucket aren't expired anymore
+        return [key for key in self.__wheel.advance(now=self.__clock()) if self.is_expired(key=key)]
@@ -0,0 +1,47 @@
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+
+from src.application.types import (
+    Any,
+    Tuple,
+    Iterator,
+    ContextManager
+)
+
+
+class LockStripes:
+    """
+    A fixed set of locks where every key is mapped onto one of them (lock striping),
+    so writers touching different users rarely contend on the same lock.
+
+    Holding several keys at once always acquires the stripes in ascending order,
+    which keeps multi-map updates atomic without any chance of deadlocks.
+    """
+
+    def __init__(self, *, stripes: int) -> None:
+        if stripes < 1:
+            raise ValueError(f"Lock stripes should be at least 1 but got {stripes}")
+        self.__locks: Tuple[Lock, ...] = tuple(Lock() for _ in range(stripes))
+
+    def __stripes_of(self, keys: Tuple[Any, ...]) -> Tuple[int, ...]:
+        return tuple(sorted({hash(key) % len(self.__locks) for key in keys if key is not None}))
+
+    @contextmanager
+    def hold(self, *keys: Any) -> Iterator[None]:
+        stripes = self.__stripes_of(keys)
+        for stripe in stripes:
+            self.__locks[stripe].acquire()
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self.__locks[stripe].release()
+
+
+class NoLockStripes(LockStripes):
+    # used for the default (single threaded) mode so it doesn't pay for any locking
+    def __init__(self) -> None:
+        super().__init__(stripes=1)
+
+    def hold(self, *keys: Any) -> ContextManager[None]:
+        return nullcontext()
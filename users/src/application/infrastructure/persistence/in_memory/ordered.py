@@ -0,0 +1,57 @@
+from collections.abc import MutableMapping
+
+from src.application.infrastructure.persistence.structures import SortedIds
+from src.application.types import (
+    Any,
+    List,
+    Iterator,
+    Maybe
+)
+
+
+class OrderedTable(MutableMapping):
+    """
+    The "ids" table (a dict or the compact one) keeping a SortedIds of its keys along,
+    every write (including the log replay and snapshot loading of the recovery) goes through here.
+    """
+
+    def __init__(self, *, table: MutableMapping) -> None:
+        self.__table = table
+        self.__sorted_ids = SortedIds()
+        for key in table:
+            self.__sorted_ids.add(user_id=int(key))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.__table[key] = value
+        self.__sorted_ids.add(user_id=int(key))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.__table[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.__table.get(key, default)
+
+    def __delitem__(self, key: str) -> None:
+        del self.__table[key]
+        self.__sorted_ids.discard(user_id=int(key))
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.__table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__table)
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    def copy(self) -> MutableMapping:
+        return self.__table.copy()
+
+    def ids_after(self, *, user_id: Maybe[int]) -> Iterator[int]:
+        return self.__sorted_ids.iter_after(user_id=user_id)
+
+    def keys_after(self, *, key: Maybe[str], limit: int) -> List[str]:
+        return [str(user_id) for user_id in self.__sorted_ids.after(
+            user_id=int(key) if key is not None else None,
+            limit=limit
+        )]
@@ -0,0 +1,240 @@
+from collections.abc import MutableMapping
+from enum import Enum
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.structures import (
+    BitmapIndex,
+    SortedIndex,
+    PrefixIndex,
+    TrigramIndex
+)
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Hashable,
+    Iterable,
+    Maybe,
+    FrozenSet,
+    dataclass
+)
+from src.application.utilities.text import trigrams_of
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import DomainUser
+
+
+def _key(value: Any) -> Maybe[Hashable]:
+    # enums are indexed by name, the members of UserRole all compare equal once marshmallow turned it into a dataclass
+    return value.name if isinstance(value, Enum) else value
+
+
+def name_key_of(name: str) -> str:
+    # case insensitive
+    return name.casefold()
+
+
+def email_key_of(email: str) -> str:
+    # the domain reversed first, "abd@mail.corp.com" is "com.corp.mail@abd" so the users of a domain share a prefix
+    local_part, _, domain = email.casefold().rpartition("@")
+    return f"{'.'.join(reversed(domain.split('.')))}@{local_part}"
+
+
+@dataclass(frozen=True)
+class IndexDefinition:
+    field: str  # the user's attribute being indexed
+    unique: bool
+    table: Maybe[str] = None  # where a backend keeps a unique index (value -> user id), if it's one of its tables
+    label: str = ""
+    # how a non unique one is kept, "bitmap" (few distinct values), "sorted" (ranges), "prefix" (string prefixes)
+    # or "trigram" (similar strings, the key being a set of trigrams)
+    structure: str = "bitmap"
+    name: Maybe[str] = None  # to tell apart several indexes of the same field, the field by default
+    normalize: Maybe[Callable[[Any], Hashable]] = None  # what's indexed out of the (not None) value
+
+    @property
+    def index_name(self) -> str:
+        return self.name or self.field
+
+    def key_of(self, *, user: Any) -> Maybe[Hashable]:
+        value = getattr(user, self.field)
+        if value is not None and self.normalize is not None:
+            return self.normalize(value)
+
+        return _key(value)
+
+    def conflict_of(self, *, key: Hashable) -> Failure:
+        return Failure(error=f"{self.label} {key} is already exist, please use a different {self.field}.")
+
+
+name_index = IndexDefinition(field="name", unique=True, table="names", label="Username")
+email_index = IndexDefinition(field="email", unique=True, table="emails", label="Email")
+role_index = IndexDefinition(field="role", unique=False, structure="bitmap")
+age_index = IndexDefinition(field="age", unique=False, structure="sorted")
+name_prefix_index = IndexDefinition(
+    field="name",
+    unique=False,
+    structure="prefix",
+    name="name_prefix",
+    normalize=name_key_of
+)
+email_domain_index = IndexDefinition(
+    field="email",
+    unique=False,
+    structure="prefix",
+    name="email_domain",
+    normalize=email_key_of
+)
+name_trigrams_index = IndexDefinition(
+    field="name",
+    unique=False,
+    structure="trigram",
+    name="name_trigrams",
+    normalize=trigrams_of
+)
+
+user_indexes: Tuple[IndexDefinition, ...] = (
+    name_index,
+    email_index,
+    role_index,
+    age_index,
+    name_prefix_index,
+    email_domain_index,
+    name_trigrams_index
+)
+# the prefix searches, by what the clients search
+prefix_indexes: Dict[str, IndexDefinition] = dict(name=name_prefix_index, email_domain=email_domain_index)
+
+_structures = dict(bitmap=BitmapIndex, sorted=SortedIndex, prefix=PrefixIndex, trigram=TrigramIndex)
+
+
+class _TablesWriter:
+    # the writer used when the caller doesn't pass one (a journal transaction for example)
+    def __init__(self, *, tables: Dict[str, MutableMapping]) -> None:
+        self.__tables = tables
+
+    def set(self, *, table: str, key: Any, value: Any) -> None:
+        self.__tables[table][key] = value
+
+    def delete(self, *, table: str, key: Any) -> None:
+        del self.__tables[table][key]
+
+
+class IndexManager:
+    """
+    Keeps the secondary indexes of the users (by id) for every declared IndexDefinition.
+
+    The unique ones map a value to its user id inside the given tables (so a backend can keep them durable,
+    their writes go through the `writer` passed to add/remove which has the `set`/`delete` of a journal transaction).
+    The non unique ones (BitmapIndex, SortedIndex, PrefixIndex or TrigramIndex of the integer ids) are kept in memory
+    and rebuilt from the users on start.
+    None values are never indexed (many users can have no email).
+
+    The caller serializes the writes of the same keys (holding the locks of `lock_keys`),
+    the unique lookups never lock.
+    """
+
+    def __init__(self, *,
+                 tables: Dict[str, MutableMapping],
+                 definitions: Tuple[IndexDefinition, ...] = user_indexes) -> None:
+        self.__definitions: Dict[str, IndexDefinition] = {
+            definition.index_name: definition for definition in definitions
+        }
+        self.__unique = tuple(definition for definition in definitions if definition.unique)
+        self.__non_unique = tuple(definition for definition in definitions if not definition.unique)
+        self.__tables = tables
+        for definition in self.__unique:
+            tables.setdefault(definition.table or definition.field, {})
+        self.__structures: Dict[str, Any] = self.__new_structures()
+        self.__writer = _TablesWriter(tables=tables)
+
+    def __table_of(self, *, definition: IndexDefinition) -> str:
+        return definition.table or definition.field
+
+    def __new_structures(self) -> Dict[str, Any]:
+        return {definition.index_name: _structures[definition.structure]() for definition in self.__non_unique}
+
+    def rebuild(self, *, users: Iterable[Tuple[str, ApplicationUser]]) -> None:
+        # only the non unique ones, the unique ones are already in the (recovered) tables
+        self.__structures = self.__new_structures()
+        for user_id, user in users:
+            self.__change_structures(user_id=user_id, user=user, added=True)
+
+    def lock_keys(self, *users: Maybe[DomainUser]) -> List[Tuple[str, Hashable]]:
+        return [
+            (definition.field, key)
+            for user in users if user is not None
+            for definition in self.__unique
+            for key in (definition.key_of(user=user),) if key is not None
+        ]
+
+    def conflict(self, *, user: DomainUser, user_id: Maybe[str] = None) -> Maybe[Failure]:
+        # a unique value already taken by another user than `user_id`
+        for definition in self.__unique:
+            key = definition.key_of(user=user)
+            if key is None:
+                continue
+            owner = self.__tables[self.__table_of(definition=definition)].get(key, None)
+            if owner is not None and owner != user_id:
+                return definition.conflict_of(key=key)
+
+        return None
+
+    def add(self, *, user_id: str, user: DomainUser, writer: Any = None) -> None:
+        writer = writer or self.__writer
+        for definition in self.__unique:
+            key = definition.key_of(user=user)
+            table = self.__table_of(definition=definition)
+            if key is not None and self.__tables[table].get(key, None) != user_id:
+                writer.set(table=table, key=key, value=user_id)
+        self.__change_structures(user_id=user_id, user=user, added=True)
+
+    def remove(self, *, user_id: str, user: DomainUser, kept: Maybe[DomainUser] = None, writer: Any = None) -> None:
+        # removes the entries of `user` that `kept` (its new version, if any) doesn't have anymore
+        writer = writer or self.__writer
+        for definition in self.__unique:
+            key = definition.key_of(user=user)
+            table = self.__table_of(definition=definition)
+            if key is None or (kept is not None and definition.key_of(user=kept) == key):
+                continue
+            if self.__tables[table].get(key, None) == user_id:
+                writer.delete(table=table, key=key)
+        self.__change_structures(user_id=user_id, user=user, added=False, kept=kept)
+
+    def __change_structures(self, *,
+                            user_id: str,
+                            user: DomainUser,
+                            added: bool,
+                            kept: Maybe[DomainUser] = None) -> None:
+        for definition in self.__non_unique:
+            key = definition.key_of(user=user)
+            if key is None or (kept is not None and definition.key_of(user=kept) == key):
+                continue
+            structure = self.__structures[definition.index_name]
+            if added:
+                structure.add(key=key, user_id=int(user_id))
+            else:
+                structure.discard(key=key, user_id=int(user_id))
+
+    def get(self, *, field: str, key: Hashable) -> Maybe[str]:
+        definition = self.__definitions[field]
+        if not definition.unique:
+            raise ValueError(f"The {field} index isn't unique, use ids_of instead")
+
+        return self.__tables[self.__table_of(definition=definition)].get(key, None)
+
+    def ids_of(self, *, field: str, key: Hashable) -> FrozenSet[str]:
+        definition = self.__definitions[field]
+        if definition.unique:
+            user_id = self.get(field=field, key=key)
+            return frozenset((user_id,)) if user_id is not None else frozenset()
+
+        key = _key(key)
+        return frozenset(
+            str(user_id) for user_id in self.__structures[field].ids_after(low=key, high=key, after_id=None)
+        )
+
+    def structure(self, *, field: str) -> Any:
+        # the structure of a non unique index (by its index_name), what the searches read
+        return self.__structures[field]
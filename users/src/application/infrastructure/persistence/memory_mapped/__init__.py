@@ -0,0 +1,688 @@
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from hashlib import blake2b
+from heapq import nlargest, nsmallest
+from threading import Lock
+from time import sleep
+
+try:
+    import fcntl
+except ImportError:  # no flock (windows), only the threads of this one process are coordinated then
+    fcntl = None
+
+from src.application.entity.health_check import HealthCheckStatus, Status
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.indexes import name_index, email_index, prefix_indexes
+from src.application.infrastructure.persistence.search import lowest_age, highest_age
+from src.application.infrastructure.web.authentication.signer import stored_token_of
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    List,
+    Tuple,
+    Iterator,
+    Maybe,
+    Either,
+    SimpleConfig
+)
+from src.application.utilities.functions import exception_handler
+from src.application.utilities.text import trigrams_of
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+# the file is laid out as
+#     header (one page): counters, the dirty flag, the indexes' version and an undo copy of the record being written
+#     records: `capacity` fixed width records of 1024 bytes (4 per page, so reading one never touches two pages)
+#     names index: open addressing slots of 8 bytes, twice the capacity rounded up to a power of 2
+#     emails index: same as the names one
+_magic = b"USERSMM1"
+_layout_version = 1
+_page_size = 4096
+_header_size = _page_size
+_header = struct.Struct("<8sIIQQQQQQB")  # magic, layout, record size, capacity, slots, next id, count,
+#                                         names tombstones, emails tombstones, dirty
+_undo_header = struct.Struct("<Q")  # the row whose old record is in the undo area
+_undo_offset = 2048
+# (seqlock) odd while a writer rebuilds the indexes, the lookups missing meanwhile are tried again
+_index_version = struct.Struct("<Q")
+_index_version_offset = 1024
+
+_roles: Tuple[UserRole, ...] = tuple(UserRole)
+# by name, the members of UserRole all compare equal
+_role_indexes = {role.name: index for index, role in enumerate(_roles)}
+
+# record: version (seqlock), state, role, age then length prefixed utf-8 fields
+_record_size = 1024
+_record_header = struct.Struct("<IBBH")
+_length = struct.Struct("<H")
+_none_length = 0xFFFF
+_field_widths = (("name", 126), ("email", 254), ("password", 254), ("token", 374))
+_field_offsets = {}
+_offset = _record_header.size
+for _field_name, _field_width in _field_widths:
+    _field_offsets[_field_name] = (_offset, _field_width)
+    _offset += _length.size + _field_width
+assert _offset == _record_size
+
+_empty, _live, _deleted = 0, 1, 2
+_state_offset = 4  # right after the version
+
+# index slot: 0 is empty, 1 is a deleted entry (tombstone), otherwise hash tag << 32 | (row + 2)
+_slot = struct.Struct("<Q")
+_empty_slot, _tombstone_slot = 0, 1
+_max_load = 0.75
+
+_default_capacity = 1_000_000
+
+
+def _to_row(user_id: Any) -> Maybe[int]:
+    # only the canonical decimal strings are ids, "01" or "-1" are not
+    if isinstance(user_id, str) and user_id.isascii() and user_id.isdigit() and \
+            (user_id == "0" or user_id[0] != "0"):
+        return int(user_id)
+
+    return None
+
+
+def _hash(*, key: str) -> int:
+    # python's own hash() is randomized per process, the indexes are shared between processes
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _Record:
+    __slots__ = ("state", "role", "age", "name", "email", "password", "token")
+
+    def __init__(self, *, state: int, role: int, age: int, name: Maybe[str], email: Maybe[str],
+                 password: Maybe[str], token: Maybe[str]) -> None:
+        self.state = state
+        self.role = role
+        self.age = age
+        self.name = name
+        self.email = email
+        self.password = password
+        self.token = token
+
+    def as_application_user(self, *, row: int) -> ApplicationUser:
+        return ApplicationUser(
+            id=str(row),
+            name=self.name,
+            age=self.age,
+            email=self.email,
+            password=self.password,
+            role=_roles[self.role]
+        )
+
+
+class MemoryMappedDatabase(PersistenceInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        """
+        config as {"path": "/var/lib/users/users.mmap", "capacity": 1000000}
+
+        Every process opening the same file shares the same users (the pages of the file, not copies of them),
+        reads never lock and cost one probe of the hash index plus reading one record,
+        writes are serialized between the processes by a lock on the file (and between the threads by a Lock).
+        The capacity is fixed when the file is created (it's a sparse file, the unused records take no disk)
+        and ids are never reused, so it bounds how many users can ever be created in this file.
+        """
+        config = config or {}
+        self.__path: str = config.get("path", "users.mmap")
+        self.__thread_lock = Lock()
+        self.__fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        with self.__file_lock():
+            if os.fstat(self.__fd).st_size == 0:
+                self.__create(capacity=config.get("capacity", _default_capacity))
+            self.__map = mmap.mmap(self.__fd, 0)
+            magic, layout, record_size, self.__capacity, self.__slots = _header.unpack_from(self.__map, 0)[:5]
+            if magic != _magic or layout != _layout_version or record_size != _record_size:
+                raise ValueError(f"{self.__path} isn't a users file of this version")
+            self.__mask = self.__slots - 1
+            self.__records_offset = _header_size
+            self.__index_offsets = dict(
+                name=self.__records_offset + self.__capacity * _record_size,
+                email=self.__records_offset + self.__capacity * _record_size + self.__slots * _slot.size
+            )
+            if self.__header()["dirty"]:
+                self.__recover()
+        super().__init__(config=config)
+
+    def __create(self, *, capacity: int) -> None:
+        slots = 1
+        while slots < capacity * 2:
+            slots *= 2
+        os.ftruncate(self.__fd, _header_size + capacity * _record_size + 2 * slots * _slot.size)
+        os.pwrite(self.__fd, _header.pack(_magic, _layout_version, _record_size, capacity, slots, 0, 0, 0, 0, 0), 0)
+
+    @contextmanager
+    def __file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        fcntl.flock(self.__fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.__fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def __write_lock(self) -> Iterator[None]:
+        # flock doesn't exclude the threads of the same process (they share the file), hence the Lock too
+        with self.__thread_lock, self.__file_lock():
+            yield
+
+    def __header(self) -> dict:
+        _, _, _, _, _, next_id, count, names_tombstones, emails_tombstones, dirty = _header.unpack_from(self.__map, 0)
+        return dict(
+            next_id=next_id,
+            count=count,
+            name_tombstones=names_tombstones,
+            email_tombstones=emails_tombstones,
+            dirty=dirty
+        )
+
+    def __set_header(self, **values: int) -> None:
+        header = {**self.__header(), **values}
+        _header.pack_into(
+            self.__map, 0,
+            _magic, _layout_version, _record_size, self.__capacity, self.__slots,
+            header["next_id"], header["count"], header["name_tombstones"], header["email_tombstones"], header["dirty"]
+        )
+
+    @contextmanager
+    def __writing(self, *, row: int) -> Iterator[None]:
+        # a one record undo log, a process dying in the middle of the write gets its old record back on the next open
+        record_offset = self.__records_offset + row * _record_size
+        _undo_header.pack_into(self.__map, _undo_offset - _undo_header.size, row)
+        self.__map[_undo_offset:_undo_offset + _record_size] = self.__map[record_offset:record_offset + _record_size]
+        self.__set_header(dirty=1)
+        try:
+            yield
+        except BaseException:
+            self.__recover()
+            raise
+        self.__maybe_rebuild_indexes()
+        self.__set_header(dirty=0)
+
+    def __recover(self) -> None:
+        row = _undo_header.unpack_from(self.__map, _undo_offset - _undo_header.size)[0]
+        record_offset = self.__records_offset + row * _record_size
+        self.__map[record_offset:record_offset + _record_size] = self.__map[_undo_offset:_undo_offset + _record_size]
+        version = _record_header.unpack_from(self.__map, record_offset)[0]
+        struct.pack_into("<I", self.__map, record_offset, version + (version & 1))
+        self.__rebuild_indexes()
+        self.__set_header(dirty=0)
+
+    # records
+
+    def __read_record(self, *, row: int) -> Maybe[_Record]:
+        if row >= self.__capacity:
+            return None
+
+        record_offset = self.__records_offset + row * _record_size
+        view = memoryview(self.__map)[record_offset:record_offset + _record_size]
+        try:
+            while True:
+                version, state, role, age = _record_header.unpack_from(view, 0)
+                if version & 1:
+                    sleep(0)  # a writer is in the middle of this record, letting it finish
+                    continue
+                fields = {}
+                for field_name, (field_offset, field_width) in _field_offsets.items():
+                    length = _length.unpack_from(view, field_offset)[0]
+                    value_offset = field_offset + _length.size
+                    # (a length over the width is a half written one, the version check below retries it)
+                    fields[field_name] = None if length == _none_length or length > field_width else str(
+                        view[value_offset:value_offset + length],
+                        "utf-8",
+                        "replace"
+                    )
+                if _record_header.unpack_from(view, 0)[0] == version:
+                    break
+        finally:
+            view.release()
+
+        if state != _live:
+            return None
+
+        return _Record(state=state, role=role, age=age, **fields)
+
+    def __write_record(self, *, row: int, record: _Record) -> None:
+        record_offset = self.__records_offset + row * _record_size
+        version = _record_header.unpack_from(self.__map, record_offset)[0]
+        _record_header.pack_into(self.__map, record_offset, version + 1, record.state, record.role, record.age)
+        for field_name, (field_offset, _) in _field_offsets.items():
+            value = getattr(record, field_name)
+            if value is None:
+                _length.pack_into(self.__map, record_offset + field_offset, _none_length)
+            else:
+                encoded_value = value.encode("utf-8")
+                value_offset = record_offset + field_offset + _length.size
+                self.__map[value_offset:value_offset + len(encoded_value)] = encoded_value
+                _length.pack_into(self.__map, record_offset + field_offset, len(encoded_value))
+        _record_header.pack_into(self.__map, record_offset, version + 2, record.state, record.role, record.age)
+
+    @staticmethod
+    def __too_long_field(*, record: _Record) -> Maybe[Failure]:
+        for field_name, field_width in _field_widths:
+            value = getattr(record, field_name)
+            if value is not None and len(value.encode("utf-8")) > field_width:
+                return Failure(error=f"The {field_name} is too long to be stored, at most {field_width} bytes.")
+
+        return None
+
+    # indexes
+
+    def __probe(self, *, index: str, key: str) -> Iterator[Tuple[int, int]]:
+        # (slot offset, slot value) from the key's home slot till an empty one
+        index_offset = self.__index_offsets[index]
+        slot = _hash(key=key) & self.__mask
+        for _ in range(self.__slots):
+            slot_offset = index_offset + slot * _slot.size
+            slot_value = _slot.unpack_from(self.__map, slot_offset)[0]
+            yield slot_offset, slot_value
+            if slot_value == _empty_slot:
+                return
+            slot = (slot + 1) & self.__mask
+
+    def __lookup(self, *, index: str, key: str) -> Tuple[Maybe[int], Maybe[_Record]]:
+        tag = _hash(key=key) >> 32
+        while True:
+            version = _index_version.unpack_from(self.__map, _index_version_offset)[0]
+            if version & 1:
+                sleep(0)  # a writer is rebuilding the indexes, letting it finish
+                continue
+            for _, slot_value in self.__probe(index=index, key=key):
+                if slot_value > _tombstone_slot and slot_value >> 32 == tag:
+                    row = (slot_value & 0xFFFFFFFF) - 2
+                    record = self.__read_record(row=row)
+                    # the tag can collide, the record tells if it's really this key
+                    if record is not None and getattr(record, index) == key:
+                        return row, record
+            # a found record is checked by its key whatever the index, but a miss only counts in a whole one
+            if _index_version.unpack_from(self.__map, _index_version_offset)[0] == version:
+                return None, None
+
+    def __index(self, *, index: str, key: Maybe[str], row: int) -> None:
+        if key is None:
+            return
+
+        tag = _hash(key=key) >> 32
+        for slot_offset, slot_value in self.__probe(index=index, key=key):
+            if slot_value <= _tombstone_slot:
+                _slot.pack_into(self.__map, slot_offset, tag << 32 | (row + 2))
+                if slot_value == _tombstone_slot:
+                    self.__set_header(**{f"{index}_tombstones": self.__header()[f"{index}_tombstones"] - 1})
+                return
+
+    def __unindex(self, *, index: str, key: Maybe[str], row: int) -> None:
+        if key is None:
+            return
+
+        tag = _hash(key=key) >> 32
+        for slot_offset, slot_value in self.__probe(index=index, key=key):
+            if slot_value == tag << 32 | (row + 2):
+                _slot.pack_into(self.__map, slot_offset, _tombstone_slot)
+                self.__set_header(**{f"{index}_tombstones": self.__header()[f"{index}_tombstones"] + 1})
+                return
+
+    def __maybe_rebuild_indexes(self) -> None:
+        header = self.__header()
+        if header["count"] + max(header["name_tombstones"], header["email_tombstones"]) > self.__slots * _max_load:
+            self.__rebuild_indexes()
+
+    def __rebuild_indexes(self) -> None:
+        # dropping the tombstones (after many deletes the probes would get longer and longer),
+        # the version is odd meanwhile (already odd when a writer died in the middle of the last rebuild)
+        version = _index_version.unpack_from(self.__map, _index_version_offset)[0] | 1
+        _index_version.pack_into(self.__map, _index_version_offset, version)
+        index_size = self.__slots * _slot.size
+        for index_offset in self.__index_offsets.values():
+            self.__map[index_offset:index_offset + index_size] = bytes(index_size)
+        self.__set_header(name_tombstones=0, email_tombstones=0)
+
+        count = 0
+        for row in range(self.__header()["next_id"]):
+            record = self.__read_record(row=row)
+            if record is not None:
+                self.__index(index="name", key=record.name, row=row)
+                self.__index(index="email", key=record.email, row=row)
+                count += 1
+        self.__set_header(count=count)
+        _index_version.pack_into(self.__map, _index_version_offset, version + 1)
+
+    def flush(self) -> None:
+        self.__map.flush()
+
+    def close(self) -> None:
+        self.__map.flush()
+        self.__map.close()
+        os.close(self.__fd)
+
+    def health_check(self) -> HealthCheckStatus:
+        try:
+            assert _header.unpack_from(self.__map, 0)[0] == _magic
+
+            return HealthCheckStatus(service_name=self.__class__.__name__, service_state=Status.HEALTHY)
+        except Exception:
+            return HealthCheckStatus(service_name=self.__class__.__name__, service_state=Status.UNHEALTHY)
+
+    @exception_handler
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        with self.__write_lock():
+            row, record = self.__lookup(index="name", key=username)
+            if record is None:
+                return Failure(error=f"There is no user with name {username} to be fetched")
+
+            if password is not None and record.password != password:
+                return Failure(error=f"Invalid password for user {username}")
+
+            # will make the generation better and generic later ;)
+            access_token = AccessToken(token=stored_token_of(username=username))
+            record.token = access_token.token
+            too_long_field = self.__too_long_field(record=record)
+            if too_long_field is not None:
+                return too_long_field
+            with self.__writing(row=row):
+                self.__write_record(row=row, record=record)
+
+            return access_token
+
+    @exception_handler
+    def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
+        _, record = self.__lookup(index="name", key=username)
+        if record is not None and record.token is not None:
+            return AccessToken(token=record.token)
+
+        return Failure(error=f"There is no access token for user {username}")
+
+    def __insert_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        # the caller holds the write lock
+        record = _Record(
+            state=_live,
+            role=_role_indexes[user.role.name],
+            age=user.age,
+            name=user.name,
+            email=user.email,
+            password=user.password,
+            token=None
+        )
+        too_long_field = self.__too_long_field(record=record)
+        if too_long_field is not None:
+            return too_long_field
+
+        if self.__lookup(index="name", key=user.name)[1] is not None:
+            return name_index.conflict_of(key=user.name)
+        if user.email is not None and self.__lookup(index="email", key=user.email)[1] is not None:
+            return email_index.conflict_of(key=user.email)
+
+        row = self.__header()["next_id"]
+        if row >= self.__capacity:
+            return Failure(error=f"There is no room for more users, the capacity is {self.__capacity} users.")
+
+        with self.__writing(row=row):
+            # the user is published by its record first so lock-free readers never find a key pointing to nothing
+            self.__write_record(row=row, record=record)
+            self.__index(index="name", key=user.name, row=row)
+            self.__index(index="email", key=user.email, row=row)
+            header = self.__header()
+            self.__set_header(next_id=row + 1, count=header["count"] + 1)
+
+        return record.as_application_user(row=row)
+
+    @exception_handler
+    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        with self.__write_lock():
+            return self.__insert_user(user=user)
+
+    @exception_handler
+    def persist_users(self, *, users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        # taking the file lock once for the whole batch
+        with self.__write_lock():
+            return [self.__insert_user(user=user) for user in users]
+
+    def __find(self, *, selector: str, data: str) -> Tuple[Maybe[int], Maybe[_Record]]:
+        if selector == "id":
+            row = _to_row(data)
+            record = self.__read_record(row=row) if row is not None else None
+            return (row, record) if record is not None else (None, None)
+
+        return self.__lookup(index=selector, key=data)
+
+    @exception_handler
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        # the ids are the rows already, in order, and never reused
+        # (the deleted ones in between are skipped reading only their state byte)
+        users: List[ApplicationUser] = []
+        row = int(after_id) + 1 if after_id is not None else 0
+        end = self.__header()["next_id"]
+        while row < end and len(users) < limit:
+            if self.__map[self.__records_offset + row * _record_size + _state_offset] == _live:
+                record = self.__read_record(row=row)
+                if record is not None:
+                    users.append(record.as_application_user(row=row))
+            row += 1
+
+        return users
+
+    @exception_handler
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        # no secondary index here, the rows are scanned but only the matching ones are read past their header
+        # (which has the state, role and age already)
+        role_index = _role_indexes[role.name] if role is not None else None
+        low = age_gte if age_gte is not None else lowest_age
+        high = age_lte if age_lte is not None else highest_age
+
+        def matches(record_role: int, age: int) -> bool:
+            return (role_index is None or record_role == role_index) and low <= age <= high
+
+        users: List[ApplicationUser] = []
+        row = int(after_id) + 1 if after_id is not None else 0
+        end = self.__header()["next_id"]
+        while row < end and len(users) < limit:
+            record_offset = self.__records_offset + row * _record_size
+            _, state, record_role, age = _record_header.unpack_from(self.__map, record_offset)
+            if state == _live and matches(record_role, age):
+                record = self.__read_record(row=row)
+                # checked again on the consistent read, the header might have been read in the middle of a write
+                if record is not None and matches(record.role, record.age):
+                    users.append(record.as_application_user(row=row))
+            row += 1
+
+        return users
+
+    @exception_handler
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        # no secondary index here either, every live row is read and the matching ones sorted by (key, id)
+        definition = prefix_indexes[selector]
+        after = (after_key, int(after_id) if after_id is not None else -1) if after_key is not None else None
+        matches: List[Tuple[str, int, ApplicationUser]] = []
+        for row in range(self.__header()["next_id"]):
+            if self.__map[self.__records_offset + row * _record_size + _state_offset] != _live:
+                continue
+            record = self.__read_record(row=row)
+            user = record.as_application_user(row=row) if record is not None else None
+            key = definition.key_of(user=user) if user is not None else None
+            if key is not None and key.startswith(prefix) and (after is None or (key, row) > after):
+                matches.append((key, row, user))
+
+        return [user for _, _, user in nsmallest(limit, matches, key=lambda match: match[:2])]
+
+    @exception_handler
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        # no inverted index here, every live row is read and the ones sharing the most trigrams kept
+        trigrams = trigrams_of(name)
+        candidates: List[Tuple[int, int, ApplicationUser]] = []
+        for row in range(self.__header()["next_id"]):
+            if self.__map[self.__records_offset + row * _record_size + _state_offset] != _live:
+                continue
+            record = self.__read_record(row=row)
+            if record is not None:
+                user = record.as_application_user(row=row)
+                shared = len(trigrams & trigrams_of(user.name))
+                if shared:
+                    candidates.append((shared, -row, user))
+
+        return [user for _, _, user in nlargest(limit, candidates, key=lambda candidate: candidate[:2])]
+
+    @exception_handler
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        return self.__find(selector=selector, data=data)[1] is not None
+
+    def _fetch_user_by(self) -> 'PersistenceInterface.FetchBy':
+        find = self.__find
+
+        def fetch(*, selector: str, data: str) -> Either[Failure, ApplicationUser]:
+            row, record = find(selector=selector, data=data)
+            if record is not None:
+                return record.as_application_user(row=row)
+
+            return Failure(error=f"There is no user with {selector} {data} to be fetched")
+
+        class MemoryMappedFetchBy(PersistenceInterface.FetchBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="id", data=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="name", data=user_name)
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="email", data=user_email)
+
+            # lock-free reads as well, a batch is just the single lookups in a row
+            @exception_handler
+            def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [fetch(selector="id", data=user_id) for user_id in user_ids]
+
+            @exception_handler
+            def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [fetch(selector="name", data=user_name) for user_name in user_names]
+
+            @exception_handler
+            def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return [fetch(selector="email", data=user_email) for user_email in user_emails]
+
+        return MemoryMappedFetchBy()
+
+    def _update_user_by(self) -> 'PersistenceInterface.UpdateBy':
+        find = self.__find
+        write_lock = self.__write_lock
+        writing = self.__writing
+        lookup = self.__lookup
+        write_record = self.__write_record
+        index = self.__index
+        unindex = self.__unindex
+        too_long_field = self.__too_long_field
+
+        def update(*, selector: str, data: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+            with write_lock():
+                row, record = find(selector=selector, data=data)
+                if record is None:
+                    return Failure(error=f"There is no user with {selector} {data} to be updated")
+
+                name_row = lookup(index="name", key=updated_user.name)[0]
+                if name_row is not None and name_row != row:
+                    return name_index.conflict_of(key=updated_user.name)
+                email_row = lookup(index="email", key=updated_user.email)[0] if updated_user.email is not None \
+                    else None
+                if email_row is not None and email_row != row:
+                    return email_index.conflict_of(key=updated_user.email)
+
+                # the access token stays with the user (like the user's id)
+                updated_record = _Record(
+                    state=_live,
+                    role=_role_indexes[updated_user.role.name],
+                    age=updated_user.age,
+                    name=updated_user.name,
+                    email=updated_user.email,
+                    password=updated_user.password,
+                    token=record.token
+                )
+                too_long_field_status = too_long_field(record=updated_record)
+                if too_long_field_status is not None:
+                    return too_long_field_status
+
+                with writing(row=row):
+                    write_record(row=row, record=updated_record)
+                    if record.name != updated_record.name:
+                        unindex(index="name", key=record.name, row=row)
+                        index(index="name", key=updated_record.name, row=row)
+                    if record.email != updated_record.email:
+                        unindex(index="email", key=record.email, row=row)
+                        index(index="email", key=updated_record.email, row=row)
+
+                return updated_record.as_application_user(row=row)
+
+        class MemoryMappedUpdateBy(PersistenceInterface.UpdateBy):
+            @exception_handler
+            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="id", data=user_id, updated_user=updated_user)
+
+            @exception_handler
+            def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="name", data=user_name, updated_user=updated_user)
+
+            @exception_handler
+            def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="email", data=user_email, updated_user=updated_user)
+
+        return MemoryMappedUpdateBy()
+
+    def _delete_user_by(self) -> 'PersistenceInterface.DeleteBy':
+        find = self.__find
+        write_lock = self.__write_lock
+        writing = self.__writing
+        write_record = self.__write_record
+        unindex = self.__unindex
+        header = self.__header
+        set_header = self.__set_header
+
+        def delete(*, selector: str, data: str) -> Either[Failure, Success]:
+            with write_lock():
+                row, record = find(selector=selector, data=data)
+                if record is None:
+                    return Failure(error=f"There is no user with {selector} {data} to be deleted")
+
+                with writing(row=row):
+                    # lock-free readers following the indexes meanwhile just find a deleted record,
+                    # the access token of the user goes with it
+                    write_record(row=row, record=_Record(
+                        state=_deleted, role=0, age=0, name=None, email=None, password=None, token=None
+                    ))
+                    set_header(count=header()["count"] - 1)
+                    unindex(index="name", key=record.name, row=row)
+                    unindex(index="email", key=record.email, row=row)
+
+                return Success()
+
+        class MemoryMappedDeleteBy(PersistenceInterface.DeleteBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, Success]:
+                return delete(selector="id", data=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, Success]:
+                return delete(selector="name", data=user_name)
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, Success]:
+                return delete(selector="email", data=user_email)
+
+        return MemoryMappedDeleteBy()
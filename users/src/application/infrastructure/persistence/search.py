@@ -0,0 +1,88 @@
+from src.application.infrastructure.persistence.indexes import IndexManager, _key
+from src.application.types import (
+    Any,
+    List,
+    Iterator,
+    Maybe,
+    dataclass
+)
+from src.domain.entity.user import UserRole
+
+lowest_age = -(2 ** 63)
+highest_age = 2 ** 63 - 1
+
+
+@dataclass(frozen=True)
+class RangePredicate:
+    field: str
+    low: Any
+    high: Any
+
+    def matches(self, *, user: Any) -> bool:
+        value = _key(getattr(user, self.field))
+        return value is not None and self.low <= value <= self.high
+
+
+def predicates_of(*,
+                  role: Maybe[UserRole],
+                  age_gte: Maybe[int],
+                  age_lte: Maybe[int]) -> List[RangePredicate]:
+    predicates: List[RangePredicate] = []
+    if role is not None:
+        predicates.append(RangePredicate(field="role", low=role.name, high=role.name))
+    if age_gte is not None or age_lte is not None:
+        predicates.append(RangePredicate(
+            field="age",
+            low=age_gte if age_gte is not None else lowest_age,
+            high=age_lte if age_lte is not None else highest_age
+        ))
+
+    return predicates
+
+
+def plan_search(*,
+                indexes: IndexManager,
+                all_ids: Iterator[int],
+                predicates: List[RangePredicate],
+                after_id: Maybe[int]) -> Iterator[int]:
+    """
+    The ids (in order, after `after_id`) that may match all the predicates,
+    `all_ids` (every id after `after_id`, lazily) being walked when there are none.
+
+    The index with the fewest ids in its range drives the walk, the others only filter its ids
+    when they can tell from the id alone (a bitmap can, a sorted index can't),
+    so the caller still checks every predicate on the users themselves (which also covers the index writes
+    racing with the walk).
+    """
+    if not predicates:
+        return all_ids
+
+    estimates = sorted(
+        (
+            (indexes.structure(field=predicate.field).count(low=predicate.low, high=predicate.high), position)
+            for position, predicate in enumerate(predicates)
+        )
+    )
+    if estimates[0][0] == 0:
+        return iter(())
+
+    driver = predicates[estimates[0][1]]
+    filters = [
+        (predicate, indexes.structure(field=predicate.field))
+        for _, position in estimates[1:]
+        for predicate in (predicates[position],)
+    ]
+
+    def candidates() -> Iterator[int]:
+        for user_id in indexes.structure(field=driver.field).ids_after(
+                low=driver.low,
+                high=driver.high,
+                after_id=after_id
+        ):
+            if all(
+                    structure.contains(low=predicate.low, high=predicate.high, user_id=user_id) is not False
+                    for predicate, structure in filters
+            ):
+                yield user_id
+
+    return candidates()
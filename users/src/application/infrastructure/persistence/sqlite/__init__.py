@@ -0,0 +1,584 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from threading import Lock, local
+
+from src.application.entity.health_check import HealthCheckStatus, Status
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.indexes import (
+    name_index,
+    email_index,
+    name_prefix_index,
+    email_domain_index
+)
+from src.application.infrastructure.persistence.search import lowest_age, highest_age
+from src.application.infrastructure.web.authentication.signer import stored_token_of
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    List,
+    Tuple,
+    Iterator,
+    Maybe,
+    Either,
+    SimpleConfig
+)
+from src.application.utilities.functions import exception_handler
+from src.application.utilities.text import trigrams_of
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import DomainUser as DomainUser, UserRole
+
+_schema = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    email TEXT,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_name ON users (name);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE INDEX IF NOT EXISTS users_role_age ON users (role, age);
+CREATE INDEX IF NOT EXISTS users_age ON users (age);
+-- (name_key and email_key are the python functions every connection registers, see _key_functions)
+CREATE INDEX IF NOT EXISTS users_name_key ON users (name_key(name), id);
+CREATE INDEX IF NOT EXISTS users_email_key ON users (email_key(email), id);
+CREATE TABLE IF NOT EXISTS access_tokens (
+    user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+    token TEXT NOT NULL
+);
+-- ids start from 0 like the other persistence implementations and are never reused
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    next_value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO sequences (name, next_value) VALUES ('users', 0);
+"""
+# the trigrams of the names for the fuzzy searches, kept up to date by the triggers,
+# in a FTS5 table when sqlite has its trigram tokenizer (3.34 on), which indexes the names padded
+# like trigrams_of pads them (the tokenizer doesn't) so the beginning and the end of a name have their trigrams too
+_fts_name_trigrams_schema = """
+CREATE VIEW IF NOT EXISTS users_padded_names AS SELECT id, '  ' || name || ' ' AS padded_name FROM users;
+CREATE VIRTUAL TABLE IF NOT EXISTS users_name_trigrams USING fts5(
+    padded_name,
+    content='users_padded_names',
+    content_rowid='id',
+    tokenize='trigram case_sensitive 0'
+);
+CREATE TRIGGER IF NOT EXISTS users_name_trigrams_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_name_trigrams (rowid, padded_name) VALUES (new.id, '  ' || new.name || ' ');
+END;
+CREATE TRIGGER IF NOT EXISTS users_name_trigrams_delete AFTER DELETE ON users BEGIN
+    INSERT INTO users_name_trigrams (users_name_trigrams, rowid, padded_name)
+    VALUES ('delete', old.id, '  ' || old.name || ' ');
+END;
+CREATE TRIGGER IF NOT EXISTS users_name_trigrams_update AFTER UPDATE OF name ON users BEGIN
+    INSERT INTO users_name_trigrams (users_name_trigrams, rowid, padded_name)
+    VALUES ('delete', old.id, '  ' || old.name || ' ');
+    INSERT INTO users_name_trigrams (rowid, padded_name) VALUES (new.id, '  ' || new.name || ' ');
+END;
+"""
+# otherwise in a plain (trigram, id) table, the trigrams being split by name_trigrams (see _key_functions)
+_table_name_trigrams_schema = """
+CREATE TABLE IF NOT EXISTS users_name_trigram_ids (
+    trigram TEXT NOT NULL,
+    id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    PRIMARY KEY (trigram, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS users_name_trigram_ids_id ON users_name_trigram_ids (id);
+CREATE TRIGGER IF NOT EXISTS users_name_trigram_ids_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_name_trigram_ids (trigram, id) SELECT value, new.id FROM json_each(name_trigrams(new.name));
+END;
+CREATE TRIGGER IF NOT EXISTS users_name_trigram_ids_update AFTER UPDATE OF name ON users BEGIN
+    DELETE FROM users_name_trigram_ids WHERE id = old.id;
+    INSERT INTO users_name_trigram_ids (trigram, id) SELECT value, new.id FROM json_each(name_trigrams(new.name));
+END;
+"""
+
+# every statement is a constant so sqlite3 keeps it prepared in the per connection statement cache
+_user_columns = "id, name, age, email, password, role"
+_select_user_by = {
+    "id": f"SELECT {_user_columns} FROM users WHERE id = ?",
+    "name": f"SELECT {_user_columns} FROM users WHERE name = ?",
+    "email": f"SELECT {_user_columns} FROM users WHERE email = ?"
+}
+# a whole batch is one json array parameter, so it's still one constant (and cached) statement whatever its size
+_select_users_by = {
+    "id": f"SELECT {_user_columns} FROM users WHERE id IN (SELECT value FROM json_each(?))",
+    "name": f"SELECT {_user_columns} FROM users WHERE name IN (SELECT value FROM json_each(?))",
+    "email": f"SELECT {_user_columns} FROM users WHERE email IN (SELECT value FROM json_each(?))"
+}
+# keyset pagination, walks the primary key b-tree from the cursor on however deep it is
+_select_users_after = f"SELECT {_user_columns} FROM users WHERE id > ? ORDER BY id LIMIT ?"
+# the missing age bounds are the widest ones, so a search is one of these two statements whatever its filters
+_search_users = f"SELECT {_user_columns} FROM users WHERE age BETWEEN ? AND ? AND id > ? ORDER BY id LIMIT ?"
+_search_users_by_role = (
+    f"SELECT {_user_columns} FROM users WHERE role = ? AND age BETWEEN ? AND ? AND id > ? ORDER BY id LIMIT ?"
+)
+# a range of the (key, id) expression indexes, from the cursor (or the prefix) to the end of the prefix
+# (the plain bounds on the key are what the planner seeks with, the row value alone only gets the upper one)
+_search_users_by_prefix = {
+    selector: f"SELECT {_user_columns} FROM users WHERE {key} >= ?1 AND {key} < ?3 AND ({key}, id) > (?1, ?2) "
+              f"ORDER BY {key}, id LIMIT ?4"
+    for selector, key in (("name", "name_key(name)"), ("email_domain", "email_key(email)"))
+}
+# any of the trigrams, the users having the most (and the rarest) of them first
+_search_users_by_similar_name = (
+    "SELECT users.id, users.name, users.age, users.email, users.password, users.role FROM users_name_trigrams "
+    "JOIN users ON users.id = users_name_trigrams.rowid WHERE users_name_trigrams MATCH ? ORDER BY rank LIMIT ?"
+)
+# the same counting the shared trigrams, the users sharing the most of them first
+_search_users_by_similar_name_in_table = (
+    f"SELECT {_user_columns} FROM ("
+    "SELECT id AS trigram_id, count(*) AS shared FROM users_name_trigram_ids "
+    "WHERE trigram IN (SELECT value FROM json_each(?)) GROUP BY id ORDER BY shared DESC, id LIMIT ?"
+    ") JOIN users ON users.id = trigram_id ORDER BY shared DESC, id"
+)
+_has_table = "SELECT 1 FROM sqlite_master WHERE name = ?"
+_rebuild_name_trigrams = "INSERT INTO users_name_trigrams (users_name_trigrams) VALUES ('rebuild')"
+_rebuild_name_trigram_ids = (
+    "INSERT INTO users_name_trigram_ids (trigram, id) SELECT value, users.id FROM users, json_each(name_trigrams(name))"
+)
+_probe_trigram_tokenizer = "CREATE VIRTUAL TABLE temp.trigram_tokenizer_probe USING fts5(name, tokenize='trigram')"
+_update_user = "UPDATE users SET name = ?, age = ?, email = ?, password = ?, role = ? WHERE id = ?"
+_delete_user_by = {
+    "id": "DELETE FROM users WHERE id = ?",
+    "name": "DELETE FROM users WHERE name = ?",
+    "email": "DELETE FROM users WHERE email = ?"
+}
+_insert_user = "INSERT INTO users (name, age, email, password, role, id) VALUES (?, ?, ?, ?, ?, ?)"
+_select_next_user_id = "SELECT next_value FROM sequences WHERE name = 'users'"
+_increment_next_user_id = "UPDATE sequences SET next_value = next_value + 1 WHERE name = 'users'"
+_set_next_user_id = "UPDATE sequences SET next_value = ? WHERE name = 'users'"
+_select_id_by = {
+    "id": "SELECT id FROM users WHERE id = ?",
+    "name": "SELECT id FROM users WHERE name = ?",
+    "email": "SELECT id FROM users WHERE email = ?"
+}
+_upsert_access_token = (
+    "INSERT INTO access_tokens (user_id, token) VALUES (?, ?) "
+    "ON CONFLICT (user_id) DO UPDATE SET token = excluded.token"
+)
+_select_access_token = (
+    "SELECT access_tokens.token FROM access_tokens JOIN users ON users.id = access_tokens.user_id "
+    "WHERE users.name = ?"
+)
+
+_selector_columns = {"id": 0, "name": 1, "email": 3}
+
+_default_cached_statements = 256
+_default_busy_timeout = 5.0
+_last_character = chr(0x10FFFF)
+
+
+def _trigrams_in(name: str) -> List[str]:
+    # the same (padded) trigrams as the in-memory indexes, so every persistence gives the same candidates
+    return sorted(trigrams_of(name))
+
+
+_key_functions = dict(
+    name_key=name_prefix_index.normalize,
+    email_key=email_domain_index.normalize,
+    name_trigrams=lambda name: json.dumps(_trigrams_in(name))
+)
+
+
+def _has_trigram_tokenizer(*, connection: sqlite3.Connection) -> bool:
+    # FTS5 and its trigram tokenizer are both optional (and the latter only from sqlite 3.34 on)
+    try:
+        connection.execute(_probe_trigram_tokenizer)
+    except sqlite3.OperationalError:
+        return False
+
+    connection.execute("DROP TABLE temp.trigram_tokenizer_probe")
+    return True
+
+
+def _null_safe(function: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: function(value) if value is not None else None
+
+
+def _prefix_end(prefix: str) -> Either[str, bytes]:
+    """
+    The smallest string after all the ones starting with the prefix, or an empty blob when there's none
+    (for an empty prefix or one of U+10FFFF only), sqlite sorting every blob after every text.
+    """
+    prefix = prefix.rstrip(_last_character)
+    if not prefix:
+        return b""
+
+    following = ord(prefix[-1]) + 1
+    # the surrogates can't be encoded, the code points after them are the next ones in UTF-8 too
+    return prefix[:-1] + chr(0xE000 if 0xD800 <= following <= 0xDFFF else following)
+
+
+def _to_user_id(user_id: str) -> Maybe[int]:
+    try:
+        return int(user_id)
+    except ValueError:
+        return None
+
+
+def _from_row_to_application_user(*, row: Tuple[Any, ...]) -> ApplicationUser:
+    return ApplicationUser(
+        id=str(row[0]),
+        name=row[1],
+        age=row[2],
+        email=row[3],
+        password=row[4],
+        role=UserRole[row[5]]
+    )
+
+
+def _from_domain_user_to_row(*, user: DomainUser) -> Tuple[Any, ...]:
+    return user.name, user.age, user.email, user.password, user.role.name
+
+
+def _from_integrity_error_to_failure(*,
+                                     connection: sqlite3.Connection,
+                                     user: DomainUser,
+                                     user_id: int) -> Failure:
+    # sqlite reports only one of the violated unique indexes, the name one is reported first like the other backends
+    row = connection.execute(_select_id_by["name"], (user.name,)).fetchone()
+    if row is not None and row[0] != user_id:
+        return name_index.conflict_of(key=user.name)
+
+    return email_index.conflict_of(key=user.email)
+
+
+class SqliteDatabase(PersistenceInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        """
+        config as {"path": "/var/lib/users/users.db", "cached_statements": 256, "busy_timeout": 5.0}
+
+        Every thread gets its own connection (sqlite connections can't be shared between threads safely)
+        and it keeps its prepared statements cached, the database itself runs in WAL journal mode
+        so the readers never block the writer.
+
+        The trigrams of the names are in a FTS5 table when sqlite has the trigram tokenizer, otherwise (and for
+        a database created without it) in a plain table counted by the fuzzy searches.
+        """
+        config = config or {}
+        self.__path: str = config.get("path", "users.db")
+        self.__cached_statements: int = config.get("cached_statements", _default_cached_statements)
+        self.__busy_timeout: float = config.get("busy_timeout", _default_busy_timeout)
+        self.__local = local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__connections_lock = Lock()
+
+        connection = self.__connection()
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(_schema)
+        # a database keeps the trigrams where it was created with them, one created before them is indexed once
+        has_fts_name_trigrams = connection.execute(_has_table, ("users_name_trigrams",)).fetchone() is not None
+        has_table_name_trigrams = connection.execute(_has_table, ("users_name_trigram_ids",)).fetchone() is not None
+        has_tokenizer = _has_trigram_tokenizer(connection=connection)
+        if has_fts_name_trigrams and not has_tokenizer:
+            raise RuntimeError(
+                f"The database {self.__path} was created with the FTS5 trigram tokenizer, "
+                f"which sqlite {sqlite3.sqlite_version} doesn't have"
+            )
+        self.__fts_name_trigrams: bool = has_tokenizer and not has_table_name_trigrams
+        if self.__fts_name_trigrams:
+            connection.executescript(_fts_name_trigrams_schema)
+            if not has_fts_name_trigrams:
+                connection.execute(_rebuild_name_trigrams)
+        else:
+            connection.executescript(_table_name_trigrams_schema)
+            if not has_table_name_trigrams:
+                connection.execute(_rebuild_name_trigram_ids)
+        super().__init__(config=config)
+
+    def __connection(self) -> sqlite3.Connection:
+        connection: Maybe[sqlite3.Connection] = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.__path,
+                timeout=self.__busy_timeout,
+                isolation_level=None,  # explicit transactions only, single statements just autocommit
+                check_same_thread=True,
+                cached_statements=self.__cached_statements
+            )
+            for name, function in _key_functions.items():
+                # deterministic, so they can be used by the expression indexes
+                connection.create_function(name, 1, _null_safe(function), deterministic=True)
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self.__local.connection = connection
+            with self.__connections_lock:
+                self.__connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def __transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self.__connection()
+        # taking the write lock up front, so a read inside the transaction can't be invalidated by other writers
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self.__connections_lock:
+            for connection in self.__connections:
+                try:
+                    connection.close()
+                except sqlite3.ProgrammingError:
+                    # connections of other (maybe already finished) threads can only be closed by them
+                    pass
+            self.__connections = []
+        self.__local = local()
+
+    def health_check(self) -> HealthCheckStatus:
+        try:
+            assert self.__connection().execute("SELECT 1").fetchone() == (1,)
+
+            return HealthCheckStatus(service_name=self.__class__.__name__, service_state=Status.HEALTHY)
+        except Exception:
+            return HealthCheckStatus(service_name=self.__class__.__name__, service_state=Status.UNHEALTHY)
+
+    @exception_handler
+    def persist_access_token(self, *, username: str, password: Maybe[str]) -> Either[Failure, AccessToken]:
+        with self.__transaction() as connection:
+            row = connection.execute(_select_user_by["name"], (username,)).fetchone()
+            if row is None:
+                return Failure(error=f"There is no user with name {username} to be fetched")
+
+            user = _from_row_to_application_user(row=row)
+            if password is not None and user.password != password:
+                return Failure(error=f"Invalid password for user {username}")
+
+            # will make the generation better and generic later ;)
+            access_token = AccessToken(token=stored_token_of(username=username))
+            connection.execute(_upsert_access_token, (int(user.id), access_token.token))
+
+            return access_token
+
+    @exception_handler
+    def fetch_access_token(self, *, username: str) -> Either[Failure, AccessToken]:
+        row = self.__connection().execute(_select_access_token, (username,)).fetchone()
+        if row is not None:
+            return AccessToken(token=row[0])
+
+        return Failure(error=f"There is no access token for user {username}")
+
+    @exception_handler
+    def persist_user(self, *, user: DomainUser) -> Either[Failure, ApplicationUser]:
+        with self.__transaction() as connection:
+            user_id: int = connection.execute(_select_next_user_id).fetchone()[0]
+            try:
+                connection.execute(_insert_user, (*_from_domain_user_to_row(user=user), user_id))
+            except sqlite3.IntegrityError:
+                return _from_integrity_error_to_failure(connection=connection, user=user, user_id=user_id)
+            connection.execute(_increment_next_user_id)
+
+            return PersistenceInterface.from_domain_user_to_database_user(
+                user=user,
+                user_id=str(user_id)
+            )
+
+    @exception_handler
+    def persist_users(self, *, users: List[DomainUser]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        # one transaction (one commit) for the whole batch, a failing insert only undoes its own row
+        with self.__transaction() as connection:
+            next_user_id: int = connection.execute(_select_next_user_id).fetchone()[0]
+            persisted_users: List[Either[Failure, ApplicationUser]] = []
+            for user in users:
+                try:
+                    connection.execute(_insert_user, (*_from_domain_user_to_row(user=user), next_user_id))
+                except sqlite3.IntegrityError:
+                    persisted_users.append(
+                        _from_integrity_error_to_failure(connection=connection, user=user, user_id=next_user_id)
+                    )
+                    continue
+                persisted_users.append(PersistenceInterface.from_domain_user_to_database_user(
+                    user=user,
+                    user_id=str(next_user_id)
+                ))
+                next_user_id += 1
+            connection.execute(_set_next_user_id, (next_user_id,))
+
+            return persisted_users
+
+    @exception_handler
+    def list_users(self, *, after_id: Maybe[str], limit: int) -> Either[Failure, List[ApplicationUser]]:
+        rows = self.__connection().execute(
+            _select_users_after,
+            (int(after_id) if after_id is not None else -1, limit)
+        )
+        return [_from_row_to_application_user(row=row) for row in rows]
+
+    @exception_handler
+    def search_users(self, *,
+                     role: Maybe[UserRole],
+                     age_gte: Maybe[int],
+                     age_lte: Maybe[int],
+                     after_id: Maybe[str],
+                     limit: int) -> Either[Failure, List[ApplicationUser]]:
+        parameters = (
+            age_gte if age_gte is not None else lowest_age,
+            age_lte if age_lte is not None else highest_age,
+            int(after_id) if after_id is not None else -1,
+            limit
+        )
+        rows = self.__connection().execute(
+            *((_search_users_by_role, (role.name, *parameters)) if role is not None else (_search_users, parameters))
+        )
+        return [_from_row_to_application_user(row=row) for row in rows]
+
+    @exception_handler
+    def search_users_by_prefix(self, *,
+                               selector: str,
+                               prefix: str,
+                               after_key: Maybe[str],
+                               after_id: Maybe[str],
+                               limit: int) -> Either[Failure, List[ApplicationUser]]:
+        after = (prefix, -1)
+        if after_key is not None:
+            after = max(after, (after_key, int(after_id) if after_id is not None else -1))
+        rows = self.__connection().execute(
+            _search_users_by_prefix[selector],
+            (*after, _prefix_end(prefix), limit)
+        )
+        return [_from_row_to_application_user(row=row) for row in rows]
+
+    @exception_handler
+    def search_users_by_similar_name(self, *, name: str, limit: int) -> Either[Failure, List[ApplicationUser]]:
+        trigrams = _trigrams_in(name)
+        if not trigrams:
+            return []
+
+        if self.__fts_name_trigrams:
+            rows = self.__connection().execute(
+                _search_users_by_similar_name,
+                (" OR ".join('"{}"'.format(trigram.replace('"', '""')) for trigram in trigrams), limit)
+            )
+        else:
+            rows = self.__connection().execute(_search_users_by_similar_name_in_table, (json.dumps(trigrams), limit))
+        return [_from_row_to_application_user(row=row) for row in rows]
+
+    @exception_handler
+    def has_user(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        return self.__connection().execute(_select_id_by[selector], (data,)).fetchone() is not None
+
+    def _fetch_user_by(self) -> 'PersistenceInterface.FetchBy':
+        connection = self.__connection
+
+        def fetch(*, selector: str, data: str) -> Either[Failure, ApplicationUser]:
+            row = connection().execute(_select_user_by[selector], (data,)).fetchone()
+            if row is not None:
+                return _from_row_to_application_user(row=row)
+
+            return Failure(error=f"There is no user with {selector} {data} to be fetched")
+
+        def fetch_many(*, selector: str, data: List[str]) -> List[Either[Failure, ApplicationUser]]:
+            users = {
+                row[_selector_columns[selector]]: _from_row_to_application_user(row=row)
+                for row in connection().execute(_select_users_by[selector], (json.dumps(data),))
+            }
+            # ids are integers in the table, "1" or "01" are the same id like with the single fetch
+            key_of = _to_user_id if selector == "id" else lambda key: key
+
+            return [
+                users.get(key_of(item), None) or Failure(error=f"There is no user with {selector} {item} to be fetched")
+                for item in data
+            ]
+
+        class SqliteFetchBy(PersistenceInterface.FetchBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="id", data=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="name", data=user_name)
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, ApplicationUser]:
+                return fetch(selector="email", data=user_email)
+
+            @exception_handler
+            def ids(self, *, user_ids: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(selector="id", data=user_ids)
+
+            @exception_handler
+            def names(self, *, user_names: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(selector="name", data=user_names)
+
+            @exception_handler
+            def emails(self, *, user_emails: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+                return fetch_many(selector="email", data=user_emails)
+
+        return SqliteFetchBy()
+
+    def _update_user_by(self) -> 'PersistenceInterface.UpdateBy':
+        transaction = self.__transaction
+
+        def update(*, selector: str, data: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+            with transaction() as connection:
+                row = connection.execute(_select_id_by[selector], (data,)).fetchone()
+                if row is None:
+                    return Failure(error=f"There is no user with {selector} {data} to be updated")
+
+                try:
+                    connection.execute(_update_user, (*_from_domain_user_to_row(user=updated_user), row[0]))
+                except sqlite3.IntegrityError:
+                    return _from_integrity_error_to_failure(
+                        connection=connection,
+                        user=updated_user,
+                        user_id=row[0]
+                    )
+
+                return PersistenceInterface.from_domain_user_to_database_user(
+                    user=updated_user,
+                    user_id=str(row[0])
+                )
+
+        class SqliteUpdateBy(PersistenceInterface.UpdateBy):
+            @exception_handler
+            def id(self, *, user_id: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="id", data=user_id, updated_user=updated_user)
+
+            @exception_handler
+            def name(self, *, user_name: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="name", data=user_name, updated_user=updated_user)
+
+            @exception_handler
+            def email(self, *, user_email: str, updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+                return update(selector="email", data=user_email, updated_user=updated_user)
+
+        return SqliteUpdateBy()
+
+    def _delete_user_by(self) -> 'PersistenceInterface.DeleteBy':
+        connection = self.__connection
+
+        def delete(*, selector: str, data: str) -> Either[Failure, Success]:
+            # the access token of the user goes with it (ON DELETE CASCADE)
+            if connection().execute(_delete_user_by[selector], (data,)).rowcount > 0:
+                return Success()
+
+            return Failure(error=f"There is no user with {selector} {data} to be deleted")
+
+        class SqliteDeleteBy(PersistenceInterface.DeleteBy):
+            @exception_handler
+            def id(self, *, user_id: str) -> Either[Failure, Success]:
+                return delete(selector="id", data=user_id)
+
+            @exception_handler
+            def name(self, *, user_name: str) -> Either[Failure, Success]:
+                return delete(selector="name", data=user_name)
+
+            @exception_handler
+            def email(self, *, user_email: str) -> Either[Failure, Success]:
+                return delete(selector="email", data=user_email)
+
+        return SqliteDeleteBy()
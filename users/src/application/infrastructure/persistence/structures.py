@@ -0,0 +1,465 @@
+from array import array
+from hashlib import blake2b
+from math import ceil, floor, log
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from heapq import merge
+from itertools import islice, takewhile
+from threading import Lock
+
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Tuple,
+    Hashable,
+    Iterator,
+    Maybe,
+    Set
+)
+
+_default_block_size = 1024
+_bitmap_chunk_bytes = 512
+_default_max_postings = 50_000
+_default_bloom_capacity = 100_000
+_default_bloom_error_rate = 0.001
+_bloom_growth = 2
+_bloom_tightening = 0.5
+
+
+class SortedBlocks:
+    """
+    Items in order, as a list of sorted blocks (each at most twice `block_size` long) plus the last item
+    of every block, so adding, removing or reading the page after any item costs a bisection and one block at most
+    whatever the number of items is (and whatever the gaps removed items left).
+    """
+
+    def __init__(self, *, block_size: int = _default_block_size, new_block: Callable[[List[Any]], Any] = list) -> None:
+        self.__block_size = block_size
+        self.__new_block = new_block
+        self.__blocks: List[Any] = []
+        self.__maxes: List[Any] = []
+        self.__length = 0
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def _add(self, item: Any) -> None:
+        with self.__lock:
+            if not self.__blocks:
+                self.__blocks.append(self.__new_block([item]))
+                self.__maxes.append(item)
+                self.__length += 1
+                return
+
+            # new ids are (nearly always) the biggest ones, so this usually appends to the last block
+            index = min(bisect_left(self.__maxes, item), len(self.__blocks) - 1)
+            block = self.__blocks[index]
+            position = bisect_left(block, item)
+            if position < len(block) and block[position] == item:
+                return
+            block.insert(position, item)
+            self.__maxes[index] = block[-1]
+            self.__length += 1
+
+            if len(block) > 2 * self.__block_size:
+                self.__blocks[index:index + 1] = [block[:self.__block_size], block[self.__block_size:]]
+                self.__maxes[index:index + 1] = [block[self.__block_size - 1], block[-1]]
+
+    def _discard(self, item: Any) -> None:
+        with self.__lock:
+            index = bisect_left(self.__maxes, item)
+            if index == len(self.__blocks):
+                return
+
+            block = self.__blocks[index]
+            position = bisect_left(block, item)
+            if position == len(block) or block[position] != item:
+                return
+            del block[position]
+            self.__length -= 1
+            if block:
+                self.__maxes[index] = block[-1]
+            else:
+                del self.__blocks[index]
+                del self.__maxes[index]
+
+    def _after(self, item: Maybe[Any], limit: int) -> List[Any]:
+        with self.__lock:
+            index = 0 if item is None else bisect_right(self.__maxes, item)
+            page: List[Any] = []
+            position = 0 if item is None or index == len(self.__blocks) else bisect_right(
+                self.__blocks[index],
+                item
+            )
+            while index < len(self.__blocks) and len(page) < limit:
+                block = self.__blocks[index]
+                page.extend(block[position:position + limit - len(page)])
+                index, position = index + 1, 0
+
+            return page
+
+    def _iter_after(self, item: Maybe[Any]) -> Iterator[Any]:
+        # lazily, a block at a time (the lock isn't held between them)
+        while True:
+            page = self._after(item, self.__block_size)
+            yield from page
+            if len(page) < self.__block_size:
+                return
+            item = page[-1]
+
+
+class SortedIds(SortedBlocks):
+    """
+    The integer ids in order, kept in blocks of 64 bits integers.
+    """
+
+    def __init__(self, *, block_size: int = _default_block_size) -> None:
+        super().__init__(block_size=block_size, new_block=lambda items: array("q", items))
+
+    def add(self, *, user_id: int) -> None:
+        self._add(user_id)
+
+    def discard(self, *, user_id: int) -> None:
+        self._discard(user_id)
+
+    def after(self, *, user_id: Maybe[int], limit: int) -> List[int]:
+        return self._after(user_id, limit)
+
+    def iter_after(self, *, user_id: Maybe[int]) -> Iterator[int]:
+        return self._iter_after(user_id)
+
+
+class BitmapIndex:
+    """
+    A non unique index for the fields with few distinct values, one bitmap (a bit per integer id) per value,
+    so testing an id is one byte lookup and the ids of a value come in order by walking its bitmap
+    a chunk (read as one big int) at a time, the empty chunks being skipped at once.
+    """
+
+    def __init__(self) -> None:
+        self.__bitmaps: Dict[Hashable, bytearray] = {}
+        self.__counts: Dict[Hashable, int] = {}
+        self.__lock = Lock()
+
+    def add(self, *, key: Hashable, user_id: int) -> None:
+        byte, bit = divmod(user_id, 8)
+        with self.__lock:
+            bitmap = self.__bitmaps.setdefault(key, bytearray())
+            if byte >= len(bitmap):
+                # doubling, so growing with the new ids stays cheap
+                bitmap.extend(bytes(max(byte + 1 - len(bitmap), len(bitmap))))
+            if not bitmap[byte] & (1 << bit):
+                bitmap[byte] |= 1 << bit
+                self.__counts[key] = self.__counts.get(key, 0) + 1
+
+    def discard(self, *, key: Hashable, user_id: int) -> None:
+        byte, bit = divmod(user_id, 8)
+        with self.__lock:
+            bitmap = self.__bitmaps.get(key, bytearray())
+            if byte < len(bitmap) and bitmap[byte] & (1 << bit):
+                bitmap[byte] &= ~(1 << bit) & 0xFF
+                self.__counts[key] -= 1
+
+    def __keys_between(self, *, low: Any, high: Any) -> List[Hashable]:
+        with self.__lock:
+            return [key for key in self.__bitmaps if low <= key <= high]
+
+    def count(self, *, low: Any, high: Any) -> int:
+        return sum(self.__counts[key] for key in self.__keys_between(low=low, high=high))
+
+    def contains(self, *, low: Any, high: Any, user_id: int) -> Maybe[bool]:
+        byte, bit = divmod(user_id, 8)
+        return any(
+            byte < len(self.__bitmaps[key]) and bool(self.__bitmaps[key][byte] & (1 << bit))
+            for key in self.__keys_between(low=low, high=high)
+        )
+
+    def __ids_of(self, *, key: Hashable, after_id: Maybe[int]) -> Iterator[int]:
+        bitmap = self.__bitmaps[key]
+        first_id = after_id + 1 if after_id is not None else 0
+        first_chunk = first_id // 8 // _bitmap_chunk_bytes * _bitmap_chunk_bytes
+        for chunk_start in range(first_chunk, len(bitmap), _bitmap_chunk_bytes):
+            bits = int.from_bytes(bitmap[chunk_start:chunk_start + _bitmap_chunk_bytes], "little")
+            base = chunk_start * 8
+            if base < first_id:
+                bits &= ~((1 << (first_id - base)) - 1)
+            while bits:
+                lowest = bits & -bits
+                yield base + lowest.bit_length() - 1
+                bits ^= lowest
+
+    def ids_after(self, *, low: Any, high: Any, after_id: Maybe[int]) -> Iterator[int]:
+        return merge(*(self.__ids_of(key=key, after_id=after_id) for key in self.__keys_between(low=low, high=high)))
+
+
+class SortedIndex:
+    """
+    A non unique index for the ordered fields, the sorted values each with the SortedIds having it,
+    so counting a range of values or walking its ids (in id order) only touches the values of that range.
+    """
+
+    def __init__(self) -> None:
+        self.__keys: List[Hashable] = []
+        self.__ids: Dict[Hashable, SortedIds] = {}
+        self.__lock = Lock()
+
+    def add(self, *, key: Hashable, user_id: int) -> None:
+        with self.__lock:
+            sorted_ids = self.__ids.get(key, None)
+            if sorted_ids is None:
+                sorted_ids = self.__ids[key] = SortedIds()
+                insort(self.__keys, key)
+        sorted_ids.add(user_id=user_id)
+
+    def discard(self, *, key: Hashable, user_id: int) -> None:
+        # an emptied value is kept, a field has few of them and they come back
+        sorted_ids = self.__ids.get(key, None)
+        if sorted_ids is not None:
+            sorted_ids.discard(user_id=user_id)
+
+    def __keys_between(self, *, low: Any, high: Any) -> List[Hashable]:
+        with self.__lock:
+            return self.__keys[bisect_left(self.__keys, low):bisect_right(self.__keys, high)]
+
+    def count(self, *, low: Any, high: Any) -> int:
+        return sum(len(self.__ids[key]) for key in self.__keys_between(low=low, high=high))
+
+    def contains(self, *, low: Any, high: Any, user_id: int) -> Maybe[bool]:
+        # unknown without reading the user's value
+        return None
+
+    def ids_after(self, *, low: Any, high: Any, after_id: Maybe[int]) -> Iterator[int]:
+        return merge(*(
+            self.__ids[key].iter_after(user_id=after_id) for key in self.__keys_between(low=low, high=high)
+        ))
+
+
+class PrefixIndex:
+    """
+    A non unique index for the string keys searched by prefix, the (key, id) pairs in order,
+    so the keys starting with a prefix are next to each other and a page of them costs a bisection
+    and the page itself (O(log n + k)) whatever the number of keys is.
+    """
+
+    def __init__(self) -> None:
+        self.__pairs = SortedBlocks()
+
+    def add(self, *, key: str, user_id: int) -> None:
+        self.__pairs._add((key, user_id))
+
+    def discard(self, *, key: str, user_id: int) -> None:
+        self.__pairs._discard((key, user_id))
+
+    def prefixed(self, *,
+                 prefix: str,
+                 after_key: Maybe[str],
+                 after_id: Maybe[int],
+                 limit: int) -> List[Tuple[str, int]]:
+        # ids are never negative, so (prefix, -1) is right before the first key having this prefix
+        after = (after_key, after_id if after_id is not None else -1) if after_key is not None else (prefix, -1)
+        if after[0] < prefix:
+            after = (prefix, -1)
+
+        return list(takewhile(lambda pair: pair[0].startswith(prefix), self.__pairs._after(after, limit)))
+
+
+class TrigramIndex:
+    """
+    An inverted index for the fuzzy searches, the SortedIds of every trigram,
+    the key of an id being the (frozen) set of its trigrams.
+
+    The candidates of a search are the ids sharing the most trigrams with it, counted reading the postings
+    of the rarest trigrams first and stopping once `max_postings` ids were read,
+    so a search costs about the same whatever the number of ids is (the very common trigrams, the ones
+    costing the most and telling the least, are the ones left out).
+    """
+
+    def __init__(self, *, max_postings: int = _default_max_postings) -> None:
+        self.__postings: Dict[str, SortedIds] = {}
+        self.__max_postings = max_postings
+        self.__lock = Lock()
+
+    def add(self, *, key: FrozenSet[str], user_id: int) -> None:
+        for trigram in key:
+            postings = self.__postings.get(trigram, None)
+            if postings is None:
+                with self.__lock:
+                    postings = self.__postings.setdefault(trigram, SortedIds())
+            postings.add(user_id=user_id)
+
+    def discard(self, *, key: FrozenSet[str], user_id: int) -> None:
+        # an emptied trigram is kept, the trigrams are a few and come back
+        for trigram in key:
+            postings = self.__postings.get(trigram, None)
+            if postings is not None:
+                postings.discard(user_id=user_id)
+
+    def candidates(self, *, trigrams: FrozenSet[str], limit: int) -> List[int]:
+        postings = sorted(
+            (postings for postings in map(self.__postings.get, trigrams) if postings),
+            key=len
+        )
+        counts: Counter = Counter()
+        budget = self.__max_postings
+        for trigram_postings in postings:
+            if budget <= 0:
+                break
+            counts.update(islice(trigram_postings.iter_after(user_id=None), budget))
+            budget -= len(trigram_postings)
+
+        return [user_id for user_id, _ in counts.most_common(limit)]
+
+
+def _bloom_hashes(key: str) -> Tuple[int, int]:
+    # one digest per key, every position (in every filter) derives from these two (Kirsch-Mitzenmacher)
+    digest = blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """
+    A set of keys answering "maybe" or "certainly not", using about 1.44 * log2(1 / error_rate) bits per key
+    and wrong (a "maybe" for an absent key) at most `error_rate` of the times until `capacity` keys were added.
+    """
+
+    def __init__(self, *, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.__size = max(8, ceil(-capacity * log(error_rate) / (log(2) ** 2)))
+        self.__hashes = max(1, round(self.__size / capacity * log(2)))
+        self.__bits = bytearray((self.__size + 7) // 8)
+        self.count = 0
+
+    def add(self, *, hashes: Tuple[int, int]) -> None:
+        first, second = hashes
+        size, bits = self.__size, self.__bits
+        for i in range(self.__hashes):
+            position = (first + i * second) % size
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def may_contain(self, *, hashes: Tuple[int, int]) -> bool:
+        # most absent keys stop at the first or second bit
+        first, second = hashes
+        size, bits = self.__size, self.__bits
+        for i in range(self.__hashes):
+            position = (first + i * second) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+
+class ScalableBloomFilter:
+    """
+    A BloomFilter growing with its keys, a full filter being followed by a twice as large one
+    with half its error rate, so the overall error rate stays under `error_rate` however many keys are added
+    (Almeida et al.), at the cost of checking every filter (a few, the count of keys doubling each time).
+
+    Keys can't be removed, a removed key stays a "maybe" (the caller falls through to the store)
+    until the filter is rebuilt.
+    """
+
+    def __init__(self, *,
+                 capacity: int = _default_bloom_capacity,
+                 error_rate: float = _default_bloom_error_rate) -> None:
+        self.__filters = [BloomFilter(capacity=capacity, error_rate=error_rate * (1 - _bloom_tightening))]
+        self.__error_rate = error_rate * (1 - _bloom_tightening)
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return sum(bloom_filter.count for bloom_filter in self.__filters)
+
+    @property
+    def filters(self) -> int:
+        return len(self.__filters)
+
+    def add(self, *, key: str) -> None:
+        hashes = _bloom_hashes(key)
+        with self.__lock:
+            # a key already there doesn't take any room
+            if any(bloom_filter.may_contain(hashes=hashes) for bloom_filter in self.__filters):
+                return
+
+            last = self.__filters[-1]
+            if last.count >= last.capacity:
+                self.__error_rate *= _bloom_tightening
+                last = BloomFilter(capacity=last.capacity * _bloom_growth, error_rate=self.__error_rate)
+                self.__filters.append(last)
+            last.add(hashes=hashes)
+
+    def may_contain(self, *, key: str) -> bool:
+        # lock free, a key being added concurrently may still be a "certainly not"
+        hashes = _bloom_hashes(key)
+        return any(bloom_filter.may_contain(hashes=hashes) for bloom_filter in self.__filters)
+
+
+class TimerWheel:
+    """
+    The deadlines of keys in buckets of `tick` seconds (a hashed timing wheel with a bucket for every tick,
+    only the non empty ones being kept), so scheduling, moving or cancelling a key is O(1)
+    and advancing the time costs the expired keys plus the elapsed ticks (the non empty buckets after a long pause),
+    never a scan of the keys still alive. A key expires at most one tick after its deadline.
+    """
+
+    def __init__(self, *, tick: float, now: float) -> None:
+        self.__tick = tick
+        self.__buckets: Dict[int, Set[Hashable]] = {}
+        self.__slots: Dict[Hashable, int] = {}  # key -> its bucket
+        self.__current = floor(now / tick)  # the last bucket emptied
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    def schedule(self, *, key: Hashable, deadline: float) -> None:
+        with self.__lock:
+            # (re)scheduling moves the key, the buckets behind the current one won't be visited again
+            # (read under the lock, an advance meanwhile would leave the key behind it for good)
+            slot = max(ceil(deadline / self.__tick), self.__current + 1)
+            previous = self.__slots.get(key, None)
+            if previous == slot:
+                return
+            if previous is not None:
+                self.__unlink(key=key, slot=previous)
+            self.__slots[key] = slot
+            self.__buckets.setdefault(slot, set()).add(key)
+
+    def cancel(self, *, key: Hashable) -> None:
+        with self.__lock:
+            slot = self.__slots.pop(key, None)
+            if slot is not None:
+                self.__unlink(key=key, slot=slot)
+
+    def __unlink(self, *, key: Hashable, slot: int) -> None:
+        bucket = self.__buckets[slot]
+        bucket.discard(key)
+        if not bucket:
+            del self.__buckets[slot]
+
+    def advance(self, *, now: float) -> List[Hashable]:
+        """
+        The keys whose deadline passed, removed from the wheel.
+        """
+        target = floor(now / self.__tick)
+        with self.__lock:
+            if target <= self.__current:
+                return []
+
+            elapsed = range(self.__current + 1, target + 1)
+            if len(elapsed) > len(self.__buckets):
+                elapsed = sorted(slot for slot in self.__buckets if slot <= target)
+            self.__current = target
+
+            expired: List[Hashable] = []
+            for slot in elapsed:
+                bucket = self.__buckets.pop(slot, None)
+                if bucket is not None:
+                    for key in bucket:
+                        del self.__slots[key]
+                    expired.extend(bucket)
+
+            return expired
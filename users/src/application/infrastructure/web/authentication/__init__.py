@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+from src.application.entity.principal import Principal
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.authentication.signer import HmacSigner
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    Either,
+    Maybe,
+    Tuple
+)
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_default_ttl = 900
+_default_algorithm = "HS256"
+_issuer = "users-service"
+_default_max_reused = 100_000
+
+
+def _checked(*, claims: Dict[str, Any], now: float) -> Maybe[str]:
+    # what's wrong with the claims of a well signed token, if anything
+    if "exp" not in claims or "iat" not in claims:
+        return "Invalid access token, Token is missing the \"exp\" or \"iat\" claim"
+    if not isinstance(claims["exp"], int) or not isinstance(claims["iat"], int):
+        return "Invalid access token, Expiration Time and Issued At claims must be integers"
+    if claims["exp"] < now:
+        return "The access token has expired"
+    if claims.get("iss", None) != _issuer:
+        return "Invalid access token, Invalid issuer"
+    if claims.get("role", None) not in UserRole.__members__:
+        return "Invalid role in the access token"
+
+    return None
+
+
+class JwtKeyring:
+    """
+    The server's signing keys of the access tokens, by key id (the "kid" header of every token),
+    so a token is verified (signature, "exp" and claims) in CPU only with no storage access.
+
+    Rotating makes a new key the signing one while the former ones keep verifying the tokens they signed
+    until these can't be alive anymore (one ttl later), then they're dropped.
+
+    A user logging in again gets the token issued last to them back while it has more than half its ttl left
+    (and their name, email and role, and the signing key, are still the ones in it), so login storms sign
+    nothing new. The last tokens of `max_reused` users are remembered.
+    """
+
+    def __init__(self, *,
+                 keys: Dict[str, str],
+                 active_kid: str,
+                 ttl: int = _default_ttl,
+                 algorithm: str = _default_algorithm,
+                 clock: Callable[[], float] = time,
+                 max_reused: int = _default_max_reused) -> None:
+        if active_kid not in keys:
+            raise ValueError(f"The active key {active_kid} should be one of the keys {list(keys)}")
+
+        self.__ttl = ttl
+        self.__signer = HmacSigner(algorithm=algorithm)
+        self.__clock = clock
+        self.__max_reused = max_reused
+        # user id -> (kid, name, email, role, exp, token), the last token issued to every user
+        self.__issued: 'OrderedDict[str, Tuple[Any, ...]]' = OrderedDict()
+        # kid -> (key, retired_at), the keys retired for longer than a ttl only signed expired tokens
+        self.__keys: Dict[str, Tuple[str, Maybe[float]]] = {kid: (key, None) for kid, key in keys.items()}
+        self.__active_kid = active_kid
+        self.__lock = Lock()
+
+    @classmethod
+    def of(cls, *, keys: str, ttl: int = _default_ttl) -> 'JwtKeyring':
+        # from "kid1:secret1,kid2:secret2", the last one signing
+        pairs = [pair.split(":", 1) for pair in keys.split(",") if pair.strip()]
+        if not pairs or any(len(pair) != 2 or not all(pair) for pair in pairs):
+            raise ValueError("The keys should look like kid1:secret1,kid2:secret2")
+
+        return cls(keys={kid.strip(): key for kid, key in pairs}, active_kid=pairs[-1][0].strip(), ttl=ttl)
+
+    @property
+    def active_kid(self) -> str:
+        return self.__active_kid
+
+    def rotate(self, *, kid: str, key: str) -> None:
+        with self.__lock:
+            now = self.__clock()
+            keys = {
+                known_kid: (known_key, retired_at)
+                for known_kid, (known_key, retired_at) in self.__keys.items()
+                if retired_at is None or retired_at + self.__ttl > now
+            }
+            keys[self.__active_kid] = (keys[self.__active_kid][0], now)
+            keys[kid] = (key, None)
+            # replaced at once, the lock free readers see either of them
+            self.__keys = keys
+            self.__active_kid = kid
+
+    def __reusable(self, *, user: ApplicationUser, kid: str) -> Maybe[str]:
+        with self.__lock:
+            issued = self.__issued.get(user.id, None)
+            if issued is None or issued[:4] != (kid, user.name, user.email, user.role.name):
+                return None
+            if issued[4] - self.__clock() <= self.__ttl / 2:
+                return None
+
+            self.__issued.move_to_end(user.id)
+            return issued[5]
+
+    def __remember(self, *, user: ApplicationUser, kid: str, exp: int, token: str) -> None:
+        with self.__lock:
+            self.__issued[user.id] = (kid, user.name, user.email, user.role.name, exp, token)
+            self.__issued.move_to_end(user.id)
+            while len(self.__issued) > self.__max_reused:
+                self.__issued.popitem(last=False)
+
+    def issue(self, *, user: ApplicationUser) -> AccessToken:
+        kid = self.__active_kid
+        token = self.__reusable(user=user, kid=kid)
+        if token is not None:
+            return AccessToken(token=token)
+
+        now = int(self.__clock())
+        token = self.__signer.sign(
+            claims=dict(
+                iss=_issuer,
+                sub=user.name,
+                uid=user.id,
+                email=user.email,
+                role=user.role.name,
+                iat=now,
+                exp=now + self.__ttl
+            ),
+            key=self.__keys[kid][0],
+            kid=kid
+        )
+        self.__remember(user=user, kid=kid, exp=now + self.__ttl, token=token)
+        return AccessToken(token=token)
+
+    def owns(self, *, token: str) -> bool:
+        # the tokens of this keyring have a kid, the stored ones (signed with a key of the server's own) don't
+        header = HmacSigner.header(token=token)
+        return header is not None and "kid" in header
+
+    def verify(self, *, token: str) -> Either[Failure, Principal]:
+        kid = (HmacSigner.header(token=token) or {}).get("kid", None)
+        signing_key = self.__keys.get(kid, None)
+        if signing_key is None or (
+                signing_key[1] is not None and signing_key[1] + self.__ttl <= self.__clock()
+        ):
+            return Failure(error=f"Unknown access token key {kid}")
+
+        claims = self.__signer.verify(token=token, key=signing_key[0])
+        if isinstance(claims, Failure):
+            return Failure(error=f"Invalid access token, {claims.error}")
+        claims_error = _checked(claims=claims, now=self.__clock())
+        if claims_error is not None:
+            return Failure(error=claims_error)
+
+        try:
+            return Principal(
+                id=claims["uid"],
+                name=claims["sub"],
+                email=claims.get("email", None),
+                role=UserRole[claims["role"]],
+                expires_at=claims["exp"]
+            )
+        except KeyError as ex:
+            return Failure(error=f"Invalid access token, {ex}")
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from hmac import compare_digest
+from threading import Lock
+from time import monotonic, time
+
+from src.application.entity.cache_stats import CacheStats
+from src.application.entity.principal import Principal
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    Maybe
+)
+
+_default_max_size = 10_000
+_default_ttl = 60.0
+
+
+def _digest(token: str) -> bytes:
+    # the tokens themselves aren't kept around
+    return blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+class PrincipalCache:
+    """
+    The principals already authenticated, by username (the digest of their token kept along), so a request
+    repeating the headers of a previous one is authenticated by one dict probe.
+
+    An entry lives at most `ttl` seconds (and never past the expiry of its token), the least recently used one
+    making room for a new one. The ids and emails of the cached principals are indexed too, so writing a user
+    by any of them drops its entry.
+    """
+
+    def __init__(self, *,
+                 max_size: int = _default_max_size,
+                 ttl: float = _default_ttl,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries: 'OrderedDict[str, Any]' = OrderedDict()  # name -> (digest, principal, expires_at)
+        self.__names: Dict[str, Dict[str, str]] = dict(id={}, email={})  # id or email -> name
+        self.__lock = Lock()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    def get(self, *, username: str, token: str) -> Maybe[Principal]:
+        with self.__lock:
+            entry = self.__entries.get(username, None)
+            if entry is not None and entry[2] <= self.__clock():
+                self.__unlink(name=username)
+                self.__expirations += 1
+                entry = None
+            if entry is None or not compare_digest(entry[0], _digest(token)):
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(username)
+            self.__hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        # taken before authenticating, see put
+        with self.__lock:
+            return self.__generation
+
+    def put(self, *, username: str, token: str, principal: Principal, generation: int) -> bool:
+        """
+        Keeps the principal unless an invalidation happened since `generation` was taken
+        (it may have been read from the user as it was before a write).
+        """
+        ttl = self.__ttl if principal.expires_at is None else min(self.__ttl, principal.expires_at - time())
+        with self.__lock:
+            if generation != self.__generation or ttl <= 0:
+                return False
+
+            if username in self.__entries:
+                self.__unlink(name=username)
+            self.__entries[username] = (_digest(token), principal, self.__clock() + ttl)
+            self.__names["id"][principal.id] = username
+            if principal.email is not None:
+                self.__names["email"][principal.email] = username
+            while len(self.__entries) > self.__max_size:
+                self.__unlink(name=next(iter(self.__entries)))
+                self.__evictions += 1
+
+            return True
+
+    def invalidate(self, *, selector: str, value: str) -> None:
+        with self.__lock:
+            self.__generation += 1
+            name = value if selector == "name" else self.__names.get(selector, {}).get(value, None)
+            if name is not None and name in self.__entries:
+                self.__unlink(name=name)
+                self.__invalidations += 1
+
+    def __unlink(self, *, name: str) -> None:
+        _, principal, _ = self.__entries.pop(name)
+        if self.__names["id"].get(principal.id, None) == name:
+            del self.__names["id"][principal.id]
+        if principal.email is not None and self.__names["email"].get(principal.email, None) == name:
+            del self.__names["email"][principal.email]
+
+    @property
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                expirations=self.__expirations,
+                invalidations=self.__invalidations,
+                size=len(self.__entries),
+                max_size=self.__max_size
+            )
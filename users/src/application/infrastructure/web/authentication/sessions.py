@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from hashlib import sha256
+from hmac import compare_digest
+from secrets import token_urlsafe
+from threading import Lock
+from time import monotonic
+
+from src.application.entity.principal import Principal
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.structures import TimerWheel
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    Either,
+    Tuple
+)
+from src.domain.entity.failure import Failure
+
+_token_bytes = 32
+_token_length = 43  # 32 bytes, base64 without padding
+_default_ttl = 3600.0
+_default_tick = 1.0
+_default_max_per_user = 16
+
+
+def _split(*, token: str) -> Tuple[bytes, bytes]:
+    # the first half of the token's digest finds the session, the second one is compared in constant time
+    digest = sha256(token.encode("utf-8")).digest()
+    return digest[:16], digest[16:]
+
+
+def _principal_of(*, user: ApplicationUser) -> Principal:
+    # the sessions slide, they have no expiry of their own to tell
+    return Principal(id=user.id, name=user.name, email=user.email, role=user.role, expires_at=None)
+
+
+class SessionStore:
+    """
+    Opaque access tokens (256 random bits) authenticated from the token alone by one dict probe, a user having
+    as many sessions as logins (logging in somewhere else doesn't end the other sessions).
+
+    Only digests of the tokens are kept, indexed by half of them, the other half being compared in constant time.
+    A session ends `ttl` seconds after its login (after its last use when sliding), the deadlines being kept in a
+    TimerWheel swept along the calls, and a user keeps its `max_per_user` most recent sessions.
+
+    The sessions live in this process only, so it's for one worker.
+    """
+
+    def __init__(self, *,
+                 ttl: float = _default_ttl,
+                 sliding: bool = True,
+                 tick: float = _default_tick,
+                 max_per_user: int = _default_max_per_user,
+                 clock: Callable[[], float] = monotonic) -> None:
+        self.__ttl = ttl
+        self.__sliding = sliding
+        self.__max_per_user = max_per_user
+        self.__clock = clock
+        self.__sessions: Dict[bytes, Any] = {}  # key -> [verifier, principal, deadline]
+        self.__users: Dict[str, 'OrderedDict[bytes, None]'] = {}  # user id -> its session keys, oldest first
+        self.__ids: Dict[str, Dict[str, str]] = dict(name={}, email={})  # name or email -> user id
+        self.__wheel = TimerWheel(tick=tick, now=clock())
+        self.__lock = Lock()
+
+    @staticmethod
+    def owns(*, token: str) -> bool:
+        # the other tokens are JWTs, always dotted
+        return len(token) == _token_length and "." not in token
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+    def issue(self, *, user: ApplicationUser) -> AccessToken:
+        token = token_urlsafe(_token_bytes)
+        key, verifier = _split(token=token)
+        with self.__lock:
+            self.__sweep()
+            deadline = self.__clock() + self.__ttl
+            self.__sessions[key] = [verifier, _principal_of(user=user), deadline]
+            self.__wheel.schedule(key=key, deadline=deadline)
+            self.__index(user=user)
+            user_sessions = self.__users.setdefault(user.id, OrderedDict())
+            user_sessions[key] = None
+            while len(user_sessions) > self.__max_per_user:
+                self.__end(key=next(iter(user_sessions)))
+
+        return AccessToken(token=token)
+
+    def authenticate(self, *, token: str) -> Either[Failure, Principal]:
+        key, verifier = _split(token=token)
+        with self.__lock:
+            self.__sweep()
+            session = self.__sessions.get(key, None)
+            if session is None or not compare_digest(session[0], verifier) or session[2] <= self.__clock():
+                return Failure(error="Invalid access token")
+
+            if self.__sliding:
+                session[2] = self.__clock() + self.__ttl
+                self.__wheel.schedule(key=key, deadline=session[2])
+            return session[1]
+
+    def revoke(self, *, token: str) -> bool:
+        key, verifier = _split(token=token)
+        with self.__lock:
+            session = self.__sessions.get(key, None)
+            if session is None or not compare_digest(session[0], verifier):
+                return False
+
+            self.__end(key=key)
+            return True
+
+    def refresh(self, *, user: ApplicationUser) -> None:
+        # the sessions of an updated user go on as the user it is now
+        with self.__lock:
+            user_sessions = self.__users.get(user.id, None)
+            if user_sessions is None:
+                return
+
+            self.__unindex(principal=self.__sessions[next(iter(user_sessions))][1])
+            self.__index(user=user)
+            principal = _principal_of(user=user)
+            for key in user_sessions:
+                self.__sessions[key][1] = principal
+
+    def revoke_user(self, *, selector: str, value: str) -> int:
+        # ends all the sessions of a user (selected by its id, name or email), returning their count
+        with self.__lock:
+            user_id = value if selector == "id" else self.__ids.get(selector, {}).get(value, None)
+            user_sessions = list(self.__users.get(user_id, None) or ())
+            for key in user_sessions:
+                self.__end(key=key)
+
+            return len(user_sessions)
+
+    def __index(self, *, user: ApplicationUser) -> None:
+        self.__ids["name"][user.name] = user.id
+        if user.email is not None:
+            self.__ids["email"][user.email] = user.id
+
+    def __unindex(self, *, principal: Principal) -> None:
+        if self.__ids["name"].get(principal.name, None) == principal.id:
+            del self.__ids["name"][principal.name]
+        if principal.email is not None and self.__ids["email"].get(principal.email, None) == principal.id:
+            del self.__ids["email"][principal.email]
+
+    def __end(self, *, key: bytes) -> None:
+        _, principal, _ = self.__sessions.pop(key)
+        self.__wheel.cancel(key=key)
+        user_sessions = self.__users[principal.id]
+        del user_sessions[key]
+        if not user_sessions:
+            del self.__users[principal.id]
+            self.__unindex(principal=principal)
+
+    def __sweep(self) -> None:
+        # costs nothing until a tick passed, then only the sessions due (the slid ones being scheduled again)
+        now = self.__clock()
+        for key in self.__wheel.advance(now=now):
+            session = self.__sessions.get(key, None)
+            if session is None:
+                continue
+            if session[2] <= now:
+                self.__end(key=key)
+            else:
+                self.__wheel.schedule(key=key, deadline=session[2])
@@ -0,0 +1,127 @@
+import hashlib
+import hmac
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from secrets import token_urlsafe
+from threading import Lock
+
+from src.application.types import (
+    Any,
+    Dict,
+    Either,
+    Maybe
+)
+from src.domain.entity.failure import Failure
+
+_digests = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_default_max_keys = 1024
+
+
+def _b64_encode(data: bytes) -> bytes:
+    return urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64_decode(segment: str) -> bytes:
+    return urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class HmacSigner:
+    """
+    Signs and verifies compact HMAC JWTs (the same tokens PyJWT makes and reads) without redoing their constant parts:
+    a key's HMAC context is set up once and copied for every token, and the header segment of every kid
+    is encoded once.
+
+    The contexts of the `max_keys` most recently used keys are kept.
+    """
+
+    def __init__(self, *, algorithm: str = "HS256", max_keys: int = _default_max_keys) -> None:
+        if algorithm not in _digests:
+            raise ValueError(f"algorithm should be within this list {list(_digests)}")
+
+        self.__algorithm = algorithm
+        self.__digest = _digests[algorithm]
+        self.__max_keys = max_keys
+        self.__contexts: 'OrderedDict[str, Any]' = OrderedDict()
+        self.__headers: Dict[Maybe[str], bytes] = {}
+        self.__lock = Lock()
+
+    def __context_of(self, *, key: str) -> Any:
+        with self.__lock:
+            context = self.__contexts.get(key, None)
+            if context is None:
+                context = self.__contexts[key] = hmac.new(key.encode("utf-8"), digestmod=self.__digest)
+                if len(self.__contexts) > self.__max_keys:
+                    self.__contexts.popitem(last=False)
+            else:
+                self.__contexts.move_to_end(key)
+
+            return context.copy()
+
+    def __header_of(self, *, kid: Maybe[str]) -> bytes:
+        header = self.__headers.get(kid, None)
+        if header is None:
+            fields = dict(typ="JWT", alg=self.__algorithm)
+            if kid is not None:
+                fields["kid"] = kid
+            # a race only encodes the same header twice
+            header = self.__headers[kid] = _b64_encode(json.dumps(fields, separators=(",", ":")).encode("utf-8"))
+
+        return header
+
+    def sign(self, *, claims: Dict[str, Any], key: str, kid: Maybe[str] = None) -> str:
+        signing_input = self.__header_of(kid=kid) + b"." + _b64_encode(
+            json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        )
+        context = self.__context_of(key=key)
+        context.update(signing_input)
+        return (signing_input + b"." + _b64_encode(context.digest())).decode("ascii")
+
+    @staticmethod
+    def header(*, token: str) -> Maybe[Dict[str, Any]]:
+        # unverified, only to tell which key signed the token
+        try:
+            header = json.loads(_b64_decode(token.split(".", 1)[0]))
+            return header if isinstance(header, dict) else None
+        except ValueError:
+            return None
+
+    def verify(self, *, token: str, key: str) -> Either[Failure, Dict[str, Any]]:
+        # the claims of a well signed token, checking them (expiry, issuer...) is up to the caller
+        segments = token.split(".")
+        if len(segments) != 3:
+            return Failure(error="Not enough segments")
+
+        try:
+            header = json.loads(_b64_decode(segments[0]))
+            signature = _b64_decode(segments[2])
+            signing_input = token.rsplit(".", 1)[0].encode("ascii")
+        except ValueError:
+            return Failure(error="Invalid header or signature padding")
+        if not isinstance(header, dict) or header.get("alg", None) != self.__algorithm:
+            return Failure(error="The specified alg value is not allowed")
+
+        context = self.__context_of(key=key)
+        context.update(signing_input)
+        if not hmac.compare_digest(context.digest(), signature):
+            return Failure(error="Signature verification failed")
+
+        try:
+            claims = json.loads(_b64_decode(segments[1]))
+        except ValueError:
+            return Failure(error="Invalid payload")
+
+        return claims if isinstance(claims, dict) else Failure(error="Invalid payload")
+
+
+# the one signing the stored access tokens of every persistence (by a key of the server's own)
+stored_token_signer = HmacSigner()
+_stored_token_key = token_urlsafe(32)
+
+
+def stored_token_of(*, username: str) -> str:
+    # only ever compared to the stored one, the random jti keeps it from being made again out of the user's data
+    return stored_token_signer.sign(
+        claims={"username": username, "jti": token_urlsafe(16)},
+        key=_stored_token_key
+    )
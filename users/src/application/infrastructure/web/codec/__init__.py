@@ -0,0 +1,87 @@
+from abc import ABCMeta, abstractmethod
+from dataclasses import fields, is_dataclass
+from typing import Union, get_args, get_origin
+
+from src.application.types import (
+    Any,
+    Callable,
+    Dict,
+    Enum,
+    Maybe,
+    SimpleConfig
+)
+
+# entity class -> its encoder
+_entity_encoders: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _is_enum(field_type: Any) -> bool:
+    return isinstance(field_type, type) and issubclass(field_type, Enum)
+
+
+def _encoder_of(*, entity_type: type) -> Callable[[Any], Dict[str, Any]]:
+    # made once for every entity class, which of its fields are roles (maybe None) being known beforehand
+    entity_fields = tuple(
+        (
+            field.name,
+            _is_enum(field.type) or (
+                get_origin(field.type) is Union and any(_is_enum(argument) for argument in get_args(field.type))
+            )
+        )
+        for field in fields(entity_type)
+    )
+
+    def encode(value: Any) -> Dict[str, Any]:
+        encoded = {}
+        for name, is_enum in entity_fields:
+            field_value = getattr(value, name)
+            encoded[name] = field_value.name if is_enum and field_value is not None else field_value
+
+        return encoded
+
+    _entity_encoders[entity_type] = encode
+    return encode
+
+
+def plain(value: Any) -> Any:
+    """
+    The JSON shape of what json can't encode by itself: an entity as its fields (without going through its as_dict),
+    an enum (the roles) as its name. The nested entities are left to the encoder, which comes back here for them.
+    """
+    encoder = _entity_encoders.get(type(value), None)
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, Enum):
+        return value.name
+    if is_dataclass(value):
+        return _encoder_of(entity_type=type(value))(value)
+    # Success isn't a dataclass
+    if hasattr(value, "as_dict"):
+        return value.as_dict()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodecInterface(metaclass=ABCMeta):
+    @abstractmethod
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig]) -> None: pass
+
+    @abstractmethod
+    def encode(self, *,
+               value: Any) -> bytes: pass
+
+    @abstractmethod
+    def decode(self, *,
+               data: bytes) -> Any: pass
+
+
+def default_json_codec() -> JsonCodecInterface:
+    # orjson when it's installed, the standard library otherwise
+    try:
+        from src.application.infrastructure.web.codec.orjson import OrjsonCodec
+    except ImportError:
+        from src.application.infrastructure.web.codec.stdlib import StdlibJsonCodec
+        return StdlibJsonCodec(config=None)
+
+    return OrjsonCodec(config=None)
@@ -0,0 +1,25 @@
+import orjson
+
+from src.application.infrastructure.web.codec import JsonCodecInterface, plain
+from src.application.types import (
+    Any,
+    Maybe,
+    SimpleConfig
+)
+
+
+class OrjsonCodec(JsonCodecInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        """
+        orjson would encode the entities by itself but their roles by value, so they're passed through to plain
+        (which only picks their fields, orjson encoding the rest). A role outside of an entity is still encoded
+        by value, orjson never handing the enums over.
+        """
+        self.__options = orjson.OPT_PASSTHROUGH_DATACLASS
+        super().__init__(config=config)
+
+    def encode(self, *, value: Any) -> bytes:
+        return orjson.dumps(value, default=plain, option=self.__options)
+
+    def decode(self, *, data: bytes) -> Any:
+        return orjson.loads(data)
@@ -0,0 +1,28 @@
+import json
+
+from src.application.infrastructure.web.codec import JsonCodecInterface, plain
+from src.application.types import (
+    Any,
+    Maybe,
+    SimpleConfig
+)
+
+
+class StdlibJsonCodec(JsonCodecInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig]) -> None:
+        # the same output as starlette's JSONResponse
+        self.__encoder = json.JSONEncoder(
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=plain
+        )
+        self.__decoder = json.JSONDecoder()
+        super().__init__(config=config)
+
+    def encode(self, *, value: Any) -> bytes:
+        return self.__encoder.encode(value).encode("utf-8")
+
+    def decode(self, *, data: bytes) -> Any:
+        return self.__decoder.decode(data.decode("utf-8"))
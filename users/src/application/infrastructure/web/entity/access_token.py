@@ -1,10 +1,12 @@
 import marshmallow_dataclass
 
-from src.application.types import dataclass, Dict
+from src.application.types import dataclass, Dict, FrozenSlots
 
 
 @dataclass(frozen=True)
-class AccessToken:
+class AccessToken(FrozenSlots):
+    __slots__ = ("token",)
+
     token: str
 
     def as_dict(self) -> Dict[str, str]:
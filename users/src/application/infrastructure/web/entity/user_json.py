@@ -5,12 +5,15 @@ from src.application.types import (
     Maybe,
     Dict,
     Any,
-    dataclass
+    dataclass,
+    FrozenSlots
 )
 
 
 @dataclass(frozen=True)
-class UserJson:
+class UserJson(FrozenSlots):
+    __slots__ = ("id", "name", "age", "email", "role")
+
     id: str
     name: str
     age: int
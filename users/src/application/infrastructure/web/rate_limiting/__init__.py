@@ -0,0 +1,61 @@
+from time import monotonic
+
+from src.application.entity.rate_limit_stats import RateLimitStats
+from src.application.types import (
+    Callable,
+    Dict,
+    Maybe,
+    SimpleConfig
+)
+from src.application.utilities.token_buckets import TokenBuckets
+
+_default_policies = dict(
+    # a login checks a password (the costly part of the service), a brute force gets 5 tries then one every 5 seconds
+    login=dict(rate=0.2, burst=5),
+    requests=dict(rate=50.0, burst=100),
+    callers=dict(rate=50.0, burst=100)
+)
+_default_max_buckets = 100_000
+_default_shards = 16
+
+
+class RateLimiter:
+    def __init__(self, *, config: Maybe[SimpleConfig], clock: Callable[[], float] = monotonic) -> None:
+        """
+        config as {"login": {"rate": 0.2, "burst": 5}, "requests": {"rate": 50.0, "burst": 100},
+                   "callers": {"rate": 50.0, "burst": 100}, "max_buckets": 100000, "shards": 16}
+
+        Every request takes a "requests" token of its client (by its IP), and once authenticated a "callers" one
+        of its caller, so a forged username header costs nothing to that user. A login also takes a "login" token
+        of its username from this client, the brute force of a password being throttled without anybody else
+        being able to stop its user from logging in (from another IP).
+        Each policy keeps at most `max_buckets` buckets, the idle ones being dropped first.
+        """
+        config = config or {}
+        self.__buckets: Dict[str, TokenBuckets] = {
+            policy: TokenBuckets(
+                **{**default, **(config.get(policy, None) or {})},
+                max_buckets=config.get("max_buckets", _default_max_buckets),
+                shards=config.get("shards", _default_shards),
+                clock=clock
+            )
+            for policy, default in _default_policies.items()
+        }
+
+    def retry_after(self, *, client: Maybe[str], login_username: Maybe[str] = None) -> float:
+        """
+        0 when the request can go on, otherwise the seconds after which it may.
+        """
+        wait = self.__buckets["requests"].take(key=("client", client)) if client is not None else 0.0
+        if wait == 0.0 and login_username is not None:
+            wait = self.__buckets["login"].take(key=(login_username, client))
+
+        return wait
+
+    def caller_retry_after(self, *, username: str) -> float:
+        # for an authenticated caller only
+        return self.__buckets["callers"].take(key=username)
+
+    @property
+    def stats(self) -> Dict[str, RateLimitStats]:
+        return {policy: buckets.stats for policy, buckets in self.__buckets.items()}
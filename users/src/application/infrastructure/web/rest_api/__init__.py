@@ -3,6 +3,7 @@ from abc import ABCMeta, abstractmethod
 from src.application.entity.service import Service
 from src.application.infrastructure.web.entity.json import _A, JsonEntity
 from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rate_limiting import RateLimiter
 from src.application.infrastructure.web.validation import JsonValidatorInterface
 from src.application.types import (
     Maybe,
@@ -14,9 +15,16 @@ from src.application.types import (
 )
 from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
 from src.application.usecase.user.add_user import AddUserUseCase
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
 from src.application.usecase.user.delete_user import DeleteUserUseCase
 from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
 from src.application.usecase.user.fetch_user import FetchUserUseCase
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.application.usecase.user.list_users import ListUsersUseCase
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase
 from src.application.usecase.user.update_user import UpdateUserUseCase
 
 
@@ -26,10 +34,29 @@ class RestApiInterface(metaclass=ABCMeta):
                  config: Maybe[SimpleConfig],
                  host: str,
                  port: int,
-                 routes: List[Route]) -> None:
+                 routes: List[Route],
+                 fetch_access_token_usecase: Maybe[FetchAccessTokenUseCase] = None,
+                 rate_limiter: Maybe[RateLimiter] = None) -> None:
+        # the middlewares registered last run first: the clients are throttled before the authentication,
+        # the callers once authenticated
+        if rate_limiter is not None and fetch_access_token_usecase is not None:
+            self.register_caller_rate_limiting(rate_limiter=rate_limiter)
+        if fetch_access_token_usecase is not None:
+            self.register_authentication(fetch_access_token_usecase=fetch_access_token_usecase)
+        if rate_limiter is not None:
+            self.register_rate_limiting(rate_limiter=rate_limiter, routes=routes)
         self.register_endpoints(routes=routes)
         self.register_generated_openid_docs(host=host, port=port)
 
+    @abstractmethod
+    def register_authentication(self, *, fetch_access_token_usecase: FetchAccessTokenUseCase) -> None: pass
+
+    @abstractmethod
+    def register_rate_limiting(self, *, rate_limiter: RateLimiter, routes: List[Route]) -> None: pass
+
+    @abstractmethod
+    def register_caller_rate_limiting(self, *, rate_limiter: RateLimiter) -> None: pass
+
     @abstractmethod
     def register_endpoints(self, *, routes: List[Route]) -> None: pass
 
@@ -76,8 +103,64 @@ class RestApiInterface(metaclass=ABCMeta):
     @classmethod
     @abstractmethod
     def get_user(cls, *,
-                 fetch_user_usecase: FetchUserUseCase,
-                 fetch_access_token_usecase: FetchAccessTokenUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+                 fetch_user_usecase: FetchUserUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def list_users(cls, *,
+                   list_users_usecase: ListUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def check_user_availability(cls, *,
+                                check_user_availability_usecase: CheckUserAvailabilityUseCase
+                                ) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def suggest_users(cls, *,
+                      suggest_users_usecase: SuggestUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def search_users(cls, *,
+                     search_users_usecase: SearchUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def search_users_by_prefix(cls, *,
+                               search_users_by_prefix_usecase: SearchUsersByPrefixUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def lookup_users(cls, *,
+                     fetch_users_usecase: FetchUsersUseCase,
+                     json_schema: Dict[str, Any],
+                     json_schema_validator: JsonValidatorInterface) -> Callable[..., JsonEntity.of(_type=_A)]:
         @abstractmethod
         def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
 
@@ -87,8 +170,6 @@ class RestApiInterface(metaclass=ABCMeta):
     @abstractmethod
     def update_user(cls, *,
                     update_user_usecase: UpdateUserUseCase,
-                    fetch_user_usecase: FetchUserUseCase,
-                    fetch_access_token_usecase: FetchAccessTokenUseCase,
                     json_schema: Dict[str, Any],
                     json_schema_validator: JsonValidatorInterface) -> Callable[..., JsonEntity.of(_type=_A)]:
         @abstractmethod
@@ -99,9 +180,16 @@ class RestApiInterface(metaclass=ABCMeta):
     @classmethod
     @abstractmethod
     def delete_user(cls, *,
-                    delete_user_usecase: DeleteUserUseCase,
-                    fetch_user_usecase: FetchUserUseCase,
-                    fetch_access_token_usecase: FetchAccessTokenUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+                    delete_user_usecase: DeleteUserUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @abstractmethod
+        def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
+
+        return wrapper
+
+    @classmethod
+    @abstractmethod
+    def bulk_add_users(cls, *,
+                       bulk_add_users_usecase: BulkAddUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
         @abstractmethod
         def wrapper(*args, **kwargs) -> JsonEntity.of(_type=_A): pass
 
@@ -109,3 +197,12 @@ class RestApiInterface(metaclass=ABCMeta):
 
     @abstractmethod
     def run(self, *, host: str, port: int, debug: bool, workers: int) -> None: pass
+
+    @classmethod
+    @abstractmethod
+    def serve(cls, *,
+              app_factory: Callable[[], Any],
+              host: str,
+              port: int,
+              debug: bool,
+              workers: int) -> None: pass
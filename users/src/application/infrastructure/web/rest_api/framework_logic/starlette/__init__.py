@@ -1,4 +1,8 @@
-import os
+import signal
+import socket
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from threading import Event
 from typing import Callable, List
 
 import marshmallow_dataclass
@@ -7,16 +11,26 @@ import yaml
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from starlette.applications import Starlette
+from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 from starlette_apispec import APISpecSchemaGenerator
 from swagger_ui import api_doc
 
 from src.application.entity.service import Service
+from src.application.infrastructure.web.codec import JsonCodecInterface
 from src.application.infrastructure.web.entity.json import JsonEntity, _A
 from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rate_limiting import RateLimiter
 from src.application.infrastructure.web.rest_api import RestApiInterface
 from src.application.infrastructure.web.rest_api.common_logic.health_check import health_check as health_check_common
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import AccessTokenBackend
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.bulk_add_users import (
+    bulk_add_users as bulk_add_users_framework
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.check_user_availability import (
+    check_user_availability as check_user_availability_framework
+)
 from src.application.infrastructure.web.rest_api.framework_logic.starlette.delete_user import (
     delete_user as delete_user_framework
 )
@@ -26,9 +40,33 @@ from src.application.infrastructure.web.rest_api.framework_logic.starlette.get_a
 from src.application.infrastructure.web.rest_api.framework_logic.starlette.get_user import (
     get_user as get_user_framework
 )
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import (
+    JsonResponse,
+    json_body,
+    use_json_codec
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.list_users import (
+    list_users as list_users_framework
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.lookup_users import (
+    lookup_users as lookup_users_framework
+)
 from src.application.infrastructure.web.rest_api.framework_logic.starlette.post_user import (
     post_user as post_user_framework
 )
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.rate_limiting import (
+    CallerRateLimitMiddleware,
+    RateLimitMiddleware
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.search_users import (
+    search_users as search_users_framework
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.search_users_by_prefix import (
+    search_users_by_prefix as search_users_by_prefix_framework
+)
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.suggest_users import (
+    suggest_users as suggest_users_framework
+)
 from src.application.infrastructure.web.rest_api.framework_logic.starlette.update_user import (
     update_user as update_user_framework
 )
@@ -42,11 +80,17 @@ from src.application.types import (
 )
 from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
 from src.application.usecase.user.add_user import AddUserUseCase
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
 from src.application.usecase.user.delete_user import DeleteUserUseCase
 from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
 from src.application.usecase.user.fetch_user import FetchUserUseCase
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.application.usecase.user.list_users import ListUsersUseCase
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase
 from src.application.usecase.user.update_user import UpdateUserUseCase
-from src.application.utilities.functions import exception_handler
 from src.domain.entity.user import DomainUser
 
 
@@ -55,7 +99,21 @@ class StarletteRestApi(RestApiInterface):
                  config: Maybe[SimpleConfig],
                  host: str,
                  port: int,
-                 routes: List[Route]) -> None:
+                 routes: List[Route],
+                 fetch_access_token_usecase: Maybe[FetchAccessTokenUseCase] = None,
+                 rate_limiter: Maybe[RateLimiter] = None,
+                 json_codec: Maybe[JsonCodecInterface] = None) -> None:
+        """
+        With a fetch access token usecase, the caller of every request is authenticated by a middleware
+        (the handlers only authorizing it).
+
+        With a rate limiter, the requests are throttled by client in front of everything else (the routes of
+        get_access_token being throttled as logins too), and by caller right after the authentication.
+
+        The request bodies and the responses go through the json codec, orjson's one by default when it's installed.
+        """
+        if json_codec is not None:
+            use_json_codec(json_codec=json_codec)
         self.__app = Starlette()
         self.__open_api_schema = APISpecSchemaGenerator(
             APISpec(
@@ -66,13 +124,16 @@ class StarletteRestApi(RestApiInterface):
                 plugins=[MarshmallowPlugin()]
             )
         )
-        super().__init__(config=config, host=host, port=port, routes=routes)
+        super().__init__(
+            config=config,
+            host=host,
+            port=port,
+            routes=routes,
+            fetch_access_token_usecase=fetch_access_token_usecase,
+            rate_limiter=rate_limiter
+        )
 
     def register_generated_openid_docs(self, *, host: str, port: int) -> None:
-        cur_dir = os.path.dirname(os.path.abspath(__file__))
-        schema_yaml_file_name = 'open_api.yaml'
-        schema_yaml_file_path = os.path.join(cur_dir, f'./{schema_yaml_file_name}')
-
         self.__app.add_route(
             path="/schema",
             route=self.open_api_schema(),
@@ -80,22 +141,23 @@ class StarletteRestApi(RestApiInterface):
             include_in_schema=False
         )
 
-        @exception_handler
-        @self.__app.on_event("shutdown")
-        def shutdown() -> None:
-            os.remove(schema_yaml_file_path)
-
         yaml_open_api_schema = yaml.dump(
             self.__open_api_schema.get_schema(routes=self.__app.routes),
             default_flow_style=False
         )
 
-        with open(schema_yaml_file_path, 'w') as writer:
-            writer.write("servers:\n"
-                         f"- url: http://{host}:{port}\n")
-            writer.write(yaml_open_api_schema)
+        # kept in memory, nothing is written next to the package (nor left behind by a worker that didn't shut down)
+        api_doc(
+            self.__app,
+            config_spec="servers:\n"
+                        f"- url: http://{host}:{port}\n"
+                        f"{yaml_open_api_schema}",
+            url_prefix="/swagger.io/docs"
+        )
 
-        api_doc(self.__app, config_path=schema_yaml_file_path, url_prefix="/swagger.io/docs")
+    @property
+    def app(self) -> Starlette:
+        return self.__app
 
     def open_api_schema(self) -> Callable[..., Any]:
         async def wrapper(request: Request) -> Any:
@@ -103,6 +165,22 @@ class StarletteRestApi(RestApiInterface):
 
         return wrapper
 
+    def register_authentication(self, *, fetch_access_token_usecase: FetchAccessTokenUseCase) -> None:
+        self.__app.add_middleware(
+            AuthenticationMiddleware,
+            backend=AccessTokenBackend(fetch_access_token_usecase=fetch_access_token_usecase)
+        )
+
+    def register_rate_limiting(self, *, rate_limiter: RateLimiter, routes: List[Route]) -> None:
+        self.__app.add_middleware(
+            RateLimitMiddleware,
+            rate_limiter=rate_limiter,
+            login_paths={route.url for route in routes if route.handler == StarletteRestApi.get_access_token}
+        )
+
+    def register_caller_rate_limiting(self, *, rate_limiter: RateLimiter) -> None:
+        self.__app.add_middleware(CallerRateLimitMiddleware, rate_limiter=rate_limiter)
+
     def register_endpoints(self, *, routes: List[Route]) -> None:
         def get_proper_handler_args(_route: Route) -> Route.handler:
             return (
@@ -121,7 +199,7 @@ class StarletteRestApi(RestApiInterface):
 
     @classmethod
     def health_check(cls, *, services: List[Service]) -> Callable[..., JsonEntity.of(_type=_A)]:
-        async def wrapper(_request: Request) -> JSONResponse:
+        async def wrapper(_request: Request) -> JsonResponse:
             """
             responses:
                 200:
@@ -130,7 +208,7 @@ class StarletteRestApi(RestApiInterface):
                         - {"InMemoryDatabase": "HEALTHY"}
                         - {"InMemoryDatabase": "UNHEALTHY"}
             """
-            return JSONResponse(health_check_common(services=services))
+            return JsonResponse(health_check_common(services=services))
 
         return wrapper
 
@@ -146,7 +224,7 @@ class StarletteRestApi(RestApiInterface):
 
         marshmallow_dataclass.class_schema(UserLoginJson)
 
-        async def wrapper(request: Request) -> JSONResponse:
+        async def wrapper(request: Request) -> JsonResponse:
             """
             requestBody:
                 description: Data to login a user and generate an access token for this particular user
@@ -170,7 +248,7 @@ class StarletteRestApi(RestApiInterface):
                     examples:
                     - {"error": "Invalid password for this user"}
             """
-            json_data: Dict[Any, Any] = await request.json()
+            json_data: Dict[Any, Any] = await json_body(request=request)
             return await get_access_token_framework(
                 add_access_token_usecase=add_access_token_usecase,
                 json_schema=json_schema,
@@ -185,7 +263,7 @@ class StarletteRestApi(RestApiInterface):
                   add_user_usecase: AddUserUseCase,
                   json_schema: Dict[str, Any],
                   json_schema_validator: JsonValidatorInterface) -> Callable[..., JsonEntity.of(_type=_A)]:
-        async def wrapper(request: Request) -> JSONResponse:
+        async def wrapper(request: Request) -> JsonResponse:
             """
             requestBody:
                 description: Data to create a user
@@ -209,7 +287,7 @@ class StarletteRestApi(RestApiInterface):
                     examples:
                     - {"error": "Username string is already exist, please use a different name."}
             """
-            json_data: Dict[Any, Any] = await request.json()
+            json_data: Dict[Any, Any] = await json_body(request=request)
             return await post_user_framework(
                 add_user_usecase=add_user_usecase,
                 json_schema=json_schema,
@@ -221,9 +299,8 @@ class StarletteRestApi(RestApiInterface):
 
     @classmethod
     def get_user(cls, *,
-                 fetch_user_usecase: FetchUserUseCase,
-                 fetch_access_token_usecase: FetchAccessTokenUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
-        async def wrapper(request: Request) -> JSONResponse:
+                 fetch_user_usecase: FetchUserUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
             """
             parameters:
                 - in: header
@@ -278,7 +355,6 @@ class StarletteRestApi(RestApiInterface):
             """
             return await get_user_framework(
                 fetch_user_usecase=fetch_user_usecase,
-                fetch_access_token_usecase=fetch_access_token_usecase,
                 request=request
             )
 
@@ -287,8 +363,6 @@ class StarletteRestApi(RestApiInterface):
     @classmethod
     def update_user(cls, *,
                     update_user_usecase: UpdateUserUseCase,
-                    fetch_user_usecase: FetchUserUseCase,
-                    fetch_access_token_usecase: FetchAccessTokenUseCase,
                     json_schema: Dict[str, Any],
                     json_schema_validator: JsonValidatorInterface) -> Callable[..., JsonEntity.of(_type=_A)]:
         @dataclass(frozen=True)
@@ -299,7 +373,7 @@ class StarletteRestApi(RestApiInterface):
 
         marshmallow_dataclass.class_schema(UpdateUserData)
 
-        async def wrapper(request: Request) -> JSONResponse:
+        async def wrapper(request: Request) -> JsonResponse:
             """
             parameters:
                 - in: header
@@ -345,8 +419,367 @@ class StarletteRestApi(RestApiInterface):
             """
             return await update_user_framework(
                 update_user_usecase=update_user_usecase,
-                fetch_user_usecase=fetch_user_usecase,
-                fetch_access_token_usecase=fetch_access_token_usecase,
+                json_schema=json_schema,
+                json_schema_validator=json_schema_validator,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def list_users(cls, *,
+                   list_users_usecase: ListUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of an admin user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+                - in: query
+                  name: limit
+                  schema:
+                    type: integer
+                  description: The number of users of the page (20 by default)
+                - in: query
+                  name: cursor
+                  schema:
+                    type: string
+                  description: The next_cursor of the previous page, the first page without it
+            responses:
+                200:
+                    description: A page of users ordered by id, next_cursor is null on the last page
+                    content:
+                        application/json:
+                            schema: UserJson
+                    examples:
+                        - {"users": [{"id": "0", "name": "test", "age": 26, "email": "test@test.com", "role": "USER"}],
+                           "next_cursor": "YWZ0ZXI6MA"}
+                400:
+                    description: error listing the users
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "limit should be between 1 and 100."}
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Your current user permission is not satisfying this operation."}
+            """
+            return await list_users_framework(
+                list_users_usecase=list_users_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def check_user_availability(cls, *,
+                                check_user_availability_usecase: CheckUserAvailabilityUseCase
+                                ) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> Response:
+            """
+            parameters:
+                - in: query
+                  name: name
+                  schema:
+                    type: string
+                  description: The name to check, or use email
+                - in: query
+                  name: email
+                  schema:
+                    type: string
+                  description: The email to check, or use name
+            responses:
+                200:
+                    description: Nobody has this name (or email) yet
+                400:
+                    description: Neither or both of name and email were given
+                409:
+                    description: A user has this name (or email) already
+                503:
+                    description: The users couldn't be read
+            """
+            return await check_user_availability_framework(
+                check_user_availability_usecase=check_user_availability_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def suggest_users(cls, *,
+                      suggest_users_usecase: SuggestUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of a user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+                - in: query
+                  name: name
+                  schema:
+                    type: string
+                  description: The (maybe misspelled) name searched, 3 characters at least
+                  require: true
+                - in: query
+                  name: limit
+                  schema:
+                    type: integer
+                  description: The number of suggestions (5 by default)
+            responses:
+                200:
+                    description: The users with the closest names, the closest first
+                    content:
+                        application/json:
+                            schema: UserJson
+                    examples:
+                        - {"suggestions": [{"id": "0", "name": "abdulrahman", "score": 0.83}]}
+                400:
+                    description: error suggesting the users
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "name should be at least 3 characters long."}
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Invalid access token for the user test"}
+            """
+            return await suggest_users_framework(
+                suggest_users_usecase=suggest_users_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def search_users(cls, *,
+                     search_users_usecase: SearchUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of an admin user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+                - in: query
+                  name: role
+                  schema:
+                    type: string
+                  description: Only the users of this role (ADMIN or USER)
+                - in: query
+                  name: age_gte
+                  schema:
+                    type: integer
+                  description: Only the users at least this old
+                - in: query
+                  name: age_lte
+                  schema:
+                    type: integer
+                  description: Only the users at most this old
+                - in: query
+                  name: limit
+                  schema:
+                    type: integer
+                  description: The number of users of the page (20 by default)
+                - in: query
+                  name: cursor
+                  schema:
+                    type: string
+                  description: The next_cursor of the previous page, the first page without it
+            responses:
+                200:
+                    description: A page of the matching users ordered by id, next_cursor is null on the last page
+                    content:
+                        application/json:
+                            schema: UserJson
+                    examples:
+                        - {"users": [{"id": "0", "name": "test", "age": 26, "email": "test@test.com", "role": "ADMIN"}],
+                           "next_cursor": "YWZ0ZXI6MA"}
+                400:
+                    description: error searching the users
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "limit should be between 1 and 100."}
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Your current user permission is not satisfying this operation."}
+            """
+            return await search_users_framework(
+                search_users_usecase=search_users_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def search_users_by_prefix(cls, *,
+                               search_users_by_prefix_usecase: SearchUsersByPrefixUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of an admin user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+                - in: query
+                  name: name
+                  schema:
+                    type: string
+                  description: The beginning of the names searched (case insensitive), or use email_domain
+                - in: query
+                  name: email_domain
+                  schema:
+                    type: string
+                  description: The domain of the emails searched like corp.com (case insensitive), or use name
+                - in: query
+                  name: limit
+                  schema:
+                    type: integer
+                  description: The number of users of the page (20 by default)
+                - in: query
+                  name: cursor
+                  schema:
+                    type: string
+                  description: The next_cursor of the previous page, the first page without it
+            responses:
+                200:
+                    description: A page of the matching users by name (or email), next_cursor is null on the last page
+                    content:
+                        application/json:
+                            schema: UserJson
+                    examples:
+                        - {"users": [{"id": "0", "name": "test", "age": 26, "email": "test@test.com", "role": "USER"}],
+                           "next_cursor": "YWZ0ZXI6MDp0ZXN0"}
+                400:
+                    description: error searching the users
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "limit should be between 1 and 100."}
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Your current user permission is not satisfying this operation."}
+            """
+            return await search_users_by_prefix_framework(
+                search_users_by_prefix_usecase=search_users_by_prefix_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def lookup_users(cls, *,
+                     fetch_users_usecase: FetchUsersUseCase,
+                     json_schema: Dict[str, Any],
+                     json_schema_validator: JsonValidatorInterface) -> Callable[..., JsonEntity.of(_type=_A)]:
+        @dataclass(frozen=True)
+        class LookupUsersData:
+            fetch_by_selector: str
+            fetch_by_data: List[str]
+
+        marshmallow_dataclass.class_schema(LookupUsersData)
+
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of the user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+            requestBody:
+                description: The selector and the values of the users to fetch
+                required: true
+                content:
+                  application/json:
+                    schema: LookupUsersData
+            responses:
+                200:
+                    description: One item per requested user (same order), the user or why it can't be fetched
+                    content:
+                        application/json:
+                            schema: UserJson
+                    examples:
+                        - [{"id": "0", "name": "test", "age": 26, "email": "test@test.com", "role": "USER"},
+                           {"error": "There is no user with id 5 to be fetched"}]
+                400:
+                    description: error fetching the users
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Fetch selector should be within this list ['id', 'name', 'email']"}
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "You should provide username and access-token into the headers."}
+            """
+            return await lookup_users_framework(
+                fetch_users_usecase=fetch_users_usecase,
                 json_schema=json_schema,
                 json_schema_validator=json_schema_validator,
                 request=request
@@ -356,10 +789,8 @@ class StarletteRestApi(RestApiInterface):
 
     @classmethod
     def delete_user(cls, *,
-                    delete_user_usecase: DeleteUserUseCase,
-                    fetch_user_usecase: FetchUserUseCase,
-                    fetch_access_token_usecase: FetchAccessTokenUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
-        async def wrapper(request: Request) -> JSONResponse:
+                    delete_user_usecase: DeleteUserUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
             """
             parameters:
                 - in: header
@@ -409,18 +840,145 @@ class StarletteRestApi(RestApiInterface):
             """
             return await delete_user_framework(
                 delete_user_usecase=delete_user_usecase,
-                fetch_user_usecase=fetch_user_usecase,
-                fetch_access_token_usecase=fetch_access_token_usecase,
+                request=request
+            )
+
+        return wrapper
+
+    @classmethod
+    def bulk_add_users(cls, *,
+                       bulk_add_users_usecase: BulkAddUsersUseCase) -> Callable[..., JsonEntity.of(_type=_A)]:
+        async def wrapper(request: Request) -> JsonResponse:
+            """
+            parameters:
+                - in: header
+                  name: username
+                  schema:
+                    type: string
+                  description: The username of an admin user who has an access-token
+                  require: true
+                - in: header
+                  name: access-token
+                  schema:
+                    type: string
+                  description: The access-token of the user currently doing this request
+                  require: true
+            requestBody:
+                description: Users to create, one json object per line or a csv with a header line
+                required: true
+                content:
+                  application/x-ndjson:
+                    schema: DomainUser
+                  text/csv:
+                    schema: DomainUser
+            responses:
+                200:
+                    description: Users imported, with the failure of every row that wasn't
+                    content:
+                        application/json:
+                            schema: BulkImportReport
+                    examples:
+                        - {"imported": 2, "failures": [{"row": 3, "error": "age should be between 16 and 150."}]}
+                400:
+                    description: error importing the users
+                    content:
+                        application/json:
+                            schema: Failure
+                401:
+                    description: unauthorized
+                    content:
+                        application/json:
+                            schema: Failure
+                    examples:
+                        - {"error": "Your current user permission is not satisfying this operation."}
+            """
+            return await bulk_add_users_framework(
+                bulk_add_users_usecase=bulk_add_users_usecase,
                 request=request
             )
 
         return wrapper
 
     def run(self, *, host: str, port: int, debug: bool, workers: int) -> None:
+        if workers > 1:
+            raise ValueError("An already built app is served by one process only, use serve with an app factory.")
+
         print(f"SERVICE-API documentation can be found on http://{host}:{port}/swagger.io/docs")
-        uvicorn.run(
-            self.__app,
-            host=host,
-            port=port,
-            debug=debug
-        )
+        uvicorn.Server(config=uvicorn_config(app=self.__app, host=host, port=port, debug=debug)).run()
+
+    @classmethod
+    def serve(cls, *,
+              app_factory: Callable[[], Starlette],
+              host: str,
+              port: int,
+              debug: bool,
+              workers: int) -> None:
+        """
+        Serves the app built by `app_factory` (a module level function, it's called in every worker process)
+        with `workers` processes, every one of them binds its own SO_REUSEPORT socket on the same host:port
+        and the kernel balances the connections between them.
+        So whatever state the workers should agree on (users, tokens) has to live in a store shared by them.
+        Once a worker exits on its own the other ones are stopped too and serve exits with code 1,
+        restarting the whole service is left to whoever started it (systemd, docker, ...).
+        """
+        if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            print("SO_REUSEPORT isn't supported on this platform, serving with one worker only")
+            workers = 1
+        if workers <= 1:
+            print(f"SERVICE-API documentation can be found on http://{host}:{port}/swagger.io/docs")
+            uvicorn.Server(config=uvicorn_config(app=app_factory(), host=host, port=port, debug=debug)).run()
+            return
+
+        print(f"SERVICE-API documentation can be found on http://{host}:{port}/swagger.io/docs ({workers} workers)")
+        context = get_context("spawn")
+        processes = [
+            context.Process(
+                target=serve_worker,
+                kwargs=dict(app_factory=app_factory, host=host, port=port, debug=debug),
+                name=f"users-worker-{worker}"
+            ) for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        stopping = Event()
+
+        def stop(_signal_number: int, _frame: Any) -> None:
+            stopping.set()
+            for _process in processes:
+                _process.terminate()
+
+        previous_handlers = {signal_number: signal.signal(signal_number, stop)
+                             for signal_number in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            wait([process.sentinel for process in processes])
+            if not stopping.is_set():
+                for process in processes:
+                    if process.exitcode is not None:
+                        print(f"{process.name} exited with code {process.exitcode}, stopping the other workers")
+                    process.terminate()
+            for process in processes:
+                process.join()
+        finally:
+            for signal_number, handler in previous_handlers.items():
+                signal.signal(signal_number, handler)
+
+        if not stopping.is_set():
+            raise SystemExit(1)
+
+
+def serve_worker(*, app_factory: Callable[[], Starlette], host: str, port: int, debug: bool) -> None:
+    # every worker builds its own app (and so runs its own startup/shutdown) over the shared socket address
+    worker_socket = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    worker_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    worker_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    worker_socket.bind((host, port))
+
+    uvicorn.Server(
+        config=uvicorn_config(app=app_factory(), host=host, port=port, debug=debug)
+    ).run(sockets=[worker_socket])
+
+
+def uvicorn_config(*, app: Starlette, host: str, port: int, debug: bool) -> uvicorn.Config:
+    # uvicorn has no debug switch (anymore), debugging the service is logging everything the server does
+    return uvicorn.Config(app, host=host, port=port, log_level="debug" if debug else "info")
@@ -0,0 +1,85 @@
+from starlette.authentication import (
+    AuthCredentials,
+    AuthenticationBackend,
+    BaseUser
+)
+from starlette.requests import HTTPConnection, Request
+
+from src.application.entity.principal import Principal
+from src.application.types import (
+    Maybe,
+    Either,
+    Tuple
+)
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.domain.entity.failure import Failure
+
+
+class PrincipalUser(BaseUser):
+    def __init__(self, *, principal: Principal) -> None:
+        self.principal = principal
+
+    @property
+    def is_authenticated(self) -> bool:
+        return True
+
+    @property
+    def display_name(self) -> str:
+        return self.principal.name
+
+
+class RejectedUser(BaseUser):
+    # a caller whose headers didn't authenticate, anonymous for the routes needing no caller (login, sign up...)
+    def __init__(self, *, failure: Failure) -> None:
+        self.failure = failure
+
+    @property
+    def is_authenticated(self) -> bool:
+        return False
+
+    @property
+    def display_name(self) -> str:
+        return ""
+
+
+class AccessTokenBackend(AuthenticationBackend):
+    """
+    Resolves the caller of every request (from its "username" and "access-token" headers) once,
+    before the routing. A bad token is kept as the failure of the request, the handlers needing a caller
+    answering it (before any user lookup) while the others go on anonymous, so a stale token doesn't
+    stop its user from logging in again.
+
+    The requests without these headers go through anonymous, the handlers needing a caller refusing them.
+    A session token is enough alone, the username header being optional for it.
+    """
+
+    def __init__(self, *, fetch_access_token_usecase: FetchAccessTokenUseCase) -> None:
+        self.__fetch_access_token_usecase = fetch_access_token_usecase
+
+    async def authenticate(self, conn: HTTPConnection) -> Maybe[Tuple[AuthCredentials, BaseUser]]:
+        username = conn.headers.get("username", None)
+        token = conn.headers.get("access-token", None)
+        if token is None:
+            return None
+
+        principal_status = await self.__fetch_access_token_usecase.authenticate_async(username=username, token=token)
+        if isinstance(principal_status, Failure):
+            return AuthCredentials(), RejectedUser(failure=principal_status)
+
+        return AuthCredentials(["authenticated", principal_status.role.name]), PrincipalUser(principal=principal_status)
+
+
+def principal_of(*, request: Request) -> Either[Failure, Principal]:
+    # the caller put on the scope by the backend
+    user = request.scope.get("user", None)
+    if isinstance(user, PrincipalUser):
+        return user.principal
+    if isinstance(user, RejectedUser):
+        return user.failure
+
+    return Failure(error="You should provide username and access-token into the headers.")
+
+
+def is_caller(*, principal: Principal, selector: str, value: str) -> bool:
+    # whether a user selected by its id, name or email is the caller itself
+    return {"id": principal.id, "name": principal.name, "email": principal.email}.get(selector, None) == value
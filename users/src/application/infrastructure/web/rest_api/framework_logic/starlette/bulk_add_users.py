@@ -0,0 +1,40 @@
+from starlette.requests import Request
+
+from src.application.entity.bulk_import import BulkImportReport
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    Callable
+)
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.utilities.rows import async_rows_of
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+
+async def bulk_add_users(*,
+                         bulk_add_users_usecase: BulkAddUsersUseCase,
+                         request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    if current_logged_user_status.role.name != UserRole.ADMIN.name:
+        return JsonResponse(
+            Failure(error="Your current user permission is not satisfying this operation."),
+            status_code=401
+        )
+
+    # the body is parsed while it's still being received, only its current line (capped) is held in memory
+    content_type = request.headers.get("content-type", "application/x-ndjson")
+    bulk_add_users_status = await bulk_add_users_usecase.execute_async(
+        rows=async_rows_of(
+            chunks=request.stream(),
+            content_format="csv" if content_type.startswith("text/csv") else "ndjson"
+        )
+    )
+    if isinstance(bulk_add_users_status, BulkImportReport):
+        return JsonResponse(bulk_add_users_status, status_code=200)
+
+    return JsonResponse(bulk_add_users_status, status_code=400)
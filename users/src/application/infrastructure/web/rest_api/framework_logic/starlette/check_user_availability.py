@@ -0,0 +1,30 @@
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.types import (
+    Callable
+)
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
+
+_availability_selectors = ["name", "email"]
+
+
+async def check_user_availability(*,
+                                  check_user_availability_usecase: CheckUserAvailabilityUseCase,
+                                  request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    # a HEAD request, only the status tells the answer
+    checks = [selector for selector in _availability_selectors if selector in request.query_params]
+    if len(checks) != 1 or not request.query_params[checks[0]]:
+        return Response(status_code=400)
+
+    availability_status = await check_user_availability_usecase.execute_async(
+        selector=checks[0],
+        data=request.query_params[checks[0]]
+    )
+    if availability_status is True:
+        return Response(status_code=200)
+    if availability_status is False:
+        return Response(status_code=409)
+
+    return Response(status_code=503)
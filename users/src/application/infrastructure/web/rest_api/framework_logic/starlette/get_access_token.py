@@ -1,7 +1,6 @@
-from starlette.responses import JSONResponse
-
 from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
 from src.application.infrastructure.web.validation import JsonValidatorInterface
 from src.application.types import (
     Dict,
@@ -24,12 +23,12 @@ async def get_access_token(*,
         data=json_data
     )
     if isinstance(json_validation_status, Success):
-        add_access_token_status = add_access_token_usecase.execute(
+        add_access_token_status = await add_access_token_usecase.execute_async(
             username=json_data["username"],
             password=json_data["password"],
         )
         if isinstance(add_access_token_status, AccessToken):
-            return JSONResponse(add_access_token_status.as_dict(), status_code=200)
+            return JsonResponse(add_access_token_status, status_code=200)
 
-        return JSONResponse(add_access_token_status.as_dict(), status_code=400)
-    return JSONResponse(json_validation_status.as_dict(), status_code=400)
+        return JsonResponse(add_access_token_status, status_code=400)
+    return JsonResponse(json_validation_status, status_code=400)
@@ -0,0 +1,23 @@
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from src.application.infrastructure.web.codec import JsonCodecInterface, default_json_codec
+from src.application.types import Any
+
+# shared by all the handlers, set once before serving (StarletteRestApi's json_codec)
+_json_codec: JsonCodecInterface = default_json_codec()
+
+
+def use_json_codec(*, json_codec: JsonCodecInterface) -> None:
+    global _json_codec
+    _json_codec = json_codec
+
+
+class JsonResponse(JSONResponse):
+    # the entities are given as they are, the codec encoding them
+    def render(self, content: Any) -> bytes:
+        return _json_codec.encode(value=content)
+
+
+async def json_body(*, request: Request) -> Any:
+    return _json_codec.decode(data=await request.body())
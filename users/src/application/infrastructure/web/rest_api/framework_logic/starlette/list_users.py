@@ -0,0 +1,48 @@
+from starlette.requests import Request
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    Callable
+)
+from src.application.usecase.user.list_users import ListUsersUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_default_limit = 20
+
+
+async def list_users(*,
+                     list_users_usecase: ListUsersUseCase,
+                     request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    if current_logged_user_status.role.name != UserRole.ADMIN.name:
+        return JsonResponse(
+            Failure(error="Your current user permission is not satisfying this operation."),
+            status_code=401
+        )
+
+    limit = request.query_params.get("limit", str(_default_limit))
+    if not limit.isdigit():
+        return JsonResponse(Failure(error="limit should be an integer."), status_code=400)
+
+    list_users_status = await list_users_usecase.execute_async(
+        cursor=request.query_params.get("cursor", None),
+        limit=int(limit)
+    )
+    if isinstance(list_users_status, UsersPage):
+        return JsonResponse(dict(
+            users=[
+                from_application_user_to_json_user(application_user=user)
+                for user in list_users_status.users
+            ],
+            next_cursor=list_users_status.next_cursor
+        ), status_code=200)
+
+    return JsonResponse(list_users_status, status_code=400)
@@ -0,0 +1,52 @@
+from starlette.requests import Request
+
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse, json_body
+from src.application.infrastructure.web.validation import JsonValidatorInterface
+from src.application.types import (
+    Dict,
+    Any,
+    Callable,
+    Either
+)
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+
+
+async def lookup_users(*,
+                       fetch_users_usecase: FetchUsersUseCase,
+                       json_schema: Dict[str, Any],
+                       json_schema_validator: JsonValidatorInterface,
+                       request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    json_data: Dict[Any, Any] = await json_body(request=request)
+    json_validation_status: Either[Failure, Success] = json_schema_validator.validate(
+        schema=json_schema,
+        data=json_data
+    )
+    if isinstance(json_validation_status, Success):
+        fetch_users_status = await fetch_users_usecase.execute_async(
+            fetch_by_selector=json_data["fetch_by_selector"],
+            fetch_by_data=json_data["fetch_by_data"]
+        )
+        if isinstance(fetch_users_status, Failure):
+            return JsonResponse(fetch_users_status, status_code=400)
+
+        # same rules as fetching a single user, applied to every item on its own
+        is_admin = current_logged_user_status.role.name == UserRole.ADMIN.name
+        return JsonResponse([
+            fetch_user_status if isinstance(fetch_user_status, Failure)
+            else from_application_user_to_json_user(application_user=fetch_user_status)
+            if is_admin or fetch_user_status.name == current_logged_user_status.name
+            else Failure(error="Your current user permission is not satisfying this operation.")
+            for fetch_user_status in fetch_users_status
+        ], status_code=200)
+
+    return JsonResponse(json_validation_status, status_code=400)
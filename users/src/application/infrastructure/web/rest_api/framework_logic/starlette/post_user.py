@@ -1,8 +1,8 @@
-from starlette.responses import JSONResponse
 
 from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.web.entity.json import JsonEntity, _A
 from src.application.infrastructure.web.entity.user_json import UserJson
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
 from src.application.infrastructure.web.validation import JsonValidatorInterface
 from src.application.types import (
     Dict,
@@ -27,7 +27,7 @@ async def post_user(*,
         data=json_data
     )
     if isinstance(json_validation_status, Success):
-        add_user_status = add_user_usecase.execute(
+        add_user_status = await add_user_usecase.execute_async(
             username=json_data["name"],
             age=json_data["age"],
             password=json_data["password"],
@@ -38,7 +38,7 @@ async def post_user(*,
             user_json: UserJson = from_application_user_to_json_user(
                 application_user=add_user_status
             )
-            return JSONResponse(user_json.as_dict(), status_code=200)
+            return JsonResponse(user_json, status_code=200)
 
-        return JSONResponse(add_user_status.as_dict(), status_code=400)
-    return JSONResponse(json_validation_status.as_dict(), status_code=400)
+        return JsonResponse(add_user_status, status_code=400)
+    return JsonResponse(json_validation_status, status_code=400)
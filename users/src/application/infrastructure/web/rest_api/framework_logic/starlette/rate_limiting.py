@@ -0,0 +1,115 @@
+import json
+from math import ceil
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.application.infrastructure.web.rate_limiting import RateLimiter
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import PrincipalUser
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    List,
+    Maybe,
+    Set,
+    Tuple
+)
+from src.domain.entity.failure import Failure
+
+_max_login_body = 16 * 1024
+
+
+async def _buffered(*, receive: Receive) -> Tuple[Maybe[bytes], Receive]:
+    # the whole body (None past _max_login_body, nothing more being read) and a receive giving it again to the app
+    messages: List[Message] = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if size > _max_login_body:
+            return None, receive
+        more_body = message.get("type", None) == "http.request" and message.get("more_body", False)
+
+    async def replay() -> Message:
+        return messages.pop(0) if messages else await receive()
+
+    return b"".join(message.get("body", b"") for message in messages), replay
+
+
+def _username_of(*, body: bytes) -> Maybe[str]:
+    try:
+        login = json.loads(body)
+    except ValueError:
+        return None
+
+    username = login.get("username", None) if isinstance(login, dict) else None
+    return username if isinstance(username, str) else None
+
+
+def _too_many_requests(*, retry_after: float) -> JsonResponse:
+    return JsonResponse(
+        Failure(error="Too many requests, try again later."),
+        status_code=429,
+        headers={"Retry-After": str(ceil(retry_after))}
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Throttles the requests by client IP before anything else runs (authentication included),
+    the logins (to the login paths) also by their username from this client.
+
+    A throttled request is answered with a 429 and a Retry-After (in seconds), a login body too large to be
+    one with a 413.
+    """
+
+    def __init__(self, app: ASGIApp, *, rate_limiter: RateLimiter, login_paths: Set[str]) -> None:
+        self.__app = app
+        self.__rate_limiter = rate_limiter
+        self.__login_paths = login_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.__app(scope, receive, send)
+            return
+
+        login_username = None
+        if scope["path"] in self.__login_paths and scope["method"] == "POST":
+            body, receive = await _buffered(receive=receive)
+            if body is None:
+                response = JsonResponse(Failure(error="The login request is too large."), status_code=413)
+                await response(scope, receive, send)
+                return
+            login_username = _username_of(body=body)
+        client = scope.get("client", None)
+
+        retry_after = self.__rate_limiter.retry_after(
+            client=client[0] if client else None,
+            login_username=login_username
+        )
+        if retry_after > 0:
+            await _too_many_requests(retry_after=retry_after)(scope, receive, send)
+            return
+
+        await self.__app(scope, receive, send)
+
+
+class CallerRateLimitMiddleware:
+    """
+    Throttles the authenticated callers by their username, after the authentication
+    (the username header alone being anybody's to send).
+    """
+
+    def __init__(self, app: ASGIApp, *, rate_limiter: RateLimiter) -> None:
+        self.__app = app
+        self.__rate_limiter = rate_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        user = scope.get("user", None) if scope["type"] == "http" else None
+        if isinstance(user, PrincipalUser):
+            retry_after = self.__rate_limiter.caller_retry_after(username=user.principal.name)
+            if retry_after > 0:
+                await _too_many_requests(retry_after=retry_after)(scope, receive, send)
+                return
+
+        await self.__app(scope, receive, send)
@@ -0,0 +1,58 @@
+from starlette.requests import Request
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    Callable,
+    Dict,
+    Maybe
+)
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_default_limit = 20
+
+
+def _is_integer(value: str) -> bool:
+    return value.lstrip("-").isdigit() and value.isascii()
+
+
+async def search_users(*,
+                       search_users_usecase: SearchUsersUseCase,
+                       request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    if current_logged_user_status.role.name != UserRole.ADMIN.name:
+        return JsonResponse(
+            Failure(error="Your current user permission is not satisfying this operation."),
+            status_code=401
+        )
+
+    integers: Dict[str, Maybe[int]] = {}
+    for parameter, default in (("limit", str(_default_limit)), ("age_gte", None), ("age_lte", None)):
+        value = request.query_params.get(parameter, default)
+        if value is not None and not _is_integer(value):
+            return JsonResponse(Failure(error=f"{parameter} should be an integer."), status_code=400)
+        integers[parameter] = int(value) if value is not None else None
+
+    search_users_status = await search_users_usecase.execute_async(
+        role=request.query_params.get("role", None),
+        cursor=request.query_params.get("cursor", None),
+        **integers
+    )
+    if isinstance(search_users_status, UsersPage):
+        return JsonResponse(dict(
+            users=[
+                from_application_user_to_json_user(application_user=user)
+                for user in search_users_status.users
+            ],
+            next_cursor=search_users_status.next_cursor
+        ), status_code=200)
+
+    return JsonResponse(search_users_status, status_code=400)
@@ -0,0 +1,58 @@
+from starlette.requests import Request
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    Callable
+)
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_default_limit = 20
+_search_selectors = ["name", "email_domain"]
+
+
+async def search_users_by_prefix(*,
+                                 search_users_by_prefix_usecase: SearchUsersByPrefixUseCase,
+                                 request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    if current_logged_user_status.role.name != UserRole.ADMIN.name:
+        return JsonResponse(
+            Failure(error="Your current user permission is not satisfying this operation."),
+            status_code=401
+        )
+
+    searches = [selector for selector in _search_selectors if selector in request.query_params]
+    if len(searches) != 1:
+        return JsonResponse(
+            Failure(error=f"Exactly one of {_search_selectors} should be searched."),
+            status_code=400
+        )
+
+    limit = request.query_params.get("limit", str(_default_limit))
+    if not limit.isdigit():
+        return JsonResponse(Failure(error="limit should be an integer."), status_code=400)
+
+    search_users_status = await search_users_by_prefix_usecase.execute_async(
+        selector=searches[0],
+        prefix=request.query_params[searches[0]],
+        cursor=request.query_params.get("cursor", None),
+        limit=int(limit)
+    )
+    if isinstance(search_users_status, UsersPage):
+        return JsonResponse(dict(
+            users=[
+                from_application_user_to_json_user(application_user=user)
+                for user in search_users_status.users
+            ],
+            next_cursor=search_users_status.next_cursor
+        ), status_code=200)
+
+    return JsonResponse(search_users_status, status_code=400)
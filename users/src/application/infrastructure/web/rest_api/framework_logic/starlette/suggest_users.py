@@ -0,0 +1,37 @@
+from starlette.requests import Request
+
+from src.application.infrastructure.web.entity.json import JsonEntity, _A
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.authentication import principal_of
+from src.application.infrastructure.web.rest_api.framework_logic.starlette.json_codec import JsonResponse
+from src.application.types import (
+    Callable
+)
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase
+from src.domain.entity.failure import Failure
+
+_default_limit = 5
+
+
+async def suggest_users(*,
+                        suggest_users_usecase: SuggestUsersUseCase,
+                        request: Request) -> Callable[..., JsonEntity.of(_type=_A)]:
+    current_logged_user_status = principal_of(request=request)
+    if isinstance(current_logged_user_status, Failure):
+        return JsonResponse(current_logged_user_status, 401)
+
+    # any logged user can look for the others (to chat with), only their ids and names are given
+    limit = request.query_params.get("limit", str(_default_limit))
+    if not limit.isdigit():
+        return JsonResponse(Failure(error="limit should be an integer."), status_code=400)
+
+    suggest_users_status = await suggest_users_usecase.execute_async(
+        name=request.query_params.get("name", ""),
+        limit=int(limit)
+    )
+    if isinstance(suggest_users_status, Failure):
+        return JsonResponse(suggest_users_status, status_code=400)
+
+    return JsonResponse(dict(suggestions=[
+        dict(id=suggestion.user.id, name=suggestion.user.name, score=round(suggestion.score, 3))
+        for suggestion in suggest_users_status
+    ]), status_code=200)
@@ -0,0 +1,15 @@
+lookup_users = {
+    "type": "object",
+    "properties": {
+        "fetch_by_selector": {
+            "type": "string"
+        },
+        "fetch_by_data": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            }
+        }
+    },
+    "required": ["fetch_by_selector", "fetch_by_data"]
+}
@@ -8,8 +8,19 @@ from typing import (
     NamedTuple,
     Callable,
     TypeVar,
+    Iterator,
+    ContextManager,
+    Awaitable,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+    Hashable,
+    FrozenSet,
+    Set,
 )
 from enum import Enum
 from dataclasses import dataclass, field
 
+from src.domain.types import FrozenSlots
+
 SimpleConfig = Dict[str, Any]
@@ -18,3 +18,6 @@ class UseCaseInterface(metaclass=ABCMeta):
 
     @abstractmethod
     def execute(self, *args, **kwargs) -> Either[Failure, Any]: pass
+
+    @abstractmethod
+    async def execute_async(self, *args, **kwargs) -> Either[Failure, Any]: pass
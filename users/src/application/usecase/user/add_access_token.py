@@ -1,27 +1,211 @@
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.hashing import PasswordHasher
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.sessions import SessionStore
 from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
 from src.application.types import (
     Maybe,
     Either,
     SimpleConfig
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.application.utilities.user import with_hashed_password
 from src.domain.entity.failure import Failure
 
 
 class AddAccessTokenUseCase(UseCaseInterface):
     def __init__(self, *,
                  config: Maybe[SimpleConfig],
-                 persistence: PersistenceInterface) -> None:
+                 persistence: PersistenceInterface,
+                 keyring: Maybe[JwtKeyring] = None,
+                 principal_cache: Maybe[PrincipalCache] = None,
+                 password_hasher: Maybe[PasswordHasher] = None,
+                 sessions: Maybe[SessionStore] = None) -> None:
+        """
+        With a keyring the access tokens are signed by the server's keys (and expire) instead of being stored.
+        With sessions every login opens a new session (an opaque token) instead, the former ones going on.
+
+        With a password hasher the password is verified against the stored hash (off the event loop),
+        the hashes of older parameters (or the passwords stored before hashing them) being rehashed on login.
+
+        A new token of a user drops its cached principal (authenticated with the former token).
+        """
         self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__keyring = keyring
+        self.__sessions = sessions
+        self.__principal_cache = principal_cache
+        self.__password_hasher = password_hasher
         super().__init__(config=config, persistence=persistence)
 
+    def __reissued(self, *,
+                   username: str,
+                   add_access_token_status: Either[Failure, AccessToken]) -> Either[Failure, AccessToken]:
+        if self.__principal_cache is not None and isinstance(add_access_token_status, AccessToken):
+            self.__principal_cache.invalidate(selector="name", value=username)
+
+        return add_access_token_status
+
+    @staticmethod
+    def __compare(*,
+                  fetch_user_status: Either[Failure, ApplicationUser],
+                  username: str,
+                  password: str) -> Either[Failure, ApplicationUser]:
+        if isinstance(fetch_user_status, Failure):
+            return fetch_user_status
+        if fetch_user_status.password != password:
+            return Failure(error=f"Invalid password for user {username}")
+
+        return fetch_user_status
+
+    @staticmethod
+    def __verified(*,
+                   fetch_user_status: ApplicationUser,
+                   verify_password_status: Either[Failure, bool],
+                   username: str) -> Either[Failure, ApplicationUser]:
+        if isinstance(verify_password_status, Failure):
+            return verify_password_status
+        if not verify_password_status:
+            return Failure(error=f"Invalid password for user {username}")
+
+        return fetch_user_status
+
+    def __needs_rehash(self, *, verify_user_status: Either[Failure, ApplicationUser]) -> bool:
+        return isinstance(verify_user_status, ApplicationUser) and self.__password_hasher.needs_rehash(
+            encoded=verify_user_status.password
+        )
+
+    @staticmethod
+    def __rehashed(*,
+                   verify_user_status: ApplicationUser,
+                   update_user_status: Either[Failure, ApplicationUser]) -> ApplicationUser:
+        # the old hash stays valid when the user changed meanwhile
+        return verify_user_status if isinstance(update_user_status, Failure) else update_user_status
+
+    def __issued(self, *,
+                 username: str,
+                 verify_user_status: Maybe[Either[Failure, ApplicationUser]]) -> Maybe[Either[Failure, AccessToken]]:
+        # the tokens needing no persistence (the sessions' and the keyring's ones), None for a stored token
+        if verify_user_status is None or isinstance(verify_user_status, Failure):
+            return verify_user_status
+        if self.__sessions is not None:
+            # the other sessions of the user (and its cached principal) stay valid
+            return self.__sessions.issue(user=verify_user_status)
+        if self.__keyring is not None:
+            return self.__reissued(username=username, add_access_token_status=self.__keyring.issue(
+                user=verify_user_status
+            ))
+
+        return None
+
+    def __checked_password(self, *, password: str) -> Maybe[str]:
+        # the password the persistence compares along with storing the token,
+        # none once verified against the stored hash (which is no password to compare)
+        return password if self.__password_hasher is None else None
+
+    def __verify(self, *, username: str, password: str) -> Either[Failure, ApplicationUser]:
+        fetch_user_status = self.__persistence.fetch_user_by.name(user_name=username)
+        if isinstance(fetch_user_status, Failure):
+            return fetch_user_status
+
+        verify_user_status = self.__verified(
+            fetch_user_status=fetch_user_status,
+            verify_password_status=self.__password_hasher.verify(password=password, encoded=fetch_user_status.password),
+            username=username
+        )
+        if not self.__needs_rehash(verify_user_status=verify_user_status):
+            return verify_user_status
+
+        rehashed_user = with_hashed_password(
+            user=verify_user_status,
+            hash_password_status=self.__password_hasher.hash(password=password)
+        )
+        if isinstance(rehashed_user, Failure):
+            return verify_user_status
+        return self.__rehashed(
+            verify_user_status=verify_user_status,
+            update_user_status=self.__persistence.update_user_by.id(
+                user_id=verify_user_status.id,
+                updated_user=rehashed_user
+            )
+        )
+
+    async def __verify_async(self, *, username: str, password: str) -> Either[Failure, ApplicationUser]:
+        fetch_user_status = await self.__async_persistence.fetch_user_by.name(user_name=username)
+        if isinstance(fetch_user_status, Failure):
+            return fetch_user_status
+
+        verify_user_status = self.__verified(
+            fetch_user_status=fetch_user_status,
+            verify_password_status=await self.__password_hasher.verify_async(
+                password=password,
+                encoded=fetch_user_status.password
+            ),
+            username=username
+        )
+        if not self.__needs_rehash(verify_user_status=verify_user_status):
+            return verify_user_status
+
+        rehashed_user = with_hashed_password(
+            user=verify_user_status,
+            hash_password_status=await self.__password_hasher.hash_async(password=password)
+        )
+        if isinstance(rehashed_user, Failure):
+            return verify_user_status
+        return self.__rehashed(
+            verify_user_status=verify_user_status,
+            update_user_status=await self.__async_persistence.update_user_by.id(
+                user_id=verify_user_status.id,
+                updated_user=rehashed_user
+            )
+        )
+
     @exception_handler
     def execute(self, *,
                 username: str,
                 password: str) -> Either[Failure, AccessToken]:
-        return self.__persistence.persist_access_token(
+        verify_user_status: Maybe[Either[Failure, ApplicationUser]] = None
+        if self.__password_hasher is not None:
+            verify_user_status = self.__verify(username=username, password=password)
+        elif self.__keyring is not None or self.__sessions is not None:
+            verify_user_status = self.__compare(
+                fetch_user_status=self.__persistence.fetch_user_by.name(user_name=username),
+                username=username,
+                password=password
+            )
+        issue_access_token_status = self.__issued(username=username, verify_user_status=verify_user_status)
+        if issue_access_token_status is not None:
+            return issue_access_token_status
+
+        add_access_token_status = self.__persistence.persist_access_token(
+            username=username,
+            password=self.__checked_password(password=password)
+        )
+        return self.__reissued(username=username, add_access_token_status=add_access_token_status)
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            username: str,
+                            password: str) -> Either[Failure, AccessToken]:
+        verify_user_status: Maybe[Either[Failure, ApplicationUser]] = None
+        if self.__password_hasher is not None:
+            verify_user_status = await self.__verify_async(username=username, password=password)
+        elif self.__keyring is not None or self.__sessions is not None:
+            verify_user_status = self.__compare(
+                fetch_user_status=await self.__async_persistence.fetch_user_by.name(user_name=username),
+                username=username,
+                password=password
+            )
+        issue_access_token_status = self.__issued(username=username, verify_user_status=verify_user_status)
+        if issue_access_token_status is not None:
+            return issue_access_token_status
+
+        add_access_token_status = await self.__async_persistence.persist_access_token(
             username=username,
-            password=password
+            password=self.__checked_password(password=password)
         )
+        return self.__reissued(username=username, add_access_token_status=add_access_token_status)
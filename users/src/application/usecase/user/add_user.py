@@ -1,20 +1,50 @@
 from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.hashing import PasswordHasher
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
 from src.application.types import (
     Maybe,
     Either,
     SimpleConfig
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.application.utilities.user import with_hashed_password
 from src.domain.entity.failure import Failure
 from src.domain.entity.user import DomainUser as DomainUser, create_user, UserRole
 
 
 class AddUserUseCase(UseCaseInterface):
-    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig],
+                 persistence: PersistenceInterface,
+                 password_hasher: Maybe[PasswordHasher] = None) -> None:
+        """
+        With a password hasher only the hashes of the passwords are stored.
+        """
         super().__init__(config=config, persistence=persistence)
         self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__password_hasher = password_hasher
+
+    @staticmethod
+    def __user_of(*,
+                  username: str,
+                  age: int,
+                  password: str,
+                  email: Maybe[str],
+                  role: UserRole) -> Either[Failure, DomainUser]:
+        domain_user_creation_status: Either[Failure, DomainUser] = create_user(
+            name=username,
+            age=age,
+            password=password,
+            email=email,
+            role=role
+        )
+        if isinstance(domain_user_creation_status, Failure):
+            return Failure(error=domain_user_creation_status.error)
+
+        return domain_user_creation_status
 
     @exception_handler
     def execute(self, *,
@@ -23,20 +53,47 @@ class AddUserUseCase(UseCaseInterface):
                 password: str,
                 email: Maybe[str],
                 role: UserRole) -> Either[Failure, ApplicationUser]:
-        domain_user_creation_status: Either[Failure, DomainUser] = create_user(
-            name=username,
+        domain_user_creation_status = self.__user_of(
+            username=username,
             age=age,
             password=password,
             email=email,
             role=role
         )
         if isinstance(domain_user_creation_status, Failure):
-            return Failure(error=domain_user_creation_status.error)
+            return domain_user_creation_status
+        if self.__password_hasher is not None:
+            domain_user_creation_status = with_hashed_password(
+                user=domain_user_creation_status,
+                hash_password_status=self.__password_hasher.hash(password=password)
+            )
+            if isinstance(domain_user_creation_status, Failure):
+                return domain_user_creation_status
+
+        return self.__persistence.persist_user(user=domain_user_creation_status)
 
-        database_user_creation_status: Either[Failure, ApplicationUser] = self.__persistence.persist_user(
-            user=domain_user_creation_status
+    @async_exception_handler
+    async def execute_async(self, *,
+                            username: str,
+                            age: int,
+                            password: str,
+                            email: Maybe[str],
+                            role: UserRole) -> Either[Failure, ApplicationUser]:
+        domain_user_creation_status = self.__user_of(
+            username=username,
+            age=age,
+            password=password,
+            email=email,
+            role=role
         )
-        if isinstance(database_user_creation_status, Failure):
-            return Failure(error=database_user_creation_status.error)
+        if isinstance(domain_user_creation_status, Failure):
+            return domain_user_creation_status
+        if self.__password_hasher is not None:
+            domain_user_creation_status = with_hashed_password(
+                user=domain_user_creation_status,
+                hash_password_status=await self.__password_hasher.hash_async(password=password)
+            )
+            if isinstance(domain_user_creation_status, Failure):
+                return domain_user_creation_status
 
-        return database_user_creation_status
+        return await self.__async_persistence.persist_user(user=domain_user_creation_status)
@@ -0,0 +1,245 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from threading import Lock
+
+from src.application.entity.bulk_import import BulkImportFailure, BulkImportReport
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.hashing import PasswordHasher, PasswordScheme, hash_password
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Maybe,
+    Either,
+    Iterable,
+    Iterator,
+    AsyncIterable,
+    SimpleConfig
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.application.utilities.rows import Row
+from src.application.utilities.user import with_password
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import DomainUser, create_user, UserRole
+
+_default_chunk_size = 10_000
+
+
+def _from_row_to_user_fields(*, row: Row) -> Either[Failure, Dict[str, Any]]:
+    if isinstance(row, Failure):
+        return row
+
+    missing_fields = [field for field in ("name", "age", "password") if row.get(field, None) is None]
+    if missing_fields:
+        return Failure(error=f"Missing fields {missing_fields}.")
+
+    try:
+        age = int(row["age"])
+    except (TypeError, ValueError):
+        return Failure(error="age should be an integer.")
+
+    role = row.get("role", None) or UserRole.USER.name
+    if role not in UserRole.__members__:
+        return Failure(error=f"role should be within this list {list(UserRole.__members__)}.")
+
+    return dict(
+        name=str(row["name"]),
+        age=age,
+        password=str(row["password"]),
+        email=str(row["email"]) if row.get("email", None) is not None else None,
+        role=UserRole[role]
+    )
+
+
+def _validate_chunk(rows: List[Row], scheme: Maybe[PasswordScheme]) -> Tuple[List[Tuple[int, str]], Dict[int, str]]:
+    # runs in the pool's processes, only the (usually few) errors are sent back instead of the users,
+    # along with the hashed passwords of the valid ones (by their index) when hashing them
+    errors: List[Tuple[int, str]] = []
+    passwords: Dict[int, str] = {}
+    for index, row in enumerate(rows):
+        user_fields = _from_row_to_user_fields(row=row)
+        user_status = user_fields if isinstance(user_fields, Failure) else create_user(**user_fields)
+        if isinstance(user_status, Failure):
+            errors.append((index, user_status.error))
+        elif scheme is not None:
+            passwords[index] = hash_password(scheme, user_status.password)
+
+    return errors, passwords
+
+
+def _chunks_of(*, rows: Iterable[Row], chunk_size: int) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _ReportBuilder:
+    def __init__(self) -> None:
+        self.__imported = 0
+        self.__failures: List[BulkImportFailure] = []
+
+    def valid_users_of(self, *,
+                       first_row: int,
+                       rows: List[Row],
+                       validation: Tuple[List[Tuple[int, str]], Dict[int, str]]) -> Tuple[List[int], List[DomainUser]]:
+        # the rows were validated already, the users of the valid ones are built without validating them again
+        errors, passwords = validation
+        invalid_rows = dict(errors)
+        valid_rows: List[int] = []
+        users: List[DomainUser] = []
+        for index, row in enumerate(rows):
+            if index in invalid_rows:
+                self.__failures.append(BulkImportFailure(row=first_row + index, error=invalid_rows[index]))
+            else:
+                valid_rows.append(first_row + index)
+                user = DomainUser(**_from_row_to_user_fields(row=row))
+                users.append(with_password(user=user, password=passwords[index]) if index in passwords else user)
+
+        return valid_rows, users
+
+    def persisted(self, *,
+                  rows: List[int],
+                  persist_users_status: Either[Failure, List[Either[Failure, ApplicationUser]]]) -> None:
+        if isinstance(persist_users_status, Failure):
+            persist_users_status = [persist_users_status] * len(rows)
+
+        for row, persist_user_status in zip(rows, persist_users_status):
+            if isinstance(persist_user_status, Failure):
+                self.__failures.append(BulkImportFailure(row=row, error=persist_user_status.error))
+            else:
+                self.__imported += 1
+
+    def build(self) -> BulkImportReport:
+        return BulkImportReport(
+            imported=self.__imported,
+            failures=sorted(self.__failures, key=lambda failure: failure.row)
+        )
+
+
+class BulkAddUsersUseCase(UseCaseInterface):
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig],
+                 persistence: PersistenceInterface,
+                 password_hasher: Maybe[PasswordHasher] = None) -> None:
+        """
+        config as {"chunk_size": 10000, "processes": 8}
+
+        The rows are validated a chunk at a time on a pool of `processes` processes (0 validates them in place)
+        while the already validated chunks are persisted as batches, a few chunks are in flight at most
+        so any number of streamed rows takes about the same memory.
+
+        With a password hasher the passwords are hashed (by its scheme) along with the validation, on the same pool.
+        """
+        config = config or {}
+        self.__scheme: Maybe[PasswordScheme] = password_hasher.scheme if password_hasher is not None else None
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__chunk_size: int = config.get("chunk_size", _default_chunk_size)
+        self.__processes: int = config.get("processes", os.cpu_count() or 1)
+        self.__pool: Maybe[ProcessPoolExecutor] = None
+        self.__pool_lock = Lock()
+        super().__init__(config=config, persistence=persistence)
+
+    def __validation_pool(self) -> Maybe[ProcessPoolExecutor]:
+        if self.__processes <= 0:
+            return None
+
+        with self.__pool_lock:
+            if self.__pool is None:
+                # spawned (not forked) processes, forking a process already running threads isn't safe
+                self.__pool = ProcessPoolExecutor(max_workers=self.__processes, mp_context=get_context("spawn"))
+
+            return self.__pool
+
+    def close(self) -> None:
+        with self.__pool_lock:
+            if self.__pool is not None:
+                self.__pool.shutdown(wait=True)
+                self.__pool = None
+
+    def __in_flight_chunks(self) -> int:
+        return max(2, 2 * self.__processes)
+
+    @exception_handler
+    def execute(self, *, rows: Iterable[Row]) -> Either[Failure, BulkImportReport]:
+        pool = self.__validation_pool()
+        report_builder = _ReportBuilder()
+        pending: deque = deque()
+
+        def persist_oldest_chunk() -> None:
+            first_row, chunk, validation = pending.popleft()
+            valid_rows, users = report_builder.valid_users_of(
+                first_row=first_row,
+                rows=chunk,
+                validation=validation.result()
+            )
+            report_builder.persisted(rows=valid_rows, persist_users_status=self.__persistence.persist_users(
+                users=users
+            ))
+
+        next_row = 1
+        for chunk in _chunks_of(rows=rows, chunk_size=self.__chunk_size):
+            if pool is not None:
+                validation = pool.submit(_validate_chunk, chunk, self.__scheme)
+            else:
+                validation = Future()
+                validation.set_result(_validate_chunk(chunk, self.__scheme))
+            pending.append((next_row, chunk, validation))
+            next_row += len(chunk)
+            if len(pending) >= self.__in_flight_chunks():
+                persist_oldest_chunk()
+        while pending:
+            persist_oldest_chunk()
+
+        return report_builder.build()
+
+    @async_exception_handler
+    async def execute_async(self, *, rows: AsyncIterable[Row]) -> Either[Failure, BulkImportReport]:
+        loop = asyncio.get_running_loop()
+        # without processes the validation still happens off the event loop, on the loop's default threads
+        pool = self.__validation_pool()
+        report_builder = _ReportBuilder()
+        pending: deque = deque()
+
+        async def persist_oldest_chunk() -> None:
+            first_row, chunk, validation = pending.popleft()
+            valid_rows, users = report_builder.valid_users_of(
+                first_row=first_row,
+                rows=chunk,
+                validation=await validation
+            )
+            report_builder.persisted(rows=valid_rows, persist_users_status=await self.__async_persistence.persist_users(
+                users=users
+            ))
+
+        async def submit(chunk: List[Row]) -> None:
+            nonlocal next_row
+            pending.append((next_row, chunk, loop.run_in_executor(pool, _validate_chunk, chunk, self.__scheme)))
+            next_row += len(chunk)
+            if len(pending) >= self.__in_flight_chunks():
+                await persist_oldest_chunk()
+
+        next_row = 1
+        chunk: List[Row] = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.__chunk_size:
+                await submit(chunk)
+                chunk = []
+        if chunk:
+            await submit(chunk)
+        while pending:
+            await persist_oldest_chunk()
+
+        return report_builder.build()
@@ -0,0 +1,55 @@
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Maybe,
+    Either,
+    SimpleConfig,
+    List
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.domain.entity.failure import Failure
+
+_availability_selectors: List[str] = ["name", "email"]
+
+
+class CheckUserAvailabilityUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        True when no user has this name (or email) yet, answered by the persistence's filter alone
+        when it's certainly free and by asking the persistence otherwise.
+        """
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        super().__init__(config=config, persistence=persistence)
+
+    def __answered(self, *, selector: str, data: str) -> Maybe[Either[Failure, bool]]:
+        # the answers needing no storage access (so no trip to the executor), None for the other ones
+        if selector not in _availability_selectors:
+            return Failure(error=f"Availability selector should be within this list {_availability_selectors}")
+        if not self.__persistence.may_have_user(selector=selector, data=data):
+            return True
+
+        return None
+
+    @staticmethod
+    def __availability_of(*, has_user_status: Either[Failure, bool]) -> Either[Failure, bool]:
+        return has_user_status if isinstance(has_user_status, Failure) else not has_user_status
+
+    @exception_handler
+    def execute(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        answer = self.__answered(selector=selector, data=data)
+        if answer is not None:
+            return answer
+
+        return self.__availability_of(has_user_status=self.__persistence.has_user(selector=selector, data=data))
+
+    @async_exception_handler
+    async def execute_async(self, *, selector: str, data: str) -> Either[Failure, bool]:
+        answer = self.__answered(selector=selector, data=data)
+        if answer is not None:
+            return answer
+
+        return self.__availability_of(
+            has_user_status=await self.__async_persistence.has_user(selector=selector, data=data)
+        )
@@ -1,5 +1,8 @@
 from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.sessions import SessionStore
 from src.application.types import (
     Maybe,
     Either,
@@ -7,7 +10,7 @@ from src.application.types import (
     List
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler, call_by_selector
 from src.domain.entity.failure import Failure
 from src.domain.entity.success import Success
 
@@ -15,24 +18,71 @@ _delete_selectors: List[str] = ["id", "name", "email"]
 
 
 class DeleteUserUseCase(UseCaseInterface):
-    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig],
+                 persistence: PersistenceInterface,
+                 principal_cache: Maybe[PrincipalCache] = None,
+                 sessions: Maybe[SessionStore] = None) -> None:
+        """
+        With a principal cache, the cached principal of the deleted user is dropped.
+        With sessions, all the sessions of the deleted user end.
+        """
         self.__persistence = persistence
+        self.__principal_cache = principal_cache
+        self.__sessions = sessions
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
         super().__init__(config=config, persistence=persistence)
 
+    def __forget(self, *,
+                 delete_by_selector: str,
+                 delete_by_data: str,
+                 delete_user_status: Either[Failure, Success]) -> Either[Failure, Success]:
+        if self.__principal_cache is not None and isinstance(delete_user_status, Success):
+            self.__principal_cache.invalidate(selector=delete_by_selector, value=delete_by_data)
+        if self.__sessions is not None and isinstance(delete_user_status, Success):
+            self.__sessions.revoke_user(selector=delete_by_selector, value=delete_by_data)
+
+        return delete_user_status
+
+    @staticmethod
+    def __validate(*, delete_by_selector: str) -> Maybe[Failure]:
+        if delete_by_selector not in _delete_selectors:
+            return Failure(error=f"Delete selector should be within this list {_delete_selectors}")
+
+        return None
+
     @exception_handler
     def execute(self, *,
                 delete_by_selector: str,
                 delete_by_data: str) -> Either[Failure, Success]:
-        if delete_by_selector not in _delete_selectors:
-            return Failure(error=f"Delete selector should be within this list {_delete_selectors}")
+        validation_failure = self.__validate(delete_by_selector=delete_by_selector)
+        if validation_failure is not None:
+            return validation_failure
 
-        selector_mapping = {
-            "id": self.__persistence.delete_user_by.id,
-            "name": self.__persistence.delete_user_by.name,
-            "email": self.__persistence.delete_user_by.email
-        }
+        return self.__forget(
+            delete_by_selector=delete_by_selector,
+            delete_by_data=delete_by_data,
+            delete_user_status=call_by_selector(
+                by=self.__persistence.delete_user_by,
+                selector=delete_by_selector,
+                data=delete_by_data
+            )
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            delete_by_selector: str,
+                            delete_by_data: str) -> Either[Failure, Success]:
+        validation_failure = self.__validate(delete_by_selector=delete_by_selector)
+        if validation_failure is not None:
+            return validation_failure
 
-        delete_user_status: Either[Failure, Success] = selector_mapping[delete_by_selector](
-            **{f"user_{delete_by_selector}": delete_by_data}
+        return self.__forget(
+            delete_by_selector=delete_by_selector,
+            delete_by_data=delete_by_data,
+            delete_user_status=await call_by_selector(
+                by=self.__async_persistence.delete_user_by,
+                selector=delete_by_selector,
+                data=delete_by_data
+            )
         )
-        return delete_user_status
@@ -1,4 +1,10 @@
+from src.application.entity.principal import Principal
+from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.sessions import SessionStore
 from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.types import (
     Maybe,
@@ -6,15 +12,35 @@ from src.application.types import (
     SimpleConfig
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler
 from src.domain.entity.failure import Failure
 
 
+def _principal_of(*, user: ApplicationUser) -> Principal:
+    return Principal(id=user.id, name=user.name, email=user.email, role=user.role, expires_at=None)
+
+
 class FetchAccessTokenUseCase(UseCaseInterface):
     def __init__(self, *,
                  config: Maybe[SimpleConfig],
-                 persistence: PersistenceInterface) -> None:
+                 persistence: PersistenceInterface,
+                 keyring: Maybe[JwtKeyring] = None,
+                 principal_cache: Maybe[PrincipalCache] = None,
+                 sessions: Maybe[SessionStore] = None) -> None:
+        """
+        With a keyring its tokens are authenticated in CPU only, the other (stored) ones still being
+        compared to the stored token of the user.
+
+        With sessions their tokens are authenticated by the token alone (no username needed),
+        the other tokens still needing the username.
+
+        With a principal cache the callers authenticated lately are served from it.
+        """
         self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__keyring = keyring
+        self.__sessions = sessions
+        self.__principal_cache = principal_cache
         super().__init__(config=config, persistence=persistence)
 
     @exception_handler
@@ -22,3 +48,136 @@ class FetchAccessTokenUseCase(UseCaseInterface):
         return self.__persistence.fetch_access_token(
             username=username
         )
+
+    @async_exception_handler
+    async def execute_async(self, *, username: str) -> Either[Failure, AccessToken]:
+        return await self.__async_persistence.fetch_access_token(
+            username=username
+        )
+
+    def __session_of(self, *, username: Maybe[str], token: str) -> Maybe[Either[Failure, Principal]]:
+        # None when it isn't a session token
+        if self.__sessions is None or not self.__sessions.owns(token=token):
+            if username is None:
+                return Failure(error="You should provide username and access-token into the headers.")
+            return None
+
+        principal_status = self.__sessions.authenticate(token=token)
+        if isinstance(principal_status, Principal) and username is not None and principal_status.name != username:
+            return Failure(error=f"Invalid access token for the user {username}")
+
+        return principal_status
+
+    def __verify(self, *, username: str, token: str) -> Either[Failure, Principal]:
+        principal_status = self.__keyring.verify(token=token)
+        if isinstance(principal_status, Principal) and principal_status.name != username:
+            return Failure(error=f"Invalid access token for the user {username}")
+
+        return principal_status
+
+    @staticmethod
+    def __compare(*,
+                  username: str,
+                  token: str,
+                  access_token_status: Either[Failure, AccessToken]) -> Maybe[Failure]:
+        # None when it's the stored token of the user
+        if isinstance(access_token_status, Failure):
+            return access_token_status
+        if access_token_status.token != token:
+            return Failure(error=f"Invalid access token for the user {username}")
+
+        return None
+
+    @staticmethod
+    def __principal_status_of(*, fetch_user_status: Either[Failure, ApplicationUser]) -> Either[Failure, Principal]:
+        if isinstance(fetch_user_status, Failure):
+            return fetch_user_status
+
+        return _principal_of(user=fetch_user_status)
+
+    def __cached(self, *, username: str, token: str) -> Maybe[Principal]:
+        if self.__principal_cache is None:
+            return None
+
+        return self.__principal_cache.get(username=username, token=token)
+
+    def __keep(self, *,
+               username: str,
+               token: str,
+               principal_status: Either[Failure, Principal],
+               generation: Maybe[int]) -> Either[Failure, Principal]:
+        if self.__principal_cache is not None and isinstance(principal_status, Principal):
+            self.__principal_cache.put(
+                username=username,
+                token=token,
+                principal=principal_status,
+                generation=generation
+            )
+
+        return principal_status
+
+    def __authenticated_without_storage(self, *,
+                                        username: Maybe[str],
+                                        token: str) -> Maybe[Either[Failure, Principal]]:
+        # the sessions, the cached principals and the keyring's tokens, None for a stored token
+        session_status = self.__session_of(username=username, token=token)
+        if session_status is not None:
+            return session_status
+
+        cached_principal = self.__cached(username=username, token=token)
+        if cached_principal is not None:
+            return cached_principal
+
+        if self.__keyring is not None and self.__keyring.owns(token=token):
+            generation = self.__generation()
+            return self.__keep(
+                username=username,
+                token=token,
+                principal_status=self.__verify(username=username, token=token),
+                generation=generation
+            )
+
+        return None
+
+    def __generation(self) -> Maybe[int]:
+        return self.__principal_cache.generation() if self.__principal_cache is not None else None
+
+    @exception_handler
+    def authenticate(self, *, username: Maybe[str], token: str) -> Either[Failure, Principal]:
+        principal_status = self.__authenticated_without_storage(username=username, token=token)
+        if principal_status is not None:
+            return principal_status
+
+        generation = self.__generation()
+        principal_status = self.__compare(
+            username=username,
+            token=token,
+            access_token_status=self.__persistence.fetch_access_token(username=username)
+        )
+        if principal_status is None:
+            # the user is only fetched for its stored token
+            principal_status = self.__principal_status_of(
+                fetch_user_status=self.__persistence.fetch_user_by.name(user_name=username)
+            )
+
+        return self.__keep(username=username, token=token, principal_status=principal_status, generation=generation)
+
+    @async_exception_handler
+    async def authenticate_async(self, *, username: Maybe[str], token: str) -> Either[Failure, Principal]:
+        # no await (so no trip to the executor) for the sessions, the cached principals and the keyring's tokens
+        principal_status = self.__authenticated_without_storage(username=username, token=token)
+        if principal_status is not None:
+            return principal_status
+
+        generation = self.__generation()
+        principal_status = self.__compare(
+            username=username,
+            token=token,
+            access_token_status=await self.__async_persistence.fetch_access_token(username=username)
+        )
+        if principal_status is None:
+            principal_status = self.__principal_status_of(
+                fetch_user_status=await self.__async_persistence.fetch_user_by.name(user_name=username)
+            )
+
+        return self.__keep(username=username, token=token, principal_status=principal_status, generation=generation)
@@ -1,5 +1,6 @@
 from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
 from src.application.types import (
     Maybe,
     Either,
@@ -7,7 +8,7 @@ from src.application.types import (
     List
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler, call_by_selector
 from src.domain.entity.failure import Failure
 
 _fetch_selectors: List[str] = ["id", "name", "email"]
@@ -16,22 +17,36 @@ _fetch_selectors: List[str] = ["id", "name", "email"]
 class FetchUserUseCase(UseCaseInterface):
     def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
         self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
         super().__init__(config=config, persistence=persistence)
 
+    @staticmethod
+    def __validate(*, fetch_by_selector: str) -> Maybe[Failure]:
+        if fetch_by_selector not in _fetch_selectors:
+            return Failure(error=f"Fetch selector should be within this list {_fetch_selectors}")
+
+        return None
+
     @exception_handler
     def execute(self, *,
                 fetch_by_selector: str,
                 fetch_by_data: str) -> Either[Failure, ApplicationUser]:
-        if fetch_by_selector not in _fetch_selectors:
-            return Failure(error=f"Fetch selector should be within this list {_fetch_selectors}")
+        validation_failure = self.__validate(fetch_by_selector=fetch_by_selector)
+        if validation_failure is not None:
+            return validation_failure
+
+        return call_by_selector(by=self.__persistence.fetch_user_by, selector=fetch_by_selector, data=fetch_by_data)
 
-        selector_mapping = {
-            "id": self.__persistence.fetch_user_by.id,
-            "name": self.__persistence.fetch_user_by.name,
-            "email": self.__persistence.fetch_user_by.email
-        }
+    @async_exception_handler
+    async def execute_async(self, *,
+                            fetch_by_selector: str,
+                            fetch_by_data: str) -> Either[Failure, ApplicationUser]:
+        validation_failure = self.__validate(fetch_by_selector=fetch_by_selector)
+        if validation_failure is not None:
+            return validation_failure
 
-        fetch_user_status: Either[Failure, ApplicationUser] = selector_mapping[fetch_by_selector](
-            **{f"user_{fetch_by_selector}": fetch_by_data}
+        return await call_by_selector(
+            by=self.__async_persistence.fetch_user_by,
+            selector=fetch_by_selector,
+            data=fetch_by_data
         )
-        return fetch_user_status
@@ -0,0 +1,63 @@
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Maybe,
+    Either,
+    SimpleConfig,
+    List
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.functions import exception_handler, async_exception_handler, call_by_selector
+from src.domain.entity.failure import Failure
+
+_fetch_selectors: List[str] = ["id", "name", "email"]
+_default_max_users = 1000
+
+
+class FetchUsersUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_users": 1000}
+        """
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__max_users: int = (config or {}).get("max_users", _default_max_users)
+        super().__init__(config=config, persistence=persistence)
+
+    def __validate(self, *, fetch_by_selector: str, fetch_by_data: List[str]) -> Maybe[Failure]:
+        if fetch_by_selector not in _fetch_selectors:
+            return Failure(error=f"Fetch selector should be within this list {_fetch_selectors}")
+        if len(fetch_by_data) > self.__max_users:
+            return Failure(error=f"At most {self.__max_users} users can be fetched at once.")
+
+        return None
+
+    @exception_handler
+    def execute(self, *,
+                fetch_by_selector: str,
+                fetch_by_data: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        validation_status = self.__validate(fetch_by_selector=fetch_by_selector, fetch_by_data=fetch_by_data)
+        if validation_status is not None:
+            return validation_status
+
+        # the batch lookups are the plural ones, fetch_user_by.ids(user_ids=...)
+        return call_by_selector(
+            by=self.__persistence.fetch_user_by,
+            selector=f"{fetch_by_selector}s",
+            data=fetch_by_data
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            fetch_by_selector: str,
+                            fetch_by_data: List[str]) -> Either[Failure, List[Either[Failure, ApplicationUser]]]:
+        validation_status = self.__validate(fetch_by_selector=fetch_by_selector, fetch_by_data=fetch_by_data)
+        if validation_status is not None:
+            return validation_status
+
+        return await call_by_selector(
+            by=self.__async_persistence.fetch_user_by,
+            selector=f"{fetch_by_selector}s",
+            data=fetch_by_data
+        )
@@ -0,0 +1,71 @@
+from src.application.entity.user import ApplicationUser
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Maybe,
+    Either,
+    SimpleConfig,
+    List
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.cursor import to_cursor, from_cursor
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.domain.entity.failure import Failure
+
+_default_max_limit = 100
+
+
+class ListUsersUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_limit": 100}
+        """
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__max_limit: int = (config or {}).get("max_limit", _default_max_limit)
+        super().__init__(config=config, persistence=persistence)
+
+    def __validate(self, *, cursor: Maybe[str], limit: int) -> Either[Failure, Maybe[str]]:
+        if not 1 <= limit <= self.__max_limit:
+            return Failure(error=f"limit should be between 1 and {self.__max_limit}.")
+        if cursor is None:
+            return None
+
+        after_id = from_cursor(cursor=cursor)
+        return after_id if after_id is not None else Failure(error=f"Invalid cursor {cursor}")
+
+    def __page_of(self, *,
+                  list_users_status: Either[Failure, List[ApplicationUser]],
+                  limit: int) -> Either[Failure, UsersPage]:
+        if isinstance(list_users_status, Failure):
+            return list_users_status
+
+        # one more user than asked tells whether there's a next page without another call
+        users = list_users_status[:limit]
+        return UsersPage(
+            users=users,
+            next_cursor=to_cursor(user_id=users[-1].id) if len(list_users_status) > limit else None
+        )
+
+    @exception_handler
+    def execute(self, *, cursor: Maybe[str], limit: int) -> Either[Failure, UsersPage]:
+        after_id = self.__validate(cursor=cursor, limit=limit)
+        if isinstance(after_id, Failure):
+            return after_id
+
+        return self.__page_of(
+            list_users_status=self.__persistence.list_users(after_id=after_id, limit=limit + 1),
+            limit=limit
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *, cursor: Maybe[str], limit: int) -> Either[Failure, UsersPage]:
+        after_id = self.__validate(cursor=cursor, limit=limit)
+        if isinstance(after_id, Failure):
+            return after_id
+
+        return self.__page_of(
+            list_users_status=await self.__async_persistence.list_users(after_id=after_id, limit=limit + 1),
+            limit=limit
+        )
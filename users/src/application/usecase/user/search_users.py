@@ -0,0 +1,96 @@
+from src.application.entity.user import ApplicationUser
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Any,
+    Dict,
+    Maybe,
+    Either,
+    SimpleConfig,
+    List
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.cursor import to_cursor, from_cursor
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_default_max_limit = 100
+
+
+class SearchUsersUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_limit": 100}
+        """
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__max_limit: int = (config or {}).get("max_limit", _default_max_limit)
+        super().__init__(config=config, persistence=persistence)
+
+    def __validate(self, *,
+                   role: Maybe[str],
+                   age_gte: Maybe[int],
+                   age_lte: Maybe[int],
+                   cursor: Maybe[str],
+                   limit: int) -> Either[Failure, Dict[str, Any]]:
+        if not 1 <= limit <= self.__max_limit:
+            return Failure(error=f"limit should be between 1 and {self.__max_limit}.")
+        if role is not None and role not in UserRole.__members__:
+            return Failure(error=f"role should be within this list {list(UserRole.__members__)}.")
+        if age_gte is not None and age_lte is not None and age_gte > age_lte:
+            return Failure(error="age_gte should not be greater than age_lte.")
+
+        after_id = from_cursor(cursor=cursor) if cursor is not None else None
+        if cursor is not None and after_id is None:
+            return Failure(error=f"Invalid cursor {cursor}")
+
+        return dict(
+            role=UserRole[role] if role is not None else None,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit + 1  # one more user than asked tells whether there's a next page
+        )
+
+    def __page_of(self, *,
+                  search_users_status: Either[Failure, List[ApplicationUser]],
+                  limit: int) -> Either[Failure, UsersPage]:
+        if isinstance(search_users_status, Failure):
+            return search_users_status
+
+        users = search_users_status[:limit]
+        return UsersPage(
+            users=users,
+            next_cursor=to_cursor(user_id=users[-1].id) if len(search_users_status) > limit else None
+        )
+
+    @exception_handler
+    def execute(self, *,
+                role: Maybe[str],
+                age_gte: Maybe[int],
+                age_lte: Maybe[int],
+                cursor: Maybe[str],
+                limit: int) -> Either[Failure, UsersPage]:
+        search = self.__validate(role=role, age_gte=age_gte, age_lte=age_lte, cursor=cursor, limit=limit)
+        if isinstance(search, Failure):
+            return search
+
+        return self.__page_of(search_users_status=self.__persistence.search_users(**search), limit=limit)
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            role: Maybe[str],
+                            age_gte: Maybe[int],
+                            age_lte: Maybe[int],
+                            cursor: Maybe[str],
+                            limit: int) -> Either[Failure, UsersPage]:
+        search = self.__validate(role=role, age_gte=age_gte, age_lte=age_lte, cursor=cursor, limit=limit)
+        if isinstance(search, Failure):
+            return search
+
+        return self.__page_of(
+            search_users_status=await self.__async_persistence.search_users(**search),
+            limit=limit
+        )
@@ -0,0 +1,108 @@
+from src.application.entity.user import ApplicationUser
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.infrastructure.persistence.indexes import prefix_indexes
+from src.application.types import (
+    Any,
+    Dict,
+    Maybe,
+    Either,
+    SimpleConfig,
+    List
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.cursor import to_keyed_cursor, from_keyed_cursor
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.domain.entity.failure import Failure
+
+_default_max_limit = 100
+_search_selectors = list(prefix_indexes)
+
+
+def _to_key_prefix(*, selector: str, prefix: str) -> str:
+    # the searched text normalized like the indexed values, a domain is searched as an email without its local part
+    if selector == "email_domain":
+        return prefix_indexes[selector].normalize(f"@{prefix.lstrip('@')}")
+
+    return prefix_indexes[selector].normalize(prefix)
+
+
+class SearchUsersByPrefixUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_limit": 100}
+
+        "name" searches the (case insensitive) beginning of the names,
+        "email_domain" the users at a domain ("corp.com" or "@corp.com", case insensitive too).
+        """
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__max_limit: int = (config or {}).get("max_limit", _default_max_limit)
+        super().__init__(config=config, persistence=persistence)
+
+    def __validate(self, *,
+                   selector: str,
+                   prefix: str,
+                   cursor: Maybe[str],
+                   limit: int) -> Either[Failure, Dict[str, Any]]:
+        if selector not in prefix_indexes:
+            return Failure(error=f"Search selector should be within this list {_search_selectors}")
+        if not prefix.lstrip("@"):
+            return Failure(error="The searched prefix should not be empty.")
+        if not 1 <= limit <= self.__max_limit:
+            return Failure(error=f"limit should be between 1 and {self.__max_limit}.")
+
+        after = from_keyed_cursor(cursor=cursor) if cursor is not None else (None, None)
+        if after is None:
+            return Failure(error=f"Invalid cursor {cursor}")
+
+        return dict(
+            selector=selector,
+            prefix=_to_key_prefix(selector=selector, prefix=prefix),
+            after_key=after[0],
+            after_id=after[1],
+            limit=limit + 1  # one more user than asked tells whether there's a next page
+        )
+
+    def __page_of(self, *,
+                  selector: str,
+                  search_users_status: Either[Failure, List[ApplicationUser]],
+                  limit: int) -> Either[Failure, UsersPage]:
+        if isinstance(search_users_status, Failure):
+            return search_users_status
+
+        users = search_users_status[:limit]
+        next_cursor = to_keyed_cursor(
+            key=prefix_indexes[selector].key_of(user=users[-1]),
+            user_id=users[-1].id
+        ) if len(search_users_status) > limit else None
+        return UsersPage(users=users, next_cursor=next_cursor)
+
+    @exception_handler
+    def execute(self, *, selector: str, prefix: str, cursor: Maybe[str], limit: int) -> Either[Failure, UsersPage]:
+        search = self.__validate(selector=selector, prefix=prefix, cursor=cursor, limit=limit)
+        if isinstance(search, Failure):
+            return search
+
+        return self.__page_of(
+            selector=selector,
+            search_users_status=self.__persistence.search_users_by_prefix(**search),
+            limit=limit
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            selector: str,
+                            prefix: str,
+                            cursor: Maybe[str],
+                            limit: int) -> Either[Failure, UsersPage]:
+        search = self.__validate(selector=selector, prefix=prefix, cursor=cursor, limit=limit)
+        if isinstance(search, Failure):
+            return search
+
+        return self.__page_of(
+            selector=selector,
+            search_users_status=await self.__async_persistence.search_users_by_prefix(**search),
+            limit=limit
+        )
@@ -0,0 +1,121 @@
+from heapq import heappush, heapreplace
+from math import floor
+
+from src.application.entity.user import ApplicationUser
+from src.application.entity.user_suggestion import UserSuggestion
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.types import (
+    Maybe,
+    Either,
+    SimpleConfig,
+    List,
+    Tuple
+)
+from src.application.usecase import UseCaseInterface
+from src.application.utilities.functions import exception_handler, async_exception_handler
+from src.application.utilities.text import trigrams_of, trigram_similarity, edit_distance
+from src.domain.entity.failure import Failure
+
+_default_max_limit = 20
+_default_candidates = 100
+_min_name_length = 3
+
+
+def _rank(*, name: str, candidates: List[ApplicationUser], limit: int) -> List[UserSuggestion]:
+    """
+    The score of a candidate is the mean of its trigram similarity and its edit similarity
+    (1 - the edit distance over the longest name), the best `limit` ones are kept in a min heap
+    so a candidate that can't beat the worst kept one has its edit distance given up early.
+    """
+    query = name.casefold()
+    query_trigrams = trigrams_of(name)
+    best: List[Tuple[float, int, ApplicationUser]] = []  # the worst one of the best ones first
+    for position, user in enumerate(candidates):
+        candidate = user.name.casefold()
+        trigram_score = trigram_similarity(query_trigrams, trigrams_of(user.name))
+        longest = max(len(query), len(candidate), 1)
+        max_distance = longest
+        if len(best) == limit:
+            # the edit distance over which it can't be better than the worst kept one
+            max_distance = floor((1 - (2 * best[0][0] - trigram_score)) * longest)
+            if max_distance < 0:
+                continue
+
+        distance = edit_distance(query, candidate, max_distance)
+        if distance > max_distance:
+            continue
+        # (the earlier candidates, sharing more trigrams, win the ties)
+        suggestion = ((trigram_score + 1 - distance / longest) / 2, -position, user)
+        if len(best) < limit:
+            heappush(best, suggestion)
+        elif suggestion[:2] > best[0][:2]:
+            heapreplace(best, suggestion)
+
+    return [
+        UserSuggestion(user=user, score=score)
+        for score, _, user in sorted(best, key=lambda suggestion: suggestion[:2], reverse=True)
+    ]
+
+
+class SuggestUsersUseCase(UseCaseInterface):
+    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+        """
+        config as {"max_limit": 20, "candidates": 100}
+
+        The "did you mean" of a name, the persistence gives the `candidates` users sharing the most trigrams with it
+        (from its trigram index, in a bounded time) and only these are ranked.
+        """
+        config = config or {}
+        self.__persistence = persistence
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
+        self.__max_limit: int = config.get("max_limit", _default_max_limit)
+        self.__candidates: int = config.get("candidates", _default_candidates)
+        super().__init__(config=config, persistence=persistence)
+
+    def __validate(self, *, name: str, limit: int) -> Maybe[Failure]:
+        if len(name.strip()) < _min_name_length:
+            return Failure(error=f"name should be at least {_min_name_length} characters long.")
+        if not 1 <= limit <= self.__max_limit:
+            return Failure(error=f"limit should be between 1 and {self.__max_limit}.")
+
+        return None
+
+    def __suggestions_of(self, *,
+                         name: str,
+                         candidates_status: Either[Failure, List[ApplicationUser]],
+                         limit: int) -> Either[Failure, List[UserSuggestion]]:
+        if isinstance(candidates_status, Failure):
+            return candidates_status
+
+        return _rank(name=name.strip(), candidates=candidates_status, limit=limit)
+
+    @exception_handler
+    def execute(self, *, name: str, limit: int) -> Either[Failure, List[UserSuggestion]]:
+        validation_failure = self.__validate(name=name, limit=limit)
+        if validation_failure is not None:
+            return validation_failure
+
+        return self.__suggestions_of(
+            name=name,
+            candidates_status=self.__persistence.search_users_by_similar_name(
+                name=name.strip(),
+                limit=max(self.__candidates, limit)
+            ),
+            limit=limit
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *, name: str, limit: int) -> Either[Failure, List[UserSuggestion]]:
+        validation_failure = self.__validate(name=name, limit=limit)
+        if validation_failure is not None:
+            return validation_failure
+
+        return self.__suggestions_of(
+            name=name,
+            candidates_status=await self.__async_persistence.search_users_by_similar_name(
+                name=name.strip(),
+                limit=max(self.__candidates, limit)
+            ),
+            limit=limit
+        )
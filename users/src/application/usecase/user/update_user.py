@@ -1,5 +1,9 @@
 from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.hashing import PasswordHasher
 from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.sessions import SessionStore
 from src.application.types import (
     Maybe,
     Either,
@@ -7,7 +11,8 @@ from src.application.types import (
     List
 )
 from src.application.usecase import UseCaseInterface
-from src.application.utilities.functions import exception_handler
+from src.application.utilities.functions import exception_handler, async_exception_handler, call_by_selector
+from src.application.utilities.user import with_hashed_password
 from src.domain.entity.failure import Failure
 from src.domain.entity.success import Success
 from src.domain.entity.user import DomainUser
@@ -16,25 +21,94 @@ _update_selectors: List[str] = ["id", "name", "email"]
 
 
 class UpdateUserUseCase(UseCaseInterface):
-    def __init__(self, *, config: Maybe[SimpleConfig], persistence: PersistenceInterface) -> None:
+    def __init__(self, *,
+                 config: Maybe[SimpleConfig],
+                 persistence: PersistenceInterface,
+                 principal_cache: Maybe[PrincipalCache] = None,
+                 password_hasher: Maybe[PasswordHasher] = None,
+                 sessions: Maybe[SessionStore] = None) -> None:
+        """
+        With a principal cache, the cached principal of the updated user is dropped.
+        With a password hasher only the hash of the new password is stored.
+        With sessions, the sessions of the updated user go on as the updated user.
+        """
         self.__persistence = persistence
+        self.__principal_cache = principal_cache
+        self.__sessions = sessions
+        self.__password_hasher = password_hasher
+        self.__async_persistence = ExecutorAsyncPersistence.of(persistence=persistence)
         super().__init__(config=config, persistence=persistence)
 
+    def __forget(self, *,
+                 update_by_selector: str,
+                 update_by_data: str,
+                 update_user_status: Either[Failure, ApplicationUser]) -> Either[Failure, ApplicationUser]:
+        if self.__principal_cache is not None and isinstance(update_user_status, ApplicationUser):
+            self.__principal_cache.invalidate(selector=update_by_selector, value=update_by_data)
+            # renamed users are still found by their id
+            self.__principal_cache.invalidate(selector="id", value=update_user_status.id)
+        if self.__sessions is not None and isinstance(update_user_status, ApplicationUser):
+            self.__sessions.refresh(user=update_user_status)
+
+        return update_user_status
+
+    @staticmethod
+    def __validate(*, update_by_selector: str) -> Maybe[Failure]:
+        if update_by_selector not in _update_selectors:
+            return Failure(error=f"Update selector should be within this list {_update_selectors}")
+
+        return None
+
     @exception_handler
     def execute(self, *,
                 update_by_selector: str,
                 update_by_data: str,
                 updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
-        if update_by_selector not in _update_selectors:
-            return Failure(error=f"Update selector should be within this list {_update_selectors}")
+        validation_failure = self.__validate(update_by_selector=update_by_selector)
+        if validation_failure is not None:
+            return validation_failure
+        if self.__password_hasher is not None:
+            updated_user = with_hashed_password(
+                user=updated_user,
+                hash_password_status=self.__password_hasher.hash(password=updated_user.password)
+            )
+            if isinstance(updated_user, Failure):
+                return updated_user
 
-        selector_mapping = {
-            "id": self.__persistence.update_user_by.id,
-            "name": self.__persistence.update_user_by.name,
-            "email": self.__persistence.update_user_by.email
-        }
+        return self.__forget(
+            update_by_selector=update_by_selector,
+            update_by_data=update_by_data,
+            update_user_status=call_by_selector(
+                by=self.__persistence.update_user_by,
+                selector=update_by_selector,
+                data=update_by_data,
+                updated_user=updated_user
+            )
+        )
+
+    @async_exception_handler
+    async def execute_async(self, *,
+                            update_by_selector: str,
+                            update_by_data: str,
+                            updated_user: DomainUser) -> Either[Failure, ApplicationUser]:
+        validation_failure = self.__validate(update_by_selector=update_by_selector)
+        if validation_failure is not None:
+            return validation_failure
+        if self.__password_hasher is not None:
+            updated_user = with_hashed_password(
+                user=updated_user,
+                hash_password_status=await self.__password_hasher.hash_async(password=updated_user.password)
+            )
+            if isinstance(updated_user, Failure):
+                return updated_user
 
-        update_user_status: Either[Failure, ApplicationUser] = selector_mapping[update_by_selector](
-            **{f"user_{update_by_selector}": update_by_data, "updated_user": updated_user}
+        return self.__forget(
+            update_by_selector=update_by_selector,
+            update_by_data=update_by_data,
+            update_user_status=await call_by_selector(
+                by=self.__async_persistence.update_user_by,
+                selector=update_by_selector,
+                data=update_by_data,
+                updated_user=updated_user
+            )
         )
-        return update_user_status
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from src.application.entity.cache_stats import CacheStats
+from src.application.types import (
+    Any,
+    Callable,
+    Hashable,
+    Maybe
+)
+
+
+class TtlLruCache:
+    """
+    At most `max_size` values, the least recently used one making room for a new one,
+    and none served once older than `ttl` seconds (None for no expiry).
+
+    Every operation is O(1) under one lock, so it can be shared by the threads of the executor.
+    """
+
+    def __init__(self, *, max_size: int, ttl: Maybe[float], clock: Callable[[], float] = monotonic) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size should be at least 1, got {max_size}")
+
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries: 'OrderedDict[Hashable, Any]' = OrderedDict()  # key -> (expires_at, value)
+        self.__lock = Lock()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    def get(self, key: Hashable) -> Maybe[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if entry is not None and entry[0] is not None and entry[0] <= self.__clock():
+                del self.__entries[key]
+                self.__expirations += 1
+                entry = None
+
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        # taken before reading the source of a value, see put
+        with self.__lock:
+            return self.__generation
+
+    def put(self, key: Hashable, value: Any, *, generation: Maybe[int] = None) -> bool:
+        """
+        Keeps `value` unless an invalidation happened since `generation` was taken,
+        the value read before it may already be stale (a read racing with a write) and is better not kept.
+        """
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return False
+
+            self.__entries[key] = (self.__clock() + self.__ttl if self.__ttl is not None else None, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+            return True
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self.__lock:
+            self.__generation += 1
+            for key in keys:
+                if self.__entries.pop(key, None) is not None:
+                    self.__invalidations += 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__invalidations += len(self.__entries)
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                expirations=self.__expirations,
+                invalidations=self.__invalidations,
+                size=len(self.__entries),
+                max_size=self.__max_size
+            )
@@ -0,0 +1,42 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from src.application.types import Maybe, Tuple
+
+_cursor_prefix = "after:"
+
+
+def to_cursor(*, user_id: str) -> str:
+    # opaque for the clients, it's just the last id they've seen
+    return urlsafe_b64encode(f"{_cursor_prefix}{user_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def from_cursor(*, cursor: str) -> Maybe[str]:
+    try:
+        decoded = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        return None
+
+    user_id = decoded[len(_cursor_prefix):]
+    if not decoded.startswith(_cursor_prefix) or not (user_id.isascii() and user_id.isdigit()):
+        return None
+
+    return user_id
+
+
+def to_keyed_cursor(*, key: str, user_id: str) -> str:
+    # for the pages ordered by (key, id), the id first since it can't have the separator
+    return to_cursor(user_id=f"{user_id}:{key}")
+
+
+def from_keyed_cursor(*, cursor: str) -> Maybe[Tuple[str, str]]:
+    try:
+        decoded = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        return None
+
+    user_id, separator, key = decoded[len(_cursor_prefix):].partition(":")
+    if not decoded.startswith(_cursor_prefix) or not separator or not (user_id.isascii() and user_id.isdigit()):
+        return None
+
+    return key, user_id
@@ -3,6 +3,7 @@ from jsonschema import ValidationError
 from src.application.types import (
     Callable,
     Any,
+    Awaitable,
     Either
 )
 from src.domain.entity.failure import Failure
@@ -18,3 +19,21 @@ def exception_handler(func: Callable[..., Any]) -> Callable[..., Any]:
             return Failure(error=str(ex))
 
     return __wrapper
+
+
+def async_exception_handler(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    async def __wrapper(*args, **kwargs) -> Either[Failure, Any]:
+        try:
+            return await func(*args, **kwargs)
+        except ValidationError as ex:
+            return Failure(error=str(ex).split("\n")[0].strip())
+        except Exception as ex:
+            return Failure(error=str(ex))
+
+    return __wrapper
+
+
+def call_by_selector(*, by: Any, selector: str, data: Any, **kwargs) -> Any:
+    # by.<selector>(user_<selector>=data), a coroutine when `by` is an async persistence's,
+    # so the sync and async versions of a use case only differ in awaiting it
+    return getattr(by, selector)(**{f"user_{selector}": data}, **kwargs)
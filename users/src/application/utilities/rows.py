@@ -0,0 +1,96 @@
+import csv
+import json
+
+from src.application.types import (
+    Any,
+    Dict,
+    List,
+    Maybe,
+    Either,
+    Iterable,
+    Iterator,
+    AsyncIterable,
+    AsyncIterator
+)
+from src.domain.entity.failure import Failure
+
+Row = Either[Failure, Dict[str, Any]]
+
+formats = ("ndjson", "csv")
+# bytes, a longer line of a streamed content is a Failure row rather than an ever growing buffer
+max_line_length = 64 * 1024
+
+
+class RowsParser:
+    """
+    Turns the lines of a NDJSON (one json object per line) or a CSV (with a header line) content into rows,
+    a line that can't be parsed becomes a Failure row instead of stopping the rest.
+    Every CSV record should be on its own line, the lines are parsed one by one as they're streamed.
+    """
+
+    def __init__(self, *, content_format: str) -> None:
+        if content_format not in formats:
+            raise ValueError(f"Format should be within this list {list(formats)}")
+        self.__content_format = content_format
+        self.__header: Maybe[List[str]] = None
+
+    def parse(self, *, line: str) -> Maybe[Row]:
+        line = line.strip()
+        if line == "":
+            return None
+
+        if self.__content_format == "ndjson":
+            try:
+                row = json.loads(line)
+            except ValueError as ex:
+                return Failure(error=f"Invalid json line, {ex}")
+            return row if isinstance(row, dict) else Failure(error="Every json line should be an object.")
+
+        values = next(csv.reader([line]))
+        if self.__header is None:
+            self.__header = [column.strip() for column in values]
+            return None
+        if len(values) != len(self.__header):
+            return Failure(error=f"Expected {len(self.__header)} columns but found {len(values)}.")
+
+        # empty csv cells are missing values
+        return {column: value for column, value in zip(self.__header, values) if value != ""}
+
+
+def rows_of(*, lines: Iterable[str], content_format: str) -> Iterator[Row]:
+    parser = RowsParser(content_format=content_format)
+    for line in lines:
+        row = parser.parse(line=line)
+        if row is not None:
+            yield row
+
+
+async def async_rows_of(*,
+                        chunks: AsyncIterable[bytes],
+                        content_format: str,
+                        max_line_length: int = max_line_length) -> AsyncIterator[Row]:
+    # the chunks (of a streamed request body for example) are cut anywhere, lines are put back together here,
+    # a line longer than `max_line_length` bytes becomes a Failure row and is skipped up to its newline
+    parser = RowsParser(content_format=content_format)
+    too_long = Failure(error=f"Every line should be at most {max_line_length} bytes long.")
+    rest = b""
+    skipping = False
+    async for chunk in chunks:
+        if skipping:
+            newline = chunk.find(b"\n")
+            if newline == -1:
+                continue
+            chunk, skipping = chunk[newline + 1:], False
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            row = parser.parse(line=line.decode("utf-8", "replace")) if len(line) <= max_line_length else too_long
+            if row is not None:
+                yield row
+        if len(rest) > max_line_length:
+            yield too_long
+            rest, skipping = b"", True
+
+    row = parser.parse(line=rest.decode("utf-8", "replace"))
+    if row is not None:
+        yield row
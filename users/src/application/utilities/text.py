@@ -0,0 +1,46 @@
+from src.application.types import (
+    FrozenSet,
+    Maybe
+)
+
+
+def trigrams_of(text: str) -> FrozenSet[str]:
+    # case insensitive, padded so the beginning and the end of a text have their own trigrams (like pg_trgm)
+    padded = f"  {text.casefold()} "
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+def trigram_similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    # the dice coefficient, 1.0 for the same trigrams and 0.0 for none in common
+    if not first and not second:
+        return 1.0
+
+    return 2 * len(first & second) / (len(first) + len(second))
+
+
+def edit_distance(first: str, second: str, max_distance: Maybe[int] = None) -> int:
+    """
+    The Levenshtein distance, or max_distance + 1 as soon as it's known to be over max_distance
+    (a whole row of the table over it), so the candidates far from a bound are given up early.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    if max_distance is None:
+        max_distance = len(first)
+    if len(first) - len(second) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row] + [0] * len(second)
+        for column, second_char in enumerate(second, start=1):
+            current[column] = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (first_char != second_char)
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return min(previous[-1], max_distance + 1)
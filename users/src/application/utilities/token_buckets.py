@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from src.application.entity.rate_limit_stats import RateLimitStats
+from src.application.types import (
+    Callable,
+    Hashable,
+    List
+)
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets", "allowed", "limited", "evictions")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.buckets: 'OrderedDict[Hashable, List[float]]' = OrderedDict()  # key -> [tokens, refilled_at]
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+
+
+class TokenBuckets:
+    """
+    A token bucket per key, refilled by `rate` tokens a second up to `burst`, so a key gets `burst` calls at once
+    then `rate` calls a second.
+
+    The keys are spread over `shards` shards (each one with its own lock, so the threads rarely wait for each other)
+    and at most `max_buckets` buckets are kept, the least recently used one of a shard making room for a new one.
+    A dropped bucket starts full again, which only matters for a key idle long enough to be the oldest.
+    """
+
+    def __init__(self, *,
+                 rate: float,
+                 burst: float,
+                 max_buckets: int,
+                 shards: int = 16,
+                 clock: Callable[[], float] = monotonic) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"rate should be positive and burst at least 1, got {rate} and {burst}")
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__shards = [_Shard() for _ in range(max(1, shards))]
+        self.__max_per_shard = max(1, max_buckets // len(self.__shards))
+        self.__clock = clock
+
+    def take(self, *, key: Hashable, tokens: float = 1.0) -> float:
+        """
+        0 when the tokens were taken, otherwise the seconds to wait for them (nothing being taken).
+        """
+        shard = self.__shards[hash(key) % len(self.__shards)]
+        now = self.__clock()
+        with shard.lock:
+            bucket = shard.buckets.get(key, None)
+            if bucket is None:
+                bucket = shard.buckets[key] = [self.__burst, now]
+                if len(shard.buckets) > self.__max_per_shard:
+                    shard.buckets.popitem(last=False)
+                    shard.evictions += 1
+            else:
+                shard.buckets.move_to_end(key)
+                bucket[0] = min(self.__burst, bucket[0] + (now - bucket[1]) * self.__rate)
+                bucket[1] = now
+
+            if bucket[0] < tokens:
+                shard.limited += 1
+                return (tokens - bucket[0]) / self.__rate
+
+            bucket[0] -= tokens
+            shard.allowed += 1
+            return 0.0
+
+    @property
+    def stats(self) -> RateLimitStats:
+        allowed = limited = evictions = buckets = 0
+        for shard in self.__shards:
+            with shard.lock:
+                allowed += shard.allowed
+                limited += shard.limited
+                evictions += shard.evictions
+                buckets += len(shard.buckets)
+
+        return RateLimitStats(
+            allowed=allowed,
+            limited=limited,
+            evictions=evictions,
+            buckets=buckets,
+            max_buckets=self.__max_per_shard * len(self.__shards)
+        )
@@ -1,5 +1,8 @@
 from src.application.entity.user import ApplicationUser
 from src.application.infrastructure.web.entity.user_json import UserJson
+from src.application.types import Either
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import DomainUser
 
 
 def from_application_user_to_json_user(*, application_user: ApplicationUser) -> UserJson:
@@ -10,3 +13,17 @@ def from_application_user_to_json_user(*, application_user: ApplicationUser) ->
         email=application_user.email,
         role=application_user.role
     )
+
+
+def with_password(*, user: Either[DomainUser, ApplicationUser], password: str) -> DomainUser:
+    # the same user with another (the hashed) password
+    return DomainUser(name=user.name, age=user.age, password=password, email=user.email, role=user.role)
+
+
+def with_hashed_password(*,
+                         user: Either[DomainUser, ApplicationUser],
+                         hash_password_status: Either[Failure, str]) -> Either[Failure, DomainUser]:
+    if isinstance(hash_password_status, Failure):
+        return hash_password_status
+
+    return with_password(user=user, password=hash_password_status)
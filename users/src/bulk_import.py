@@ -0,0 +1,65 @@
+"""
+Imports users from a NDJSON (one json object per line) or a CSV (with a header line) file into the store
+configured by the same environment variables as the service (see main.create_persistence).
+
+usage: python src/bulk_import.py users.ndjson [--format ndjson] [--chunk-size 10000] [--processes 8]
+       [--failures failures.ndjson]
+       cat users.csv | python src/bulk_import.py - --format csv
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from src.application.entity.bulk_import import BulkImportReport
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.utilities.rows import formats, rows_of
+from src.main import create_password_hasher, create_persistence
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk users import")
+    parser.add_argument("path", help="the file to import, - reads the standard input")
+    parser.add_argument("--format", choices=formats, default=None, help="inferred from the file extension if missing")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="0 validates in this process")
+    parser.add_argument("--failures", default=None, help="writes the failed rows there, one json per line")
+    args = parser.parse_args()
+
+    content_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    db = create_persistence()
+    bulk_add_users_usecase = BulkAddUsersUseCase(
+        config=dict(chunk_size=args.chunk_size, processes=args.processes),
+        persistence=db,
+        # hashed like the service does (by the validation processes)
+        password_hasher=create_password_hasher()
+    )
+
+    started = time.perf_counter()
+    try:
+        with (sys.stdin if args.path == "-" else open(args.path, newline="")) as lines:
+            report = bulk_add_users_usecase.execute(rows=rows_of(lines=lines, content_format=content_format))
+    finally:
+        bulk_add_users_usecase.close()
+        if hasattr(db, "close"):
+            db.close()
+    elapsed = time.perf_counter() - started
+
+    if not isinstance(report, BulkImportReport):
+        print(report.error, file=sys.stderr)
+        return 1
+
+    if args.failures is not None:
+        with open(args.failures, "w") as failures:
+            for failure in report.failures:
+                failures.write(json.dumps(failure.as_dict()) + "\n")
+
+    print(f"imported {report.imported} users, {len(report.failures)} failed rows in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
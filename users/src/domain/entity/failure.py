@@ -1,10 +1,12 @@
 import marshmallow_dataclass
 
-from src.domain.types import dataclass, Dict
+from src.domain.types import dataclass, Dict, FrozenSlots
 
 
 @dataclass(frozen=True)
-class Failure:
+class Failure(FrozenSlots):
+    __slots__ = ("error",)
+
     error: str
 
     def as_dict(self) -> Dict[str, str]:
@@ -1,2 +1,4 @@
 class Success:
+    __slots__ = ()
+
     def as_dict(self): return {"status": "ok"}
@@ -15,6 +15,7 @@ from src.domain.types import (
     List,
     Dict,
     dataclass,
+    FrozenSlots,
     Enum
 )
 
@@ -30,7 +31,9 @@ class UserRole(Enum):
 
 
 @dataclass(frozen=True)
-class DomainUser:
+class DomainUser(FrozenSlots):
+    __slots__ = ("name", "age", "password", "email", "role")
+
     name: str
     age: int
     password: str
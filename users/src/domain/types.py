@@ -7,8 +7,24 @@ from typing import (
     List,
     Dict,
     Pattern,
-    AnyStr
+    AnyStr,
+    Tuple
 )
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
+
+
+class FrozenSlots:
+    """
+    Base of the frozen dataclasses declaring their own __slots__ (no per instance __dict__),
+    pickling/copying them needs the state set back without going through the frozen __setattr__.
+    """
+    __slots__ = ()
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, _field.name) for _field in fields(self))
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for _field, value in zip(fields(self), state):
+            object.__setattr__(self, _field.name, value)
@@ -1,140 +1,353 @@
 import os
 import sys
 
+from starlette.applications import Starlette
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 from src.domain.entity.user import create_user, UserRole
 from src.application.infrastructure.web.schema.json.user.login_user import login_user
+from src.application.infrastructure.web.schema.json.user.lookup_users import lookup_users
 from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
 from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
 
 from src.application.entity.service import Service
+from src.application.infrastructure.hashing import PasswordHasher
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.bloom_filter import BloomFilterPersistence
+from src.application.infrastructure.persistence.caching import CachingPersistence
 from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.memory_mapped import MemoryMappedDatabase
+from src.application.infrastructure.persistence.sqlite import SqliteDatabase
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.sessions import SessionStore
+from src.application.infrastructure.web.rate_limiting import RateLimiter
 from src.application.infrastructure.web.entity.route import Route
 from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
 from src.application.infrastructure.web.schema.json.user.post_user import post_user
 from src.application.infrastructure.web.schema.json.user.put_user import put_user
 from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.types import Maybe
 from src.application.usecase.user.add_user import AddUserUseCase
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
 from src.application.usecase.user.delete_user import DeleteUserUseCase
 from src.application.usecase.user.fetch_user import FetchUserUseCase
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.application.usecase.user.list_users import ListUsersUseCase
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase
 from src.application.usecase.user.update_user import UpdateUserUseCase
 
-db = InMemoryDatabase(config=None)
-db.persist_user(user=create_user(
-    name="test1",
-    age=26,
-    password="Str0ngPassword",
-    email="test1@valid.com",
-    role=UserRole.USER
-))
-db.persist_user(user=create_user(
-    name="test2",
-    age=26,
-    password="Str0ngPassword",
-    email="test1@valid.com",
-    role=UserRole.USER
-))
-
-StarletteRestApi(
-    config=None,
-    host="0.0.0.0",
-    port=3000,
-    routes=[
-        Route(
-            url="/users/login",
-            methods=["POST"],
-            handler=StarletteRestApi.get_access_token,
-            args=None,
-            kwargs=dict(
-                add_access_token_usecase=AddAccessTokenUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                json_schema=login_user,
-                json_schema_validator=JsonSchemaValidator(
-                    config=None
-                )
-            )
-        ),
-        Route(
-            url="/users",
-            methods=["GET"],
-            handler=StarletteRestApi.get_user,
-            args=None,
-            kwargs=dict(
-                fetch_user_usecase=FetchUserUseCase(config=None, persistence=db),
-                fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db)
+_host = "0.0.0.0"
+_port = 3000
+
+
+def workers() -> int:
+    return int(os.environ.get("USERS_WORKERS", 1))
+
+
+def create_persistence() -> PersistenceInterface:
+    # setting USERS_CACHE_TTL (in seconds) serves the users and tokens from a per process cache in front of the store,
+    # the writes of the other workers being only seen once it has passed
+    persistence = create_storage()
+    if workers() == 1:
+        # the filter of the names and emails only sees the writes of its own process
+        persistence = BloomFilterPersistence(config=None, persistence=persistence)
+    if "USERS_CACHE_TTL" in os.environ:
+        return CachingPersistence(config=dict(ttl=float(os.environ["USERS_CACHE_TTL"])), persistence=persistence)
+
+    return persistence
+
+
+def create_storage() -> PersistenceInterface:
+    # setting USERS_SQLITE_PATH keeps the users in a sqlite database file,
+    # setting USERS_MMAP_PATH keeps them in a memory mapped file (shareable between processes, searched by scanning),
+    # otherwise setting USERS_DATA_DIRECTORY keeps the in memory users and tokens on disk between restarts
+    # (the in memory one is always concurrent, the handlers run the usecases on a pool of threads)
+    if "USERS_SQLITE_PATH" in os.environ:
+        return SqliteDatabase(config=dict(path=os.environ["USERS_SQLITE_PATH"]))
+
+    if "USERS_MMAP_PATH" in os.environ:
+        return MemoryMappedDatabase(config=dict(path=os.environ["USERS_MMAP_PATH"]))
+
+    if workers() > 1:
+        # the workers are separate processes, they can only agree on the users (and a login on one of them
+        # be honored by the others) through a store they all share, the sqlite one keeping its indexed searches
+        if "USERS_DATA_DIRECTORY" not in os.environ:
+            raise ValueError(
+                "USERS_WORKERS above 1 needs a store shared by the workers, "
+                "set USERS_DATA_DIRECTORY, USERS_SQLITE_PATH or USERS_MMAP_PATH"
             )
+        return SqliteDatabase(config=dict(path=os.path.join(os.environ["USERS_DATA_DIRECTORY"], "users.sqlite3")))
+
+    return InMemoryDatabase(
+        config=dict(
+            concurrent=True,
+            durability=dict(directory=os.environ["USERS_DATA_DIRECTORY"])
+        ) if "USERS_DATA_DIRECTORY" in os.environ else dict(concurrent=True)
+    )
+
+
+def create_keyring() -> Maybe[JwtKeyring]:
+    # setting USERS_JWT_KEYS as "kid1:secret1,kid2:secret2" (the last one signing, the others only verifying)
+    # issues access tokens expiring after USERS_JWT_TTL seconds, authenticated without reading the store,
+    # otherwise the tokens are stored and compared on every request
+    if "USERS_JWT_KEYS" not in os.environ:
+        return None
+
+    return JwtKeyring.of(keys=os.environ["USERS_JWT_KEYS"], ttl=int(os.environ.get("USERS_JWT_TTL", 900)))
+
+
+def create_sessions() -> Maybe[SessionStore]:
+    # setting USERS_SESSION_TTL (in seconds, of inactivity) makes every login open a session of its own,
+    # an opaque token authenticated by itself alone, the sessions living in the process so for one worker only
+    if "USERS_SESSION_TTL" not in os.environ:
+        return None
+    if workers() > 1:
+        raise ValueError("USERS_SESSION_TTL needs USERS_WORKERS to be 1, the sessions aren't shared by the workers")
+
+    return SessionStore(ttl=float(os.environ["USERS_SESSION_TTL"]))
+
+
+def create_rate_limiter() -> Maybe[RateLimiter]:
+    # the requests are throttled per client IP and per authenticated caller, the logins per username and client IP,
+    # USERS_RATE_LIMITS as "login:0.2:5,requests:50:100,callers:50:100" (a rate a second and a burst,
+    # every worker having its own buckets) or "off"
+    rate_limits = os.environ.get("USERS_RATE_LIMITS", "")
+    if rate_limits == "off":
+        return None
+
+    config = {}
+    for rate_limit in filter(None, (part.strip() for part in rate_limits.split(","))):
+        policy, rate, burst = rate_limit.split(":")
+        config[policy] = dict(rate=float(rate), burst=float(burst))
+    return RateLimiter(config=config)
+
+
+def create_password_hasher() -> PasswordHasher:
+    # the passwords are hashed by USERS_PASSWORD_ALGORITHM (scrypt or pbkdf2_sha256) at USERS_PASSWORD_COST,
+    # changing them rehashes the passwords on login, the cores being shared by the workers' hashing processes
+    return PasswordHasher(config=dict(
+        algorithm=os.environ.get("USERS_PASSWORD_ALGORITHM", "scrypt"),
+        processes=max(1, (os.cpu_count() or 1) // workers()),
+        **({"cost": int(os.environ["USERS_PASSWORD_COST"])} if "USERS_PASSWORD_COST" in os.environ else {})
+    ))
+
+
+def create_principal_cache() -> Maybe[PrincipalCache]:
+    # the authenticated principals are cached per process (dropped on login, update and delete of their user),
+    # with more workers only when USERS_PRINCIPAL_CACHE_TTL (in seconds, 0 disables) says how stale they may get,
+    # the writes of the other workers not reaching it
+    if "USERS_PRINCIPAL_CACHE_TTL" in os.environ:
+        ttl = float(os.environ["USERS_PRINCIPAL_CACHE_TTL"])
+        return PrincipalCache(ttl=ttl) if ttl > 0 else None
+
+    return PrincipalCache() if workers() == 1 else None
+
+
+def create_app() -> Starlette:
+    # called once per worker process, so every worker has its own app on top of the shared store
+    db = create_persistence()
+    keyring = create_keyring()
+    principal_cache = create_principal_cache()
+    sessions = create_sessions()
+    password_hasher = create_password_hasher()
+    # seeding is a no-op once the users are there already (recovered, or seeded by another worker),
+    # their passwords are stored as is and hashed on their first login
+    db.persist_user(user=create_user(
+        name="test1",
+        age=26,
+        password="Str0ngPassword",
+        email="test1@valid.com",
+        role=UserRole.USER
+    ))
+    db.persist_user(user=create_user(
+        name="test2",
+        age=26,
+        password="Str0ngPassword",
+        email="test2@valid.com",
+        role=UserRole.USER
+    ))
+
+    return StarletteRestApi(
+        config=None,
+        host=_host,
+        port=_port,
+        # every request carrying a username and access-token is authenticated once, by a middleware
+        fetch_access_token_usecase=FetchAccessTokenUseCase(
+            config=None,
+            persistence=db,
+            keyring=keyring,
+            principal_cache=principal_cache,
+            sessions=sessions
         ),
-        Route(
-            url="/users",
-            methods=["POST"],
-            handler=StarletteRestApi.post_user,
-            args=None,
-            kwargs=dict(
-                add_user_usecase=AddUserUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                json_schema=post_user,
-                json_schema_validator=JsonSchemaValidator(
-                    config=None
+        rate_limiter=create_rate_limiter(),
+        routes=[
+            Route(
+                url="/users/login",
+                methods=["POST"],
+                handler=StarletteRestApi.get_access_token,
+                args=None,
+                kwargs=dict(
+                    add_access_token_usecase=AddAccessTokenUseCase(
+                        config=None,
+                        persistence=db,
+                        keyring=keyring,
+                        principal_cache=principal_cache,
+                        password_hasher=password_hasher,
+                        sessions=sessions
+                    ),
+                    json_schema=login_user,
+                    json_schema_validator=JsonSchemaValidator(
+                        config=None
+                    )
                 )
-            )
-        ),
-        Route(
-            url="/users",
-            methods=["PUT"],
-            handler=StarletteRestApi.update_user,
-            args=None,
-            kwargs=dict(
-                update_user_usecase=UpdateUserUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                fetch_user_usecase=FetchUserUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                fetch_access_token_usecase=FetchAccessTokenUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                json_schema=put_user,
-                json_schema_validator=JsonSchemaValidator(
-                    config=None
+            ),
+            Route(
+                url="/users/available",
+                methods=["HEAD"],
+                handler=StarletteRestApi.check_user_availability,
+                args=None,
+                kwargs=dict(
+                    check_user_availability_usecase=CheckUserAvailabilityUseCase(config=None, persistence=db)
                 )
-            )
-        ),
-        Route(
-            url="/users",
-            methods=["DELETE"],
-            handler=StarletteRestApi.delete_user,
-            args=None,
-            kwargs=dict(
-                delete_user_usecase=DeleteUserUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                fetch_user_usecase=FetchUserUseCase(
-                    config=None,
-                    persistence=db
-                ),
-                fetch_access_token_usecase=FetchAccessTokenUseCase(
-                    config=None,
-                    persistence=db
+            ),
+            Route(
+                url="/users",
+                methods=["GET"],
+                handler=StarletteRestApi.get_user,
+                args=None,
+                kwargs=dict(
+                    fetch_user_usecase=FetchUserUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users/list",
+                methods=["GET"],
+                handler=StarletteRestApi.list_users,
+                args=None,
+                kwargs=dict(
+                    list_users_usecase=ListUsersUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users/search",
+                methods=["GET"],
+                handler=StarletteRestApi.search_users,
+                args=None,
+                kwargs=dict(
+                    search_users_usecase=SearchUsersUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users/search/prefix",
+                methods=["GET"],
+                handler=StarletteRestApi.search_users_by_prefix,
+                args=None,
+                kwargs=dict(
+                    search_users_by_prefix_usecase=SearchUsersByPrefixUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users/suggestions",
+                methods=["GET"],
+                handler=StarletteRestApi.suggest_users,
+                args=None,
+                kwargs=dict(
+                    suggest_users_usecase=SuggestUsersUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users/lookup",
+                methods=["POST"],
+                handler=StarletteRestApi.lookup_users,
+                args=None,
+                kwargs=dict(
+                    fetch_users_usecase=FetchUsersUseCase(config=None, persistence=db),
+                    json_schema=lookup_users,
+                    json_schema_validator=JsonSchemaValidator(
+                        config=None
+                    )
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["POST"],
+                handler=StarletteRestApi.post_user,
+                args=None,
+                kwargs=dict(
+                    add_user_usecase=AddUserUseCase(
+                        config=None,
+                        persistence=db,
+                        password_hasher=password_hasher
+                    ),
+                    json_schema=post_user,
+                    json_schema_validator=JsonSchemaValidator(
+                        config=None
+                    )
+                )
+            ),
+            Route(
+                url="/users/bulk",
+                methods=["POST"],
+                handler=StarletteRestApi.bulk_add_users,
+                args=None,
+                kwargs=dict(
+                    bulk_add_users_usecase=BulkAddUsersUseCase(
+                        config=None,
+                        persistence=db,
+                        password_hasher=password_hasher
+                    )
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["PUT"],
+                handler=StarletteRestApi.update_user,
+                args=None,
+                kwargs=dict(
+                    update_user_usecase=UpdateUserUseCase(
+                        config=None,
+                        persistence=db,
+                        principal_cache=principal_cache,
+                        password_hasher=password_hasher,
+                        sessions=sessions
+                    ),
+                    json_schema=put_user,
+                    json_schema_validator=JsonSchemaValidator(
+                        config=None
+                    )
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["DELETE"],
+                handler=StarletteRestApi.delete_user,
+                args=None,
+                kwargs=dict(
+                    delete_user_usecase=DeleteUserUseCase(
+                        config=None,
+                        persistence=db,
+                        principal_cache=principal_cache,
+                        sessions=sessions
+                    )
+                )
+            ),
+            Route(
+                url="/healthz",
+                methods=["GET"],
+                handler=StarletteRestApi.health_check,
+                args=None,
+                kwargs=dict(
+                    services=[Service(service_instance=db)]
                 )
             )
-        ),
-        Route(
-            url="/healthz",
-            methods=["GET"],
-            handler=StarletteRestApi.health_check,
-            args=None,
-            kwargs=dict(
-                services=[Service(service_instance=db)]
-            )
-        )
-    ]
-).run(host='0.0.0.0', port=3000, debug=False, workers=1)
+        ]
+    ).app
+
+
+if __name__ == "__main__":
+    StarletteRestApi.serve(app_factory=create_app, host=_host, port=_port, debug=False, workers=workers())
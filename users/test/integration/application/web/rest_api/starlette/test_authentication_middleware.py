@@ -0,0 +1,127 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.infrastructure.web.schema.json.user.login_user import login_user
+from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from test.utilities.user import generate_valid_domain_user
+
+
+class CountingFetchUserUseCase(FetchUserUseCase):
+    def __init__(self, **kwargs) -> None:
+        self.calls = 0
+        super().__init__(**kwargs)
+
+    async def execute_async(self, **kwargs):
+        self.calls += 1
+        return await super().execute_async(**kwargs)
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    domain_user = generate_valid_domain_user()
+    db.persist_user(user=domain_user)
+    fetch_user_usecase = CountingFetchUserUseCase(config=None, persistence=db)
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        routes=[
+            Route(
+                url="/users/login",
+                methods=["POST"],
+                handler=StarletteRestApi.get_access_token,
+                args=None,
+                kwargs=dict(
+                    add_access_token_usecase=AddAccessTokenUseCase(config=None, persistence=db),
+                    json_schema=login_user,
+                    json_schema_validator=JsonSchemaValidator(config=None)
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["GET"],
+                handler=StarletteRestApi.get_user,
+                args=None,
+                kwargs=dict(
+                    fetch_user_usecase=fetch_user_usecase
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, domain_user, fetch_user_usecase
+    del api, test_api, db, fetch_user_usecase
+
+
+def test_authenticated_request(setup):
+    api, domain_user, fetch_user_usecase = setup
+
+    token = api.post(
+        url="/users/login",
+        json={"username": domain_user.name, "password": domain_user.password}
+    ).json()["token"]
+    response = api.get(
+        url=f"/users?name={domain_user.name}",
+        headers={"username": domain_user.name, "access-token": token}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == domain_user.name
+    assert fetch_user_usecase.calls == 1
+
+
+def test_bad_token_is_rejected_before_any_lookup(setup):
+    api, domain_user, fetch_user_usecase = setup
+    api.post(url="/users/login", json={"username": domain_user.name, "password": domain_user.password})
+
+    response = api.get(
+        url=f"/users?name={domain_user.name}",
+        headers={"username": domain_user.name, "access-token": "wrong"}
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {"error": f"Invalid access token for the user {domain_user.name}"}
+    assert fetch_user_usecase.calls == 0
+
+
+def test_anonymous_request(setup):
+    api, domain_user, fetch_user_usecase = setup
+
+    # anonymous requests go through, only the handlers needing a caller refuse them
+    assert api.post(
+        url="/users/login",
+        json={"username": domain_user.name, "password": domain_user.password}
+    ).status_code == 200
+    response = api.get(url=f"/users?name={domain_user.name}")
+    assert response.status_code == 401
+    assert response.json() == {"error": "You should provide username and access-token into the headers."}
+    assert fetch_user_usecase.calls == 0
+
+
+def test_stale_token_does_not_stop_a_login(setup):
+    api, domain_user, fetch_user_usecase = setup
+
+    # no token stored yet for the user, like after it expired
+    stale_headers = {"username": domain_user.name, "access-token": "stale"}
+    response = api.post(
+        url="/users/login",
+        json={"username": domain_user.name, "password": domain_user.password},
+        headers=stale_headers
+    )
+    assert response.status_code == 200
+    assert "token" in response.json()
+
+    # while the routes needing a caller still refuse it
+    response = api.get(url=f"/users?name={domain_user.name}", headers=stale_headers)
+    assert response.status_code == 401
+    assert response.json() == {"error": f"Invalid access token for the user {domain_user.name}"}
+    assert fetch_user_usecase.calls == 0
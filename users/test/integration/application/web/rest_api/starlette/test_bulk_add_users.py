@@ -0,0 +1,103 @@
+import json
+
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=None
+    )
+    bulk_add_users_usecase = BulkAddUsersUseCase(config=dict(chunk_size=2, processes=0), persistence=db)
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(
+            config=None,
+            persistence=db
+        ),
+        routes=[
+            Route(
+                url="/users/bulk",
+                methods=["POST"],
+                handler=StarletteRestApi.bulk_add_users,
+                args=None,
+                kwargs=dict(
+                    bulk_add_users_usecase=bulk_add_users_usecase
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_bulk_add_users(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    admin = create_user(
+        name="admin",
+        age=26,
+        password="Str0ngPassword",
+        email="admin@test.com",
+        role=UserRole.ADMIN
+    )
+    db.persist_user(user=admin)
+    token: AccessToken = db.persist_access_token(username=admin.name, password=admin.password)
+    headers = {'username': admin.name, 'access-token': token.token}
+
+    ndjson = "\n".join(json.dumps(row) for row in [
+        dict(name="test1", age=26, password="Str0ngPassword", email="test1@test.com"),
+        dict(name="test2", age=26, password="weak"),
+        dict(name="test3", age=30, password="Str0ngPassword")
+    ])
+    assert api.post(url="/users/bulk", data=ndjson, headers=headers).json() == dict(
+        imported=2,
+        failures=[dict(row=2, error="password should be stronger.")]
+    )
+
+    csv = "name,age,password,role\ntest4,40,Str0ngPassword,ADMIN\ntest1,26,Str0ngPassword,\n"
+    assert api.post(url="/users/bulk", data=csv, headers=dict(headers, **{'content-type': 'text/csv'})).json() == dict(
+        imported=1,
+        failures=[dict(row=2, error="Username test1 is already exist, please use a different name.")]
+    )
+    test4 = db.fetch_user_by.name(user_name="test4")
+    assert isinstance(test4, ApplicationUser) and test4.role == UserRole.ADMIN
+
+
+def test_bulk_add_users_not_admin(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    domain_user = generate_valid_domain_user()
+    db.persist_user(user=domain_user)
+    token: AccessToken = db.persist_access_token(username=domain_user.name, password=domain_user.password)
+
+    response = api.post(
+        url="/users/bulk",
+        data='{"name": "test1", "age": 26, "password": "Str0ngPassword"}',
+        headers={'username': domain_user.name, 'access-token': token.token}
+    )
+    assert response.status_code == 401
+    assert response.json() == Failure(error="Your current user permission is not satisfying this operation.").as_dict()
+    assert isinstance(db.fetch_user_by.name(user_name="test1"), Failure)
+
+    assert api.post(url="/users/bulk", data="").status_code == 401
@@ -0,0 +1,57 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.bloom_filter import BloomFilterPersistence
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = BloomFilterPersistence(config=None, persistence=InMemoryDatabase(config=None))
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        routes=[
+            Route(
+                url="/users/available",
+                methods=["HEAD"],
+                handler=StarletteRestApi.check_user_availability,
+                args=None,
+                kwargs=dict(
+                    check_user_availability_usecase=CheckUserAvailabilityUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_check_user_availability(setup):
+    api, db = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+
+    response = api.head("/users/available", params=dict(name="free"))
+    assert response.status_code == 200
+    assert response.content == b""
+    assert api.head("/users/available", params=dict(name=user.name)).status_code == 409
+    assert api.head("/users/available", params=dict(email=user.email)).status_code == 409
+    assert api.head("/users/available", params=dict(email="free@test.com")).status_code == 200
+
+
+def test_check_user_availability_bad_request(setup):
+    api, _ = setup
+    api: TestClient
+
+    assert api.head("/users/available").status_code == 400
+    assert api.head("/users/available", params=dict(name="a", email="a@test.com")).status_code == 400
+    assert api.head("/users/available", params=dict(name="")).status_code == 400
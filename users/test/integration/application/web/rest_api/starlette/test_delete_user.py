@@ -4,7 +4,6 @@ from starlette.testclient import TestClient
 from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
 from src.application.infrastructure.web.entity.access_token import AccessToken
 from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
-from src.application.usecase.user.fetch_user import FetchUserUseCase
 from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
 from src.application.infrastructure.web.entity.route import Route
 from src.application.usecase.user.delete_user import DeleteUserUseCase
@@ -23,6 +22,10 @@ def setup():
         config=None,
         host=host,
         port=port,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(
+            config=None,
+            persistence=db
+        ),
         routes=[
             Route(
                 url="/users",
@@ -33,14 +36,6 @@ def setup():
                     delete_user_usecase=DeleteUserUseCase(
                         config=None,
                         persistence=db
-                    ),
-                    fetch_user_usecase=FetchUserUseCase(
-                        config=None,
-                        persistence=db
-                    ),
-                    fetch_access_token_usecase=FetchAccessTokenUseCase(
-                        config=None,
-                        persistence=db
                     )
                 )
             )
@@ -74,6 +69,8 @@ def test_valid_delete_user(setup):
 
     # by name
     db.persist_user(user=domain_user)
+    # deleting the user removed its access token too
+    token = db.persist_access_token(username=domain_user.name, password=domain_user.password)
     dummy_name = domain_user.name
     assert api.delete(
         url=f"/users?name={dummy_name}",
@@ -85,6 +82,8 @@ def test_valid_delete_user(setup):
 
     # by email
     db.persist_user(user=domain_user)
+    # deleting the user removed its access token too
+    token = db.persist_access_token(username=domain_user.name, password=domain_user.password)
     dummy_email = domain_user.email
     assert api.delete(
         url=f"/users?email={dummy_email}",
@@ -28,6 +28,10 @@ def setup():
         config=None,
         host=host,
         port=port,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(
+            config=None,
+            persistence=db
+        ),
         routes=[
             Route(
                 url="/users",
@@ -38,10 +42,6 @@ def setup():
                     fetch_user_usecase=FetchUserUseCase(
                         config=None,
                         persistence=db
-                    ),
-                    fetch_access_token_usecase=FetchAccessTokenUseCase(
-                        config=None,
-                        persistence=db
                     )
                 )
             )
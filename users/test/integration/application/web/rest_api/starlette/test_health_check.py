@@ -47,3 +47,13 @@ def test_valid_health_check(setup):
     assert api.get(
         url="/health"
     ).json() == {db.__class__.__name__: Status.HEALTHY.name}
+
+
+def test_generated_docs(setup):
+    api, _ = setup
+    api: TestClient
+
+    response = api.get(url="/swagger.io/docs/swagger.json")
+    assert response.status_code == 200
+    assert response.json()["servers"] == [{"url": "http://0.0.0.0:3000"}]
+    assert "/health" in response.json()["paths"]
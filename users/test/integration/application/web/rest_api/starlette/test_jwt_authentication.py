@@ -0,0 +1,85 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.infrastructure.web.schema.json.user.login_user import login_user
+from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60)
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db, keyring=keyring),
+        routes=[
+            Route(
+                url="/users/login",
+                methods=["POST"],
+                handler=StarletteRestApi.get_access_token,
+                args=None,
+                kwargs=dict(
+                    add_access_token_usecase=AddAccessTokenUseCase(config=None, persistence=db, keyring=keyring),
+                    json_schema=login_user,
+                    json_schema_validator=JsonSchemaValidator(config=None)
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["GET"],
+                handler=StarletteRestApi.get_user,
+                args=None,
+                kwargs=dict(
+                    fetch_user_usecase=FetchUserUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db, keyring
+    del api, test_api, db, keyring
+
+
+def test_login_then_authenticated_requests(setup):
+    api, db, keyring = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    response = api.post("/users/login", json=dict(username=user.name, password=user.password))
+    assert response.status_code == 200
+    token = response.json()["token"]
+
+    headers = {"username": user.name, "access-token": token}
+    response = api.get("/users", params=dict(name=user.name), headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == user.id
+
+    # still verified after a rotation, and another user can't use it
+    keyring.rotate(kid="second", key="another secret")
+    assert api.get("/users", params=dict(name=user.name), headers=headers).status_code == 200
+    response = api.get("/users", params=dict(name=user.name), headers={"username": "other", "access-token": token})
+    assert response.status_code == 401
+    assert response.json() == {"error": "Invalid access token for the user other"}
+
+
+def test_tampered_token(setup):
+    api, db, _ = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    forged = JwtKeyring(keys=dict(first="guessed"), active_kid="first").issue(user=user)
+
+    headers = {"username": user.name, "access-token": forged.token}
+    response = api.get("/users", params=dict(name=user.name), headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,84 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.infrastructure.web.schema.json.user.lookup_users import lookup_users
+from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=None
+    )
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        routes=[
+            Route(
+                url="/users/lookup",
+                methods=["POST"],
+                handler=StarletteRestApi.lookup_users,
+                args=None,
+                kwargs=dict(
+                    fetch_users_usecase=FetchUsersUseCase(config=None, persistence=db),
+                    json_schema=lookup_users,
+                    json_schema_validator=JsonSchemaValidator(
+                        config=None
+                    )
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_lookup_users(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    admin = generate_numbered_domain_user(0, role=UserRole.ADMIN)
+    users = [db.persist_user(user=admin)] + [db.persist_user(user=generate_numbered_domain_user(number))
+                                             for number in range(1, 3)]
+    user_jsons = [from_application_user_to_json_user(application_user=user).as_dict() for user in users]
+    not_found = Failure(error="There is no user with id 9 to be fetched").as_dict()
+
+    # an admin gets everyone
+    admin_token: AccessToken = db.persist_access_token(username=admin.name, password=admin.password)
+    assert api.post(
+        url="/users/lookup",
+        json=dict(fetch_by_selector="id", fetch_by_data=["2", "9", "0", "1"]),
+        headers={'username': admin.name, 'access-token': admin_token.token}
+    ).json() == [user_jsons[2], not_found, user_jsons[0], user_jsons[1]]
+
+    # a user only gets itself, the rest of the batch is still answered item by item
+    user_token: AccessToken = db.persist_access_token(username="test1", password="Str0ngPassword")
+    headers = {'username': "test1", 'access-token': user_token.token}
+    assert api.post(
+        url="/users/lookup",
+        json=dict(fetch_by_selector="name", fetch_by_data=["test1", "test2"]),
+        headers=headers
+    ).json() == [
+        user_jsons[1],
+        Failure(error="Your current user permission is not satisfying this operation.").as_dict()
+    ]
+
+    response = api.post(url="/users/lookup", json=dict(fetch_by_selector="age", fetch_by_data=["26"]), headers=headers)
+    assert response.status_code == 400
+    assert api.post(url="/users/lookup", json=dict(fetch_by_selector="id"), headers=headers).status_code == 400
+    assert api.post(url="/users/lookup", json=dict(fetch_by_selector="id", fetch_by_data=[])).status_code == 401
@@ -0,0 +1,134 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rate_limiting import RateLimiter
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.infrastructure.web.schema.json.user.login_user import login_user
+from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from test.utilities.user import generate_valid_domain_user
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    clock = FakeClock()
+    rate_limiter = RateLimiter(
+        config={
+            "login": {"rate": 0.5, "burst": 2},
+            "requests": {"rate": 1.0, "burst": 5},
+            "callers": {"rate": 1.0, "burst": 2}
+        },
+        clock=clock
+    )
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        rate_limiter=rate_limiter,
+        routes=[
+            Route(
+                url="/users/login",
+                methods=["POST"],
+                handler=StarletteRestApi.get_access_token,
+                args=None,
+                kwargs=dict(
+                    add_access_token_usecase=AddAccessTokenUseCase(config=None, persistence=db),
+                    json_schema=login_user,
+                    json_schema_validator=JsonSchemaValidator(config=None)
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["GET"],
+                handler=StarletteRestApi.get_user,
+                args=None,
+                kwargs=dict(
+                    fetch_user_usecase=FetchUserUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db, rate_limiter, clock
+    del api, test_api, db, rate_limiter, clock
+
+
+def test_login_is_throttled(setup):
+    api, db, rate_limiter, clock = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    login = dict(username=user.name, password="wrong password")
+    assert [api.post("/users/login", json=login).status_code for _ in range(2)] == [400, 400]
+
+    response = api.post("/users/login", json=login)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert response.json() == {"error": "Too many requests, try again later."}
+    # the other usernames from the same client aren't
+    assert api.post("/users/login", json=dict(username="other", password="password")).status_code == 400
+
+    # the body still reaches the handler once the bucket refilled
+    clock.now += 2
+    response = api.post("/users/login", json=dict(username=user.name, password=user.password))
+    assert response.status_code == 200
+    assert "token" in response.json()
+    assert (rate_limiter.stats["login"].allowed, rate_limiter.stats["login"].limited) == (4, 1)
+
+
+def test_too_large_login(setup):
+    api, db, rate_limiter, _ = setup
+    api: TestClient
+
+    response = api.post("/users/login", json=dict(username="test", password="x" * 20_000))
+    assert response.status_code == 413
+    assert response.json() == {"error": "The login request is too large."}
+    assert rate_limiter.stats["login"].allowed == 0
+
+
+def test_requests_are_throttled(setup):
+    api, db, rate_limiter, clock = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    token = api.post("/users/login", json=dict(username=user.name, password=user.password)).json()["token"]
+    headers = {"username": user.name, "access-token": token}
+
+    statuses = [api.get("/users", params=dict(name=user.name), headers=headers).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert rate_limiter.stats["callers"].limited == 1
+    # the clients have their own buckets
+    clock.now += 1
+    assert api.get("/users", params=dict(name=user.name), headers=headers).status_code == 200
+    assert rate_limiter.stats["requests"].limited == 0
+
+
+def test_forged_username_costs_the_user_nothing(setup):
+    api, db, rate_limiter, clock = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    forged_headers = {"username": user.name, "access-token": "forged"}
+    for _ in range(5):
+        api.get("/users", params=dict(name=user.name), headers=forged_headers)
+        clock.now += 1
+
+    token = api.post("/users/login", json=dict(username=user.name, password=user.password)).json()["token"]
+    response = api.get("/users", params=dict(name=user.name), headers={"username": user.name, "access-token": token})
+    assert response.status_code == 200
+    assert rate_limiter.stats["callers"].allowed == 1
@@ -0,0 +1,81 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=None
+    )
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        routes=[
+            Route(
+                url="/users/search",
+                methods=["GET"],
+                handler=StarletteRestApi.search_users,
+                args=None,
+                kwargs=dict(
+                    search_users_usecase=SearchUsersUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_search_users(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    admin = generate_numbered_domain_user(0, age=35, role=UserRole.ADMIN)
+    users = [db.persist_user(user=admin)] + [
+        db.persist_user(user=generate_numbered_domain_user(
+            number,
+            age=25 + number * 3,
+            role=UserRole.ADMIN if number % 2 == 0 else UserRole.USER
+        )) for number in range(1, 8)
+    ]
+    user_jsons = [from_application_user_to_json_user(application_user=user).as_dict() for user in users]
+    token: AccessToken = db.persist_access_token(username=admin.name, password=admin.password)
+    headers = {'username': admin.name, 'access-token': token.token}
+
+    # the admins of ages 30 to 40 are test0 (35), test2 (31) and test4 (37)
+    first_page = api.get(url="/users/search?role=ADMIN&age_gte=30&age_lte=40&limit=2", headers=headers).json()
+    assert first_page["users"] == [user_jsons[0], user_jsons[2]]
+    last_page = api.get(
+        url=f"/users/search?role=ADMIN&age_gte=30&age_lte=40&limit=2&cursor={first_page['next_cursor']}",
+        headers=headers
+    ).json()
+    assert last_page == dict(users=[user_jsons[4]], next_cursor=None)
+    assert api.get(url="/users/search?age_gte=40", headers=headers).json() == dict(
+        users=[user_jsons[5], user_jsons[6], user_jsons[7]],
+        next_cursor=None
+    )
+
+    assert api.get(url="/users/search?age_gte=old", headers=headers).json() == Failure(
+        error="age_gte should be an integer."
+    ).as_dict()
+    assert api.get(url="/users/search?role=OWNER", headers=headers).status_code == 400
+
+    user_token: AccessToken = db.persist_access_token(username="test1", password="Str0ngPassword")
+    response = api.get(url="/users/search?role=USER", headers={'username': "test1", 'access-token': user_token.token})
+    assert response.status_code == 401
@@ -0,0 +1,78 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.application.utilities.user import from_application_user_to_json_user
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=None
+    )
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        routes=[
+            Route(
+                url="/users/search/prefix",
+                methods=["GET"],
+                handler=StarletteRestApi.search_users_by_prefix,
+                args=None,
+                kwargs=dict(
+                    search_users_by_prefix_usecase=SearchUsersByPrefixUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_search_users_by_prefix(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    admin = generate_numbered_domain_user(0, role=UserRole.ADMIN)
+    users = [db.persist_user(user=admin)] + [
+        db.persist_user(user=generate_numbered_domain_user(number)) for number in range(1, 4)
+    ]
+    user_jsons = [from_application_user_to_json_user(application_user=user).as_dict() for user in users]
+    token: AccessToken = db.persist_access_token(username=admin.name, password=admin.password)
+    headers = {'username': admin.name, 'access-token': token.token}
+
+    first_page = api.get(url="/users/search/prefix?name=TEST&limit=3", headers=headers).json()
+    assert first_page["users"] == user_jsons[:3]
+    last_page = api.get(url=f"/users/search/prefix?name=test&limit=3&cursor={first_page['next_cursor']}",
+                        headers=headers).json()
+    assert last_page == dict(users=user_jsons[3:], next_cursor=None)
+    assert api.get(url="/users/search/prefix?email_domain=test.com", headers=headers).json() == dict(
+        users=user_jsons,
+        next_cursor=None
+    )
+    assert api.get(url="/users/search/prefix?name=test2", headers=headers).json()["users"] == [user_jsons[2]]
+
+    assert api.get(url="/users/search/prefix?name=a&email_domain=b", headers=headers).json() == Failure(
+        error="Exactly one of ['name', 'email_domain'] should be searched."
+    ).as_dict()
+    assert api.get(url="/users/search/prefix?name=a&limit=many", headers=headers).status_code == 400
+
+    user_token: AccessToken = db.persist_access_token(username="test1", password="Str0ngPassword")
+    response = api.get(
+        url="/users/search/prefix?name=a",
+        headers={'username': "test1", 'access-token': user_token.token}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,98 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.authentication.sessions import SessionStore
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.infrastructure.web.schema.json.user.login_user import login_user
+from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
+from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
+from src.application.usecase.user.delete_user import DeleteUserUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    sessions = SessionStore()
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db, sessions=sessions),
+        routes=[
+            Route(
+                url="/users/login",
+                methods=["POST"],
+                handler=StarletteRestApi.get_access_token,
+                args=None,
+                kwargs=dict(
+                    add_access_token_usecase=AddAccessTokenUseCase(config=None, persistence=db, sessions=sessions),
+                    json_schema=login_user,
+                    json_schema_validator=JsonSchemaValidator(config=None)
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["GET"],
+                handler=StarletteRestApi.get_user,
+                args=None,
+                kwargs=dict(
+                    fetch_user_usecase=FetchUserUseCase(config=None, persistence=db)
+                )
+            ),
+            Route(
+                url="/users",
+                methods=["DELETE"],
+                handler=StarletteRestApi.delete_user,
+                args=None,
+                kwargs=dict(
+                    delete_user_usecase=DeleteUserUseCase(config=None, persistence=db, sessions=sessions)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db, sessions
+
+
+def test_sessions_of_a_user(setup):
+    api, db = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    laptop, phone = (
+        api.post("/users/login", json=dict(username=user.name, password=user.password)).json()["token"]
+        for _ in range(2)
+    )
+
+    # logging in on the phone doesn't log the laptop out, and the token alone is enough
+    for token in (laptop, phone):
+        response = api.get("/users", params=dict(name=user.name), headers={"access-token": token})
+        assert response.status_code == 200
+        assert response.json()["id"] == user.id
+
+    response = api.get("/users", params=dict(name=user.name), headers={"username": "other", "access-token": laptop})
+    assert response.status_code == 401
+    assert response.json() == {"error": "Invalid access token for the user other"}
+    response = api.get("/users", params=dict(name=user.name), headers={"access-token": "not a session"})
+    assert response.status_code == 401
+    assert response.json() == {"error": "You should provide username and access-token into the headers."}
+
+
+def test_deleted_user_sessions_end(setup):
+    api, db = setup
+    api: TestClient
+
+    user = db.persist_user(user=generate_valid_domain_user())
+    token = api.post("/users/login", json=dict(username=user.name, password=user.password)).json()["token"]
+
+    assert api.delete("/users", params=dict(name=user.name), headers={"access-token": token}).status_code == 200
+    response = api.get("/users", params=dict(name=user.name), headers={"access-token": token})
+    assert response.status_code == 401
+    assert response.json() == {"error": "Invalid access token"}
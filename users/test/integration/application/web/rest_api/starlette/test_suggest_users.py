@@ -0,0 +1,72 @@
+from pytest import fixture
+from starlette.testclient import TestClient
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.infrastructure.web.entity.route import Route
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=None
+    )
+    api = StarletteRestApi(
+        config=None,
+        host="0.0.0.0",
+        port=3000,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(config=None, persistence=db),
+        routes=[
+            Route(
+                url="/users/suggestions",
+                methods=["GET"],
+                handler=StarletteRestApi.suggest_users,
+                args=None,
+                kwargs=dict(
+                    suggest_users_usecase=SuggestUsersUseCase(config=None, persistence=db)
+                )
+            )
+        ]
+    )
+    test_api = TestClient(app=api.app)
+
+    yield test_api, db
+    del api, test_api, db
+
+
+def test_suggest_users(setup):
+    api, db = setup
+    api: TestClient
+    db: InMemoryDatabase
+
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(3)]
+    abdulrahman = db.persist_user(user=create_user(
+        name="abdulrahman",
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    ))
+    # any logged user, not only the admins
+    token: AccessToken = db.persist_access_token(username=users[1].name, password="Str0ngPassword")
+    headers = {'username': users[1].name, 'access-token': token.token}
+
+    response = api.get(url="/users/suggestions?name=abdelrahman&limit=1", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == dict(suggestions=[dict(id=abdulrahman.id, name="abdulrahman", score=0.83)])
+    assert [suggestion["name"] for suggestion in api.get(
+        url="/users/suggestions?name=tset2",
+        headers=headers
+    ).json()["suggestions"]][0] == "test2"
+
+    assert api.get(url="/users/suggestions?name=ab", headers=headers).json() == Failure(
+        error="name should be at least 3 characters long."
+    ).as_dict()
+    assert api.get(url="/users/suggestions?name=abd&limit=many", headers=headers).status_code == 400
+    assert api.get(url="/users/suggestions?name=abd").status_code == 401
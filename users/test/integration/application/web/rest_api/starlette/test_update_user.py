@@ -9,7 +9,6 @@ from src.application.infrastructure.web.rest_api.framework_logic.starlette impor
 from src.application.infrastructure.web.schema.json.user.put_user import put_user
 from src.application.infrastructure.web.validation.jsonschema import JsonSchemaValidator
 from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
-from src.application.usecase.user.fetch_user import FetchUserUseCase
 from src.application.usecase.user.update_user import UpdateUserUseCase
 from src.domain.entity.user import DomainUser, create_user
 from test.utilities.user import generate_valid_domain_user
@@ -30,6 +29,10 @@ def setup():
         config=None,
         host=host,
         port=port,
+        fetch_access_token_usecase=FetchAccessTokenUseCase(
+            config=None,
+            persistence=db
+        ),
         routes=[
             Route(
                 url="/users",
@@ -41,14 +44,6 @@ def setup():
                         config=None,
                         persistence=db
                     ),
-                    fetch_user_usecase=FetchUserUseCase(
-                        config=None,
-                        persistence=db
-                    ),
-                    fetch_access_token_usecase=FetchAccessTokenUseCase(
-                        config=None,
-                        persistence=db
-                    ),
                     json_schema=put_user,
                     json_schema_validator=JsonSchemaValidator(
                         config=None
@@ -181,3 +176,22 @@ def test_invalid_update_user(setup):
             'access-token': token.token
         }
     ).json() == {'error': 'email should be a valid one.'}
+
+    # another user
+    assert api.put(
+        url="/users",
+        json={
+            'updated_user': dict(
+                name=domain_user.name,
+                age=domain_user.age,
+                email=domain_user.email,
+                password=domain_user.password
+            ),
+            'update_by_selector': 'name',
+            'update_by_data': "someoneelse"
+        },
+        headers={
+            'username': domain_user.name,
+            'access-token': token.token
+        }
+    ).json() == {'error': 'Your current user permission is not satisfying this operation.'}
@@ -0,0 +1,63 @@
+from pytest import fixture, raises
+from starlette.testclient import TestClient
+
+from src.main import create_app
+
+
+@fixture(scope="function")
+def setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("USERS_MMAP_PATH", str(tmp_path / "users.mmap"))
+    monkeypatch.delenv("USERS_SQLITE_PATH", raising=False)
+
+    # two apps built by the factory, like two worker processes would over the same store
+    worker_a = TestClient(app=create_app())
+    worker_b = TestClient(app=create_app())
+
+    yield worker_a, worker_b
+    del worker_a, worker_b
+
+
+def test_login_on_one_worker_is_honored_by_another(setup):
+    worker_a, worker_b = setup
+    worker_a: TestClient
+    worker_b: TestClient
+
+    login_response = worker_a.post(url="/users/login", json=dict(username="test1", password="Str0ngPassword"))
+    assert login_response.status_code == 200
+
+    response = worker_b.get(
+        url="/users",
+        params=dict(name="test1"),
+        headers={"username": "test1", "access-token": login_response.json()["token"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "test1"
+
+
+def test_workers_share_a_sqlite_store_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("USERS_WORKERS", "2")
+    monkeypatch.setenv("USERS_DATA_DIRECTORY", str(tmp_path))
+    for name in ("USERS_SQLITE_PATH", "USERS_MMAP_PATH"):
+        monkeypatch.delenv(name, raising=False)
+
+    worker_a = TestClient(app=create_app())
+    worker_b = TestClient(app=create_app())
+    login_response = worker_a.post(url="/users/login", json=dict(username="test1", password="Str0ngPassword"))
+    assert login_response.status_code == 200
+
+    response = worker_b.get(
+        url="/users",
+        params=dict(name="test1"),
+        headers={"username": "test1", "access-token": login_response.json()["token"]}
+    )
+    assert response.status_code == 200
+    assert (tmp_path / "users.sqlite3").is_file()
+
+
+def test_workers_need_a_shared_store(monkeypatch):
+    monkeypatch.setenv("USERS_WORKERS", "2")
+    for name in ("USERS_DATA_DIRECTORY", "USERS_SQLITE_PATH", "USERS_MMAP_PATH"):
+        monkeypatch.delenv(name, raising=False)
+
+    with raises(ValueError):
+        create_app()
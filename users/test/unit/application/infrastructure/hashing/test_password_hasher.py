@@ -0,0 +1,71 @@
+import asyncio
+
+from pytest import fixture, raises
+
+from src.application.infrastructure.hashing import PasswordHasher, PasswordScheme, hash_password, verify_password
+from src.domain.entity.failure import Failure
+
+# cheap enough for the tests
+_scrypt = dict(algorithm="scrypt", cost=2 ** 4)
+_pbkdf2 = dict(algorithm="pbkdf2_sha256", cost=10)
+
+
+@fixture(scope="function", params=[0, 1])
+def setup(request):
+    password_hasher = PasswordHasher(config=dict(**_scrypt, processes=request.param))
+
+    yield password_hasher
+    password_hasher.close()
+    del password_hasher
+
+
+def test_hash_and_verify(setup):
+    password_hasher = setup
+
+    encoded = password_hasher.hash(password="Str0ngPassword")
+    assert encoded.startswith("scrypt$16$") and "Str0ngPassword" not in encoded
+    # salted
+    assert encoded != password_hasher.hash(password="Str0ngPassword")
+    assert password_hasher.verify(password="Str0ngPassword", encoded=encoded) is True
+    assert password_hasher.verify(password="Wr0ngPassword", encoded=encoded) is False
+    assert asyncio.run(password_hasher.verify_async(
+        password="Str0ngPassword",
+        encoded=asyncio.run(password_hasher.hash_async(password="Str0ngPassword"))
+    )) is True
+    assert (password_hasher.stats.pending, password_hasher.stats.completed) == (0, 6)
+
+
+def test_plain_passwords_are_verified_and_rehashed():
+    password_hasher = PasswordHasher(config=dict(**_scrypt, processes=0))
+
+    assert password_hasher.verify(password="Str0ngPassword", encoded="Str0ngPassword") is True
+    assert password_hasher.verify(password="Wr0ngPassword", encoded="Str0ngPassword") is False
+    assert password_hasher.needs_rehash(encoded="Str0ngPassword")
+
+
+def test_changed_parameters_need_rehash():
+    old = hash_password(PasswordScheme(**_pbkdf2), "Str0ngPassword")
+    password_hasher = PasswordHasher(config=dict(**_scrypt, processes=0))
+
+    # the old hashes are still verified
+    assert verify_password("Str0ngPassword", old)
+    assert password_hasher.needs_rehash(encoded=old)
+    assert password_hasher.needs_rehash(encoded=hash_password(PasswordScheme(algorithm="scrypt", cost=2 ** 5), "x"))
+    assert not password_hasher.needs_rehash(encoded=password_hasher.hash(password="Str0ngPassword"))
+
+
+def test_full_queue_is_refused():
+    password_hasher = PasswordHasher(config=dict(**_scrypt, processes=0, max_pending=1))
+
+    async def concurrently():
+        return await asyncio.gather(*(password_hasher.hash_async(password="Str0ngPassword") for _ in range(3)))
+
+    hashes = asyncio.run(concurrently())
+    assert isinstance(hashes[0], str)
+    assert hashes[1:] == [Failure(error="Too many passwords are being checked, try again later.")] * 2
+    assert password_hasher.stats.rejected == 2
+
+
+def test_unknown_algorithm():
+    with raises(ValueError):
+        PasswordHasher(config=dict(algorithm="md5"))
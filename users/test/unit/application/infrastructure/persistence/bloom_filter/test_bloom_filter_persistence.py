@@ -0,0 +1,75 @@
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.bloom_filter import BloomFilterPersistence
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(5)]
+    # small pages so the rebuild reads a few of them
+    filtered_db = BloomFilterPersistence(config=dict(page_size=2), persistence=db)
+
+    yield db, filtered_db, users
+    del db, filtered_db, users
+
+
+def test_rebuilt_from_the_storage(setup):
+    _, filtered_db, users = setup
+
+    for user in users:
+        assert filtered_db.may_have_user(selector="name", data=user.name)
+        assert filtered_db.may_have_user(selector="email", data=user.email)
+        assert filtered_db.fetch_user_by.name(user_name=user.name) == user
+    # ids aren't filtered
+    assert filtered_db.may_have_user(selector="id", data="1000")
+
+
+def test_certainly_absent_users_skip_the_storage(setup):
+    db, filtered_db, _ = setup
+
+    # written behind the filter's back, so only the storage knows it
+    hidden = db.persist_user(user=generate_numbered_domain_user(9, name="hidden"))
+    assert isinstance(hidden, ApplicationUser)
+
+    assert not filtered_db.may_have_user(selector="name", data="hidden")
+    fetch_user_status = filtered_db.fetch_user_by.name(user_name="hidden")
+    assert isinstance(fetch_user_status, Failure)
+    assert fetch_user_status.error == "There is no user with name hidden to be fetched"
+    assert isinstance(filtered_db.delete_user_by.name(user_name="hidden"), Failure)
+    assert db.fetch_user_by.name(user_name="hidden") == hidden
+
+
+def test_writes_are_added(setup):
+    _, filtered_db, users = setup
+
+    new_user = filtered_db.persist_user(user=generate_numbered_domain_user(5))
+    assert filtered_db.fetch_user_by.email(user_email="test5@test.com") == new_user
+
+    bulk = filtered_db.persist_users(users=[generate_numbered_domain_user(6)])
+    assert filtered_db.fetch_user_by.name(user_name="test6") == bulk[0]
+
+    updated_user = filtered_db.update_user_by.id(
+        user_id=users[0].id,
+        updated_user=generate_numbered_domain_user(0, name="renamed")
+    )
+    assert filtered_db.fetch_user_by.name(user_name="renamed") == updated_user
+    # removed ones stay a maybe, the storage tells
+    assert isinstance(filtered_db.fetch_user_by.name(user_name="test0"), Failure)
+    assert isinstance(filtered_db.delete_user_by.name(user_name="renamed"), Success)
+
+
+def test_batches(setup):
+    _, filtered_db, users = setup
+
+    fetch_users_status = filtered_db.fetch_user_by.names(user_names=["test1", "missing", "test3"])
+
+    assert fetch_users_status[0] == users[1]
+    assert fetch_users_status[1].error == "There is no user with name missing to be fetched"
+    assert fetch_users_status[2] == users[3]
+    assert isinstance(filtered_db.fetch_user_by.emails(user_emails=["missing@test.com"])[0], Failure)
@@ -0,0 +1,129 @@
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.caching import CachingPersistence
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    cached_db = CachingPersistence(config=dict(max_users=2, ttl=60.0), persistence=db)
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(3)]
+
+    yield db, cached_db, users
+    del db, cached_db, users
+
+
+def test_users_are_read_through(setup):
+    db, cached_db, users = setup
+
+    assert cached_db.fetch_user_by.name(user_name="test0") == users[0]
+    # the same user by any of its keys
+    assert cached_db.fetch_user_by.id(user_id=users[0].id) == users[0]
+    assert cached_db.fetch_user_by.email(user_email="test0@test.com") == users[0]
+    # the first lookup by name missed its alias, the next ones found the user
+    assert (cached_db.stats["aliases"].misses, cached_db.stats["aliases"].hits) == (1, 1)
+    assert (cached_db.stats["users"].misses, cached_db.stats["users"].hits) == (0, 2)
+
+    # not going to the wrapped one anymore
+    db.delete_user_by.id(user_id=users[0].id)
+    assert cached_db.fetch_user_by.name(user_name="test0") == users[0]
+
+
+def test_failures_are_not_cached(setup):
+    db, cached_db, _ = setup
+
+    assert isinstance(cached_db.fetch_user_by.name(user_name="later"), Failure)
+    later = db.persist_user(user=generate_numbered_domain_user(9, name="later"))
+    assert cached_db.fetch_user_by.name(user_name="later") == later
+
+
+def test_bounded(setup):
+    _, cached_db, users = setup
+
+    for user in users:
+        cached_db.fetch_user_by.id(user_id=user.id)
+
+    assert cached_db.stats["users"].size == 2
+    assert cached_db.stats["users"].evictions == 1
+
+
+def test_batches_only_fetch_the_missing_users(setup):
+    _, cached_db, users = setup
+
+    cached_db.fetch_user_by.id(user_id=users[1].id)
+    fetch_users_status = cached_db.fetch_user_by.names(user_names=["test1", "missing", "test2"])
+
+    assert fetch_users_status[0] == users[1]
+    assert isinstance(fetch_users_status[1], Failure)
+    assert fetch_users_status[2] == users[2]
+    assert cached_db.fetch_user_by.emails(user_emails=["test2@test.com"]) == [users[2]]
+
+
+def test_updates_invalidate(setup):
+    _, cached_db, users = setup
+
+    cached_db.fetch_user_by.email(user_email="test0@test.com")
+    updated_user = cached_db.update_user_by.email(
+        user_email="test0@test.com",
+        updated_user=generate_numbered_domain_user(0, name="renamed")
+    )
+
+    assert isinstance(updated_user, ApplicationUser)
+    assert cached_db.fetch_user_by.id(user_id=users[0].id) == updated_user
+    assert cached_db.fetch_user_by.name(user_name="renamed") == updated_user
+    assert isinstance(cached_db.fetch_user_by.name(user_name="test0"), Failure)
+
+
+def test_deletes_invalidate(setup):
+    _, cached_db, users = setup
+
+    cached_db.fetch_user_by.id(user_id=users[0].id)
+    assert isinstance(cached_db.delete_user_by.name(user_name="test0"), Success)
+
+    assert isinstance(cached_db.fetch_user_by.id(user_id=users[0].id), Failure)
+    assert isinstance(cached_db.fetch_user_by.email(user_email="test0@test.com"), Failure)
+
+
+def test_tokens(setup):
+    db, cached_db, _ = setup
+
+    assert isinstance(cached_db.fetch_access_token(username="test0"), Failure)
+    access_token = cached_db.persist_access_token(username="test0", password="Str0ngPassword")
+    assert isinstance(access_token, AccessToken)
+    assert cached_db.fetch_access_token(username="test0") == access_token
+    assert cached_db.fetch_access_token(username="test0") == access_token
+    assert (cached_db.stats["tokens"].misses, cached_db.stats["tokens"].hits) == (2, 1)
+
+    # a rename moves the token, a delete drops it
+    cached_db.update_user_by.name(user_name="test0", updated_user=generate_numbered_domain_user(0, name="renamed"))
+    assert isinstance(cached_db.fetch_access_token(username="test0"), Failure)
+    assert cached_db.fetch_access_token(username="renamed") == access_token
+    cached_db.delete_user_by.name(user_name="renamed")
+    assert isinstance(cached_db.fetch_access_token(username="renamed"), Failure)
+
+
+def test_expired_users_are_read_again():
+    db = InMemoryDatabase(config=None)
+    cached_db = CachingPersistence(config=dict(ttl=0), persistence=db)
+    user = db.persist_user(user=generate_numbered_domain_user(0))
+
+    assert cached_db.fetch_user_by.id(user_id=user.id) == user
+    db.delete_user_by.id(user_id=user.id)
+    assert isinstance(cached_db.fetch_user_by.id(user_id=user.id), Failure)
+
+
+def test_pages_go_to_the_wrapped_persistence(setup):
+    _, cached_db, users = setup
+
+    assert cached_db.list_users(after_id=None, limit=10) == users
+    assert cached_db.search_users(role=UserRole.USER, age_gte=26, age_lte=None, after_id=None, limit=10) == users
+    assert cached_db.search_users_by_prefix(
+        selector="name", prefix="test", after_key=None, after_id=None, limit=10
+    ) == users
@@ -0,0 +1,122 @@
+import asyncio
+from threading import current_thread
+from time import sleep
+
+from pytest import fixture
+
+from src.application.entity.health_check import Status
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.executor import ExecutorAsyncPersistence
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.add_user import AddUserUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_valid_domain_user, generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=dict(concurrent=True))
+    async_db = ExecutorAsyncPersistence.of(persistence=db)
+
+    yield db, async_db
+    async_db.close()
+    del db, async_db
+
+
+def test_one_adapter_per_persistence(setup):
+    db, async_db = setup
+
+    assert ExecutorAsyncPersistence.of(persistence=db) is async_db
+    assert ExecutorAsyncPersistence.of(persistence=async_db) is async_db
+    assert ExecutorAsyncPersistence.of(persistence=InMemoryDatabase(config=None)) is not async_db
+
+
+class RecordingDatabase(InMemoryDatabase):
+    def __init__(self) -> None:
+        super().__init__(config=None)
+        self.threads = set()
+        self.running = 0
+        self.most_running = 0
+
+    def health_check(self):
+        self.threads.add(current_thread().name)
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        sleep(0.01)
+        self.running -= 1
+        return super().health_check()
+
+
+def test_not_thread_safe_persistence_runs_one_call_at_a_time():
+    db = RecordingDatabase()
+    assert not db.thread_safe
+    async_db = ExecutorAsyncPersistence.of(persistence=db)
+
+    async def scenario():
+        await asyncio.gather(*(async_db.health_check() for _ in range(8)))
+
+    asyncio.run(scenario())
+    assert db.most_running == 1
+    assert len(db.threads) == 1
+    async_db.close()
+
+
+def test_async_persistence(setup):
+    _, async_db = setup
+    async_db: ExecutorAsyncPersistence
+    domain_user = generate_valid_domain_user()
+
+    async def scenario():
+        assert (await async_db.health_check()).service_state == Status.HEALTHY
+
+        persisted_user = await async_db.persist_user(user=domain_user)
+        assert persisted_user == PersistenceInterface.from_domain_user_to_database_user(user=domain_user, user_id="0")
+        assert await async_db.fetch_user_by.name(user_name=domain_user.name) == persisted_user
+        assert await async_db.fetch_user_by.email(user_email="invalid") == Failure(
+            error="There is no user with email invalid to be fetched"
+        )
+
+        access_token = await async_db.persist_access_token(username=domain_user.name, password=domain_user.password)
+        assert await async_db.fetch_access_token(username=domain_user.name) == access_token
+
+        updated_user = await async_db.update_user_by.name(
+            user_name=domain_user.name,
+            updated_user=generate_numbered_domain_user(1)
+        )
+        assert updated_user.name == "test1"
+
+        other_user = await async_db.persist_user(user=generate_numbered_domain_user(2))
+        assert isinstance(await async_db.delete_user_by.id(user_id=other_user.id), Success)
+        assert isinstance(await async_db.fetch_user_by.id(user_id=other_user.id), Failure)
+
+    asyncio.run(scenario())
+
+
+def test_async_usecases_run_concurrently(setup):
+    db, _ = setup
+    add_usecase = AddUserUseCase(config=None, persistence=db)
+    fetch_usecase = FetchUserUseCase(config=None, persistence=db)
+
+    async def scenario():
+        persisted_users = await asyncio.gather(*(
+            add_usecase.execute_async(
+                username=f"test{number}",
+                age=26,
+                password="Str0ngPassword",
+                email=f"test{number}@test.com",
+                role=UserRole.USER
+            ) for number in range(50)
+        ))
+        assert sorted(int(user.id) for user in persisted_users) == list(range(50))
+
+        assert await fetch_usecase.execute_async(
+            fetch_by_selector="invalid_selector",
+            fetch_by_data="invalid"
+        ) == Failure(error="Fetch selector should be within this list ['id', 'name', 'email']")
+        assert (await fetch_usecase.execute_async(fetch_by_selector="name", fetch_by_data="test7")).id == \
+            db.fetch_user_by.name(user_name="test7").id
+
+    asyncio.run(scenario())
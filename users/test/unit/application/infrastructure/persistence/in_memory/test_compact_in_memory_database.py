@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.in_memory.compact import CompactUsers
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=dict(concurrent=True, storage="compact")
+    )
+
+    yield db
+    del db
+
+
+def test_compact_storage(setup):
+    db: InMemoryDatabase = setup
+
+    admin = db.persist_user(user=generate_numbered_domain_user(0, role=UserRole.ADMIN))
+    user = db.persist_user(user=generate_numbered_domain_user(1))
+    assert admin == PersistenceInterface.from_domain_user_to_database_user(
+        user=generate_numbered_domain_user(0, role=UserRole.ADMIN),
+        user_id="0"
+    )
+    assert db.fetch_user_by.id(user_id="1") == user
+    assert db.fetch_user_by.name(user_name="test0") == admin
+    assert db.fetch_user_by.email(user_email="test1@test.com") == user
+    assert db.persist_user(user=generate_numbered_domain_user(1)) == Failure(
+        error="Username test1 is already exist, please use a different name."
+    )
+
+    # only the canonical string ids are ids
+    for invalid_id in ("01", "-1", "1.0", " 1", "2"):
+        assert db.fetch_user_by.id(user_id=invalid_id) == Failure(
+            error=f"There is no user with id {invalid_id} to be fetched"
+        )
+
+    access_token = db.persist_access_token(username="test1", password="Str0ngPassword")
+    assert isinstance(access_token, AccessToken)
+    assert db.fetch_access_token(username="test1") == access_token
+
+    assert db.update_user_by.name(user_name="test1", updated_user=generate_numbered_domain_user(5, age=25)).age == 25
+    assert isinstance(db.delete_user_by.id(user_id="0"), Success)
+    assert isinstance(db.fetch_user_by.id(user_id="0"), Failure)
+    assert isinstance(db.fetch_user_by.name(user_name="test0"), Failure)
+
+
+def test_compact_users_mapping():
+    users = CompactUsers()
+    user = PersistenceInterface.from_domain_user_to_database_user(user=generate_numbered_domain_user(0), user_id="3")
+    users["3"] = user
+
+    assert list(users) == ["3"] and len(users) == 1
+    assert "3" in users and "0" not in users and "03" not in users
+    assert users.get("0") is None
+
+    copied_users = users.copy()
+    del users["3"]
+    assert len(users) == 0 and copied_users["3"] == user
+
+
+def test_lock_free_reads_never_see_a_torn_user(setup):
+    db: InMemoryDatabase = setup
+    db.persist_user(user=generate_numbered_domain_user(0))
+    versions = [generate_numbered_domain_user(number, age=20 + number) for number in range(1, 3)]
+
+    def update(rounds: int) -> None:
+        for round_number in range(rounds):
+            db.update_user_by.id(user_id="0", updated_user=versions[round_number % 2])
+
+    def read(rounds: int) -> bool:
+        # every read should be exactly one of the written versions, never a mix of both
+        expected_users = [PersistenceInterface.from_domain_user_to_database_user(user=version, user_id="0")
+                          for version in versions] + [db.fetch_user_by.id(user_id="0")]
+        for _ in range(rounds):
+            user = db.fetch_user_by.id(user_id="0")
+            if not isinstance(user, ApplicationUser) or user not in expected_users:
+                return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        updater = executor.submit(update, 5_000)
+        readers = [executor.submit(read, 5_000) for _ in range(3)]
+        updater.result()
+        assert all(reader.result() for reader in readers)
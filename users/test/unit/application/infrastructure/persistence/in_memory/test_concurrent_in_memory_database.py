@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.in_memory.lock_striping import LockStripes
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(
+        config=dict(concurrent=True, lock_stripes=8)
+    )
+    executor = ThreadPoolExecutor(max_workers=8)
+
+    yield db, executor
+    executor.shutdown(wait=True)
+    del db, executor
+
+
+def test_concurrent_persist_user(setup):
+    db, executor = setup
+    db: InMemoryDatabase
+    executor: ThreadPoolExecutor
+
+    persisted_users = list(executor.map(
+        lambda number: db.persist_user(user=generate_numbered_domain_user(number)),
+        range(200)
+    ))
+
+    assert all(isinstance(user, ApplicationUser) for user in persisted_users)
+    assert sorted(int(user.id) for user in persisted_users) == list(range(200))
+    for user in persisted_users:
+        assert db.fetch_user_by.name(user_name=user.name) == user
+        assert db.fetch_user_by.email(user_email=user.email) == user
+
+
+def test_concurrent_persist_same_user_only_once(setup):
+    db, executor = setup
+    db: InMemoryDatabase
+    executor: ThreadPoolExecutor
+
+    persist_statuses = list(executor.map(
+        lambda _: db.persist_user(user=generate_numbered_domain_user(0)),
+        range(50)
+    ))
+
+    assert len([status for status in persist_statuses if isinstance(status, ApplicationUser)]) == 1
+    assert len([status for status in persist_statuses if isinstance(status, Failure)]) == 49
+
+
+def test_concurrent_update_user(setup):
+    db, executor = setup
+    db: InMemoryDatabase
+    executor: ThreadPoolExecutor
+
+    persisted_users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(100)]
+    for user in persisted_users:
+        db.persist_access_token(username=user.name, password=user.password)
+
+    updated_users = list(executor.map(
+        lambda user: db.update_user_by.id(
+            user_id=user.id,
+            updated_user=generate_numbered_domain_user(int(user.id) + 1000)
+        ),
+        persisted_users
+    ))
+    assert all(isinstance(user, ApplicationUser) for user in updated_users)
+    for user in updated_users:
+        assert db.fetch_user_by.id(user_id=user.id) == user
+        assert not isinstance(db.fetch_access_token(username=user.name), Failure)
+
+
+def test_concurrent_delete_user(setup):
+    db, executor = setup
+    db: InMemoryDatabase
+    executor: ThreadPoolExecutor
+
+    persisted_users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(100)]
+
+    delete_statuses = list(executor.map(
+        lambda user: db.delete_user_by.id(user_id=user.id),
+        persisted_users + persisted_users
+    ))
+    assert len([status for status in delete_statuses if isinstance(status, Success)]) == 100
+    for user in persisted_users:
+        assert isinstance(db.fetch_user_by.id(user_id=user.id), Failure)
+        assert isinstance(db.fetch_user_by.name(user_name=user.name), Failure)
+
+
+def test_lock_stripes_hold_many_keys():
+    locks = LockStripes(stripes=4)
+
+    def hold_and_release() -> bool:
+        with locks.hold(*[("name", f"test{number}") for number in range(20)]):
+            return True
+
+    # colliding keys share stripes, which should be acquired once and released afterwards
+    assert hold_and_release()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(hold_and_release).result(timeout=1)
+
+
+def test_concurrent_persist_users(setup):
+    db, executor = setup
+    db: InMemoryDatabase
+    executor: ThreadPoolExecutor
+
+    # overlapping batches, every name should only be persisted once whoever gets it first
+    batches = [
+        [generate_numbered_domain_user(number) for number in range(start, start + 50)]
+        for start in range(0, 200, 25)
+    ]
+    persist_users_statuses = [status for statuses in executor.map(
+        lambda batch: db.persist_users(users=batch),
+        batches
+    ) for status in statuses]
+
+    persisted_users = [status for status in persist_users_statuses if isinstance(status, ApplicationUser)]
+    assert len(persisted_users) == 225
+    assert len(persist_users_statuses) - len(persisted_users) == 175
+    assert len({user.id for user in persisted_users}) == 225
+    assert all(isinstance(db.fetch_user_by.name(user_name=f"test{number}"), ApplicationUser) for number in range(225))
@@ -0,0 +1,226 @@
+import os
+import pickle
+from threading import Thread, Timer
+from time import sleep
+
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.domain.entity.failure import Failure
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup(tmp_path):
+    config = dict(
+        concurrent=True,
+        durability=dict(
+            directory=str(tmp_path),
+            group_commit_interval=0.0,
+            snapshot_interval=3600.0
+        )
+    )
+    db = InMemoryDatabase(config=config)
+
+    yield db, config
+    db.close()
+    del db
+
+
+def reopen(*, db: InMemoryDatabase, config) -> InMemoryDatabase:
+    db.close()
+    return InMemoryDatabase(config=config)
+
+
+def test_recover_from_write_ahead_log(setup):
+    db, config = setup
+    db: InMemoryDatabase
+
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(3)]
+    db.persist_access_token(username=users[0].name, password=users[0].password)
+    db.update_user_by.id(user_id=users[1].id, updated_user=generate_numbered_domain_user(10))
+    db.delete_user_by.name(user_name=users[2].name)
+
+    recovered_db = reopen(db=db, config=config)
+    try:
+        assert recovered_db.fetch_user_by.id(user_id=users[0].id) == users[0]
+        assert recovered_db.fetch_access_token(username=users[0].name) == db.fetch_access_token(
+            username=users[0].name
+        )
+        assert recovered_db.fetch_user_by.id(user_id=users[1].id).name == "test10"
+        assert isinstance(recovered_db.fetch_user_by.id(user_id=users[2].id), Failure)
+        assert isinstance(recovered_db.fetch_user_by.name(user_name=users[2].name), Failure)
+
+        # ids keep increasing after the restart and never reuse an old one
+        assert recovered_db.persist_user(user=generate_numbered_domain_user(3)).id == "3"
+    finally:
+        recovered_db.close()
+
+
+def test_recover_from_snapshot_and_write_ahead_log_tail(setup):
+    db, config = setup
+    db: InMemoryDatabase
+
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(5)]
+    db.snapshot()
+    db.delete_user_by.id(user_id=users[0].id)
+    tail_user = db.persist_user(user=generate_numbered_domain_user(5))
+    db.snapshot()
+    db.persist_access_token(username=tail_user.name, password=tail_user.password)
+
+    # older snapshots and the log before the newest one are compacted away
+    directory = config["durability"]["directory"]
+    assert len([file_name for file_name in os.listdir(directory) if file_name.endswith(".snapshot")]) == 1
+
+    recovered_db = reopen(db=db, config=config)
+    try:
+        assert isinstance(recovered_db.fetch_user_by.id(user_id=users[0].id), Failure)
+        for user in users[1:] + [tail_user]:
+            assert recovered_db.fetch_user_by.name(user_name=user.name) == user
+        assert recovered_db.fetch_access_token(username=tail_user.name) == db.fetch_access_token(
+            username=tail_user.name
+        )
+    finally:
+        recovered_db.close()
+
+
+def test_recover_ignores_torn_write_ahead_log_tail(setup):
+    db, config = setup
+    db: InMemoryDatabase
+
+    user = db.persist_user(user=generate_numbered_domain_user(0))
+    db.close()
+
+    directory = config["durability"]["directory"]
+    segment_name = sorted(file_name for file_name in os.listdir(directory) if file_name.endswith(".wal"))[-1]
+    with open(os.path.join(directory, segment_name), "a") as segment:
+        segment.write('{"lsn":1,"changes":[["ids","1",')
+
+    recovered_db = InMemoryDatabase(config=config)
+    assert recovered_db.fetch_user_by.id(user_id=user.id) == user
+    next_user = recovered_db.persist_user(user=generate_numbered_domain_user(1))
+    assert isinstance(next_user, ApplicationUser)
+
+    recovered_db = reopen(db=recovered_db, config=config)
+    try:
+        assert recovered_db.fetch_user_by.id(user_id=user.id) == user
+        assert recovered_db.fetch_user_by.id(user_id=next_user.id) == next_user
+    finally:
+        recovered_db.close()
+
+
+def test_failed_write_is_undone(setup, monkeypatch):
+    db, config = setup
+    db: InMemoryDatabase
+
+    user = db.persist_user(user=generate_numbered_domain_user(0))
+    db.persist_access_token(username=user.name, password=user.password)
+    access_token = db.fetch_access_token(username=user.name)
+
+    def failing_remove(**_kwargs):
+        raise RuntimeError("the stale index entries can't be removed")
+
+    # failing between publishing the updated user and unlinking the stale index entries
+    monkeypatch.setattr(db._InMemoryDatabase__indexes, "remove", failing_remove)
+    assert isinstance(db.update_user_by.id(user_id=user.id, updated_user=generate_numbered_domain_user(1)), Failure)
+    monkeypatch.undo()
+
+    assert db.fetch_user_by.id(user_id=user.id) == user
+    assert db.fetch_user_by.name(user_name=user.name) == user
+    assert isinstance(db.fetch_user_by.name(user_name="test1"), Failure)
+    assert db.fetch_access_token(username=user.name) == access_token
+    assert isinstance(db.persist_user(user=generate_numbered_domain_user(1)), ApplicationUser)
+
+    recovered_db = reopen(db=db, config=config)
+    try:
+        assert recovered_db.fetch_user_by.id(user_id=user.id) == user
+        assert recovered_db.fetch_user_by.name(user_name="test1").id != user.id
+    finally:
+        recovered_db.close()
+
+
+def test_failed_snapshot_is_retried(tmp_path, monkeypatch):
+    dump = pickle.dump
+    failures = []
+
+    def failing_once_dump(*args, **kwargs):
+        if not failures:
+            failures.append(True)
+            raise OSError("No space left on device")
+        dump(*args, **kwargs)
+
+    monkeypatch.setattr(pickle, "dump", failing_once_dump)
+    config = dict(durability=dict(directory=str(tmp_path), snapshot_interval=0.05, snapshot_min_records=1))
+    db = InMemoryDatabase(config=config)
+    user = db.persist_user(user=generate_numbered_domain_user(0))
+    try:
+        for _ in range(100):
+            if any(file_name.endswith(".snapshot") for file_name in os.listdir(tmp_path)):
+                break
+            sleep(0.05)
+
+        assert failures
+        file_names = os.listdir(tmp_path)
+        assert any(file_name.endswith(".snapshot") for file_name in file_names)
+        assert not any(file_name.endswith(".tmp") for file_name in file_names)
+    finally:
+        db.close()
+
+    recovered_db = InMemoryDatabase(config=config)
+    try:
+        assert recovered_db.fetch_user_by.id(user_id=user.id) == user
+    finally:
+        recovered_db.close()
+
+
+def test_recover_compact_storage(tmp_path):
+    config = dict(
+        concurrent=True,
+        storage="compact",
+        durability=dict(directory=str(tmp_path), snapshot_interval=3600.0)
+    )
+    db = InMemoryDatabase(config=config)
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(4)]
+    db.snapshot()
+    db.delete_user_by.id(user_id=users[0].id)
+    db.persist_access_token(username=users[1].name, password=users[1].password)
+
+    recovered_db = reopen(db=db, config=config)
+    try:
+        assert isinstance(recovered_db.fetch_user_by.id(user_id=users[0].id), Failure)
+        for user in users[1:]:
+            assert recovered_db.fetch_user_by.email(user_email=user.email) == user
+        assert recovered_db.fetch_access_token(username=users[1].name) == db.fetch_access_token(
+            username=users[1].name
+        )
+    finally:
+        recovered_db.close()
+
+
+def test_snapshot_while_a_compact_row_is_written(tmp_path):
+    config = dict(
+        concurrent=True,
+        storage="compact",
+        durability=dict(directory=str(tmp_path), snapshot_interval=3600.0)
+    )
+    db = InMemoryDatabase(config=config)
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(2)]
+
+    # a writer in the middle of the first user's row while the snapshot copies the table
+    compact_users = db._InMemoryDatabase__db["ids"]._OrderedTable__table
+    compact_users._CompactUsers__begin_write(row=int(users[0].id))
+    writer = Timer(0.05, compact_users._CompactUsers__end_write, kwargs=dict(row=int(users[0].id)))
+    writer.start()
+    snapshotter = Thread(target=db.snapshot, daemon=True)
+    snapshotter.start()
+    snapshotter.join(timeout=5)
+    writer.join()
+    assert not snapshotter.is_alive()
+
+    recovered_db = reopen(db=db, config=config)
+    try:
+        for user in users:
+            assert recovered_db.fetch_user_by.id(user_id=user.id) == user
+    finally:
+        recovered_db.close()
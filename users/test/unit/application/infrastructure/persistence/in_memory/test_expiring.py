@@ -0,0 +1,137 @@
+from threading import enumerate as threads
+
+from pytest import fixture
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.in_memory.expiring import ExpiringTable
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_valid_domain_user
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_expiring_table():
+    clock = FakeClock()
+    table = ExpiringTable(table=dict(old="recovered"), ttl=10.0, tick=1.0, clock=clock)
+    table["a"] = "token"
+    clock.now = 5.0
+    table["b"] = "token"
+    clock.now = 7.0
+    table.touch(key="a")
+
+    clock.now = 12.0
+    assert table.get("old") is None
+    assert table.get("a") == "token"
+    assert table.expired() == ["old"]
+    del table["old"]
+
+    clock.now = 16.0
+    assert table.expired() == ["b"]
+    assert table.get("b", "gone") == "gone"
+    assert "b" in table
+
+
+@fixture(scope="function")
+def setup():
+    clock = FakeClock()
+    db = InMemoryDatabase(config=dict(tokens=dict(ttl=60.0, tick=1.0, clock=clock)))
+    user = db.persist_user(user=generate_valid_domain_user())
+
+    yield db, user, clock
+    db.close()
+    del db, user, clock
+
+
+def test_access_tokens_expire(setup):
+    db, user, clock = setup
+
+    access_token = db.persist_access_token(username=user.name, password=user.password)
+    assert isinstance(access_token, AccessToken)
+
+    clock.now = 59.0
+    assert db.expire_access_tokens() == 0
+    assert db.fetch_access_token(username=user.name) == access_token
+
+    # sliding, the fetch renewed it
+    clock.now = 100.0
+    assert db.expire_access_tokens() == 0
+    assert db.fetch_access_token(username=user.name) == access_token
+
+    clock.now = 200.0
+    fetch_access_token_status = db.fetch_access_token(username=user.name)
+    assert isinstance(fetch_access_token_status, Failure)
+    assert fetch_access_token_status.error == f"There is no access token for user {user.name}"
+    assert db.expire_access_tokens() == 1
+    assert db.expire_access_tokens() == 0
+
+
+def test_relogin_renews(setup):
+    db, user, clock = setup
+
+    db.persist_access_token(username=user.name, password=user.password)
+    clock.now = 61.0
+    access_token = db.persist_access_token(username=user.name, password=user.password)
+    assert db.expire_access_tokens() == 0
+    assert db.fetch_access_token(username=user.name) == access_token
+
+
+def test_fixed_lifetime():
+    clock = FakeClock()
+    db = InMemoryDatabase(config=dict(tokens=dict(ttl=60.0, sliding=False, clock=clock)))
+    user = db.persist_user(user=generate_valid_domain_user())
+    db.persist_access_token(username=user.name, password=user.password)
+
+    clock.now = 30.0
+    assert isinstance(db.fetch_access_token(username=user.name), AccessToken)
+    clock.now = 60.0
+    assert isinstance(db.fetch_access_token(username=user.name), Failure)
+    db.close()
+
+
+def test_no_lifetime():
+    db = InMemoryDatabase(config=dict(tokens=dict(ttl=None)))
+    user = db.persist_user(user=generate_valid_domain_user())
+    db.persist_access_token(username=user.name, password=user.password)
+
+    assert db.expire_access_tokens() == 0
+    assert isinstance(db.fetch_access_token(username=user.name), AccessToken)
+
+
+def test_expired_along_the_logins(setup):
+    db, user, clock = setup
+    other_user = db.persist_user(user=create_user(
+        name="other",
+        age=26,
+        password="Str0ngPassword",
+        email="other@test.com",
+        role=UserRole.USER
+    ))
+
+    db.persist_access_token(username=user.name, password=user.password)
+    clock.now = 61.0
+    db.persist_access_token(username=other_user.name, password=other_user.password)
+    # the second login removed the first token already
+    assert db.expire_access_tokens() == 0
+
+
+def test_expiry_thread_only_when_concurrent():
+    def expiry_threads():
+        return {thread for thread in threads() if thread.name == "tokens-expiry"}
+
+    before = expiry_threads()
+
+    db = InMemoryDatabase(config=None)
+    assert expiry_threads() - before == set()
+    db.close()
+
+    concurrent_db = InMemoryDatabase(config=dict(concurrent=True))
+    assert len(expiry_threads() - before) == 1
+    concurrent_db.close()
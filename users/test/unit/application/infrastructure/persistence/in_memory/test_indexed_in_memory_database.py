@@ -0,0 +1,82 @@
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope="function", params=["dict", "compact"])
+def setup(request, tmp_path):
+    config = dict(concurrent=True, storage=request.param, durability=dict(directory=str(tmp_path)))
+    db = InMemoryDatabase(config=config)
+    for number in range(2):
+        db.persist_user(user=generate_numbered_domain_user(number))
+
+    yield db, config
+    db.close()
+    del db
+
+
+def test_unique_email(setup):
+    db, _ = setup
+    db: InMemoryDatabase
+
+    email_taken = Failure(error="Email test0@test.com is already exist, please use a different email.")
+    assert db.persist_user(user=generate_numbered_domain_user(2, email="test0@test.com")) == email_taken
+    assert db.update_user_by.id(
+        user_id="1",
+        updated_user=generate_numbered_domain_user(1, email="test0@test.com")
+    ) == email_taken
+    assert db.update_user_by.id(
+        user_id="1",
+        updated_user=generate_numbered_domain_user(0)
+    ) == Failure(error="Username test0 is already exist, please use a different name.")
+    assert db.fetch_user_by.email(user_email="test0@test.com").id == "0"
+
+
+def test_updates_re_key_the_indexes(setup):
+    db, _ = setup
+    db: InMemoryDatabase
+
+    token = db.persist_access_token(username="test1", password="Str0ngPassword")
+    renamed_user = create_user(
+        name="renamed",
+        age=30,
+        password="Str0ngPassword",
+        email="renamed@test.com",
+        role=UserRole.ADMIN
+    )
+    for update_user_by in (
+            lambda: db.update_user_by.name(user_name="test1", updated_user=renamed_user),
+            lambda: db.update_user_by.email(user_email="renamed@test.com", updated_user=renamed_user)
+    ):
+        assert isinstance(update_user_by(), ApplicationUser)
+
+        assert isinstance(db.fetch_user_by.name(user_name="test1"), Failure)
+        assert isinstance(db.fetch_user_by.email(user_email="test1@test.com"), Failure)
+        assert db.fetch_user_by.name(user_name="renamed").id == "1"
+        assert db.fetch_user_by.email(user_email="renamed@test.com").id == "1"
+        assert db.indexes.ids_of(field="role", key=UserRole.ADMIN) == {"1"}
+        assert db.fetch_access_token(username="renamed") == token
+
+
+def test_delete_removes_every_entry(setup):
+    db, config = setup
+    db: InMemoryDatabase
+
+    db.persist_access_token(username="test1", password="Str0ngPassword")
+    assert isinstance(db.delete_user_by.email(user_email="test1@test.com"), Success)
+
+    assert isinstance(db.fetch_access_token(username="test1"), Failure)
+    assert db.indexes.ids_of(field="role", key=UserRole.USER) == {"0"}
+    # so they're all free for a new user
+    assert db.persist_user(user=generate_numbered_domain_user(1)).id == "2"
+
+    db.close()
+    recovered_db = InMemoryDatabase(config=config)
+    assert recovered_db.indexes.ids_of(field="role", key=UserRole.USER) == {"0", "2"}
+    assert recovered_db.fetch_user_by.name(user_name="test1").id == "2"
+    recovered_db.close()
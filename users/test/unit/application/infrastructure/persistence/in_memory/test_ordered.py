@@ -0,0 +1,38 @@
+import random
+
+from src.application.infrastructure.persistence.in_memory.ordered import SortedIds, OrderedTable
+
+
+def test_sorted_ids_follow_a_sorted_set():
+    randomizer = random.Random(7)
+    sorted_ids = SortedIds(block_size=4)
+    expected_ids = set()
+
+    for _ in range(2000):
+        user_id = randomizer.randrange(300)
+        if randomizer.random() < 0.6:
+            sorted_ids.add(user_id=user_id)
+            expected_ids.add(user_id)
+        else:
+            sorted_ids.discard(user_id=user_id)
+            expected_ids.discard(user_id)
+
+        after = randomizer.choice([None, randomizer.randrange(-5, 305)])
+        limit = randomizer.randrange(1, 20)
+        assert sorted_ids.after(user_id=after, limit=limit) == sorted(
+            user_id for user_id in expected_ids if after is None or user_id > after
+        )[:limit]
+
+
+def test_ordered_table():
+    table = OrderedTable(table={"3": "c", "1": "a"})
+    table["10"] = "j"
+    table["2"] = "b"
+    del table["3"]
+    table.pop("404", None)
+
+    assert table.keys_after(key=None, limit=10) == ["1", "2", "10"]
+    assert table.keys_after(key="1", limit=1) == ["2"]
+    assert table.keys_after(key="10", limit=10) == []
+    assert table.copy() == {"1": "a", "2": "b", "10": "j"}
+    assert len(table) == 3 and "3" not in table
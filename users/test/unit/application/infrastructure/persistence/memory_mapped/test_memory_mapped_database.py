@@ -0,0 +1,333 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from threading import Event, Thread
+
+from pytest import fixture
+
+from src.application.entity.health_check import Status
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.memory_mapped import MemoryMappedDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_valid_domain_user, generate_numbered_domain_user
+
+
+def persist_numbered_users(path: str, numbers: range) -> None:
+    db = MemoryMappedDatabase(config=dict(path=path))
+    for number in numbers:
+        db.persist_user(user=generate_numbered_domain_user(number))
+    db.close()
+
+
+@fixture(scope="function")
+def setup(tmp_path):
+    config = dict(path=str(tmp_path / "users.mmap"), capacity=64)
+    db = MemoryMappedDatabase(config=config)
+    domain_user = generate_valid_domain_user()
+    db.persist_user(user=domain_user)
+
+    yield db, domain_user, config
+    db.close()
+    del db
+
+
+def test_persist_and_fetch_user(setup):
+    db, domain_user, _ = setup
+    db: MemoryMappedDatabase
+
+    assert db.health_check().service_state == Status.HEALTHY
+    expected_user = PersistenceInterface.from_domain_user_to_database_user(user=domain_user, user_id="0")
+    assert db.fetch_user_by.id(user_id="0") == expected_user
+    assert db.fetch_user_by.name(user_name=domain_user.name) == expected_user
+    assert db.fetch_user_by.email(user_email=domain_user.email) == expected_user
+
+    assert db.persist_user(user=domain_user) == Failure(
+        error="Username test is already exist, please use a different name."
+    )
+    assert db.persist_user(user=create_user(
+        name="other",
+        age=26,
+        password="Str0ngPassword",
+        email=domain_user.email,
+        role=UserRole.USER
+    )) == Failure(error="Email test@test.com is already exist, please use a different email.")
+    for invalid_id in ("01", "-1", "1", "invalid"):
+        assert db.fetch_user_by.id(user_id=invalid_id) == Failure(
+            error=f"There is no user with id {invalid_id} to be fetched"
+        )
+    assert db.fetch_user_by.name(user_name="invalid") == Failure(
+        error="There is no user with name invalid to be fetched"
+    )
+
+
+def test_update_and_delete_user(setup):
+    db, domain_user, _ = setup
+    db: MemoryMappedDatabase
+
+    access_token = db.persist_access_token(username=domain_user.name, password=domain_user.password)
+    assert isinstance(access_token, AccessToken)
+    assert db.persist_access_token(username=domain_user.name, password="invalid") == Failure(
+        error="Invalid password for user test"
+    )
+
+    # the indexes follow the renamed user and so does its token
+    updated_user = db.update_user_by.email(user_email=domain_user.email, updated_user=generate_numbered_domain_user(1))
+    assert updated_user.name == "test1" and updated_user.id == "0"
+    assert db.fetch_user_by.email(user_email="test1@test.com") == updated_user
+    assert isinstance(db.fetch_user_by.name(user_name=domain_user.name), Failure)
+    assert isinstance(db.fetch_user_by.email(user_email=domain_user.email), Failure)
+    assert db.fetch_access_token(username="test1") == access_token
+
+    assert isinstance(db.delete_user_by.name(user_name="test1"), Success)
+    assert db.delete_user_by.id(user_id="0") == Failure(error="There is no user with id 0 to be deleted")
+    assert db.fetch_access_token(username="test1") == Failure(error="There is no access token for user test1")
+
+    # ids are never reused
+    assert db.persist_user(user=domain_user).id == "1"
+
+
+def test_capacity_and_field_widths(setup):
+    db, _, _ = setup
+    db: MemoryMappedDatabase
+
+    assert db.persist_user(user=create_user(
+        name="a" * 127,
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    )) == Failure(error="The name is too long to be stored, at most 126 bytes.")
+
+    persisted_users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(1, 64)]
+    assert all(isinstance(user, ApplicationUser) for user in persisted_users)
+    assert db.persist_user(user=generate_numbered_domain_user(64)) == Failure(
+        error="There is no room for more users, the capacity is 64 users."
+    )
+
+    # deleting and renaming many users leaves tombstones behind, the lookups keep working after their cleanup
+    for user in persisted_users[:40]:
+        assert isinstance(db.delete_user_by.id(user_id=user.id), Success)
+    for user in persisted_users[40:]:
+        db.update_user_by.id(user_id=user.id, updated_user=create_user(
+            name=f"renamed{user.id}",
+            age=30,
+            password="Str0ngPassword",
+            email=None,
+            role=UserRole.ADMIN
+        ))
+        assert db.fetch_user_by.name(user_name=f"renamed{user.id}").role == UserRole.ADMIN
+        assert isinstance(db.fetch_user_by.email(user_email=user.email), Failure)
+
+
+def test_shared_between_processes(setup):
+    db, domain_user, config = setup
+    db: MemoryMappedDatabase
+
+    processes = [
+        get_context("spawn").Process(target=persist_numbered_users, args=(config["path"], range(start, start + 10)))
+        for start in (1, 11)
+    ]
+    for process in processes:
+        process.start()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda number: db.persist_user(user=generate_numbered_domain_user(number)), range(21, 31)))
+    for process in processes:
+        process.join()
+
+    # every user written by any of the processes is visible here, with a unique id
+    users = [db.fetch_user_by.name(user_name=f"test{number}") for number in range(1, 31)]
+    assert all(isinstance(user, ApplicationUser) for user in users)
+    assert sorted(int(user.id) for user in users) == list(range(1, 31))
+
+    reopened_db = MemoryMappedDatabase(config=config)
+    try:
+        assert reopened_db.fetch_user_by.id(user_id="0") == db.fetch_user_by.name(user_name=domain_user.name)
+    finally:
+        reopened_db.close()
+
+
+def test_persist_users(setup):
+    db = setup[0]
+
+    persist_users_status = db.persist_users(users=[
+        generate_numbered_domain_user(1),
+        generate_valid_domain_user(),  # already there
+        generate_numbered_domain_user(2),
+        generate_numbered_domain_user(1)  # already in the same batch
+    ])
+    assert persist_users_status[0] == PersistenceInterface.from_domain_user_to_database_user(
+        user=generate_numbered_domain_user(1),
+        user_id="1"
+    )
+    assert isinstance(persist_users_status[1], Failure)
+    assert persist_users_status[2] == PersistenceInterface.from_domain_user_to_database_user(
+        user=generate_numbered_domain_user(2),
+        user_id="2"
+    )
+    assert isinstance(persist_users_status[3], Failure)
+
+    assert db.fetch_user_by.name(user_name="test2") == persist_users_status[2]
+    assert db.persist_user(user=generate_numbered_domain_user(3)).id == "3"
+
+
+def test_fetch_users(setup):
+    db, domain_user, _ = setup
+    db: MemoryMappedDatabase
+
+    expected_user = PersistenceInterface.from_domain_user_to_database_user(user=domain_user, user_id="0")
+    other_user = db.persist_user(user=generate_numbered_domain_user(1))
+
+    assert db.fetch_user_by.ids(user_ids=["1", "invalid", "0"]) == [
+        other_user,
+        Failure(error="There is no user with id invalid to be fetched"),
+        expected_user
+    ]
+    assert db.fetch_user_by.names(user_names=[domain_user.name]) == [expected_user]
+    assert db.fetch_user_by.emails(user_emails=["test1@test.com", "invalid"]) == [
+        other_user,
+        Failure(error="There is no user with email invalid to be fetched")
+    ]
+
+
+def test_list_users(setup):
+    db = setup[0]
+
+    users = [db.fetch_user_by.id(user_id="0")] + [
+        db.persist_user(user=generate_numbered_domain_user(number)) for number in range(1, 6)
+    ]
+    db.delete_user_by.id(user_id="2")
+    db.delete_user_by.id(user_id="3")
+
+    assert db.list_users(after_id=None, limit=2) == users[:2]
+    assert db.list_users(after_id="1", limit=2) == [users[4], users[5]]
+    assert db.list_users(after_id="4", limit=10) == [users[5]]
+    assert db.list_users(after_id="5", limit=10) == []
+
+
+def test_search_users(setup):
+    db = setup[0]
+
+    for number in range(1, 13):
+        db.persist_user(user=create_user(
+            name=f"test{number}",
+            age=20 + number % 4,
+            password="Str0ngPassword",
+            email=f"test{number}@test.com",
+            role=UserRole.ADMIN if number % 3 == 0 else UserRole.USER
+        ))
+    db.delete_user_by.id(user_id="6")
+    db.update_user_by.id(user_id="9", updated_user=create_user(
+        name="test9",
+        age=40,
+        password="Str0ngPassword",
+        email="test9@test.com",
+        role=UserRole.USER
+    ))
+
+    def search(*, role=None, age_gte=None, age_lte=None, after_id=None, limit=100):
+        return [user.name for user in db.search_users(
+            role=role,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit
+        )]
+
+    assert search(role=UserRole.ADMIN) == ["test3", "test12"]
+    assert search(role=UserRole.ADMIN, age_gte=21) == ["test3"]
+    assert search(role=UserRole.USER, age_gte=21, age_lte=22) == ["test1", "test2", "test5", "test10"]
+    assert search(age_gte=26) == ["test", "test9"]
+    assert search(age_lte=20, after_id="4", limit=2) == ["test8", "test12"]
+    assert search(limit=3) == ["test", "test1", "test2"]
+    assert search(role=UserRole.ADMIN, age_gte=100) == []
+
+
+def test_search_users_by_prefix(setup):
+    db = setup[0]
+
+    for number, (name, email) in enumerate([
+        ("Abdel", "abdel@corp.com"),
+        ("abdou", "ABDOU@Corp.com"),
+        ("abc", "abc@other.com"),
+        ("Zed", "zed@corp.com"),
+        ("abdul", "abdul@mail.corp.com"),
+        ("aBd", None)
+    ]):
+        db.persist_user(user=create_user(
+            name=name,
+            age=26,
+            password="Str0ngPassword",
+            email=email,
+            role=UserRole.USER
+        ))
+    db.delete_user_by.name(user_name="abdou")
+
+    def search(*, selector, prefix, after_key=None, after_id=None, limit=100):
+        return [user.name for user in db.search_users_by_prefix(
+            selector=selector,
+            prefix=prefix,
+            after_key=after_key,
+            after_id=after_id,
+            limit=limit
+        )]
+
+    # ordered by key then id
+    assert search(selector="name", prefix="abd") == ["aBd", "Abdel", "abdul"]
+    assert search(selector="name", prefix="abd", limit=2) == ["aBd", "Abdel"]
+    assert search(selector="name", prefix="abd", after_key="abdel", after_id="1", limit=2) == ["abdul"]
+    assert search(selector="name", prefix="t") == ["test"]
+    assert search(selector="email_domain", prefix="com.corp@") == ["Abdel", "Zed"]
+    assert search(selector="email_domain", prefix="com.corp.mail@") == ["abdul"]
+    assert search(selector="email_domain", prefix="org.") == []
+
+
+def test_search_users_by_similar_name(setup):
+    db = setup[0]
+
+    for name in ["abdulrahman", "Abdelrahman", "mohamed", "zed"]:
+        db.persist_user(user=create_user(name=name, age=26, password="Str0ngPassword", email=None, role=UserRole.USER))
+    db.update_user_by.name(user_name="zed", updated_user=create_user(
+        name="zeyad",
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    ))
+    db.delete_user_by.name(user_name="mohamed")
+
+    def search(*, name, limit=10):
+        return [user.name for user in db.search_users_by_similar_name(name=name, limit=limit)]
+
+    assert set(search(name="abdulrahmen")) == {"abdulrahman", "Abdelrahman"}
+    assert search(name="ABDULRAHMEN", limit=1) == ["abdulrahman"]
+    assert search(name="zeyad") == ["zeyad"]
+    assert search(name="mohamed") == []
+
+
+def test_lookups_during_an_index_rebuild(tmp_path):
+    db = MemoryMappedDatabase(config=dict(path=str(tmp_path / "users.mmap"), capacity=4096))
+    db.persist_users(users=[generate_numbered_domain_user(number) for number in range(2000)])
+    stopped = Event()
+
+    def rebuild_indexes():
+        # (the rebuilds come after many writes, never back to back)
+        while not stopped.wait(0.001):
+            db._MemoryMappedDatabase__rebuild_indexes()
+
+    rebuilder = Thread(target=rebuild_indexes)
+    rebuilder.start()
+    try:
+        # the readers never lock, they have to see either index (and never a half rebuilt one)
+        missed = [
+            number for number in range(1999, 1499, -1)
+            if isinstance(db.fetch_user_by.name(user_name=f"test{number}"), Failure)
+        ]
+    finally:
+        stopped.set()
+        rebuilder.join()
+    db.close()
+
+    assert missed == []
@@ -0,0 +1,344 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture, raises
+
+from src.application.entity.health_check import Status
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import PersistenceInterface, sqlite
+from src.application.infrastructure.persistence.sqlite import SqliteDatabase
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.usecase.user.delete_user import DeleteUserUseCase
+from src.application.usecase.user.fetch_user import FetchUserUseCase
+from src.application.usecase.user.update_user import UpdateUserUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_valid_domain_user, generate_numbered_domain_user
+
+
+@fixture(scope="function")
+def setup(tmp_path):
+    db = SqliteDatabase(
+        config=dict(path=str(tmp_path / "users.db"))
+    )
+    domain_user = generate_valid_domain_user()
+    db.persist_user(user=domain_user)
+
+    yield db, domain_user
+    db.close()
+    del db
+
+
+def test_health_check(setup):
+    db, _ = setup
+    db: SqliteDatabase
+
+    assert db.health_check().service_state == Status.HEALTHY
+
+
+def test_persist_and_fetch_user(setup):
+    db, domain_user = setup
+    db: SqliteDatabase
+
+    expected_user = PersistenceInterface.from_domain_user_to_database_user(user=domain_user, user_id="0")
+    assert db.fetch_user_by.id(user_id="0") == expected_user
+    assert db.fetch_user_by.name(user_name=domain_user.name) == expected_user
+    assert db.fetch_user_by.email(user_email=domain_user.email) == expected_user
+
+    assert db.persist_user(user=domain_user) == Failure(
+        error="Username test is already exist, please use a different name."
+    )
+    assert db.fetch_user_by.id(user_id="invalid") == Failure(error="There is no user with id invalid to be fetched")
+    assert db.fetch_user_by.name(user_name="invalid") == Failure(
+        error="There is no user with name invalid to be fetched"
+    )
+    assert db.fetch_user_by.email(user_email="invalid") == Failure(
+        error="There is no user with email invalid to be fetched"
+    )
+
+
+def test_unique_email(setup):
+    db, domain_user = setup
+    db: SqliteDatabase
+
+    assert db.persist_user(user=create_user(
+        name="other",
+        age=26,
+        password="Str0ngPassword",
+        email=domain_user.email,
+        role=UserRole.USER
+    )) == Failure(error="Email test@test.com is already exist, please use a different email.")
+
+
+def test_access_token_follows_the_user(setup):
+    db, domain_user = setup
+    db: SqliteDatabase
+
+    assert db.persist_access_token(username=domain_user.name, password="invalid") == Failure(
+        error="Invalid password for user test"
+    )
+    access_token = db.persist_access_token(username=domain_user.name, password=domain_user.password)
+    assert isinstance(access_token, AccessToken)
+    assert db.fetch_access_token(username=domain_user.name) == access_token
+
+    # renaming the user keeps its token
+    db.update_user_by.id(user_id="0", updated_user=generate_numbered_domain_user(1))
+    assert db.fetch_access_token(username="test1") == access_token
+    assert isinstance(db.fetch_access_token(username=domain_user.name), Failure)
+
+    # deleting the user drops its token
+    assert isinstance(db.delete_user_by.name(user_name="test1"), Success)
+    assert db.fetch_access_token(username="test1") == Failure(error="There is no access token for user test1")
+
+
+def test_selector_semantics_through_usecases(setup):
+    db, domain_user = setup
+    db: SqliteDatabase
+    fetch_usecase = FetchUserUseCase(config=None, persistence=db)
+    update_usecase = UpdateUserUseCase(config=None, persistence=db)
+    delete_usecase = DeleteUserUseCase(config=None, persistence=db)
+
+    updated_domain_user = generate_numbered_domain_user(1)
+    assert update_usecase.execute(
+        update_by_selector="email",
+        update_by_data=domain_user.email,
+        updated_user=updated_domain_user
+    ) == PersistenceInterface.from_domain_user_to_database_user(user=updated_domain_user, user_id="0")
+    assert update_usecase.execute(
+        update_by_selector="name",
+        update_by_data="invalid",
+        updated_user=updated_domain_user
+    ) == Failure(error="There is no user with name invalid to be updated")
+
+    assert fetch_usecase.execute(fetch_by_selector="name", fetch_by_data="test1") == \
+        PersistenceInterface.from_domain_user_to_database_user(user=updated_domain_user, user_id="0")
+
+    assert isinstance(delete_usecase.execute(delete_by_selector="id", delete_by_data="0"), Success)
+    assert delete_usecase.execute(delete_by_selector="id", delete_by_data="0") == Failure(
+        error="There is no user with id 0 to be deleted"
+    )
+
+    # ids are never reused
+    assert db.persist_user(user=domain_user).id == "1"
+
+
+def test_concurrent_persist_user(setup):
+    db, _ = setup
+    db: SqliteDatabase
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        persisted_users = list(executor.map(
+            lambda number: db.persist_user(user=generate_numbered_domain_user(number)),
+            range(1, 41)
+        ))
+
+    assert all(isinstance(user, ApplicationUser) for user in persisted_users)
+    assert sorted(int(user.id) for user in persisted_users) == list(range(1, 41))
+
+
+def test_persist_users(setup):
+    db = setup[0]
+
+    persist_users_status = db.persist_users(users=[
+        generate_numbered_domain_user(1),
+        generate_valid_domain_user(),  # already there
+        generate_numbered_domain_user(2),
+        generate_numbered_domain_user(1)  # already in the same batch
+    ])
+    assert persist_users_status[0] == PersistenceInterface.from_domain_user_to_database_user(
+        user=generate_numbered_domain_user(1),
+        user_id="1"
+    )
+    assert isinstance(persist_users_status[1], Failure)
+    assert persist_users_status[2] == PersistenceInterface.from_domain_user_to_database_user(
+        user=generate_numbered_domain_user(2),
+        user_id="2"
+    )
+    assert isinstance(persist_users_status[3], Failure)
+
+    assert db.fetch_user_by.name(user_name="test2") == persist_users_status[2]
+    assert db.persist_user(user=generate_numbered_domain_user(3)).id == "3"
+
+
+def test_fetch_users(setup):
+    db, domain_user = setup
+    db: SqliteDatabase
+
+    expected_user = PersistenceInterface.from_domain_user_to_database_user(user=domain_user, user_id="0")
+    other_user = db.persist_user(user=generate_numbered_domain_user(1))
+
+    assert db.fetch_user_by.ids(user_ids=["1", "invalid", "0", "00"]) == [
+        other_user,
+        Failure(error="There is no user with id invalid to be fetched"),
+        expected_user,
+        expected_user
+    ]
+    assert db.fetch_user_by.names(user_names=[domain_user.name, "invalid"]) == [
+        expected_user,
+        Failure(error="There is no user with name invalid to be fetched")
+    ]
+    assert db.fetch_user_by.emails(user_emails=["test1@test.com"] * 2) == [other_user] * 2
+    assert db.fetch_user_by.ids(user_ids=[]) == []
+
+
+def test_list_users(setup):
+    db = setup[0]
+
+    users = [db.fetch_user_by.id(user_id="0")] + [
+        db.persist_user(user=generate_numbered_domain_user(number)) for number in range(1, 6)
+    ]
+    db.delete_user_by.id(user_id="2")
+    db.delete_user_by.id(user_id="3")
+
+    assert db.list_users(after_id=None, limit=2) == users[:2]
+    assert db.list_users(after_id="1", limit=2) == [users[4], users[5]]
+    assert db.list_users(after_id="4", limit=10) == [users[5]]
+    assert db.list_users(after_id="5", limit=10) == []
+
+
+def test_search_users(setup):
+    db = setup[0]
+
+    for number in range(1, 13):
+        db.persist_user(user=create_user(
+            name=f"test{number}",
+            age=20 + number % 4,
+            password="Str0ngPassword",
+            email=f"test{number}@test.com",
+            role=UserRole.ADMIN if number % 3 == 0 else UserRole.USER
+        ))
+    db.delete_user_by.id(user_id="6")
+    db.update_user_by.id(user_id="9", updated_user=create_user(
+        name="test9",
+        age=40,
+        password="Str0ngPassword",
+        email="test9@test.com",
+        role=UserRole.USER
+    ))
+
+    def search(*, role=None, age_gte=None, age_lte=None, after_id=None, limit=100):
+        return [user.name for user in db.search_users(
+            role=role,
+            age_gte=age_gte,
+            age_lte=age_lte,
+            after_id=after_id,
+            limit=limit
+        )]
+
+    assert search(role=UserRole.ADMIN) == ["test3", "test12"]
+    assert search(role=UserRole.ADMIN, age_gte=21) == ["test3"]
+    assert search(role=UserRole.USER, age_gte=21, age_lte=22) == ["test1", "test2", "test5", "test10"]
+    assert search(age_gte=26) == ["test", "test9"]
+    assert search(age_lte=20, after_id="4", limit=2) == ["test8", "test12"]
+    assert search(limit=3) == ["test", "test1", "test2"]
+    assert search(role=UserRole.ADMIN, age_gte=100) == []
+
+
+def test_search_users_by_prefix(setup):
+    db = setup[0]
+
+    for number, (name, email) in enumerate([
+        ("Abdel", "abdel@corp.com"),
+        ("abdou", "ABDOU@Corp.com"),
+        ("abc", "abc@other.com"),
+        ("Zed", "zed@corp.com"),
+        ("abdul", "abdul@mail.corp.com"),
+        ("aBd", None)
+    ]):
+        db.persist_user(user=create_user(
+            name=name,
+            age=26,
+            password="Str0ngPassword",
+            email=email,
+            role=UserRole.USER
+        ))
+    db.delete_user_by.name(user_name="abdou")
+
+    def search(*, selector, prefix, after_key=None, after_id=None, limit=100):
+        return [user.name for user in db.search_users_by_prefix(
+            selector=selector,
+            prefix=prefix,
+            after_key=after_key,
+            after_id=after_id,
+            limit=limit
+        )]
+
+    # ordered by key then id
+    assert search(selector="name", prefix="abd") == ["aBd", "Abdel", "abdul"]
+    assert search(selector="name", prefix="abd", limit=2) == ["aBd", "Abdel"]
+    assert search(selector="name", prefix="abd", after_key="abdel", after_id="1", limit=2) == ["abdul"]
+    assert search(selector="name", prefix="t") == ["test"]
+    assert search(selector="email_domain", prefix="com.corp@") == ["Abdel", "Zed"]
+    assert search(selector="email_domain", prefix="com.corp.mail@") == ["abdul"]
+    assert search(selector="email_domain", prefix="org.") == []
+    # no string after all the ones starting with these, the range is open ended
+    assert search(selector="name", prefix="", limit=2) == ["abc", "aBd"]
+    assert search(selector="name", prefix="z\U0010ffff") == []
+    assert search(selector="name", prefix="\U0010ffff") == []
+
+
+def test_search_users_by_similar_name(setup):
+    search_users_by_similar_name(db=setup[0])
+
+
+def test_search_users_by_similar_name_without_trigram_tokenizer(tmp_path, monkeypatch):
+    # like a sqlite older than 3.34
+    monkeypatch.setattr(sqlite, "_has_trigram_tokenizer", lambda connection: False)
+    db = SqliteDatabase(config=dict(path=str(tmp_path / "users.db")))
+    db.persist_user(user=generate_valid_domain_user())
+
+    search_users_by_similar_name(db=db)
+    db.close()
+
+    # the database keeps its trigram table, even opened by a sqlite having the tokenizer
+    monkeypatch.undo()
+    reopened_db = SqliteDatabase(config=dict(path=str(tmp_path / "users.db")))
+    assert [user.name for user in reopened_db.search_users_by_similar_name(name="zeyad", limit=1)] == ["zeyad"]
+    reopened_db.close()
+
+
+def test_trigram_tokenizer_needed_by_the_database(setup, tmp_path, monkeypatch):
+    setup[0].close()
+    monkeypatch.setattr(sqlite, "_has_trigram_tokenizer", lambda connection: False)
+
+    with raises(RuntimeError):
+        SqliteDatabase(config=dict(path=str(tmp_path / "users.db")))
+
+
+def search_users_by_similar_name(*, db: SqliteDatabase):
+    for name in ["abdulrahman", "Abdelrahman", "mohamed", "zed"]:
+        db.persist_user(user=create_user(name=name, age=26, password="Str0ngPassword", email=None, role=UserRole.USER))
+    db.update_user_by.name(user_name="zed", updated_user=create_user(
+        name="zeyad",
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    ))
+    db.delete_user_by.name(user_name="mohamed")
+
+    def search(*, name, limit=10):
+        return [user.name for user in db.search_users_by_similar_name(name=name, limit=limit)]
+
+    assert set(search(name="abdulrahmen")) == {"abdulrahman", "Abdelrahman"}
+    assert search(name="ABDULRAHMEN", limit=1) == ["abdulrahman"]
+    assert search(name="zeyad") == ["zeyad"]
+    assert search(name="mohamed") == []
+
+
+def test_name_trigrams_of_an_older_database(setup, tmp_path):
+    db, domain_user = setup
+    db.close()
+    # as it was before the trigrams
+    connection = sqlite3.connect(str(tmp_path / "users.db"))
+    for trigger in ("insert", "delete", "update"):
+        connection.execute(f"DROP TRIGGER users_name_trigrams_{trigger}")
+    connection.execute("DROP TABLE users_name_trigrams")
+    connection.close()
+
+    reopened_db = SqliteDatabase(config=dict(path=str(tmp_path / "users.db")))
+    assert [user.name for user in reopened_db.search_users_by_similar_name(name=domain_user.name, limit=1)] == [
+        domain_user.name
+    ]
+    reopened_db.close()
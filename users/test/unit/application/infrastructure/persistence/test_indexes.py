@@ -0,0 +1,69 @@
+from pytest import raises
+
+from src.application.infrastructure.persistence import PersistenceInterface
+from src.application.infrastructure.persistence.indexes import IndexManager, name_key_of, email_key_of
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+
+
+def generate_numbered_user(number: int, email: str = None, role: UserRole = UserRole.USER):
+    return PersistenceInterface.from_domain_user_to_database_user(
+        user=create_user(
+            name=f"test{number}",
+            age=26,
+            password="Str0ngPassword",
+            email=email if email is not None else f"test{number}@test.com",
+            role=role
+        ),
+        user_id=str(number)
+    )
+
+
+def test_index_manager():
+    tables = {}
+    indexes = IndexManager(tables=tables)
+    first_user, second_user = generate_numbered_user(0), generate_numbered_user(1, role=UserRole.ADMIN)
+    indexes.add(user_id="0", user=first_user)
+    indexes.add(user_id="1", user=second_user)
+
+    assert tables["names"] == {"test0": "0", "test1": "1"}
+    assert indexes.get(field="email", key="test1@test.com") == "1"
+    assert indexes.ids_of(field="role", key=UserRole.USER) == {"0"}
+    assert indexes.ids_of(field="name", key="test0") == {"0"}
+    with raises(ValueError):
+        indexes.get(field="role", key=UserRole.USER)
+
+    # the user's own values aren't conflicts, the others' are
+    assert indexes.conflict(user=first_user, user_id="0") is None
+    assert indexes.conflict(user=first_user) == Failure(
+        error="Username test0 is already exist, please use a different name."
+    )
+    assert indexes.conflict(user=generate_numbered_user(2, email="test1@test.com")) == Failure(
+        error="Email test1@test.com is already exist, please use a different email."
+    )
+    assert indexes.lock_keys(first_user) == [("name", "test0"), ("email", "test0@test.com")]
+
+    # re-keying, only what changed moves
+    updated_user = generate_numbered_user(0, email="new@test.com", role=UserRole.ADMIN)
+    indexes.add(user_id="0", user=updated_user)
+    indexes.remove(user_id="0", user=first_user, kept=updated_user)
+    assert tables["names"] == {"test0": "0", "test1": "1"}
+    assert tables["emails"] == {"new@test.com": "0", "test1@test.com": "1"}
+    assert indexes.ids_of(field="role", key=UserRole.ADMIN) == {"0", "1"}
+    assert indexes.ids_of(field="role", key=UserRole.USER) == frozenset()
+
+    indexes.remove(user_id="1", user=second_user)
+    assert tables["names"] == {"test0": "0"}
+    assert indexes.ids_of(field="role", key=UserRole.ADMIN) == {"0"}
+
+    rebuilt_indexes = IndexManager(tables=tables)
+    rebuilt_indexes.rebuild(users=[("0", updated_user)])
+    assert rebuilt_indexes.ids_of(field="role", key=UserRole.ADMIN) == {"0"}
+
+
+def test_prefix_keys():
+    assert name_key_of("Abdel") == "abdel"
+    assert email_key_of("Abd@Mail.Corp.com") == "com.corp.mail@abd"
+    # a domain alone is the prefix of all its emails
+    assert email_key_of("abd@corp.com").startswith(email_key_of("@corp.com"))
+    assert not email_key_of("abd@notcorp.com").startswith(email_key_of("@corp.com"))
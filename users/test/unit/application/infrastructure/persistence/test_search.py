@@ -0,0 +1,43 @@
+import random
+
+from src.application.infrastructure.persistence.indexes import IndexManager
+from src.application.infrastructure.persistence.search import plan_search, predicates_of
+from src.domain.entity.user import create_user, UserRole
+
+
+def test_plan_search_matches_a_full_scan():
+    randomizer = random.Random(5)
+    indexes = IndexManager(tables={})
+    users = {}
+    for user_id in range(500):
+        user = create_user(
+            name=f"test{user_id}",
+            age=randomizer.randrange(18, 60),
+            password="Str0ngPassword",
+            email=None,
+            role=UserRole.ADMIN if randomizer.random() < 0.1 else UserRole.USER
+        )
+        users[str(user_id)] = user
+        indexes.add(user_id=str(user_id), user=user)
+    for user_id in randomizer.sample(sorted(users), 100):
+        indexes.remove(user_id=user_id, user=users.pop(user_id))
+
+    for _ in range(200):
+        predicates = predicates_of(
+            role=randomizer.choice([None, UserRole.ADMIN, UserRole.USER]),
+            age_gte=randomizer.choice([None, randomizer.randrange(15, 65)]),
+            age_lte=randomizer.choice([None, randomizer.randrange(15, 65)])
+        )
+        after_id = randomizer.choice([None, randomizer.randrange(500)])
+        all_ids = iter(sorted(int(user_id) for user_id in users if after_id is None or int(user_id) > after_id))
+        candidates = list(plan_search(indexes=indexes, all_ids=all_ids, predicates=predicates, after_id=after_id))
+
+        # the candidates are in order, all the matching users are among them
+        assert candidates == sorted(candidates)
+        assert [user_id for user_id in candidates if all(
+            predicate.matches(user=users[str(user_id)]) for predicate in predicates
+        )] == sorted(
+            int(user_id) for user_id, user in users.items()
+            if (after_id is None or int(user_id) > after_id)
+            and all(predicate.matches(user=user) for predicate in predicates)
+        )
@@ -0,0 +1,116 @@
+import random
+
+from src.application.infrastructure.persistence.structures import (
+    BitmapIndex,
+    SortedIndex,
+    PrefixIndex,
+    TrigramIndex,
+    ScalableBloomFilter,
+    TimerWheel
+)
+from src.application.utilities.text import trigrams_of
+
+
+def test_structures_follow_a_dict_of_sets():
+    randomizer = random.Random(11)
+    bitmap_index, sorted_index = BitmapIndex(), SortedIndex()
+    expected = {}  # user id -> key, a user has one value of a field
+
+    for _ in range(3000):
+        # ids far apart too, so whole empty chunks of the bitmaps get skipped
+        user_id = randomizer.choice([randomizer.randrange(100), randomizer.randrange(100_000)])
+        key = randomizer.randrange(10)
+        for index in (bitmap_index, sorted_index):
+            index.discard(key=expected.get(user_id, key), user_id=user_id)
+        expected.pop(user_id, None)
+        if randomizer.random() < 0.7:
+            bitmap_index.add(key=key, user_id=user_id)
+            sorted_index.add(key=key, user_id=user_id)
+            expected[user_id] = key
+
+        low = randomizer.randrange(10)
+        high = low + randomizer.randrange(3)
+        after_id = randomizer.choice([None, randomizer.randrange(100_000)])
+        in_range = {user_id for user_id, key in expected.items() if low <= key <= high}
+        for index in (bitmap_index, sorted_index):
+            assert index.count(low=low, high=high) == len(in_range)
+            assert list(index.ids_after(low=low, high=high, after_id=after_id)) == sorted(
+                user_id for user_id in in_range if after_id is None or user_id > after_id
+            )
+
+        assert bitmap_index.contains(low=low, high=high, user_id=user_id) == (user_id in in_range)
+        assert sorted_index.contains(low=low, high=high, user_id=user_id) is None
+
+
+def test_prefix_index_follows_a_sorted_list():
+    randomizer = random.Random(3)
+    prefix_index = PrefixIndex()
+    expected = set()
+
+    for _ in range(2000):
+        pair = ("".join(randomizer.choice("abc") for _ in range(randomizer.randrange(1, 4))), randomizer.randrange(50))
+        if randomizer.random() < 0.7:
+            prefix_index.add(key=pair[0], user_id=pair[1])
+            expected.add(pair)
+        else:
+            prefix_index.discard(key=pair[0], user_id=pair[1])
+            expected.discard(pair)
+
+        prefix = "".join(randomizer.choice("abc") for _ in range(randomizer.randrange(0, 3)))
+        after = randomizer.choice([(None, None), (pair[0], None), pair])
+        limit = randomizer.randrange(1, 10)
+        assert prefix_index.prefixed(prefix=prefix, after_key=after[0], after_id=after[1], limit=limit) == sorted(
+            (key, user_id) for key, user_id in expected
+            if key.startswith(prefix) and (after[0] is None or (key, user_id) > (after[0], -1 if after[1] is None else after[1]))
+        )[:limit]
+
+
+def test_trigram_index_candidates():
+    trigram_index = TrigramIndex(max_postings=8)
+    names = ["abdul", "abdel", "abdo", "zed", "zeyad"] + [f"common{number}" for number in range(20)]
+    for user_id, name in enumerate(names):
+        trigram_index.add(key=trigrams_of(name), user_id=user_id)
+    trigram_index.discard(key=trigrams_of("abdo"), user_id=2)
+
+    assert trigram_index.candidates(trigrams=trigrams_of("abdul"), limit=2) == [0, 1]
+    assert trigram_index.candidates(trigrams=trigrams_of("zed"), limit=5)[0] == 3
+    assert trigram_index.candidates(trigrams=trigrams_of("xyz"), limit=5) == []
+    # the postings read are bounded, the rarest trigrams are read first
+    assert trigram_index.candidates(trigrams=trigrams_of("common7"), limit=1) == [names.index("common7")]
+
+
+def test_scalable_bloom_filter():
+    bloom_filter = ScalableBloomFilter(capacity=1000, error_rate=0.01)
+    for number in range(20_000):
+        bloom_filter.add(key=f"name:test{number}")
+
+    # never a false "certainly not", and about the asked error rate however much it grew
+    assert all(bloom_filter.may_contain(key=f"name:test{number}") for number in range(20_000))
+    assert bloom_filter.filters > 1
+    false_positives = sum(bloom_filter.may_contain(key=f"name:other{number}") for number in range(20_000))
+    assert false_positives < 20_000 * 0.02
+
+    # an added key again takes no room
+    count = len(bloom_filter)
+    bloom_filter.add(key="name:test0")
+    assert len(bloom_filter) == count
+
+
+def test_timer_wheel():
+    wheel = TimerWheel(tick=1.0, now=0.0)
+    for key, deadline in (("a", 0.5), ("b", 2.5), ("c", 2.0), ("d", 10.0)):
+        wheel.schedule(key=key, deadline=deadline)
+
+    assert wheel.advance(now=0.9) == []
+    assert wheel.advance(now=1.0) == ["a"]
+    # moved later, then cancelled
+    wheel.schedule(key="c", deadline=5.0)
+    wheel.schedule(key="d", deadline=3.0)
+    wheel.cancel(key="d")
+    assert wheel.advance(now=3.0) == ["b"]
+    assert len(wheel) == 1
+    # past deadlines expire on the next tick, long pauses only visit the non empty buckets
+    wheel.schedule(key="e", deadline=1.0)
+    assert wheel.advance(now=4.0) == ["e"]
+    assert wheel.advance(now=10 ** 9) == ["c"]
+    assert len(wheel) == 0
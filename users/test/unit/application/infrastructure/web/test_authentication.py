@@ -0,0 +1,125 @@
+import time
+
+import jwt
+from pytest import raises
+
+from src.application.entity.principal import Principal
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_user = ApplicationUser(
+    id="7",
+    name="test",
+    age=26,
+    email="test@test.com",
+    password="Str0ngPassword",
+    role=UserRole.ADMIN
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_issue_and_verify():
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60)
+    access_token = keyring.issue(user=_user)
+
+    assert keyring.owns(token=access_token.token)
+    principal = keyring.verify(token=access_token.token)
+    assert isinstance(principal, Principal)
+    assert (principal.id, principal.name, principal.email) == ("7", "test", "test@test.com")
+    assert principal.role.name == "ADMIN"
+    assert principal.expires_at - time.time() <= 60
+
+
+def test_other_tokens():
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first")
+    # like the stored ones, signed with another key and without a kid
+    stored_token = jwt.encode({"username": "test"}, "Str0ngPassword", algorithm="HS256").decode("utf-8")
+
+    assert not keyring.owns(token=stored_token)
+    assert not keyring.owns(token="not a token")
+    assert isinstance(keyring.verify(token=stored_token), Failure)
+
+    forged = JwtKeyring(keys=dict(first="other secret"), active_kid="first").issue(user=_user)
+    assert keyring.owns(token=forged.token)
+    assert "Signature verification failed" in keyring.verify(token=forged.token).error
+
+
+def test_expired():
+    clock = FakeClock()
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60, clock=clock)
+    access_token = keyring.issue(user=_user)
+
+    # still valid by the wall clock, not by the keyring's one
+    clock.now += 120
+    verify_status = keyring.verify(token=access_token.token)
+    assert isinstance(verify_status, Failure)
+    assert verify_status.error == "The access token has expired"
+
+
+def test_rotation():
+    clock = FakeClock()
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60, clock=clock)
+    first_token = keyring.issue(user=_user)
+
+    keyring.rotate(kid="second", key="another secret")
+    clock.now += 30
+    second_token = keyring.issue(user=_user)
+    assert keyring.active_kid == "second"
+    assert jwt.get_unverified_header(second_token.token)["kid"] == "second"
+    assert isinstance(keyring.verify(token=first_token.token), Principal)
+
+    # the first key is of no use once all its tokens expired
+    clock.now += 30
+    assert keyring.verify(token=first_token.token).error == "Unknown access token key first"
+    keyring.rotate(kid="third", key="yet another secret")
+    assert isinstance(keyring.verify(token=second_token.token), Principal)
+
+
+def test_of():
+    keyring = JwtKeyring.of(keys="first:secret, second:another:secret")
+
+    assert keyring.active_kid == "second"
+    assert isinstance(keyring.verify(token=keyring.issue(user=_user).token), Principal)
+    with raises(ValueError):
+        JwtKeyring.of(keys="first")
+    with raises(ValueError):
+        JwtKeyring(keys=dict(first="secret"), active_kid="second")
+
+
+def test_reused_on_login():
+    clock = FakeClock()
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60, clock=clock)
+    first_token = keyring.issue(user=_user)
+
+    # logging in again while the token is still fresh gives it back
+    clock.now += 20
+    assert keyring.issue(user=_user) == first_token
+
+    # not when the user changed
+    renamed_token = keyring.issue(user=ApplicationUser(**{**_user.as_dict(), "name": "renamed", "role": _user.role}))
+    assert renamed_token != first_token
+    assert keyring.verify(token=renamed_token.token).name == "renamed"
+
+    # nor past half of its ttl, or once the keys rotated
+    clock.now += 20
+    second_token = keyring.issue(user=_user)
+    assert second_token != renamed_token and second_token != first_token
+    keyring.rotate(kid="second", key="another secret")
+    assert jwt.get_unverified_header(keyring.issue(user=_user).token)["kid"] == "second"
+
+
+def test_without_reuse():
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first", ttl=60, max_reused=0)
+    access_token = keyring.issue(user=_user)
+
+    assert isinstance(keyring.verify(token=access_token.token), Principal)
+    assert isinstance(keyring.verify(token=keyring.issue(user=_user).token), Principal)
@@ -0,0 +1,80 @@
+import json
+
+from pytest import fixture, importorskip, param, raises
+
+from src.application.entity.bulk_import import BulkImportFailure, BulkImportReport
+from src.application.entity.user import ApplicationUser
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.web.codec import default_json_codec
+from src.application.infrastructure.web.codec.stdlib import StdlibJsonCodec
+from src.application.infrastructure.web.entity.user_json import UserJson
+from src.domain.entity.failure import Failure
+from src.domain.entity.success import Success
+from src.domain.entity.user import UserRole
+
+_user = ApplicationUser(
+    id="7",
+    name="tëst",
+    age=26,
+    email=None,
+    password="Str0ngPassword",
+    role=UserRole.ADMIN
+)
+
+
+def _orjson_codec():
+    importorskip("orjson")
+    from src.application.infrastructure.web.codec.orjson import OrjsonCodec
+    return OrjsonCodec(config=None)
+
+
+@fixture(scope="function", params=[
+    param(lambda: StdlibJsonCodec(config=None), id="stdlib"),
+    param(_orjson_codec, id="orjson")
+])
+def setup(request):
+    yield request.param()
+
+
+def _as_json(value) -> bytes:
+    # what starlette's JSONResponse made of the as_dict of the entities
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def test_entities_as_their_dict(setup):
+    codec = setup
+    user_json = UserJson(id="7", name="tëst", age=26, email="test@test.com", role=UserRole.USER)
+
+    for entity in (
+            user_json,
+            _user,
+            Failure(error="error"),
+            Success(),
+            UsersPage(users=[_user], next_cursor=None),
+            BulkImportReport(imported=1, failures=[BulkImportFailure(row=2, error="error")])
+    ):
+        assert codec.encode(value=entity) == _as_json(entity.as_dict())
+
+    assert codec.encode(value=dict(users=[user_json], next_cursor="7")) == _as_json(
+        dict(users=[user_json.as_dict()], next_cursor="7")
+    )
+    with raises(TypeError):
+        codec.encode(value=object())
+
+
+def test_decode(setup):
+    codec = setup
+
+    assert codec.decode(data='{"name": "tëst", "age": 26}'.encode("utf-8")) == {"name": "tëst", "age": 26}
+    with raises(ValueError):
+        codec.decode(data=b"not json")
+
+
+def test_default():
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        assert isinstance(default_json_codec(), StdlibJsonCodec)
+    else:
+        from src.application.infrastructure.web.codec.orjson import OrjsonCodec
+        assert isinstance(default_json_codec(), OrjsonCodec)
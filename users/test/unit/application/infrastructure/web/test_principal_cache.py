@@ -0,0 +1,104 @@
+import time
+
+from pytest import fixture
+
+from src.application.entity.principal import Principal
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.domain.entity.user import UserRole
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _principal(*, user_id: str, name: str, expires_at=None) -> Principal:
+    return Principal(id=user_id, name=name, email=f"{name}@test.com", role=UserRole.USER, expires_at=expires_at)
+
+
+@fixture(scope="function")
+def setup():
+    clock = FakeClock()
+    cache = PrincipalCache(max_size=2, ttl=10.0, clock=clock)
+
+    yield cache, clock
+    del cache, clock
+
+
+def test_hits_need_the_same_token(setup):
+    cache, _ = setup
+    principal = _principal(user_id="1", name="first")
+
+    assert cache.get(username="first", token="token") is None
+    assert cache.put(username="first", token="token", principal=principal, generation=cache.generation())
+    assert cache.get(username="first", token="token") == principal
+    assert cache.get(username="first", token="other") is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.size) == (1, 2, 1)
+
+
+def test_entries_expire(setup):
+    cache, clock = setup
+    cache.put(username="first", token="token", principal=_principal(user_id="1", name="first"), generation=0)
+
+    clock.now = 10.0
+    assert cache.get(username="first", token="token") is None
+    assert (cache.stats.expirations, cache.stats.size) == (1, 0)
+
+
+def test_entries_never_outlive_their_token(setup):
+    cache, clock = setup
+    expiring = _principal(user_id="1", name="first", expires_at=int(time.time()) + 2)
+    expired = _principal(user_id="2", name="second", expires_at=int(time.time()) - 1)
+
+    assert cache.put(username="first", token="token", principal=expiring, generation=0)
+    assert not cache.put(username="second", token="token", principal=expired, generation=0)
+    clock.now = 3.0
+    assert cache.get(username="first", token="token") is None
+
+
+def test_least_recently_used_is_evicted(setup):
+    cache, _ = setup
+    for user_id, name in [("1", "first"), ("2", "second")]:
+        cache.put(username=name, token="token", principal=_principal(user_id=user_id, name=name), generation=0)
+    cache.get(username="first", token="token")
+    cache.put(username="third", token="token", principal=_principal(user_id="3", name="third"), generation=0)
+
+    assert cache.get(username="second", token="token") is None
+    assert cache.get(username="first", token="token") is not None
+    assert cache.stats.evictions == 1
+    # the evicted entry isn't found by its id anymore
+    cache.invalidate(selector="id", value="2")
+    assert cache.stats.invalidations == 0
+
+
+def test_invalidated_by_any_selector(setup):
+    cache, _ = setup
+    for selector, value in [("id", "1"), ("name", "first"), ("email", "first@test.com")]:
+        cache.put(
+            username="first",
+            token="token",
+            principal=_principal(user_id="1", name="first"),
+            generation=cache.generation()
+        )
+        cache.invalidate(selector=selector, value=value)
+        assert cache.get(username="first", token="token") is None
+
+    assert cache.stats.invalidations == 3
+
+
+def test_no_put_after_an_invalidation(setup):
+    cache, _ = setup
+    generation = cache.generation()
+    # the user written while it was being authenticated
+    cache.invalidate(selector="name", value="first")
+
+    assert not cache.put(
+        username="first",
+        token="token",
+        principal=_principal(user_id="1", name="first"),
+        generation=generation
+    )
+    assert cache.get(username="first", token="token") is None
@@ -0,0 +1,24 @@
+from pytest import raises
+from starlette.applications import Starlette
+
+from src.application.infrastructure.web.rest_api.framework_logic.starlette import StarletteRestApi, uvicorn_config
+
+
+def failing_app_factory() -> Starlette:
+    raise RuntimeError("the app can't be built")
+
+
+def test_worker_config_is_accepted_by_uvicorn():
+    config = uvicorn_config(app=Starlette(), host="127.0.0.1", port=8000, debug=True)
+
+    assert config.host == "127.0.0.1"
+    assert config.port == 8000
+    assert config.log_level == "debug"
+    assert uvicorn_config(app=Starlette(), host="127.0.0.1", port=8000, debug=False).log_level == "info"
+
+
+def test_serve_exits_with_an_error_once_a_worker_dies():
+    with raises(SystemExit) as exit_info:
+        StarletteRestApi.serve(app_factory=failing_app_factory, host="127.0.0.1", port=0, debug=False, workers=2)
+
+    assert exit_info.value.code == 1
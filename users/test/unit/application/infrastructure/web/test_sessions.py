@@ -0,0 +1,84 @@
+from src.application.entity.principal import Principal
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.web.authentication.sessions import SessionStore
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+_user = ApplicationUser(
+    id="7",
+    name="test",
+    age=26,
+    email="test@test.com",
+    password="Str0ngPassword",
+    role=UserRole.USER
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sessions():
+    sessions = SessionStore()
+    laptop = sessions.issue(user=_user).token
+    phone = sessions.issue(user=_user).token
+
+    assert laptop != phone and len(laptop) == 43
+    assert SessionStore.owns(token=laptop)
+    assert not SessionStore.owns(token="a.jwt.token")
+    for token in (laptop, phone):
+        principal = sessions.authenticate(token=token)
+        assert isinstance(principal, Principal)
+        assert (principal.id, principal.name, principal.role.name) == ("7", "test", "USER")
+
+    assert sessions.revoke(token=laptop)
+    assert not sessions.revoke(token=laptop)
+    assert sessions.authenticate(token=laptop) == Failure(error="Invalid access token")
+    assert isinstance(sessions.authenticate(token=phone), Principal)
+    # nor is a token a character away from a live one
+    assert sessions.authenticate(token=phone[:-1] + ("A" if phone[-1] != "A" else "B")) == Failure(
+        error="Invalid access token"
+    )
+
+
+def test_expiry():
+    clock = FakeClock()
+    sessions = SessionStore(ttl=60, clock=clock)
+    used = sessions.issue(user=_user).token
+    idle = sessions.issue(user=_user).token
+
+    # a used session slides, an idle one ends (and is swept)
+    clock.now += 40
+    assert isinstance(sessions.authenticate(token=used), Principal)
+    clock.now += 40
+    assert isinstance(sessions.authenticate(token=used), Principal)
+    assert sessions.authenticate(token=idle) == Failure(error="Invalid access token")
+    assert len(sessions) == 1
+
+    fixed = SessionStore(ttl=60, sliding=False, clock=clock)
+    token = fixed.issue(user=_user).token
+    clock.now += 40
+    assert isinstance(fixed.authenticate(token=token), Principal)
+    clock.now += 40
+    assert isinstance(fixed.authenticate(token=token), Failure)
+
+
+def test_users_sessions():
+    sessions = SessionStore(max_per_user=2)
+    oldest, older, newest = (sessions.issue(user=_user).token for _ in range(3))
+
+    assert isinstance(sessions.authenticate(token=oldest), Failure)
+    assert isinstance(sessions.authenticate(token=older), Principal)
+
+    sessions.refresh(user=ApplicationUser(**{**_user.as_dict(), "name": "renamed", "role": UserRole.ADMIN}))
+    principal = sessions.authenticate(token=newest)
+    assert (principal.name, principal.role.name) == ("renamed", "ADMIN")
+
+    assert sessions.revoke_user(selector="name", value="test") == 0
+    assert sessions.revoke_user(selector="name", value="renamed") == 2
+    assert isinstance(sessions.authenticate(token=newest), Failure)
+    assert len(sessions) == 0
@@ -0,0 +1,47 @@
+import jwt
+from pytest import raises
+
+from src.application.infrastructure.web.authentication.signer import HmacSigner, stored_token_signer
+from src.domain.entity.failure import Failure
+
+_claims = {"sub": "test", "role": "ADMIN", "iat": 1, "exp": 2}
+
+
+def test_same_tokens_as_pyjwt():
+    signer = HmacSigner()
+
+    assert signer.sign(claims=_claims, key="secret") == jwt.encode(_claims, "secret", algorithm="HS256").decode("utf-8")
+    assert signer.sign(claims=_claims, key="secret", kid="first") == jwt.encode(
+        _claims, "secret", algorithm="HS256", headers=dict(kid="first")
+    ).decode("utf-8")
+    assert stored_token_signer.sign(claims={"username": "test"}, key="Str0ngPassword") == jwt.encode(
+        {"username": "test"}, "Str0ngPassword", algorithm="HS256"
+    ).decode("utf-8")
+
+
+def test_verify():
+    signer = HmacSigner(algorithm="HS512", max_keys=1)
+    token = signer.sign(claims=_claims, key="secret", kid="first")
+
+    assert HmacSigner.header(token=token) == {"typ": "JWT", "alg": "HS512", "kid": "first"}
+    assert signer.verify(token=token, key="secret") == _claims
+    # the contexts of evicted keys are just made again
+    assert signer.verify(token=signer.sign(claims=_claims, key="other secret"), key="other secret") == _claims
+    assert signer.verify(token=token, key="secret") == _claims
+    assert signer.verify(token=jwt.encode(_claims, "secret", algorithm="HS512").decode("utf-8"), key="secret") == _claims
+
+
+def test_bad_tokens():
+    signer = HmacSigner()
+    token = signer.sign(claims=_claims, key="secret")
+
+    assert signer.verify(token=token, key="other secret") == Failure(error="Signature verification failed")
+    assert signer.verify(token="not a token", key="secret") == Failure(error="Not enough segments")
+    assert signer.verify(token="a.b.c", key="secret") == Failure(error="Invalid header or signature padding")
+    assert signer.verify(
+        token=HmacSigner(algorithm="HS384").sign(claims=_claims, key="secret"),
+        key="secret"
+    ) == Failure(error="The specified alg value is not allowed")
+    assert HmacSigner.header(token="not a token") is None
+    with raises(ValueError):
+        HmacSigner(algorithm="none")
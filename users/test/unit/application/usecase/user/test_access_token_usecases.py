@@ -0,0 +1,170 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.entity.principal import Principal
+from src.application.infrastructure.hashing import PasswordHasher
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.web.authentication import JwtKeyring
+from src.application.infrastructure.web.authentication.principal_cache import PrincipalCache
+from src.application.infrastructure.web.authentication.signer import stored_token_signer
+from src.application.infrastructure.web.entity.access_token import AccessToken
+from src.application.usecase.user.add_access_token import AddAccessTokenUseCase
+from src.application.usecase.user.add_user import AddUserUseCase
+from src.application.usecase.user.delete_user import DeleteUserUseCase
+from src.application.usecase.user.fetch_access_token import FetchAccessTokenUseCase
+from src.application.usecase.user.update_user import UpdateUserUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    user = db.persist_user(user=generate_valid_domain_user())
+    keyring = JwtKeyring(keys=dict(first="secret"), active_kid="first")
+
+    yield db, user, keyring
+    del db, user, keyring
+
+
+def test_stored_tokens(setup):
+    db, user, _ = setup
+    add_access_token_usecase = AddAccessTokenUseCase(config=None, persistence=db)
+    fetch_access_token_usecase = FetchAccessTokenUseCase(config=None, persistence=db)
+
+    access_token = add_access_token_usecase.execute(username=user.name, password=user.password)
+    assert db.fetch_access_token(username=user.name) == access_token
+
+    principal = fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token)
+    assert isinstance(principal, Principal)
+    assert (principal.id, principal.role.name, principal.expires_at) == (user.id, user.role.name, None)
+    invalid = asyncio.run(fetch_access_token_usecase.authenticate_async(username=user.name, token="other"))
+    assert invalid.error == f"Invalid access token for the user {user.name}"
+    missing = asyncio.run(fetch_access_token_usecase.authenticate_async(username="missing", token="other"))
+    assert missing.error == "There is no access token for user missing"
+    # the same answers without the event loop
+    assert fetch_access_token_usecase.authenticate(username=user.name, token="other") == invalid
+    assert fetch_access_token_usecase.authenticate(username="missing", token="other") == missing
+
+
+def test_keyring_tokens(setup):
+    db, user, keyring = setup
+    add_access_token_usecase = AddAccessTokenUseCase(config=None, persistence=db, keyring=keyring)
+    fetch_access_token_usecase = FetchAccessTokenUseCase(config=None, persistence=db, keyring=keyring)
+
+    access_token = asyncio.run(add_access_token_usecase.execute_async(username=user.name, password=user.password))
+    assert isinstance(access_token, AccessToken)
+    # not stored
+    assert isinstance(db.fetch_access_token(username=user.name), Failure)
+
+    principal = asyncio.run(fetch_access_token_usecase.authenticate_async(username=user.name, token=access_token.token))
+    assert isinstance(principal, Principal)
+    assert principal.name == user.name and principal.expires_at is not None
+    # stateless, it stays valid until it expires
+    db.delete_user_by.name(user_name=user.name)
+    assert isinstance(fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token), Principal)
+
+    someone_else = fetch_access_token_usecase.authenticate(username="someone", token=access_token.token)
+    assert someone_else.error == "Invalid access token for the user someone"
+
+
+def test_keyring_login_failures(setup):
+    db, user, keyring = setup
+    add_access_token_usecase = AddAccessTokenUseCase(config=None, persistence=db, keyring=keyring)
+
+    assert add_access_token_usecase.execute(username=user.name, password="wrong").error == \
+        f"Invalid password for user {user.name}"
+    assert isinstance(add_access_token_usecase.execute(username="missing", password="wrong"), Failure)
+
+
+def test_cached_principals(setup):
+    db, user, _ = setup
+    principal_cache = PrincipalCache()
+    add_access_token_usecase = AddAccessTokenUseCase(config=None, persistence=db, principal_cache=principal_cache)
+    fetch_access_token_usecase = FetchAccessTokenUseCase(config=None, persistence=db, principal_cache=principal_cache)
+    update_user_usecase = UpdateUserUseCase(config=None, persistence=db, principal_cache=principal_cache)
+    delete_user_usecase = DeleteUserUseCase(config=None, persistence=db, principal_cache=principal_cache)
+
+    access_token = add_access_token_usecase.execute(username=user.name, password=user.password)
+    principal = fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token)
+    # served from the cache, the store isn't read (a token stored behind its back isn't seen)
+    db.persist_access_token(username=user.name, password=user.password)
+    assert asyncio.run(fetch_access_token_usecase.authenticate_async(
+        username=user.name,
+        token=access_token.token
+    )) == principal
+
+    # a new login drops it
+    access_token = add_access_token_usecase.execute(username=user.name, password=user.password)
+    assert principal_cache.get(username=user.name, token=access_token.token) is None
+
+    fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token)
+    update_user_usecase.execute(
+        update_by_selector="id",
+        update_by_data=user.id,
+        updated_user=create_user(
+            name=user.name,
+            age=user.age,
+            password=user.password,
+            email=user.email,
+            role=UserRole.ADMIN
+        )
+    )
+    assert principal_cache.get(username=user.name, token=access_token.token) is None
+    updated = fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token)
+    assert updated.role.name == "ADMIN"
+
+    delete_user_usecase.execute(delete_by_selector="email", delete_by_data=user.email)
+    assert principal_cache.get(username=user.name, token=access_token.token) is None
+    assert isinstance(fetch_access_token_usecase.authenticate(username=user.name, token=access_token.token), Failure)
+
+
+def test_hashed_passwords(setup):
+    db, user, keyring = setup
+    old_password_hasher = PasswordHasher(config=dict(algorithm="pbkdf2_sha256", cost=10, processes=0))
+    password_hasher = PasswordHasher(config=dict(algorithm="scrypt", cost=2 ** 4, processes=0))
+    AddUserUseCase(config=None, persistence=db, password_hasher=old_password_hasher).execute(
+        username="hashed",
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    )
+    assert db.fetch_user_by.name(user_name="hashed").password.startswith("pbkdf2_sha256$10$")
+
+    for keyring in [None, keyring]:
+        add_access_token_usecase = AddAccessTokenUseCase(
+            config=None,
+            persistence=db,
+            keyring=keyring,
+            password_hasher=password_hasher
+        )
+        wrong = asyncio.run(add_access_token_usecase.execute_async(username="hashed", password="Wr0ngPassword"))
+        assert wrong.error == "Invalid password for user hashed"
+        assert isinstance(add_access_token_usecase.execute(username="hashed", password="Str0ngPassword"), AccessToken)
+        # the older hashes and the plain passwords (stored before hashing them) are rehashed on login
+        assert isinstance(
+            asyncio.run(add_access_token_usecase.execute_async(username=user.name, password=user.password)),
+            AccessToken
+        )
+        assert db.fetch_user_by.name(user_name="hashed").password.startswith("scrypt$16$")
+        assert db.fetch_user_by.name(user_name=user.name).password.startswith("scrypt$16$")
+
+    stored_token = AddAccessTokenUseCase(config=None, persistence=db, password_hasher=password_hasher).execute(
+        username=user.name,
+        password=user.password
+    )
+    principal = FetchAccessTokenUseCase(config=None, persistence=db).authenticate(
+        username=user.name,
+        token=stored_token.token
+    )
+    assert isinstance(principal, Principal)
+    # nothing to make out of the stored hash
+    stored_hash = db.fetch_user_by.name(user_name=user.name).password
+    assert stored_token.token != stored_token_signer.sign(claims={"username": user.name}, key=stored_hash)
+    assert AddAccessTokenUseCase(config=None, persistence=db, password_hasher=password_hasher).execute(
+        username=user.name,
+        password=user.password
+    ) != stored_token
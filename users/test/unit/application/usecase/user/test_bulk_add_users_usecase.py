@@ -0,0 +1,86 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.entity.bulk_import import BulkImportFailure, BulkImportReport
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.hashing import PasswordHasher, verify_password
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.bulk_add_users import BulkAddUsersUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+
+
+def generate_rows():
+    rows = [
+        dict(name=f"test{number}", age=26, password="Str0ngPassword", email=f"test{number}@test.com")
+        for number in range(10)
+    ]
+    rows[2] = dict(rows[2], age=10)
+    rows[4] = dict(rows[4], role="ADMIN")
+    rows[5] = dict(name="test5", age="old", password="Str0ngPassword")
+    rows[7] = dict(rows[7], name="test1")  # duplicated name
+    rows[8] = Failure(error="Invalid json line")
+    rows[9] = dict(name="test9", age="27", password="Str0ngPassword")
+
+    return rows
+
+
+expected_report = BulkImportReport(
+    imported=6,
+    failures=[
+        BulkImportFailure(row=3, error="age should be between 16 and 150."),
+        BulkImportFailure(row=6, error="age should be an integer."),
+        BulkImportFailure(row=8, error="Username test1 is already exist, please use a different name."),
+        BulkImportFailure(row=9, error="Invalid json line")
+    ]
+)
+
+
+@fixture(scope="function", params=[0, 2])
+def setup(request):
+    db = InMemoryDatabase(config=None)
+    usecase = BulkAddUsersUseCase(config=dict(chunk_size=3, processes=request.param), persistence=db)
+
+    yield usecase, db
+    usecase.close()
+    del usecase, db
+
+
+def test_bulk_add_users(setup):
+    usecase, db = setup
+    usecase: BulkAddUsersUseCase
+    db: InMemoryDatabase
+
+    assert usecase.execute(rows=iter(generate_rows())) == expected_report
+
+    admin = db.fetch_user_by.name(user_name="test4")
+    assert isinstance(admin, ApplicationUser) and admin.role == UserRole.ADMIN
+    assert db.fetch_user_by.name(user_name="test9").age == 27
+    assert isinstance(db.fetch_user_by.name(user_name="test2"), Failure)
+
+
+def test_bulk_add_users_async(setup):
+    usecase, db = setup
+    usecase: BulkAddUsersUseCase
+
+    async def rows():
+        for row in generate_rows():
+            yield row
+
+    assert asyncio.run(usecase.execute_async(rows=rows())) == expected_report
+    # importing them again only fails
+    assert usecase.execute(rows=generate_rows()).imported == 0
+
+
+def test_bulk_add_users_hashes_passwords():
+    db = InMemoryDatabase(config=None)
+    usecase = BulkAddUsersUseCase(
+        config=dict(chunk_size=3, processes=0),
+        persistence=db,
+        password_hasher=PasswordHasher(config=dict(algorithm="scrypt", cost=2 ** 4))
+    )
+
+    assert usecase.execute(rows=iter(generate_rows())) == expected_report
+    password = db.fetch_user_by.name(user_name="test9").password
+    assert password.startswith("scrypt$16$") and verify_password("Str0ngPassword", password)
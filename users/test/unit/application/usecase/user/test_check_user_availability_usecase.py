@@ -0,0 +1,64 @@
+import asyncio
+
+from pytest import fixture, mark
+
+from src.application.infrastructure.persistence.bloom_filter import BloomFilterPersistence
+from src.application.infrastructure.persistence.caching import CachingPersistence
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.memory_mapped import MemoryMappedDatabase
+from src.application.infrastructure.persistence.sqlite import SqliteDatabase
+from src.application.usecase.user.check_user_availability import CheckUserAvailabilityUseCase
+from src.domain.entity.failure import Failure
+from test.utilities.user import generate_valid_domain_user
+
+
+@fixture(scope="function")
+def setup():
+    db = InMemoryDatabase(config=None)
+    user = db.persist_user(user=generate_valid_domain_user())
+    plain_usecase = CheckUserAvailabilityUseCase(config=None, persistence=db)
+    filtered_usecase = CheckUserAvailabilityUseCase(
+        config=None,
+        persistence=BloomFilterPersistence(config=None, persistence=db)
+    )
+    cached_usecase = CheckUserAvailabilityUseCase(
+        config=None,
+        persistence=CachingPersistence(config=None, persistence=BloomFilterPersistence(config=None, persistence=db))
+    )
+
+    yield user, plain_usecase, filtered_usecase, cached_usecase
+    del db, user, plain_usecase, filtered_usecase, cached_usecase
+
+
+def test_check_user_availability(setup):
+    user, *usecases = setup
+
+    for usecase in usecases:
+        assert usecase.execute(selector="name", data=user.name) is False
+        assert usecase.execute(selector="email", data=user.email) is False
+        assert usecase.execute(selector="name", data="free") is True
+        assert usecase.execute(selector="email", data="free@test.com") is True
+        assert asyncio.run(usecase.execute_async(selector="name", data=user.name)) is False
+        assert asyncio.run(usecase.execute_async(selector="name", data="free")) is True
+
+
+@mark.parametrize("persistence_type", [SqliteDatabase, MemoryMappedDatabase])
+def test_check_user_availability_on_disk(persistence_type, tmp_path):
+    db = persistence_type(config=dict(path=str(tmp_path / "users")))
+    user = db.persist_user(user=generate_valid_domain_user())
+    usecase = CheckUserAvailabilityUseCase(config=None, persistence=db)
+
+    assert usecase.execute(selector="name", data=user.name) is False
+    assert usecase.execute(selector="email", data=user.email) is False
+    assert asyncio.run(usecase.execute_async(selector="name", data="free")) is True
+    db.delete_user_by.name(user_name=user.name)
+    assert usecase.execute(selector="name", data=user.name) is True
+    db.close()
+
+
+def test_check_user_availability_invalid_selector(setup):
+    _, usecase, *_ = setup
+
+    check_status = usecase.execute(selector="id", data="0")
+    assert isinstance(check_status, Failure)
+    assert check_status.error == "Availability selector should be within this list ['name', 'email']"
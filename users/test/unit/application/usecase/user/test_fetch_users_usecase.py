@@ -0,0 +1,51 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.fetch_users import FetchUsersUseCase
+from src.domain.entity.failure import Failure
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope='function')
+def setup():
+    db = InMemoryDatabase(config=None)
+    expected_users = [
+        db.persist_user(user=generate_numbered_domain_user(number)) for number in range(3)
+    ]
+    usecase = FetchUsersUseCase(config=dict(max_users=4), persistence=db)
+
+    yield usecase, expected_users
+    del usecase, db
+
+
+def test_fetch_users(setup):
+    usecase, expected_users = setup
+    usecase: FetchUsersUseCase
+
+    assert usecase.execute(fetch_by_selector="id", fetch_by_data=["2", "5", "0"]) == [
+        expected_users[2],
+        Failure(error="There is no user with id 5 to be fetched"),
+        expected_users[0]
+    ]
+    assert usecase.execute(fetch_by_selector="name", fetch_by_data=["test1", "test1"]) == [expected_users[1]] * 2
+    assert usecase.execute(fetch_by_selector="email", fetch_by_data=["test0@test.com"]) == [expected_users[0]]
+    assert usecase.execute(fetch_by_selector="id", fetch_by_data=[]) == []
+
+    assert usecase.execute(fetch_by_selector="age", fetch_by_data=["26"]) == Failure(
+        error="Fetch selector should be within this list ['id', 'name', 'email']"
+    )
+    assert usecase.execute(fetch_by_selector="id", fetch_by_data=["0"] * 5) == Failure(
+        error="At most 4 users can be fetched at once."
+    )
+
+
+def test_fetch_users_async(setup):
+    usecase, expected_users = setup
+    usecase: FetchUsersUseCase
+
+    assert asyncio.run(usecase.execute_async(fetch_by_selector="name", fetch_by_data=["test2", "test0"])) == [
+        expected_users[2],
+        expected_users[0]
+    ]
@@ -0,0 +1,66 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.list_users import ListUsersUseCase
+from src.domain.entity.failure import Failure
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope='function', params=["dict", "compact"])
+def setup(request, tmp_path):
+    config = dict(storage=request.param, durability=dict(directory=str(tmp_path)))
+    db = InMemoryDatabase(config=config)
+    users = [db.persist_user(user=generate_numbered_domain_user(number)) for number in range(10)]
+    usecase = ListUsersUseCase(config=dict(max_limit=5), persistence=db)
+
+    yield usecase, db, users, config
+    db.close()
+    del usecase, db
+
+
+def list_all(*, usecase: ListUsersUseCase, limit: int):
+    pages = [usecase.execute(cursor=None, limit=limit)]
+    while pages[-1].next_cursor is not None:
+        pages.append(usecase.execute(cursor=pages[-1].next_cursor, limit=limit))
+
+    return pages
+
+
+def test_list_users(setup):
+    usecase, db, users, _ = setup
+    usecase: ListUsersUseCase
+    db: InMemoryDatabase
+
+    pages = list_all(usecase=usecase, limit=4)
+    assert [page.users for page in pages] == [users[:4], users[4:8], users[8:]]
+
+    # deleting users (even the last one of a page) leaves gaps the cursors go through
+    db.delete_user_by.id(user_id="3")
+    db.delete_user_by.id(user_id="4")
+    pages = list_all(usecase=usecase, limit=3)
+    assert [page.users for page in pages] == [users[:3], users[5:8], users[8:]]
+    assert usecase.execute(cursor=pages[0].next_cursor, limit=3) == pages[1]
+
+    assert usecase.execute(cursor=None, limit=6) == Failure(error="limit should be between 1 and 5.")
+    assert usecase.execute(cursor=None, limit=0) == Failure(error="limit should be between 1 and 5.")
+    assert usecase.execute(cursor="not a cursor", limit=1) == Failure(error="Invalid cursor not a cursor")
+
+
+def test_list_users_async_after_recovery(setup):
+    usecase, db, users, config = setup
+    db: InMemoryDatabase
+
+    db.snapshot()
+    db.persist_user(user=generate_numbered_domain_user(10))
+    db.delete_user_by.id(user_id="0")
+    db.close()
+
+    recovered_db = InMemoryDatabase(config=config)
+    recovered_usecase = ListUsersUseCase(config=None, persistence=recovered_db)
+    page = asyncio.run(recovered_usecase.execute_async(cursor=None, limit=100))
+    assert isinstance(page, UsersPage) and page.next_cursor is None
+    assert [user.name for user in page.users] == [f"test{number}" for number in range(1, 11)]
+    recovered_db.close()
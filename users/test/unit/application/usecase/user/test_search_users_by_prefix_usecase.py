@@ -0,0 +1,94 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.search_users_by_prefix import SearchUsersByPrefixUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+
+
+def generate_domain_user(name: str, email: str = None):
+    return create_user(
+        name=name,
+        age=26,
+        password="Str0ngPassword",
+        email=email,
+        role=UserRole.USER
+    )
+
+
+@fixture(scope='function', params=["dict", "compact"])
+def setup(request, tmp_path):
+    config = dict(storage=request.param, durability=dict(directory=str(tmp_path)))
+    db = InMemoryDatabase(config=config)
+    for name, email in [
+        ("Abdel", "abdel@corp.com"),
+        ("abdou", "abdou@Corp.com"),
+        ("abc", "abc@other.com"),
+        ("ABDUL", "abdul@corp.com"),
+        ("zed", "zed@corp.com.eg")
+    ]:
+        db.persist_user(user=generate_domain_user(name, email))
+    usecase = SearchUsersByPrefixUseCase(config=dict(max_limit=5), persistence=db)
+
+    yield usecase, db, config
+    db.close()
+    del usecase, db
+
+
+def search_all(*, usecase: SearchUsersByPrefixUseCase, selector: str, prefix: str, limit: int):
+    pages = [usecase.execute(selector=selector, prefix=prefix, cursor=None, limit=limit)]
+    while pages[-1].next_cursor is not None:
+        pages.append(usecase.execute(selector=selector, prefix=prefix, cursor=pages[-1].next_cursor, limit=limit))
+
+    return [[user.name for user in page.users] for page in pages]
+
+
+def test_search_users_by_prefix(setup):
+    usecase, db, _ = setup
+    usecase: SearchUsersByPrefixUseCase
+    db: InMemoryDatabase
+
+    assert search_all(usecase=usecase, selector="name", prefix="ABD", limit=2) == [["Abdel", "abdou"], ["ABDUL"]]
+    assert search_all(usecase=usecase, selector="email_domain", prefix="@CORP.com", limit=5) == [
+        ["Abdel", "abdou", "ABDUL"]
+    ]
+    assert search_all(usecase=usecase, selector="email_domain", prefix="corp.com.eg", limit=5) == [["zed"]]
+
+    # the index follows the renames and deletes
+    db.update_user_by.name(user_name="Abdel", updated_user=generate_domain_user("kamal", "kamal@corp.com"))
+    db.delete_user_by.name(user_name="abdou")
+    assert search_all(usecase=usecase, selector="name", prefix="abd", limit=5) == [["ABDUL"]]
+    assert search_all(usecase=usecase, selector="name", prefix="k", limit=5) == [["kamal"]]
+    assert search_all(usecase=usecase, selector="email_domain", prefix="corp.com", limit=5) == [["ABDUL", "kamal"]]
+
+    assert usecase.execute(selector="age", prefix="2", cursor=None, limit=1) == Failure(
+        error="Search selector should be within this list ['name', 'email_domain']"
+    )
+    assert usecase.execute(selector="email_domain", prefix="@", cursor=None, limit=1) == Failure(
+        error="The searched prefix should not be empty."
+    )
+    assert usecase.execute(selector="name", prefix="a", cursor=None, limit=6) == Failure(
+        error="limit should be between 1 and 5."
+    )
+    assert usecase.execute(selector="name", prefix="a", cursor="nope", limit=1) == Failure(
+        error="Invalid cursor nope"
+    )
+
+
+def test_search_users_by_prefix_async_after_recovery(setup):
+    usecase, db, config = setup
+    db: InMemoryDatabase
+
+    db.snapshot()
+    db.persist_user(user=generate_domain_user("abdo", "abdo@corp.com"))
+    db.close()
+
+    recovered_db = InMemoryDatabase(config=config)
+    recovered_usecase = SearchUsersByPrefixUseCase(config=None, persistence=recovered_db)
+    page = asyncio.run(recovered_usecase.execute_async(selector="name", prefix="abd", cursor=None, limit=100))
+    assert isinstance(page, UsersPage) and page.next_cursor is None
+    assert [user.name for user in page.users] == ["Abdel", "abdo", "abdou", "ABDUL"]
+    recovered_db.close()
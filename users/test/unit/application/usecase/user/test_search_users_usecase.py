@@ -0,0 +1,83 @@
+import asyncio
+
+from pytest import fixture
+
+from src.application.entity.users_page import UsersPage
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.usecase.user.search_users import SearchUsersUseCase
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import UserRole
+from test.utilities.user import generate_numbered_domain_user
+
+
+@fixture(scope='function', params=["dict", "compact"])
+def setup(request, tmp_path):
+    config = dict(storage=request.param, durability=dict(directory=str(tmp_path)))
+    db = InMemoryDatabase(config=config)
+    for number in range(20):
+        db.persist_user(user=generate_numbered_domain_user(
+            number,
+            age=20 + number,
+            role=UserRole.ADMIN if number % 2 == 0 else UserRole.USER
+        ))
+    usecase = SearchUsersUseCase(config=dict(max_limit=5), persistence=db)
+
+    yield usecase, db, config
+    db.close()
+    del usecase, db
+
+
+def search_all(*, usecase: SearchUsersUseCase, **search):
+    pages = [usecase.execute(cursor=None, **search)]
+    while pages[-1].next_cursor is not None:
+        pages.append(usecase.execute(cursor=pages[-1].next_cursor, **search))
+
+    return [[user.name for user in page.users] for page in pages]
+
+
+def test_search_users(setup):
+    usecase, db, _ = setup
+    usecase: SearchUsersUseCase
+    db: InMemoryDatabase
+
+    assert search_all(usecase=usecase, role="ADMIN", age_gte=30, age_lte=36, limit=2) == [
+        ["test10", "test12"], ["test14", "test16"]
+    ]
+    assert search_all(usecase=usecase, role=None, age_gte=None, age_lte=22, limit=5) == [["test0", "test1", "test2"]]
+
+    # the indexes follow the updates and deletes
+    db.update_user_by.id(user_id="12", updated_user=generate_numbered_domain_user(12, age=50, role=UserRole.USER))
+    db.delete_user_by.id(user_id="14")
+    assert search_all(usecase=usecase, role="ADMIN", age_gte=30, age_lte=36, limit=5) == [["test10", "test16"]]
+    assert search_all(usecase=usecase, role="USER", age_gte=50, age_lte=None, limit=5) == [["test12"]]
+
+    assert usecase.execute(role="OWNER", age_gte=None, age_lte=None, cursor=None, limit=1) == Failure(
+        error="role should be within this list ['ADMIN', 'USER']."
+    )
+    assert usecase.execute(role=None, age_gte=40, age_lte=30, cursor=None, limit=1) == Failure(
+        error="age_gte should not be greater than age_lte."
+    )
+    assert usecase.execute(role=None, age_gte=None, age_lte=None, cursor=None, limit=6) == Failure(
+        error="limit should be between 1 and 5."
+    )
+    assert usecase.execute(role=None, age_gte=None, age_lte=None, cursor="nope", limit=1) == Failure(
+        error="Invalid cursor nope"
+    )
+
+
+def test_search_users_async_after_recovery(setup):
+    usecase, db, config = setup
+    db: InMemoryDatabase
+
+    db.snapshot()
+    db.persist_user(user=generate_numbered_domain_user(20, age=33, role=UserRole.ADMIN))
+    db.delete_user_by.id(user_id="12")
+    db.close()
+
+    # the non unique indexes are rebuilt from the recovered users
+    recovered_db = InMemoryDatabase(config=config)
+    recovered_usecase = SearchUsersUseCase(config=None, persistence=recovered_db)
+    page = asyncio.run(recovered_usecase.execute_async(role="ADMIN", age_gte=30, age_lte=40, cursor=None, limit=100))
+    assert isinstance(page, UsersPage) and page.next_cursor is None
+    assert [user.name for user in page.users] == ["test10", "test14", "test16", "test18", "test20"]
+    recovered_db.close()
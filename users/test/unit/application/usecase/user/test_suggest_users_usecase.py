@@ -0,0 +1,117 @@
+import asyncio
+import random
+
+from pytest import fixture
+
+from src.application.entity.user import ApplicationUser
+from src.application.infrastructure.persistence import sqlite
+from src.application.infrastructure.persistence.in_memory import InMemoryDatabase
+from src.application.infrastructure.persistence.memory_mapped import MemoryMappedDatabase
+from src.application.infrastructure.persistence.sqlite import SqliteDatabase
+from src.application.usecase.user.suggest_users import SuggestUsersUseCase, _rank
+from src.application.utilities.text import trigrams_of, trigram_similarity, edit_distance
+from src.domain.entity.failure import Failure
+from src.domain.entity.user import create_user, UserRole
+
+
+def generate_named_domain_user(name: str):
+    return create_user(
+        name=name,
+        age=26,
+        password="Str0ngPassword",
+        email=None,
+        role=UserRole.USER
+    )
+
+
+@fixture(scope='function', params=["dict", "compact"])
+def setup(request):
+    db = InMemoryDatabase(config=dict(storage=request.param))
+    for name in ["abdulrahman", "Abdelrahman", "abdo", "mohamed", "muhammad", "ahmed"]:
+        db.persist_user(user=generate_named_domain_user(name))
+    usecase = SuggestUsersUseCase(config=dict(max_limit=5), persistence=db)
+
+    yield usecase, db
+    db.close()
+    del usecase, db
+
+
+@fixture(scope='function', params=["dict", "compact", "memory_mapped", "sqlite", "sqlite_without_trigram_tokenizer"])
+def every_persistence(request, tmp_path, monkeypatch):
+    if request.param == "memory_mapped":
+        db = MemoryMappedDatabase(config=dict(path=str(tmp_path / "users.mmap"), capacity=64))
+    elif request.param.startswith("sqlite"):
+        if request.param == "sqlite_without_trigram_tokenizer":
+            monkeypatch.setattr(sqlite, "_has_trigram_tokenizer", lambda connection: False)
+        db = SqliteDatabase(config=dict(path=str(tmp_path / "users.db")))
+    else:
+        db = InMemoryDatabase(config=dict(storage=request.param))
+
+    yield db
+    db.close()
+    del db
+
+
+def test_rank_keeps_the_best_ones():
+    randomizer = random.Random(4)
+    for _ in range(50):
+        candidates = [
+            ApplicationUser(
+                id=str(number),
+                name="".join(randomizer.choice("abcd") for _ in range(randomizer.randrange(1, 9))),
+                age=26,
+                email=None,
+                password="Str0ngPassword",
+                role=UserRole.USER
+            ) for number in range(30)
+        ]
+        name = "".join(randomizer.choice("abcd") for _ in range(randomizer.randrange(3, 9)))
+        limit = randomizer.randrange(1, 8)
+
+        def score_of(user: ApplicationUser) -> float:
+            longest = max(len(name), len(user.name))
+            return (trigram_similarity(trigrams_of(name), trigrams_of(user.name)) +
+                    1 - edit_distance(name, user.name) / longest) / 2
+
+        # the early given up edit distances don't change what's kept
+        expected = sorted(candidates, key=lambda user: (score_of(user), -int(user.id)), reverse=True)[:limit]
+        assert [suggestion.user for suggestion in _rank(name=name, candidates=candidates, limit=limit)] == expected
+
+
+def test_suggest_users(setup):
+    usecase, db = setup
+    usecase: SuggestUsersUseCase
+    db: InMemoryDatabase
+
+    suggestions = usecase.execute(name="abdulrahmen", limit=2)
+    assert [suggestion.user.name for suggestion in suggestions] == ["abdulrahman", "Abdelrahman"]
+    assert 0.0 < suggestions[1].score < suggestions[0].score < 1.0
+    assert [suggestion.user.name for suggestion in usecase.execute(name="mohammed", limit=1)] == ["mohamed"]
+    assert usecase.execute(name="Ahmed", limit=1)[0].score == 1.0
+
+    # the trigram index follows the renames
+    db.update_user_by.name(user_name="mohamed", updated_user=generate_named_domain_user("kamal"))
+    suggestions = asyncio.run(usecase.execute_async(name="mohammed", limit=1))
+    assert [suggestion.user.name for suggestion in suggestions] == ["muhammad"]
+
+    assert usecase.execute(name=" ab ", limit=1) == Failure(error="name should be at least 3 characters long.")
+    assert usecase.execute(name="abdo", limit=6) == Failure(error="limit should be between 1 and 5.")
+
+
+def test_same_suggestions_on_every_persistence(every_persistence):
+    db = every_persistence
+    for name in ["john", "sara", "user0", "user1", "user12"]:
+        db.persist_user(user=generate_named_domain_user(name))
+    usecase = SuggestUsersUseCase(config=None, persistence=db)
+
+    def suggest(*, name, limit=1):
+        return [suggestion.user.name for suggestion in usecase.execute(name=name, limit=limit)]
+
+    # short names with a typo share only their padded trigrams with the right one
+    assert suggest(name="jon") == ["john"]
+    assert suggest(name="sra") == ["sara"]
+    assert set(user.name for user in db.search_users_by_similar_name(name="usr12", limit=3)) == {
+        "user12",
+        "user0",
+        "user1"
+    }
@@ -64,11 +64,16 @@ def test_valid_update_user(setup):
         role=updated_domain_user.role
     )
 
-    # by name
+    # by name (the user is only found by its new name after the update above)
     assert usecase.execute(
         update_by_selector="name",
         update_by_data="test",
         updated_user=updated_domain_user
+    ) == Failure(error="There is no user with name test to be updated")
+    assert usecase.execute(
+        update_by_selector="name",
+        update_by_data="newname",
+        updated_user=updated_domain_user
     ) == ApplicationUser(
         id="0",
         name=updated_domain_user.name,
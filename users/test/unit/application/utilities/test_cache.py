@@ -0,0 +1,85 @@
+from pytest import fixture, raises
+
+from src.application.utilities.cache import TtlLruCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@fixture(scope="function")
+def setup():
+    clock = FakeClock()
+    cache = TtlLruCache(max_size=2, ttl=10.0, clock=clock)
+
+    yield cache, clock
+    del cache, clock
+
+
+def test_hits_and_misses(setup):
+    cache, _ = setup
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.size) == (1, 1, 1)
+
+
+def test_least_recently_used_is_evicted(setup):
+    cache, _ = setup
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+
+def test_expired_values_are_not_served(setup):
+    cache, clock = setup
+
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert (cache.stats.expirations, cache.stats.size) == (1, 0)
+
+
+def test_no_ttl():
+    clock = FakeClock()
+    cache = TtlLruCache(max_size=1, ttl=None, clock=clock)
+
+    cache.put("a", 1)
+    clock.now = 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_invalidation_discards_the_racing_reads(setup):
+    cache, _ = setup
+
+    cache.put("a", 1)
+    generation = cache.generation()
+    cache.invalidate("a", "missing")
+    assert cache.put("a", 2, generation=generation) is False
+    assert cache.get("a") is None
+    assert cache.put("a", 3, generation=cache.generation()) is True
+    assert cache.get("a") == 3
+    assert cache.stats.invalidations == 1
+
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats.invalidations == 2
+
+
+def test_invalid_size():
+    with raises(ValueError):
+        TtlLruCache(max_size=0, ttl=None)
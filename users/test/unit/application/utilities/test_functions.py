@@ -1,4 +1,6 @@
-from src.application.utilities.functions import exception_handler
+import asyncio
+
+from src.application.utilities.functions import exception_handler, async_exception_handler
 from src.domain.entity.failure import Failure
 
 
@@ -16,3 +18,11 @@ def test_invalid_exception_handling_utility():
         raise Exception("Boom !")
 
     assert hello("test") == Failure(error='Boom !')
+
+
+def test_invalid_async_exception_handling_utility():
+    @async_exception_handler
+    async def hello(_name: str) -> str:
+        raise Exception("Boom !")
+
+    assert asyncio.run(hello("test")) == Failure(error='Boom !')
@@ -0,0 +1,64 @@
+import asyncio
+
+from src.application.utilities.rows import rows_of, async_rows_of
+from src.domain.entity.failure import Failure
+
+
+def test_ndjson_rows():
+    rows = list(rows_of(lines=[
+        '{"name": "test1", "age": 26}\n',
+        '\n',
+        '{"name": "test2"',
+        '["not", "an", "object"]'
+    ], content_format="ndjson"))
+
+    assert rows[0] == dict(name="test1", age=26)
+    assert isinstance(rows[1], Failure)
+    assert rows[2] == Failure(error="Every json line should be an object.")
+    assert len(rows) == 3
+
+
+def test_csv_rows():
+    rows = list(rows_of(lines=[
+        'name, age, email\n',
+        'test1,26,\n',
+        '"test,2",27,test2@test.com\n',
+        'test3,28\n'
+    ], content_format="csv"))
+
+    assert rows == [
+        dict(name="test1", age="26"),
+        dict(name="test,2", age="27", email="test2@test.com"),
+        Failure(error="Expected 3 columns but found 2.")
+    ]
+
+
+def test_async_rows_from_any_chunks():
+    content = '{"name": "test1"}\n{"name": "tést2"}\n{"name": "test3"}'.encode("utf-8")
+
+    async def chunks():
+        for start in range(0, len(content), 7):  # cuts lines (and the é) anywhere
+            yield content[start:start + 7]
+
+    async def scenario():
+        return [row async for row in async_rows_of(chunks=chunks(), content_format="ndjson")]
+
+    assert asyncio.run(scenario()) == [dict(name="test1"), dict(name="tést2"), dict(name="test3")]
+
+
+def test_async_rows_skip_too_long_lines():
+    content = b'{"name": "test1"}\n{"name": "' + b"x" * 100 + b'"}\n{"name": "test3"}\n' + b"y" * 100
+
+    async def chunks(size: int):
+        for start in range(0, len(content), size):
+            yield content[start:start + size]
+
+    async def scenario(size: int):
+        return [
+            row async for row in async_rows_of(chunks=chunks(size), content_format="ndjson", max_line_length=50)
+        ]
+
+    too_long = Failure(error="Every line should be at most 50 bytes long.")
+    # cut in small chunks or the whole content in one
+    for size in (7, len(content)):
+        assert asyncio.run(scenario(size)) == [dict(name="test1"), too_long, dict(name="test3"), too_long]
@@ -0,0 +1,33 @@
+import random
+
+from src.application.utilities.text import trigrams_of, trigram_similarity, edit_distance
+
+
+def full_edit_distance(first: str, second: str) -> int:
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current = [row]
+        for column, second_char in enumerate(second, start=1):
+            current.append(min(previous[column] + 1, current[-1] + 1, previous[column - 1] + (first_char != second_char)))
+        previous = current
+
+    return previous[-1]
+
+
+def test_edit_distance():
+    randomizer = random.Random(2)
+    for _ in range(500):
+        first = "".join(randomizer.choice("abc") for _ in range(randomizer.randrange(8)))
+        second = "".join(randomizer.choice("abc") for _ in range(randomizer.randrange(8)))
+        max_distance = randomizer.randrange(5)
+        distance = full_edit_distance(first, second)
+
+        assert edit_distance(first, second) == distance
+        assert edit_distance(first, second, max_distance) == min(distance, max_distance + 1)
+
+
+def test_trigrams():
+    assert trigrams_of("Abd") == {"  a", " ab", "abd", "bd "}
+    assert trigram_similarity(trigrams_of("abdul"), trigrams_of("ABDUL")) == 1.0
+    assert trigram_similarity(trigrams_of("abdul"), trigrams_of("zed")) == 0.0
+    assert 0.0 < trigram_similarity(trigrams_of("abdul"), trigrams_of("abdel")) < 1.0
@@ -0,0 +1,43 @@
+from pytest import raises
+
+from src.application.utilities.token_buckets import TokenBuckets
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_burst_then_rate():
+    clock = FakeClock()
+    buckets = TokenBuckets(rate=2.0, burst=3, max_buckets=10, clock=clock)
+
+    assert [buckets.take(key="a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.take(key="a") == 0.5
+    # the other keys have their own bucket
+    assert buckets.take(key="b") == 0.0
+
+    clock.now += 0.5
+    assert buckets.take(key="a") == 0.0
+    assert buckets.take(key="a") == 0.5
+    # refilled up to the burst only
+    clock.now += 60
+    assert [buckets.take(key="a") for _ in range(4)][-1] == 0.5
+
+    stats = buckets.stats
+    assert (stats.allowed, stats.limited, stats.buckets) == (8, 3, 2)
+
+
+def test_bounded():
+    buckets = TokenBuckets(rate=1.0, burst=1, max_buckets=8, shards=2)
+    for key in range(1000):
+        buckets.take(key=key)
+
+    stats = buckets.stats
+    assert stats.buckets <= stats.max_buckets == 8
+    assert stats.evictions == 1000 - stats.buckets
+    with raises(ValueError):
+        TokenBuckets(rate=0, burst=1, max_buckets=8)
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 from src.domain.entity.failure import Failure
 from src.domain.entity.user import DomainUser, create_user, UserRole
 
@@ -100,3 +103,18 @@ def test_invalid_user_creation():
         email="invalid_email",
         role=UserRole.USER
     ) == Failure(error='email should be a valid one.')
+
+
+def test_user_is_slotted_and_picklable():
+    user = create_user(
+        name="name",
+        age=26,
+        password="StrongPassw0rd",
+        email="email@test.com",
+        role=UserRole.USER
+    )
+
+    assert not hasattr(user, "__dict__")
+    assert pickle.loads(pickle.dumps(user)) == user
+    assert copy.deepcopy(user) == user
+    assert pickle.loads(pickle.dumps(Failure(error="Boom !"))) == Failure(error="Boom !")
@@ -9,3 +9,18 @@ def generate_valid_domain_user():
         email="test@test.com",
         role=UserRole.USER
     )
+
+
+def generate_numbered_domain_user(number: int,
+                                  age: int = 26,
+                                  role: UserRole = UserRole.USER,
+                                  *,
+                                  name: str = None,
+                                  email: str = None):
+    return create_user(
+        name=name if name is not None else f"test{number}",
+        age=age,
+        password="Str0ngPassword",
+        email=email if email is not None else f"test{number}@test.com",
+        role=role
+    )